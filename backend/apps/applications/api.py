@@ -2,7 +2,6 @@
 Application API endpoints - Full CRUD and lifecycle management
 """
 
-from typing import List
 from ninja import Router
 from ninja.errors import HttpError
 from django.shortcuts import get_object_or_404
@@ -10,7 +9,13 @@ from django.db.models import Q
 from django.db import transaction
 import uuid
 
-from .models import Application, DeploymentLog
+from .models import (
+    Application,
+    AppColdStart,
+    AppMigration,
+    DeploymentLog,
+    ResourceRecommendation,
+)
 from .schemas import (
     ApplicationCreate,
     ApplicationResponse,
@@ -18,7 +23,22 @@ from .schemas import (
     ApplicationAction,
     ApplicationLogsResponse,
     ApplicationClone,
+    ApplicationCloneBatch,
+    ApplicationCloneBatchResponse,
     ApplicationAdopt,
+    ApplicationBatchCreate,
+    ApplicationBulkAdopt,
+    ApplicationBatchResponse,
+    ApplicationMigrate,
+    MigrationResponse,
+    MigrationListResponse,
+    RebalancePlanResponse,
+    RebalanceExecuteResponse,
+    RightsizingResponse,
+    RightsizingListResponse,
+    ColdStartListResponse,
+    DeploymentStepListResponse,
+    WakeResponse,
 )
 from .tasks import (
     deploy_app_task,
@@ -28,13 +48,47 @@ from .tasks import (
     delete_app_task,
     clone_app_task,
     adopt_app_task,
+    bulk_adopt_task,
 )
 from .port_manager import PortManagerService
+from .placement import PlacementService, PlacementError
+from .batch_deploy import BatchDeployService, BatchDeployError
+from .clone_engine import CloneService, CloneError
+from .node_migration import MigrationService, MigrationError
+from .rebalancer import RebalanceService
+from .rightsizing import RightsizingService, RightsizingError
+from .autosuspend import AutosuspendService, AutosuspendError
+from .deploy_engine import steps_to_dict
+from .discovery import get_unmanaged_containers, filter_containers
+from apps.proxmox import ProxmoxError
 from apps.proxmox.models import ProxmoxNode
+from proximity.auth import JWTCookieAuthenticator, WakeTokenAuthenticator
 
 router = Router()
 
 
+def _app_to_response(app: Application) -> dict:
+    """Serialize an Application for ApplicationResponse (no live metrics)."""
+    return {
+        "id": app.id,
+        "catalog_id": app.catalog_id,
+        "name": app.name,
+        "hostname": app.hostname,
+        "status": app.status,
+        "url": app.url,
+        "iframe_url": app.iframe_url,
+        "public_port": app.public_port,
+        "internal_port": app.internal_port,
+        "lxc_id": app.lxc_id,
+        "node": app.node,
+        "host_id": app.host_id,
+        "created_at": app.created_at.isoformat(),
+        "updated_at": app.updated_at.isoformat(),
+        "config": app.config,
+        "environment": app.environment,
+    }
+
+
 @router.get("/apps/", response=ApplicationListResponse)
 def list_applications(
     request, page: int = 1, per_page: int = 20, status: str = None, search: str = None
@@ -147,89 +201,29 @@ def create_application(request, payload: ApplicationCreate):
     # This is safer than checking before creation (check-then-act race condition).
 
     # Get or select Proxmox host and node with intelligent selection
+    placement = PlacementService()
     if payload.node:
         # Explicit node specified - verify it's online
-        node_obj = ProxmoxNode.objects.filter(name=payload.node, status="online").first()
-        if not node_obj:
-            # Check if node exists but is offline
-            offline_node = ProxmoxNode.objects.filter(name=payload.node).first()
-            if offline_node:
-                raise HttpError(
-                    400,
-                    f"The specified node '{payload.node}' is not online (status: {offline_node.status})",
-                )
-            else:
-                raise HttpError(400, f"The specified node '{payload.node}' does not exist")
+        try:
+            node_obj = placement.get_explicit_node(payload.node)
+        except PlacementError as e:
+            raise HttpError(400, str(e))
 
         host = node_obj.host
         node = payload.node
     else:
         # No node specified - intelligent selection
         # Strategy: Select the online node with most available memory
-
         logger.info("🔍 Starting smart node selection...")
 
-        # Get all online nodes across all active hosts
-        online_nodes = ProxmoxNode.objects.filter(
-            status="online", host__is_active=True
-        ).select_related("host")
-
-        logger.info(f"📊 Found {online_nodes.count()} online nodes across active hosts")
-
-        # Log details of each candidate node
-        for node_obj in online_nodes:
-            if node_obj.memory_total and node_obj.memory_used is not None:
-                free_gb = (node_obj.memory_total - node_obj.memory_used) / (1024**3)
-                logger.info(
-                    f"   - Node '{node_obj.name}': "
-                    f"status={node_obj.status}, "
-                    f"host={node_obj.host.name}, "
-                    f"host_active={node_obj.host.is_active}, "
-                    f"free_memory={free_gb:.2f}GB"
-                )
-            else:
-                logger.info(
-                    f"   - Node '{node_obj.name}': "
-                    f"status={node_obj.status}, "
-                    f"host={node_obj.host.name}, "
-                    f"host_active={node_obj.host.is_active}, "
-                    f"free_memory=UNKNOWN"
-                )
-
-        if not online_nodes.exists():
+        best_node = placement.select_node()
+        if not best_node:
             logger.error("❌ No online Proxmox nodes available for deployment")
             raise HttpError(503, "No online Proxmox nodes available for deployment")
 
-        # Select node with most available memory (best for load balancing)
-        best_node = None
-        max_available_memory = -1
-
-        for node_obj in online_nodes:
-            # Calculate available memory (total - used)
-            if node_obj.memory_total and node_obj.memory_used is not None:
-                available = node_obj.memory_total - node_obj.memory_used
-                if available > max_available_memory:
-                    max_available_memory = available
-                    best_node = node_obj
-
-        # Fallback: if no memory info, just pick first online node
-        if not best_node:
-            logger.warning("⚠️  No memory info available, using first online node")
-            best_node = online_nodes.first()
-        else:
-            free_gb = max_available_memory / (1024**3)
-            logger.info(
-                f"✅ Selected node '{best_node.name}' with {free_gb:.2f}GB free memory "
-                f"(host: {best_node.host.name})"
-            )
-
         host = best_node.host
         node = best_node.name
 
-        print(
-            f"[API] Smart node selection: {node} on host {host.name} (available memory: {max_available_memory / (1024**3):.2f} GB)"
-        )
-
     # 🔐 TRANSACTION: Wrap port allocation and app creation with proper cleanup
     port_manager = PortManagerService()
     public_port = None
@@ -336,31 +330,85 @@ def create_application(request, payload: ApplicationCreate):
     }
 
 
-@router.get("/apps/discover", response=List[dict])
-def discover_unmanaged_containers(request, host_id: int = None):
+@router.post("/apps/batch", response={202: ApplicationBatchResponse})
+def create_application_batch(request, payload: ApplicationBatchCreate):
+    """
+    Create and deploy many applications from one request.
+
+    Ports, VMIDs and node placement are resolved for the whole batch, the rows
+    are inserted in bulk, and deployments run in per-node lanes so a node never
+    runs more than BATCH_DEPLOY_NODE_CONCURRENCY deploys at once.
+
+    Requires JWT authentication. All apps will be owned by the authenticated user.
+    """
+    # 🔐 AUTHORIZATION: Require authentication
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required to create applications")
+
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logger.info(f"[API] Received batch deployment request for {len(payload.apps)} app(s)")
+
+    try:
+        result = BatchDeployService().create_batch(
+            [spec.dict() for spec in payload.apps], owner=request.user
+        )
+    except BatchDeployError as e:
+        raise HttpError(e.status_code, str(e))
+    except Exception as e:
+        logger.error(f"[API] ❌ Unexpected error during batch creation: {e}", exc_info=True)
+        # 🔐 Don't expose internal exception details to client
+        raise HttpError(500, "Failed to create applications. Please try again or contact support.")
+
+    return 202, {
+        "batch_id": result["batch_id"],
+        "total": len(result["apps"]),
+        "lanes": result["lanes"],
+        "apps": [_app_to_response(app) for app in result["apps"]],
+    }
+
+
+@router.get("/apps/discover", response=dict)
+def discover_unmanaged_containers(
+    request,
+    host_id: int = None,
+    node: str = None,
+    status: str = None,
+    search: str = None,
+    page: int = 1,
+    per_page: int = 50,
+    refresh: bool = False,
+):
     """
     Discover LXC containers that exist on Proxmox but are not managed by Proximity.
 
-    This endpoint scans all Proxmox nodes and returns containers that could be adopted.
+    Results come from a short-lived per-host cache that is refreshed in the
+    background, so opening the adoption UI does not wait on Proxmox.
 
     Query params:
         host_id: Optional Proxmox host ID (uses default if not specified)
+        node: Filter by node name
+        status: Filter by container status (running, stopped)
+        search: Search by container name or VMID
+        page: Page number (default: 1)
+        per_page: Items per page (default: 50, max: 500)
+        refresh: Bypass the cache and query Proxmox now
 
     Returns:
-        List of unmanaged containers with their basic information
+        Page of unmanaged containers with their basic information
     """
     import logging
-    from apps.proxmox import ProxmoxService, ProxmoxError
+    from datetime import datetime, timezone as dt_timezone
+    from apps.proxmox import ProxmoxError
 
     logger = logging.getLogger(__name__)
 
-    try:
-        service = ProxmoxService(host_id=host_id)
-        unmanaged_containers = service.discover_unmanaged_lxc()
-
-        logger.info(f"Discovery API: Found {len(unmanaged_containers)} unmanaged containers")
-        return unmanaged_containers
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), 500)
 
+    try:
+        containers, fetched_at = get_unmanaged_containers(host_id=host_id, force_refresh=refresh)
     except ProxmoxError as e:
         logger.error(f"Discovery failed: {e}", exc_info=True)
         # 🔐 Don't expose Proxmox connection details
@@ -370,6 +418,168 @@ def discover_unmanaged_containers(request, host_id: int = None):
         # 🔐 Don't expose internal error details
         raise HttpError(500, "Discovery operation failed. Please try again or contact support.")
 
+    containers = filter_containers(containers, node=node, status=status, search=search)
+    start = (page - 1) * per_page
+
+    logger.debug(f"Discovery API: {len(containers)} unmanaged containers match")
+    return {
+        "containers": containers[start : start + per_page],
+        "total": len(containers),
+        "page": page,
+        "per_page": per_page,
+        "fetched_at": datetime.fromtimestamp(fetched_at, tz=dt_timezone.utc).isoformat(),
+    }
+
+
+@router.post("/apps/adopt/bulk", response={202: dict})
+def bulk_adopt_containers(request, payload: ApplicationBulkAdopt):
+    """
+    Adopt many existing LXC containers in a single background job.
+
+    Containers that are missing, already managed or whose name clashes with an
+    existing hostname are skipped and reported in the task result, as are those
+    whose hostname or port was taken concurrently while the job ran.
+
+    Returns:
+        202 Accepted with the bulk adoption task ID
+    """
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+    logger.info(f"[ADOPT API] Received bulk adoption request for {len(payload.items)} container(s)")
+
+    try:
+        task = bulk_adopt_task.delay([item.dict() for item in payload.items], payload.host_id)
+    except Exception as e:
+        logger.error(f"[ADOPT API] ❌ Failed to start bulk adoption: {e}", exc_info=True)
+        # 🔐 Don't expose internal error details
+        raise HttpError(500, "Failed to start bulk adoption. Please try again or contact support.")
+
+    return 202, {
+        "message": f"Bulk adoption of {len(payload.items)} container(s) started",
+        "task_id": task.id,
+        "count": len(payload.items),
+    }
+
+
+@router.get("/apps/rebalance", response=RebalancePlanResponse)
+def get_rebalance_plan(request, host_id: int = None):
+    """
+    Propose moves that take running apps off hot nodes.
+
+    Query params:
+        host_id: Only rebalance the nodes of this Proxmox host
+    """
+    # 🔐 Authorization: Only admins can rebalance the cluster
+    if not request.user.is_authenticated or not request.user.is_staff:
+        raise HttpError(403, "Admin privileges required to rebalance nodes")
+
+    return RebalanceService().propose(host_id)
+
+
+@router.post("/apps/rebalance", response={202: RebalanceExecuteResponse})
+def execute_rebalance(request, host_id: int = None):
+    """
+    Compute a fresh rebalance proposal and start its migrations.
+
+    Query params:
+        host_id: Only rebalance the nodes of this Proxmox host
+    """
+    # 🔐 Authorization: Only admins can rebalance the cluster
+    if not request.user.is_authenticated or not request.user.is_staff:
+        raise HttpError(403, "Admin privileges required to rebalance nodes")
+
+    service = RebalanceService()
+    outcome = service.execute(service.propose(host_id)["moves"], requested_by=request.user)
+
+    return 202, {
+        "migrations": [MigrationService.to_dict(migration) for migration in outcome["started"]],
+        "skipped": outcome["skipped"],
+    }
+
+
+@router.get("/apps/rightsizing", response=RightsizingListResponse)
+def list_rightsizing(request, changes_only: bool = False):
+    """
+    List right-sizing recommendations of the caller's applications.
+
+    Query params:
+        changes_only: Only recommendations that differ from the current allocation
+    """
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    queryset = ResourceRecommendation.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(application__owner=request.user)
+
+    recommendations = [
+        recommendation
+        for recommendation in queryset.order_by("application_id")
+        if recommendation.has_changes or not changes_only
+    ]
+
+    return {
+        "recommendations": [RightsizingService.to_dict(r) for r in recommendations],
+        "total": len(recommendations),
+        "memory_savings": sum(r.memory_savings for r in recommendations if not r.applied_at),
+    }
+
+
+@router.post(
+    "/apps/wake",
+    response={200: WakeResponse, 202: WakeResponse},
+    auth=[WakeTokenAuthenticator(), JWTCookieAuthenticator()],
+)
+def wake_application(request, hostname: str = None, public_port: int = None, wait: bool = True):
+    """
+    Wake a suspended application and hold the request until it runs.
+
+    Called by the reverse proxy (X-Proximity-Wake-Token) when an app's
+    upstream is down, or by a signed-in owner. Concurrent calls share one
+    cold start. Returns 200 once the app runs, 202 if it is still booting
+    after AUTOSUSPEND_WAKE_TIMEOUT (the proxy retries).
+
+    Query params:
+        hostname: Application hostname
+        public_port: Application public port
+        wait: Hold the request until the container runs (default: true)
+    """
+    if not hostname and public_port is None:
+        raise HttpError(400, "hostname or public_port is required")
+
+    queryset = Application.objects.all()
+    if hostname:
+        queryset = queryset.filter(hostname=hostname)
+    if public_port is not None:
+        queryset = queryset.filter(public_port=public_port)
+    # 🔐 AUTHORIZATION: The proxy may wake any app, users only their own
+    if not isinstance(request.auth, str) and not request.auth.is_staff:
+        queryset = queryset.filter(owner=request.auth)
+
+    app = get_object_or_404(queryset)
+    if app.status == "running":
+        return 200, {"app_id": app.id, "status": "running", "url": app.url, "cold_start": None}
+
+    try:
+        cold_start = AutosuspendService().wake(app)
+    except AutosuspendError as e:
+        raise HttpError(e.status_code, str(e))
+
+    if wait:
+        cold_start = AutosuspendService.wait(cold_start)
+    if cold_start.status == "failed":
+        raise HttpError(502, f"Failed to wake '{app.hostname}': {cold_start.error}")
+
+    ready = cold_start.status == "ready"
+    return (200 if ready else 202), {
+        "app_id": app.id,
+        "status": "running" if ready else "starting",
+        "url": app.url,
+        "cold_start": AutosuspendService.to_dict(cold_start),
+    }
+
 
 @router.post("/apps/adopt", response={202: dict})
 def adopt_existing_container(request, payload: ApplicationAdopt):
@@ -497,7 +707,14 @@ def app_action(request, app_id: str, payload: ApplicationAction):
     action = payload.action.lower()
 
     if action == "start":
-        start_app_task.delay(app_id)
+        if app.status == "suspended":
+            # Waking through autosuspend records the cold start
+            try:
+                AutosuspendService().wake(app, trigger="manual")
+            except AutosuspendError as e:
+                raise HttpError(e.status_code, str(e))
+        else:
+            start_app_task.delay(app_id)
         return {"success": True, "message": f"Starting {app.name}"}
 
     elif action == "stop":
@@ -566,7 +783,12 @@ def clone_application(request, app_id: str, payload: ApplicationClone):
     )
 
     # Start clone task in background
-    clone_app_task.delay(source_app_id=app_id, new_hostname=payload.new_hostname, owner_id=owner_id)
+    clone_app_task.delay(
+        source_app_id=app_id,
+        new_hostname=payload.new_hostname,
+        owner_id=owner_id,
+        mode=payload.mode,
+    )
 
     logger.info("[CLONE API] Clone task started successfully")
 
@@ -579,6 +801,210 @@ def clone_application(request, app_id: str, payload: ApplicationClone):
     }
 
 
+@router.post("/{app_id}/clones", response={202: ApplicationCloneBatchResponse})
+def clone_application_copies(request, app_id: str, payload: ApplicationCloneBatch):
+    """
+    Clone an application into many copies as one operation.
+
+    All copies share one temporary snapshot of the source, use linked clones
+    when the source is a template on copy-on-write storage, and are spread
+    over nodes and storages by the placement engine.
+    """
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+    # 🔐 AUTHORIZATION: Only owner or admin can clone application
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    source_app = get_object_or_404(queryset, id=app_id)
+
+    if source_app.status not in ["running", "stopped"]:
+        raise HttpError(
+            400,
+            f"Cannot clone application in status '{source_app.status}'. Only running or stopped applications can be cloned.",
+        )
+
+    logger.info(
+        f"[CLONE API] Cloning {source_app.name} into {len(payload.hostnames)} cop(ies) "
+        f"(mode={payload.mode})"
+    )
+
+    try:
+        result = CloneService().create_clones(
+            source_app, payload.hostnames, owner=request.user, mode=payload.mode
+        )
+    except CloneError as e:
+        raise HttpError(e.status_code, str(e))
+    except Exception as e:
+        logger.error(f"[CLONE API] ❌ Unexpected error during clone: {e}", exc_info=True)
+        # 🔐 Don't expose internal exception details to client
+        raise HttpError(500, "Failed to clone application. Please try again or contact support.")
+
+    return 202, {
+        "clone_id": result["clone_id"],
+        "total": len(result["apps"]),
+        "mode": result["mode"],
+        "apps": [_app_to_response(app) for app in result["apps"]],
+    }
+
+
+@router.post("/{app_id}/migrate", response={202: MigrationResponse})
+def migrate_application(request, app_id: str, payload: ApplicationMigrate):
+    """
+    Move an application to another node of its cluster.
+
+    Running containers are migrated in restart mode (short downtime). Returns
+    202 Accepted with the migration; poll /{app_id}/migrations for progress.
+    """
+    # 🔐 AUTHORIZATION: Only owner or admin can migrate application
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    app = get_object_or_404(queryset, id=app_id)
+
+    try:
+        migration = MigrationService().start_migration(
+            app,
+            target_node=payload.target_node,
+            requested_by=request.user,
+            target_storage=payload.target_storage,
+        )
+    except MigrationError as e:
+        raise HttpError(e.status_code, str(e))
+
+    return 202, MigrationService.to_dict(migration)
+
+
+@router.get("/{app_id}/migrations", response=MigrationListResponse)
+def list_application_migrations(request, app_id: str, limit: int = 20):
+    """
+    Get the node migrations of an application with their progress.
+
+    Query params:
+        limit: Maximum number of migrations (default: 20)
+    """
+    # 🔐 AUTHORIZATION: Only owner or admin can view migrations
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    app = get_object_or_404(queryset, id=app_id)
+    migrations = list(AppMigration.objects.filter(application=app)[:limit])
+
+    return {
+        "app_id": app.id,
+        "migrations": [MigrationService.to_dict(migration) for migration in migrations],
+        "total": len(migrations),
+    }
+
+
+@router.get("/{app_id}/rightsizing", response=RightsizingResponse)
+def get_application_rightsizing(request, app_id: str, refresh: bool = False):
+    """
+    Get the right-sizing recommendation of an application.
+
+    Query params:
+        refresh: Recompute from the usage history instead of the stored advice
+    """
+    # 🔐 AUTHORIZATION: Only owner or admin can view recommendations
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    app = get_object_or_404(queryset, id=app_id)
+
+    recommendation = ResourceRecommendation.objects.filter(application=app).first()
+    if refresh or not recommendation:
+        if not app.lxc_id:
+            raise HttpError(400, f"Application '{app.hostname}' has no container")
+        try:
+            recommendation = RightsizingService().analyze(app)
+        except ProxmoxError as e:
+            raise HttpError(503, f"Failed to read usage history: {e}")
+
+    return RightsizingService.to_dict(recommendation)
+
+
+@router.post("/{app_id}/rightsizing/apply", response=RightsizingResponse)
+def apply_application_rightsizing(request, app_id: str):
+    """
+    Apply the stored right-sizing recommendation (memory and cores, no restart).
+    """
+    # 🔐 AUTHORIZATION: Only owner or admin can resize application
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    app = get_object_or_404(queryset, id=app_id)
+
+    try:
+        recommendation = RightsizingService().apply(app)
+    except RightsizingError as e:
+        raise HttpError(e.status_code, str(e))
+    except ProxmoxError as e:
+        raise HttpError(502, f"Proxmox rejected the new limits: {e}")
+
+    return RightsizingService.to_dict(recommendation)
+
+
+@router.get("/{app_id}/cold-starts", response=ColdStartListResponse)
+def list_application_cold_starts(request, app_id: str, limit: int = 50):
+    """
+    List the wake-ups of a suspended application with their latency.
+
+    Query params:
+        limit: Maximum cold starts to return (default: 50)
+    """
+    # 🔐 AUTHORIZATION: Only owner or admin can view cold starts
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    app = get_object_or_404(queryset, id=app_id)
+    cold_starts = list(AppColdStart.objects.filter(application=app)[:limit])
+    durations = [c.duration_ms for c in cold_starts if c.duration_ms is not None]
+
+    return {
+        "app_id": app.id,
+        "cold_starts": [AutosuspendService.to_dict(c) for c in cold_starts],
+        "total": len(cold_starts),
+        "average_ms": sum(durations) // len(durations) if durations else None,
+        "max_ms": max(durations) if durations else None,
+    }
+
+
+@router.get("/{app_id}/deploy-steps", response=DeploymentStepListResponse)
+def list_application_deploy_steps(request, app_id: str):
+    """
+    List the deployment steps of an application with their status, outputs and timing.
+    """
+    # 🔐 AUTHORIZATION: Only owner or admin can view deployment steps
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+    queryset = Application.objects.all()
+    if not request.user.is_staff:
+        queryset = queryset.filter(owner=request.user)
+
+    app = get_object_or_404(queryset, id=app_id)
+    return {"app_id": app.id, "steps": steps_to_dict(app)}
+
+
 @router.get("/{app_id}/logs", response=ApplicationLogsResponse)
 def get_application_logs(request, app_id: str, limit: int = 50):
     """
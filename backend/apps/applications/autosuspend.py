@@ -0,0 +1,300 @@
+"""
+Autosuspend - stop idle applications and wake them on their next request.
+
+An application is idle when, over the last AUTOSUSPEND_IDLE_MINUTES, every
+Proxmox RRD sample of its container (MAX per sample, so a single burst counts
+as activity) shows network traffic below AUTOSUSPEND_NET_THRESHOLD and CPU
+below AUTOSUSPEND_CPU_THRESHOLD. Idle containers are shut down and the
+application is marked 'suspended', which frees their memory on the node.
+
+Suspended applications are woken by the reverse proxy in front of their
+public port: it calls the wake endpoint when the upstream is down, which
+starts the container through start_app_task and holds the request until
+Proxmox reports the start task finished. Each wake-up is recorded as an AppColdStart with its latency.
+
+Autosuspend is opt-in: AUTOSUSPEND_ENABLED turns it on for every app, and an
+app's config can override it either way with {"autosuspend": true|false}.
+"""
+
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.proxmox import ProxmoxService, ProxmoxError
+from apps.applications.models import AppColdStart, Application, DeploymentLog
+from apps.applications.rebalancer import app_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+# Smallest Proxmox RRD timeframe that covers an idle window (minutes)
+_TIMEFRAMES = [(60, "hour"), (1440, "day"), (10080, "week")]
+
+
+class AutosuspendError(Exception):
+    """Raised when an application cannot be suspended or woken."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def autosuspend_enabled(app: Application) -> bool:
+    """Whether an application may be suspended when idle."""
+    override = (app.config or {}).get("autosuspend")
+    return settings.AUTOSUSPEND_ENABLED if override is None else bool(override)
+
+
+def rrd_timeframe(minutes: int) -> str:
+    """RRD timeframe whose history covers the last `minutes`."""
+    for limit, timeframe in _TIMEFRAMES:
+        if minutes <= limit:
+            return timeframe
+    return "month"
+
+
+def is_idle(samples: List[Dict[str, Any]], since: float) -> bool:
+    """
+    Whether usage samples show no activity since a point in time.
+
+    Args:
+        samples: RRD samples with 'time', 'cpu' (fraction of 'maxcpu'),
+            'maxcpu', 'netin' and 'netout' (bytes/s)
+        since: Start of the idle window (UNIX timestamp)
+
+    Returns:
+        True only when the history reaches back to `since` and no sample in
+        the window crosses a threshold; missing data is never idle.
+    """
+    measured = sorted(
+        (s for s in samples if s.get("time") is not None and s.get("cpu") is not None),
+        key=lambda s: s["time"],
+    )
+    if not measured or measured[0]["time"] > since:
+        return False
+
+    window = [s for s in measured if s["time"] >= since]
+    if not window:
+        return False
+
+    for sample in window:
+        traffic = (sample.get("netin") or 0) + (sample.get("netout") or 0)
+        busy_cores = sample["cpu"] * (sample.get("maxcpu") or 1)
+        if (
+            traffic >= settings.AUTOSUSPEND_NET_THRESHOLD
+            or busy_cores >= settings.AUTOSUSPEND_CPU_THRESHOLD
+        ):
+            return False
+    return True
+
+
+class AutosuspendService:
+    """
+    Suspends idle applications and wakes suspended ones.
+    """
+
+    def __init__(self, idle_minutes: Optional[int] = None):
+        self.idle_minutes = idle_minutes or settings.AUTOSUSPEND_IDLE_MINUTES
+
+    def candidates(self, host_id: Optional[int] = None) -> List[Application]:
+        """
+        Running applications that may be suspended.
+
+        Apps that changed state within the idle window (just deployed,
+        started or woken) have not been observed long enough and are skipped.
+        """
+        window_start = timezone.now() - timedelta(minutes=self.idle_minutes)
+        apps = Application.objects.filter(
+            status="running", lxc_id__isnull=False, state_changed_at__lte=window_start
+        )
+        if host_id is not None:
+            apps = apps.filter(host_id=host_id)
+        return [app for app in apps.order_by("id") if autosuspend_enabled(app)]
+
+    def find_idle(self, host_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Check the usage history of every candidate.
+
+        Returns:
+            Dictionary with the 'idle' applications and per-app 'errors'
+        """
+        since = time.time() - self.idle_minutes * 60
+        timeframe = rrd_timeframe(self.idle_minutes)
+        services: Dict[int, ProxmoxService] = {}
+        idle, errors = [], {}
+
+        for app in self.candidates(host_id):
+            proxmox = services.setdefault(app.host_id, ProxmoxService(host_id=app.host_id))
+            try:
+                samples = proxmox.get_lxc_rrd_data(app.node, app.lxc_id, timeframe=timeframe)
+            except ProxmoxError as e:
+                errors[app.id] = str(e)
+                continue
+            if is_idle(samples, since):
+                idle.append(app)
+
+        return {"idle": idle, "errors": errors}
+
+    def suspend(self, app: Application, proxmox: Optional[ProxmoxService] = None) -> Application:
+        """
+        Shut down an application's container and mark it suspended.
+
+        Raises:
+            AutosuspendError: If the application is no longer running
+            ProxmoxError: If the container cannot be shut down or the shutdown task fails
+        """
+        if app.status != "running":
+            raise AutosuspendError(
+                f"Cannot suspend application in status '{app.status}'", status_code=409
+            )
+
+        proxmox = proxmox or ProxmoxService(host_id=app.host_id)
+        upid = proxmox.stop_lxc(app.node, app.lxc_id)
+        # Suspended (and its memory free) only once the shutdown task has finished
+        if isinstance(upid, str):
+            proxmox.wait_for_task(app.node, upid, timeout=120)
+
+        with transaction.atomic():
+            locked = Application.objects.select_for_update().get(id=app.id)
+            if locked.status != "running":
+                raise AutosuspendError(
+                    f"Application '{app.hostname}' changed to '{locked.status}' while suspending",
+                    status_code=409,
+                )
+            locked.status = "suspended"
+            locked.save(update_fields=["status", "state_changed_at", "updated_at"])
+            DeploymentLog.objects.create(
+                application=locked,
+                level="info",
+                message=f"Suspended after {self.idle_minutes} minutes without activity",
+                step="autosuspend",
+            )
+
+        logger.info(f"💤 Suspended idle app {locked.hostname} on {locked.node}")
+        return locked
+
+    def run(self, host_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Suspend every idle application.
+
+        Returns:
+            Summary with suspended app IDs, memory freed (MB) and errors
+        """
+        found = self.find_idle(host_id)
+        errors = dict(found["errors"])
+        suspended = []
+
+        for app in found["idle"]:
+            try:
+                suspended.append(self.suspend(app))
+            except (AutosuspendError, ProxmoxError) as e:
+                errors[app.id] = str(e)
+
+        return {
+            "success": True,
+            "suspended": [app.id for app in suspended],
+            "memory_freed_mb": sum(app_memory_bytes(app) for app in suspended) // 1024**2,
+            "errors": errors,
+        }
+
+    def wake(self, app: Application, trigger: str = "request") -> AppColdStart:
+        """
+        Start a suspended application, once however many requests ask for it.
+
+        A cold start still pending after AUTOSUSPEND_WAKE_STALE_AFTER seconds is
+        marked failed and replaced, so a lost start task cannot block wakes forever.
+
+        Args:
+            app: Suspended application
+            trigger: "request" (reverse proxy) or "manual" (start action)
+
+        Returns:
+            The pending (or already finished) AppColdStart
+
+        Raises:
+            AutosuspendError: If the application is not suspended
+        """
+        from apps.applications.tasks import start_app_task
+
+        with transaction.atomic():
+            locked = Application.objects.select_for_update().get(id=app.id)
+
+            pending = locked.cold_starts.filter(status="pending").first()
+            if pending:
+                age = (timezone.now() - pending.requested_at).total_seconds()
+                if age <= settings.AUTOSUSPEND_WAKE_STALE_AFTER:
+                    return pending
+                # start_app_task never reported back (worker killed, message lost)
+                pending.status = "failed"
+                pending.error = f"Abandoned: no outcome after {int(age)}s"
+                pending.save(update_fields=["status", "error"])
+                logger.warning(f"⚠️  Cold start {pending.id} abandoned after {int(age)}s, retrying")
+            if locked.status != "suspended":
+                raise AutosuspendError(
+                    f"Application '{locked.hostname}' is {locked.status}, not suspended",
+                    status_code=409,
+                )
+
+            cold_start = AppColdStart.objects.create(
+                application=locked, trigger=trigger, suspended_at=locked.state_changed_at
+            )
+            transaction.on_commit(
+                lambda: start_app_task.delay(locked.id, cold_start_id=cold_start.id)
+            )
+
+        logger.info(f"⏰ Waking {locked.hostname} (cold start {cold_start.id}, {trigger})")
+        return cold_start
+
+    @staticmethod
+    def wait(
+        cold_start: AppColdStart, timeout: Optional[float] = None, poll_interval: float = 0.5
+    ) -> AppColdStart:
+        """Block until a cold start finishes or the timeout (AUTOSUSPEND_WAKE_TIMEOUT) expires."""
+        timeout = settings.AUTOSUSPEND_WAKE_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while cold_start.status == "pending" and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            cold_start.refresh_from_db(fields=["status", "ready_at", "duration_ms", "error"])
+        return cold_start
+
+    @staticmethod
+    def finish(cold_start_id: int, error: Optional[str] = None) -> None:
+        """Record the outcome of a cold start (called by start_app_task)."""
+        cold_start = AppColdStart.objects.filter(id=cold_start_id, status="pending").first()
+        if not cold_start:
+            return
+
+        now = timezone.now()
+        cold_start.status = "failed" if error else "ready"
+        cold_start.error = error
+        if not error:
+            cold_start.ready_at = now
+            cold_start.duration_ms = int((now - cold_start.requested_at).total_seconds() * 1000)
+        cold_start.save(update_fields=["status", "error", "ready_at", "duration_ms"])
+
+        if error:
+            logger.error(f"❌ Cold start {cold_start_id} failed: {error}")
+        else:
+            logger.info(f"✅ Cold start {cold_start_id} ready in {cold_start.duration_ms}ms")
+
+    @staticmethod
+    def to_dict(cold_start: AppColdStart) -> Dict[str, Any]:
+        """Serialize an AppColdStart for ColdStartResponse."""
+        return {
+            "id": cold_start.id,
+            "app_id": cold_start.application_id,
+            "trigger": cold_start.trigger,
+            "status": cold_start.status,
+            "suspended_at": (
+                cold_start.suspended_at.isoformat() if cold_start.suspended_at else None
+            ),
+            "requested_at": cold_start.requested_at.isoformat(),
+            "ready_at": cold_start.ready_at.isoformat() if cold_start.ready_at else None,
+            "duration_ms": cold_start.duration_ms,
+            "error": cold_start.error,
+        }
@@ -0,0 +1,219 @@
+"""
+Batch Deploy Service - Provision many applications from a single request.
+
+Ports, VMIDs and node placement are resolved for the whole batch up front,
+rows are inserted with one bulk_create, and deployments are dispatched in
+per-node lanes so no node runs more than a bounded number of deploys at once.
+
+A reserved VMID is kept in config["reserved_vmid"] until the deployment's vmid
+step moves it to lxc_id: rows can wait in a lane for a long time, and
+reconciliation treats an lxc_id missing from Proxmox as an orphan.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, List, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from apps.proxmox import ProxmoxService, ProxmoxError
+from apps.applications.models import Application
+from apps.applications.placement import PlacementService, PlacementError, NoOnlineNodesError
+from apps.applications.port_manager import PortManagerService
+
+logger = logging.getLogger(__name__)
+
+
+# Batch rows still waiting in their lane: the deploy has not taken up its reserved VMID
+QUEUED_IN_BATCH = Q(lxc_id__isnull=True, config__reserved_vmid__isnull=False)
+
+
+def reserved_vmids() -> Set[int]:
+    """VMIDs reserved by queued batch deploys whose container does not exist yet."""
+    return {
+        int(vmid)
+        for vmid in Application.objects.filter(QUEUED_IN_BATCH).values_list(
+            "config__reserved_vmid", flat=True
+        )
+        if vmid is not None
+    }
+
+
+class BatchDeployError(Exception):
+    """Raised when a batch cannot be provisioned as a whole."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class BatchDeployService:
+    """
+    Provisions a batch of deployments atomically and dispatches them.
+    """
+
+    def __init__(self):
+        self.port_manager = PortManagerService()
+        self.placement = PlacementService()
+
+    def create_batch(self, specs: List[Dict[str, Any]], owner=None) -> Dict[str, Any]:
+        """
+        Create Application rows for every spec and enqueue their deployments.
+
+        Args:
+            specs: List of ApplicationCreate-shaped dicts
+            owner: User that will own the applications
+
+        Returns:
+            Dictionary with batch_id, the created applications and lane layout
+
+        Raises:
+            BatchDeployError: If validation, placement or allocation fails
+        """
+        hostnames = [spec["hostname"] for spec in specs]
+        duplicates = sorted({h for h in hostnames if hostnames.count(h) > 1})
+        if duplicates:
+            raise BatchDeployError(f"Duplicate hostnames in batch: {', '.join(duplicates)}")
+
+        existing = sorted(
+            Application.objects.filter(hostname__in=hostnames).values_list("hostname", flat=True)
+        )
+        if existing:
+            raise BatchDeployError(
+                f"Hostnames already exist: {', '.join(existing)}", status_code=409
+            )
+
+        try:
+            placements = self.placement.place_batch(specs)
+        except NoOnlineNodesError as e:
+            raise BatchDeployError(str(e), status_code=503)
+        except PlacementError as e:
+            raise BatchDeployError(str(e))
+
+        batch_id = uuid.uuid4().hex[:12]
+
+        with transaction.atomic():
+            try:
+                port_pairs = self.port_manager.allocate_port_batch(len(specs))
+            except ValueError as e:
+                raise BatchDeployError(str(e), status_code=500)
+
+            try:
+                vmids = self.reserve_vmids([node_obj.host_id for node_obj in placements])
+            except ProxmoxError as e:
+                logger.error(f"[BATCH {batch_id}] VMID reservation failed: {e}")
+                raise BatchDeployError("Failed to reserve VMIDs from Proxmox", status_code=503)
+
+            apps = [
+                Application(
+                    id=f"{spec['catalog_id']}-{uuid.uuid4().hex[:8]}",
+                    catalog_id=spec["catalog_id"],
+                    name=spec["catalog_id"],
+                    hostname=spec["hostname"],
+                    status="deploying",
+                    public_port=public_port,
+                    internal_port=internal_port,
+                    node=node_obj.name,
+                    host=node_obj.host,
+                    config={
+                        **(spec.get("config") or {}),
+                        "batch_id": batch_id,
+                        "reserved_vmid": vmid,
+                    },
+                    environment=spec.get("environment") or {},
+                    owner=owner,
+                )
+                for spec, node_obj, (public_port, internal_port), vmid in zip(
+                    specs, placements, port_pairs, vmids
+                )
+            ]
+            Application.objects.bulk_create(apps)
+
+            lanes = self.build_lanes(apps, owner_id=owner.id if owner else None)
+
+            # Dispatch only once the rows are visible to workers
+            transaction.on_commit(lambda: self.dispatch(lanes))
+
+        logger.info(
+            f"[BATCH {batch_id}] Created {len(apps)} application(s) in {len(lanes)} lane(s)"
+        )
+
+        return {"batch_id": batch_id, "apps": apps, "lanes": len(lanes)}
+
+    def reserve_vmids(self, host_ids: List[int]) -> List[int]:
+        """
+        Reserve one VMID per entry of host_ids, grouped by Proxmox host.
+
+        Each host is queried once for its next free VMID and once for all VMIDs
+        in use, then candidates are handed out sequentially, skipping anything
+        Proxmox or our database already knows about.
+        """
+        taken_in_db: Set[int] = set(
+            Application.objects.filter(lxc_id__isnull=False).values_list("lxc_id", flat=True)
+        )
+        taken_in_db.update(reserved_vmids())
+
+        counts: Dict[int, int] = {}
+        for host_id in host_ids:
+            counts[host_id] = counts.get(host_id, 0) + 1
+
+        reserved_by_host: Dict[int, List[int]] = {}
+        for host_id, count in counts.items():
+            proxmox_service = ProxmoxService(host_id=host_id)
+            taken = taken_in_db | proxmox_service.get_used_vmids()
+            candidate = int(proxmox_service.get_next_vmid())
+
+            reserved = []
+            while len(reserved) < count:
+                if candidate not in taken:
+                    reserved.append(candidate)
+                    taken.add(candidate)
+                candidate += 1
+
+            taken_in_db.update(reserved)
+            reserved_by_host[host_id] = reserved
+
+        return [reserved_by_host[host_id].pop(0) for host_id in host_ids]
+
+    def build_lanes(self, apps: List[Application], owner_id=None) -> List[List[Dict[str, Any]]]:
+        """
+        Split deployments into per-node lanes.
+
+        Each node gets at most BATCH_DEPLOY_NODE_CONCURRENCY lanes; a lane runs
+        its deployments one after another.
+        """
+        concurrency = max(1, getattr(settings, "BATCH_DEPLOY_NODE_CONCURRENCY", 3))
+
+        by_node: Dict[str, List[Application]] = {}
+        for app in apps:
+            by_node.setdefault(app.node, []).append(app)
+
+        lanes: List[List[Dict[str, Any]]] = []
+        for node_apps in by_node.values():
+            node_lanes: List[List[Dict[str, Any]]] = [[] for _ in range(concurrency)]
+            for index, app in enumerate(node_apps):
+                node_lanes[index % concurrency].append(
+                    {
+                        "app_id": app.id,
+                        "catalog_id": app.catalog_id,
+                        "hostname": app.hostname,
+                        "host_id": app.host_id,
+                        "node": app.node,
+                        "config": app.config,
+                        "environment": app.environment,
+                        "owner_id": owner_id,
+                        "vmid": app.config.get("reserved_vmid"),
+                    }
+                )
+            lanes.extend(lane for lane in node_lanes if lane)
+
+        return lanes
+
+    def dispatch(self, lanes: List[List[Dict[str, Any]]]):
+        """Start every lane as a Celery group."""
+        from celery import group
+        from apps.applications.tasks import advance_deploy_lane_task
+
+        return group(advance_deploy_lane_task.si(lane) for lane in lanes).apply_async()
@@ -0,0 +1,259 @@
+"""
+Bulk Adoption Service - Import many existing LXC containers in one job.
+
+Container facts come from a single discovery listing, configuration snapshots
+are fetched concurrently, ports are allocated in one batch, and Application and
+DeploymentLog rows are inserted with bulk_create.
+"""
+
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.proxmox import ProxmoxService
+from apps.proxmox.models import ProxmoxNode
+from apps.applications.discovery import get_unmanaged_containers
+from apps.applications.models import Application, DeploymentLog
+from apps.applications.port_manager import PortManagerService
+
+logger = logging.getLogger(__name__)
+
+# Port exposed when the request does not name one (same default as adopt_app_task)
+DEFAULT_CONTAINER_PORT = 80
+
+
+class BulkAdoptionService:
+    """
+    Adopts a set of discovered containers on one Proxmox host.
+    """
+
+    def __init__(self, host_id: Optional[int] = None):
+        self.host_id = host_id
+        self.proxmox_service = ProxmoxService(host_id=host_id)
+        self.port_manager = PortManagerService()
+
+    def adopt(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Adopt every requested container that is still unmanaged.
+
+        Args:
+            items: ApplicationAdopt-shaped dicts (vmid, node_name, suggested_type,
+                port_to_expose)
+
+        Returns:
+            Dictionary with 'adopted' (created apps), 'skipped' (vmid + reason) and
+            'failed' (vmid + reason, for rows that conflicted with a concurrent insert)
+
+        Raises:
+            ProxmoxError: If the discovery listing cannot be fetched
+            ValueError: If the port ranges cannot hold the whole batch
+        """
+        discovered = {
+            c["vmid"]: c
+            for c in get_unmanaged_containers(host_id=self.host_id, force_refresh=True)[0]
+        }
+        nodes = {
+            node.name: node
+            for node in ProxmoxNode.objects.filter(
+                name__in={item["node_name"] for item in items}
+            ).select_related("host")
+        }
+
+        targets, skipped = self._select_targets(items, discovered, nodes)
+        if not targets:
+            return {"success": True, "adopted": [], "skipped": skipped, "failed": []}
+
+        snapshots = self._fetch_config_snapshots(targets)
+        adoption_date = timezone.now().isoformat()
+
+        with transaction.atomic():
+            port_pairs = self.port_manager.allocate_port_batch(len(targets))
+
+            apps = []
+            logs = []
+            for (item, container), snapshot, (public_port, internal_port) in zip(
+                targets, snapshots, port_pairs
+            ):
+                apps.append(
+                    self._build_application(
+                        item,
+                        container,
+                        nodes[item["node_name"]],
+                        snapshot,
+                        public_port,
+                        internal_port,
+                        adoption_date,
+                    )
+                )
+
+            created, failed = self._insert_applications(apps, targets)
+            apps = [app for app, _ in created]
+
+            for app, (item, container) in created:
+                logs.append(
+                    DeploymentLog(
+                        application=app,
+                        level="info",
+                        message=(
+                            f'Adopted existing container "{container["name"]}" '
+                            f"(VMID {container['vmid']}) in bulk. Status: {app.status}, "
+                            f"Port: {app.public_port}->{app.config['container_port']}"
+                        ),
+                        step="adoption_complete",
+                    )
+                )
+            DeploymentLog.objects.bulk_create(logs)
+
+        logger.info(
+            f"[BULK ADOPT] Adopted {len(apps)} container(s), skipped {len(skipped)}, "
+            f"failed {len(failed)} (host_id={self.host_id})"
+        )
+
+        return {
+            "success": True,
+            "adopted": [
+                {
+                    "app_id": app.id,
+                    "vmid": app.lxc_id,
+                    "hostname": app.hostname,
+                    "status": app.status,
+                    "public_port": app.public_port,
+                }
+                for app in apps
+            ],
+            "skipped": skipped,
+            "failed": failed,
+        }
+
+    def _insert_applications(self, apps, targets):
+        """
+        Insert the built applications, one bulk insert when nothing conflicts.
+
+        A hostname or port taken concurrently (by another adoption or a deploy)
+        makes the bulk insert fail as a whole; the rows are then inserted one at
+        a time, each in its own savepoint, so only the conflicting containers fail.
+
+        Returns:
+            (created (app, target) pairs, failed vmid + reason dicts)
+        """
+        try:
+            with transaction.atomic():
+                Application.objects.bulk_create(apps)
+            return list(zip(apps, targets)), []
+        except IntegrityError as e:
+            logger.warning(f"[BULK ADOPT] Bulk insert conflicted ({e}), inserting row by row")
+
+        created, failed = [], []
+        for app, (item, container) in zip(apps, targets):
+            try:
+                with transaction.atomic():
+                    app.save(force_insert=True)
+            except IntegrityError as e:
+                logger.warning(f"[BULK ADOPT] Could not adopt {item['vmid']}: {e}")
+                failed.append({"vmid": item["vmid"], "reason": f"Conflicting record: {e}"})
+                continue
+            created.append((app, (item, container)))
+
+        return created, failed
+
+    def _select_targets(self, items, discovered, nodes):
+        """Split requested items into adoptable (item, container) pairs and skips."""
+        targets = []
+        skipped = []
+        seen_vmids = set()
+        seen_hostnames = set()
+
+        names = [discovered[item["vmid"]]["name"] for item in items if item["vmid"] in discovered]
+        taken_hostnames = set(
+            Application.objects.filter(hostname__in=names).values_list("hostname", flat=True)
+        )
+
+        for item in items:
+            vmid = item["vmid"]
+            container = discovered.get(vmid)
+
+            if vmid in seen_vmids:
+                reason = "Duplicate VMID in request"
+            elif container is None:
+                reason = "Container not found or already managed"
+            elif container["node"] != item["node_name"]:
+                reason = f"Container is on node '{container['node']}', not '{item['node_name']}'"
+            elif item["node_name"] not in nodes:
+                reason = f"Node '{item['node_name']}' not found"
+            elif container["name"] in taken_hostnames or container["name"] in seen_hostnames:
+                reason = f"Hostname '{container['name']}' is already in use"
+            else:
+                reason = None
+
+            if reason:
+                skipped.append({"vmid": vmid, "reason": reason})
+                continue
+
+            seen_vmids.add(vmid)
+            seen_hostnames.add(container["name"])
+            targets.append((item, container))
+
+        return targets, skipped
+
+    def _fetch_config_snapshots(self, targets) -> List[Dict[str, Any]]:
+        """Fetch every container's configuration ('pct config') concurrently."""
+
+        def fetch(target):
+            item, container = target
+            try:
+                return dict(self.proxmox_service.get_lxc_config(container["node"], item["vmid"]))
+            except Exception as e:
+                # Continue with adoption even if config capture fails (as adopt_app_task does)
+                logger.warning(f"[BULK ADOPT] Could not capture config of {item['vmid']}: {e}")
+                return {"error": str(e)}
+
+        # Connect once up front so worker threads share the client and never touch the DB
+        self.proxmox_service.get_client()
+
+        workers = max(1, min(settings.BULK_ADOPT_CONCURRENCY, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch, targets))
+
+    def _build_application(
+        self, item, container, node, snapshot, public_port, internal_port, adoption_date
+    ) -> Application:
+        vmid = container["vmid"]
+        suggested_type = item.get("suggested_type") or "custom"
+        container_port = item.get("port_to_expose") or DEFAULT_CONTAINER_PORT
+
+        return Application(
+            id=f"{suggested_type}-{uuid.uuid4().hex[:8]}",
+            catalog_id=suggested_type,
+            name=container["name"],
+            hostname=container["name"],
+            status="running" if container["status"] == "running" else "stopped",
+            lxc_id=vmid,
+            node=node.name,
+            host_id=node.host_id,
+            public_port=public_port,
+            internal_port=internal_port,
+            config={
+                "adopted": True,
+                "bulk_adopted": True,
+                "original_vmid": vmid,
+                "original_name": container["name"],
+                "adoption_date": adoption_date,
+                "suggested_type": suggested_type,
+                "container_port": container_port,
+                "detected_ports": [],
+                "proxmox_config_snapshot": snapshot,
+                "resources_at_adoption": {
+                    "cpus": container["cpus"],
+                    "memory_bytes": container["memory"],
+                    "disk_bytes": container["disk"],
+                    "uptime_seconds": container["uptime"],
+                },
+                "status_at_adoption": container["status"],
+            },
+            environment={},
+        )
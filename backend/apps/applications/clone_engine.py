@@ -0,0 +1,455 @@
+"""
+Clone Engine - storage-aware, linked and multi-copy LXC cloning.
+
+The engine inspects the source container's volumes to learn what its storage
+can do, then picks the cheapest clone that is safe:
+
+- Templates on thin/CoW storage (ZFS, LVM-thin, Ceph RBD, btrfs) get linked
+  clones, which share blocks with the template and finish in seconds.
+- Everything else gets full clones, placed on the target node's storage with
+  the most room (PlacementService) instead of a hardcoded storage.
+- A non-template source on snapshot-capable storage is cloned from one
+  temporary snapshot. The source keeps running and every copy has the same
+  state, however many copies are made.
+
+Proxmox locks a container while it is being cloned, so one source can only
+feed one clone at a time. N copies are therefore made as a fan-out: every
+finished copy becomes a seed for the next round, and rounds run their clone
+tasks concurrently (bounded per node by CLONE_NODE_CONCURRENCY). Ten copies
+take four rounds instead of ten sequential clones. Clones land on other nodes
+only when all volumes are on shared storage, and a copy on node-local storage
+only seeds copies on its own node.
+"""
+
+import logging
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.proxmox import ProxmoxService, ProxmoxError
+from apps.applications.models import Application
+from apps.applications.placement import PlacementService, PlacementError
+from apps.applications.port_manager import PortManagerService
+
+logger = logging.getLogger(__name__)
+
+MODE_AUTO = "auto"
+MODE_LINKED = "linked"
+MODE_FULL = "full"
+
+# Storage types with copy-on-write snapshots (and therefore linked clones)
+COW_STORAGE_TYPES = {"zfspool", "lvmthin", "rbd", "btrfs"}
+
+_VOLUME_KEY_RE = re.compile(r"^(rootfs|mp\d+)$")
+_SIZE_RE = re.compile(r"(?:^|,)size=(\d+(?:\.\d+)?)([KMGT]?)")
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+class CloneError(Exception):
+    """Raised when a clone cannot be planned or provisioned."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_volumes(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extract storage-backed volumes (rootfs, mpN) from an LXC config.
+
+    Bind mounts (host paths) are skipped: they are not cloned.
+
+    Returns:
+        List of dicts with 'key', 'storage' and 'size' (bytes, 0 if unknown)
+    """
+    volumes = []
+    for key, value in config.items():
+        if not _VOLUME_KEY_RE.match(key) or not isinstance(value, str):
+            continue
+        volume = value.split(",", 1)[0]
+        if volume.startswith("/") or ":" not in volume:
+            continue
+        size_match = _SIZE_RE.search(value)
+        size = (
+            int(float(size_match.group(1)) * _SIZE_UNITS[size_match.group(2)]) if size_match else 0
+        )
+        volumes.append({"key": key, "storage": volume.split(":", 1)[0], "size": size})
+    return volumes
+
+
+class CloneEngine:
+    """
+    Plans and runs clones of one source container.
+    """
+
+    def __init__(self, proxmox: ProxmoxService, placement: Optional[PlacementService] = None):
+        self.proxmox = proxmox
+        self.placement = placement or PlacementService()
+
+    def detect_capabilities(self, node_name: str, vmid: int) -> Dict[str, Any]:
+        """
+        Inspect the storages backing a container.
+
+        Returns:
+            Dictionary with 'template', 'storages' (id -> type), 'snapshots'
+            (all volumes support snapshots), 'linked' (linked clones possible),
+            'shared' (all volumes on shared storage) and 'size' (bytes)
+        """
+        config = self.proxmox.get_lxc_config(node_name, vmid)
+        volumes = parse_volumes(config)
+
+        storages: Dict[str, str] = {}
+        shared = bool(volumes)
+        for storage in {volume["storage"] for volume in volumes}:
+            try:
+                status = self.proxmox.get_storage_status(node_name, storage)
+            except ProxmoxError as e:
+                logger.warning(f"Could not inspect storage {storage}: {e}")
+                status = {}
+            storages[storage] = status.get("type", "unknown")
+            shared = shared and bool(status.get("shared"))
+
+        template = str(config.get("template", "0")) == "1"
+        snapshots = bool(storages) and all(kind in COW_STORAGE_TYPES for kind in storages.values())
+
+        return {
+            "template": template,
+            "storages": storages,
+            "snapshots": snapshots,
+            "linked": template and snapshots,
+            "shared": shared,
+            "size": sum(volume["size"] for volume in volumes),
+        }
+
+    def plan(self, source_app: Application, count: int, mode: str = MODE_AUTO) -> Dict[str, Any]:
+        """
+        Decide how to make `count` copies of an application's container.
+
+        Args:
+            source_app: Application to clone
+            count: Number of copies
+            mode: "auto", "linked" (fail if impossible) or "full"
+
+        Returns:
+            Dictionary with 'mode', 'snapshot' (clone from a shared temporary
+            snapshot), 'capabilities' and 'targets' ({'node', 'storage', 'shared'}
+            per copy; 'shared' if the copy's storage is reachable from every node)
+
+        Raises:
+            CloneError: If the requested clone is impossible
+        """
+        caps = self.detect_capabilities(source_app.node, source_app.lxc_id)
+
+        if mode == MODE_LINKED and not caps["linked"]:
+            raise CloneError(
+                "Linked clones need a template on copy-on-write storage "
+                f"(source is {'a template' if caps['template'] else 'not a template'} "
+                f"on {', '.join(sorted(set(caps['storages'].values()))) or 'unknown storage'})"
+            )
+        linked = mode == MODE_LINKED or (mode == MODE_AUTO and caps["linked"])
+
+        running = False
+        if not caps["template"]:
+            status = self.proxmox.get_lxc_status(source_app.node, source_app.lxc_id)
+            running = status.get("status") == "running"
+            if running and not caps["snapshots"]:
+                raise CloneError(
+                    "Source is running on storage without snapshot support; stop it to clone",
+                    status_code=409,
+                )
+
+        memory = (source_app.config or {}).get("memory")
+        spec = {"config": {"memory": memory}} if memory else {}
+        if caps["shared"]:
+            try:
+                nodes = self.placement.place_batch([spec] * count, host_id=source_app.host_id)
+            except PlacementError as e:
+                raise CloneError(str(e), status_code=503)
+            node_names = [node_obj.name for node_obj in nodes]
+        else:
+            node_names = [source_app.node] * count
+
+        storages: List[Optional[str]] = [None] * count
+        shared: List[bool] = [False] * count
+        if not linked:
+            for node_name in set(node_names):
+                indexes = [i for i, name in enumerate(node_names) if name == node_name]
+                node_storages = self.proxmox.list_node_storages(node_name)
+                shared_ids = {
+                    storage["storage"] for storage in node_storages if storage.get("shared")
+                }
+                chosen = self.placement.select_storages(
+                    node_storages, [caps["size"]] * len(indexes)
+                )
+                if None in chosen:
+                    raise CloneError(
+                        f"Not enough free storage on {node_name} for {len(indexes)} clone(s)",
+                        status_code=507,
+                    )
+                for i, storage in zip(indexes, chosen):
+                    storages[i] = storage
+                    shared[i] = storage in shared_ids
+
+        plan = {
+            "mode": MODE_LINKED if linked else MODE_FULL,
+            "snapshot": not caps["template"] and caps["snapshots"],
+            "capabilities": caps,
+            "targets": [
+                {"node": node_name, "storage": storage, "shared": is_shared}
+                for node_name, storage, is_shared in zip(node_names, storages, shared)
+            ],
+        }
+        logger.info(
+            f"🧬 Clone plan for {source_app.name}: {count} x {plan['mode']} "
+            f"(snapshot={plan['snapshot']}, storages={caps['storages']})"
+        )
+        return plan
+
+    def execute(
+        self, source_app: Application, clones: List[Dict[str, Any]], mode: str, snapshot: bool
+    ) -> Dict[int, Optional[str]]:
+        """
+        Create the planned clones.
+
+        Args:
+            source_app: Application being cloned
+            clones: Dicts with 'vmid', 'hostname', 'node', 'storage' and 'shared'
+            mode: "linked" or "full" (from the plan)
+            snapshot: Clone from one shared temporary snapshot of the source
+
+        Returns:
+            Dictionary mapping each clone VMID to None (success) or an error message
+        """
+        linked = mode == MODE_LINKED
+        concurrency = max(1, settings.CLONE_NODE_CONCURRENCY)
+        timeout = settings.CLONE_TASK_TIMEOUT
+        results: Dict[int, Optional[str]] = {}
+
+        snapname = None
+        if snapshot:
+            snapname = f"prox_clone_{uuid.uuid4().hex[:8]}"
+            upid = self.proxmox.create_snapshot(
+                source_app.node,
+                source_app.lxc_id,
+                snapname,
+                description=f"Temporary snapshot for cloning {len(clones)} cop(ies)",
+            )
+            self.proxmox.wait_for_task(source_app.node, upid, timeout=300)
+
+        try:
+            # The plan only puts copies where the source can reach them
+            seeds = [
+                {
+                    "node": source_app.node,
+                    "vmid": source_app.lxc_id,
+                    "snapname": snapname,
+                    "shared": True,
+                }
+            ]
+            queue = list(clones)
+            round_number = 0
+
+            while queue:
+                round_number += 1
+                started = []
+                busy: Dict[str, int] = {}
+
+                for seed in list(seeds):
+                    if busy.get(seed["node"], 0) >= concurrency:
+                        continue
+                    # A copy on node-local storage can only seed copies on its own node
+                    clone = next(
+                        (
+                            clone
+                            for clone in queue
+                            if seed["shared"] or clone["node"] == seed["node"]
+                        ),
+                        None,
+                    )
+                    if clone is None:
+                        continue
+                    queue.remove(clone)
+                    try:
+                        upid = self.proxmox.start_clone_lxc(
+                            seed["node"],
+                            seed["vmid"],
+                            clone["vmid"],
+                            clone["hostname"],
+                            full=not linked,
+                            storage=clone["storage"],
+                            target_node=clone["node"],
+                            snapname=seed["snapname"],
+                        )
+                    except ProxmoxError as e:
+                        results[clone["vmid"]] = str(e)
+                        continue
+                    busy[seed["node"]] = busy.get(seed["node"], 0) + 1
+                    started.append((seed["node"], upid, clone))
+
+                if not started:
+                    # Every seed failed to start a clone: nothing will change
+                    for clone in queue:
+                        results[clone["vmid"]] = "No clone source available"
+                    break
+
+                t0 = time.monotonic()
+                outcome = self.proxmox.wait_for_tasks(
+                    [(node_name, upid) for node_name, upid, _ in started], timeout=timeout
+                )
+                logger.info(
+                    f"🧬 Clone round {round_number}: {len(started)} clone(s) in "
+                    f"{time.monotonic() - t0:.1f}s, {len(queue)} remaining"
+                )
+
+                for _, upid, clone in started:
+                    results[clone["vmid"]] = outcome.get(upid)
+                    # Finished full copies feed later rounds (linked clones need the template)
+                    if outcome.get(upid) is None and not linked:
+                        seeds.append(
+                            {
+                                "node": clone["node"],
+                                "vmid": clone["vmid"],
+                                "snapname": None,
+                                "shared": clone.get("shared", False),
+                            }
+                        )
+
+        finally:
+            if snapname:
+                try:
+                    upid = self.proxmox.delete_snapshot(
+                        source_app.node, source_app.lxc_id, snapname
+                    )
+                    self.proxmox.wait_for_task(source_app.node, upid, timeout=120)
+                except Exception as cleanup_error:
+                    logger.critical(
+                        f"✗ FAILED to delete temporary snapshot '{snapname}': {cleanup_error}. "
+                        f"Manual cleanup required: "
+                        f"'pct delsnapshot {source_app.lxc_id} {snapname}'"
+                    )
+
+        return results
+
+
+class CloneService:
+    """
+    Provisions many clones of an application as one operation.
+    """
+
+    def __init__(self):
+        self.port_manager = PortManagerService()
+
+    def create_clones(
+        self, source_app: Application, hostnames: List[str], owner=None, mode: str = MODE_AUTO
+    ) -> Dict[str, Any]:
+        """
+        Plan the clones, create their Application rows and enqueue the clone task.
+
+        Args:
+            source_app: Application to clone
+            hostnames: Hostname of every copy
+            owner: User that will own the copies
+            mode: "auto", "linked" or "full"
+
+        Returns:
+            Dictionary with clone_id, the created applications and the clone mode
+
+        Raises:
+            CloneError: If validation, planning or allocation fails
+        """
+        from apps.applications.batch_deploy import BatchDeployService
+
+        duplicates = sorted({h for h in hostnames if hostnames.count(h) > 1})
+        if duplicates:
+            raise CloneError(f"Duplicate hostnames: {', '.join(duplicates)}")
+
+        existing = sorted(
+            Application.objects.filter(hostname__in=hostnames).values_list("hostname", flat=True)
+        )
+        if existing:
+            raise CloneError(f"Hostnames already exist: {', '.join(existing)}", status_code=409)
+
+        proxmox = ProxmoxService(host_id=source_app.host_id)
+        try:
+            plan = CloneEngine(proxmox).plan(source_app, len(hostnames), mode)
+        except ProxmoxError as e:
+            logger.error(f"[CLONE] Planning failed for {source_app.id}: {e}")
+            raise CloneError("Failed to inspect the source container", status_code=503)
+
+        clone_id = uuid.uuid4().hex[:12]
+
+        with transaction.atomic():
+            try:
+                port_pairs = self.port_manager.allocate_port_batch(len(hostnames))
+            except ValueError as e:
+                raise CloneError(str(e), status_code=500)
+
+            try:
+                vmids = BatchDeployService().reserve_vmids([source_app.host_id] * len(hostnames))
+            except ProxmoxError as e:
+                logger.error(f"[CLONE {clone_id}] VMID reservation failed: {e}")
+                raise CloneError("Failed to reserve VMIDs from Proxmox", status_code=503)
+
+            apps = [
+                Application(
+                    id=str(uuid.uuid4()),
+                    catalog_id=source_app.catalog_id,
+                    name=f"{source_app.name}-clone",
+                    hostname=hostname,
+                    status="cloning",
+                    public_port=public_port,
+                    internal_port=internal_port,
+                    lxc_id=vmid,
+                    lxc_root_password=source_app.lxc_root_password,
+                    host_id=source_app.host_id,
+                    node=target["node"],
+                    config={
+                        **(source_app.config or {}),
+                        "clone_of": source_app.id,
+                        "clone_id": clone_id,
+                    },
+                    ports=dict(source_app.ports or {}),
+                    volumes=list(source_app.volumes or []),
+                    environment=dict(source_app.environment or {}),
+                    owner=owner,
+                )
+                for hostname, (public_port, internal_port), vmid, target in zip(
+                    hostnames, port_pairs, vmids, plan["targets"]
+                )
+            ]
+            Application.objects.bulk_create(apps)
+
+            clones = [
+                {
+                    "app_id": app.id,
+                    "vmid": app.lxc_id,
+                    "hostname": app.hostname,
+                    "node": app.node,
+                    "storage": target["storage"],
+                    "shared": target["shared"],
+                }
+                for app, target in zip(apps, plan["targets"])
+            ]
+
+            # Dispatch only once the rows are visible to workers
+            transaction.on_commit(lambda: self.dispatch(source_app.id, clones, plan))
+
+        logger.info(
+            f"[CLONE {clone_id}] Cloning {source_app.name} into {len(apps)} {plan['mode']} cop(ies)"
+        )
+        return {"clone_id": clone_id, "apps": apps, "mode": plan["mode"]}
+
+    def dispatch(self, source_app_id: str, clones: List[Dict[str, Any]], plan: Dict[str, Any]):
+        """Start the clone task for a provisioned set of copies."""
+        from apps.applications.tasks import clone_apps_task
+
+        return clone_apps_task.delay(
+            source_app_id=source_app_id,
+            clones=clones,
+            mode=plan["mode"],
+            snapshot=plan["snapshot"],
+        )
@@ -0,0 +1,79 @@
+"""
+Pytest fixtures for application tests.
+"""
+
+from datetime import timedelta
+from typing import Optional
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.proxmox.models import ProxmoxHost
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner():
+    """Create the user owning the test applications."""
+    return User.objects.create_user(username="appowner", password="testpass123")
+
+
+@pytest.fixture
+def host():
+    """Create the default test Proxmox host (without nodes)."""
+    return ProxmoxHost.objects.create(
+        name="app-host", host="192.168.1.50", user="root@pam", password="secret", is_default=True
+    )
+
+
+@pytest.fixture
+def make_app(host):
+    """
+    Factory creating applications on the test host.
+
+    Fields default to a running nginx app on node pve1 whose name and hostname
+    are its ID; changed_ago backdates state_changed_at.
+    """
+
+    def make(app_id: str, changed_ago: Optional[timedelta] = None, **fields) -> Application:
+        values = {
+            "catalog_id": "nginx",
+            "name": app_id,
+            "hostname": app_id,
+            "status": "running",
+            "host": host,
+            "node": "pve1",
+            **fields,
+        }
+        app = Application.objects.create(id=app_id, **values)
+        if changed_ago is not None:
+            Application.objects.filter(id=app_id).update(
+                state_changed_at=timezone.now() - changed_ago
+            )
+            app.refresh_from_db()
+        return app
+
+    return make
+
+
+@pytest.fixture
+def make_container():
+    """Factory for containers as returned by discover_unmanaged_lxc."""
+
+    def make(vmid: int, name: str, node: str = "pve1", status: str = "running", **fields):
+        return {
+            "vmid": vmid,
+            "name": name,
+            "status": status,
+            "node": node,
+            "memory": 0,
+            "disk": 0,
+            "uptime": 0,
+            "cpus": 1,
+            **fields,
+        }
+
+    return make
@@ -0,0 +1,483 @@
+"""
+Deployment Engine - resumable deployment of an application as a graph of steps.
+
+A deployment is a set of steps with declared dependencies (STEP_GRAPH). Steps
+whose dependencies are done run concurrently: VMID allocation, the template
+download and the compose rendering overlap, and the compose file is written
+while Docker installs. A deployment takes as long as its critical path, not
+the sum of its steps.
+
+Each step is recorded as a DeploymentStep row with its status, attempts, timing
+and output (the VMID, the Proxmox task UPIDs, ...), and timed as a Sentry span
+and in the step latency histogram (apps.core.metrics). When deploy_app_task is
+retried, the engine skips the completed steps and continues with the unfinished
+ones, reusing their outputs: a retry after a failed Docker install neither
+allocates a new VMID nor creates a second container.
+
+Every step is also idempotent on its own, for a worker that died between
+doing the work and recording it:
+
+- vmid: reuses the VMID already stored on the application (or reserved for
+  it by a batch deploy);
+- resources: reuses the root password already stored on the application;
+- template: only downloads a template the node does not have;
+- lxc_create: skips creation when the container already exists;
+- lxc_configure: the config edits are guarded by grep;
+- lxc_start: skips starting a running container;
+- docker_setup: skips the installation when the Docker daemon answers;
+- compose, compose_write, image_pull, app_up: render, overwrite, pull and
+  `docker compose up -d` converge to the same state;
+- finalize: only sets fields.
+
+The steps in DB_STEPS run on the calling thread, where the step bookkeeping
+happens too; the others run in a thread pool and only call Proxmox.
+"""
+
+import logging
+import secrets
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.core.metrics import DEPLOY_DURATION, DEPLOY_STEP_DURATION, span
+from apps.proxmox import ProxmoxService, ProxmoxError
+from apps.applications.models import Application, DeploymentLog, DeploymentStep
+from apps.applications.batch_deploy import reserved_vmids
+
+logger = logging.getLogger(__name__)
+
+# Step -> steps it depends on, in a valid execution order
+STEP_GRAPH = {
+    "vmid": [],
+    "resources": [],
+    "template": [],
+    "compose": [],
+    "lxc_create": ["vmid", "resources", "template"],
+    "lxc_configure": ["lxc_create"],
+    "lxc_start": ["lxc_configure"],
+    "docker_setup": ["lxc_start"],
+    "compose_write": ["lxc_start", "compose"],
+    "image_pull": ["docker_setup", "compose_write"],
+    "app_up": ["image_pull"],
+    "finalize": ["app_up"],
+}
+
+STEPS = list(STEP_GRAPH)
+
+# Steps that use the database, run on the calling thread
+DB_STEPS = {"vmid", "resources", "finalize"}
+
+# TODO: Get ostemplate from catalog configuration
+DEFAULT_OSTEMPLATE = "local:vztmpl/alpine-3.22-default_20250617_amd64.tar.xz"
+
+MAX_VMID_ATTEMPTS = 10
+
+# Seconds to let a container bring up its network after it started
+BOOT_WAIT = 10
+
+# Seconds to wait when Proxmox returns no task to follow
+CREATE_WAIT = 5
+
+
+class DeploymentError(Exception):
+    """Raised when a deployment step cannot complete."""
+
+
+class DeploymentEngine:
+    """
+    Runs the deployment steps of one application, resuming after completed ones.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        catalog_id: str,
+        hostname: str,
+        node: str,
+        config: Dict[str, Any],
+        proxmox: ProxmoxService,
+        docker=None,
+    ):
+        self.app_id = app_id
+        self.catalog_id = catalog_id
+        self.hostname = hostname
+        self.node = node
+        self.config = config or {}
+        self.proxmox = proxmox
+        if docker is None:
+            from apps.applications.docker_setup import DockerSetupService
+
+            docker = DockerSetupService(proxmox)
+        self.docker = docker
+        # Kept off the step outputs, which are stored in plain JSON
+        self._root_password: Optional[str] = None
+        # Parent of the step spans, which mostly run on pool threads
+        self._span = None
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every step that has not completed yet, as their dependencies allow.
+
+        Returns:
+            The outputs of all steps, merged
+
+        Raises:
+            Exception: What made the first failed step fail; steps already running
+                are finished and recorded, no new ones are started
+        """
+        started = time.monotonic()
+        steps = self._load_steps()
+        done = {name for name, step in steps.items() if step.status == "completed"}
+        context: Dict[str, Any] = {}
+        for name in STEPS:
+            if name in done:
+                logger.info(f"[{self.app_id}] ⏭️  Step '{name}' already completed, skipping")
+                context.update(steps[name].output)
+
+        labels = {"node": self.node, "catalog_id": self.catalog_id}
+        with span(
+            "deploy", f"deploy {self.catalog_id}", DEPLOY_DURATION, labels, app_id=self.app_id
+        ) as self._span:
+            self._schedule(steps, done, context)
+
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        total_ms = sum(step.duration_ms or 0 for step in steps.values())
+        logger.info(
+            f"[{self.app_id}] 🏁 Deployment steps took {elapsed_ms}ms "
+            f"(sum of step durations: {total_ms}ms)"
+        )
+        return context
+
+    def _schedule(
+        self, steps: Dict[str, DeploymentStep], done: set, context: Dict[str, Any]
+    ) -> None:
+        """Run the pending steps as soon as their dependencies are done."""
+        pending = [name for name in STEPS if name not in done]
+        running = {}
+        failure: Optional[Exception] = None
+
+        with ThreadPoolExecutor(max_workers=settings.DEPLOY_STEP_CONCURRENCY) as pool:
+            while True:
+                ready = []
+                if failure is None:
+                    ready = [n for n in pending if all(d in done for d in STEP_GRAPH[n])]
+                if not ready and not running:
+                    break
+
+                for name in ready:
+                    pending.remove(name)
+                    self._begin(steps[name])
+                    if name not in DB_STEPS:
+                        running[pool.submit(self._call, name, dict(context), True)] = name
+
+                # Database steps run here, then the ready set is recomputed
+                inline = [name for name in ready if name in DB_STEPS]
+                results = [(name, self._call(name, dict(context))) for name in inline]
+                if not inline:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    results = [(running.pop(future), future.result()) for future in finished]
+
+                for name, (output, error, duration_ms) in results:
+                    self._end(steps[name], output, error, duration_ms)
+                    if error is not None:
+                        failure = failure or error
+                        continue
+                    done.add(name)
+                    context.update(output)
+
+        if failure is not None:
+            raise failure
+
+    def _load_steps(self) -> Dict[str, DeploymentStep]:
+        DeploymentStep.objects.bulk_create(
+            [DeploymentStep(application_id=self.app_id, name=name) for name in STEPS],
+            ignore_conflicts=True,
+        )
+        steps = DeploymentStep.objects.filter(application_id=self.app_id, name__in=STEPS)
+        self._root_password = (
+            Application.objects.filter(id=self.app_id)
+            .values_list("lxc_root_password", flat=True)
+            .first()
+        )
+        return {step.name: step for step in steps}
+
+    def _call(
+        self, name: str, context: Dict[str, Any], threaded: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Exception], int]:
+        """Run a step function; returns (output, error, duration in ms)."""
+        started = time.monotonic()
+        labels = {"step": name, "node": self.node, "catalog_id": self.catalog_id}
+        try:
+            with span(
+                "deploy.step",
+                name,
+                DEPLOY_STEP_DURATION,
+                labels,
+                parent=self._span,
+                app_id=self.app_id,
+            ):
+                output, error = getattr(self, f"_step_{name}")(context) or {}, None
+        except Exception as e:
+            output, error = None, e
+        finally:
+            if threaded:
+                # Proxmox lookups may have opened a connection on this pool thread
+                connections.close_all()
+        return output, error, int((time.monotonic() - started) * 1000)
+
+    def _begin(self, step: DeploymentStep) -> None:
+        step.status = "running"
+        step.attempts += 1
+        step.error = None
+        step.started_at = timezone.now()
+        step.finished_at = None
+        step.duration_ms = None
+        step.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "error",
+                "started_at",
+                "finished_at",
+                "duration_ms",
+            ]
+        )
+        self._log("info", f"Step '{step.name}' started (attempt {step.attempts})", step.name)
+
+    def _end(
+        self,
+        step: DeploymentStep,
+        output: Optional[Dict[str, Any]],
+        error: Optional[Exception],
+        duration_ms: int,
+    ) -> None:
+        """Record the outcome of a step."""
+        step.finished_at = timezone.now()
+        step.duration_ms = duration_ms
+        fields = ["status", "error", "finished_at", "duration_ms"]
+
+        if error is not None:
+            step.status = "failed"
+            step.error = str(error)
+            step.save(update_fields=fields)
+            self._log("error", f"Step '{step.name}' failed: {error}", step.name)
+            return
+
+        step.status = "completed"
+        step.output = output
+        step.save(update_fields=fields + ["output"])
+        self._log("info", f"Step '{step.name}' completed in {duration_ms}ms", step.name)
+
+    def _log(self, level: str, message: str, step: str) -> None:
+        DeploymentLog.objects.create(
+            application_id=self.app_id, level=level, message=message, step=step
+        )
+        getattr(logger, level)(f"[{self.app_id}] {message}")
+
+    def _wait(self, upid: Any) -> None:
+        """Wait for a Proxmox task, or a fixed delay when there is no task to follow."""
+        if isinstance(upid, str) and upid.startswith("UPID:"):
+            self.proxmox.wait_for_task(self.node, upid)
+        else:
+            time.sleep(CREATE_WAIT)
+
+    # ------------------------------------------------------------------
+    # Steps: each gets the outputs of the steps it depends on and returns its own
+    # ------------------------------------------------------------------
+
+    def _step_vmid(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Allocate a VMID no other application uses (under the app's row lock)."""
+        with transaction.atomic():
+            app = Application.objects.select_for_update().get(id=self.app_id)
+            if app.lxc_id:
+                # Allocated by an attempt that died
+                logger.info(f"[{self.app_id}] ✓ Using VMID already assigned: {app.lxc_id}")
+                return {"vmid": app.lxc_id}
+
+            reserved_vmid = (app.config or {}).get("reserved_vmid")
+            if reserved_vmid:
+                # Reserved by a batch deploy; only becomes lxc_id once the deploy runs
+                app.lxc_id = int(reserved_vmid)
+                app.save(update_fields=["lxc_id"])
+                logger.info(f"[{self.app_id}] ✓ Using VMID reserved by batch: {app.lxc_id}")
+                return {"vmid": app.lxc_id}
+
+            vmid = None
+            reserved = reserved_vmids()
+            for _ in range(MAX_VMID_ATTEMPTS):
+                candidate = int(self.proxmox.get_next_vmid())
+                if candidate in reserved:
+                    # Proxmox does not know about batch reservations: skip past them
+                    taken = reserved | self.proxmox.get_used_vmids()
+                    while candidate in taken:
+                        candidate += 1
+                existing = Application.objects.filter(lxc_id=candidate).first()
+                if not existing:
+                    vmid = candidate
+                    break
+                if existing.status == "error":
+                    logger.info(
+                        f"[{self.app_id}] 🧹 Clearing lxc_id from orphaned application: "
+                        f"{existing.hostname}"
+                    )
+                    existing.lxc_id = None
+                    existing.save(update_fields=["lxc_id"])
+                    vmid = candidate
+                    break
+                logger.info(f"[{self.app_id}] 🔄 VMID {candidate} is in use, trying again...")
+
+            if vmid is None:
+                raise DeploymentError(
+                    f"Failed to allocate unique VMID after {MAX_VMID_ATTEMPTS} attempts"
+                )
+            app.lxc_id = vmid
+            app.save(update_fields=["lxc_id"])
+
+        return {"vmid": vmid}
+
+    def _step_resources(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Size the container and set its root password."""
+        # Stored before the container exists, so a retry creates it with the same password
+        if not self._root_password:
+            self._root_password = secrets.token_urlsafe(16)
+            Application.objects.filter(id=self.app_id).update(lxc_root_password=self._root_password)
+
+        # Unset resources fall back to SystemSettings, never below the catalog minimums
+        from apps.applications.rightsizing import default_resources, resource_floor
+
+        defaults = default_resources()
+        floor = resource_floor(self.catalog_id)
+        return {
+            "memory": max(int(self.config.get("memory", defaults["memory"])), floor["memory"]),
+            "cores": max(int(self.config.get("cores", defaults["cores"])), floor["cores"]),
+            "disk_size": self.config.get("disk_size", str(defaults["disk_size"])),
+        }
+
+    def _step_template(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        ostemplate = self.config.get("ostemplate", DEFAULT_OSTEMPLATE)
+        upid = self.proxmox.ensure_template(self.node, ostemplate)
+        if upid:
+            self.proxmox.wait_for_task(self.node, upid)
+        return {"ostemplate": ostemplate, "template_upid": upid}
+
+    def _step_compose(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        if self.catalog_id != "adminer":
+            # TODO: Get docker-compose from catalog
+            raise DeploymentError(f"Unsupported app: {self.catalog_id}")
+        return {"compose": self.docker.generate_adminer_compose(port=80)}
+
+    def _existing_container(self, vmid: int) -> Optional[Dict[str, Any]]:
+        """Status of container `vmid` if it exists (and is ours), else None."""
+        try:
+            status = self.proxmox.get_lxc_status(self.node, vmid)
+        except ProxmoxError:
+            return None
+        if status.get("name") not in (None, self.hostname):
+            raise DeploymentError(
+                f"VMID {vmid} belongs to another container ({status.get('name')})"
+            )
+        return status
+
+    def _step_lxc_create(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        vmid = context["vmid"]
+        if self._existing_container(vmid) is not None:
+            logger.info(f"[{self.app_id}] ✓ Container {vmid} already exists, not recreating it")
+            return {"create_upid": None}
+
+        upid = self.proxmox.create_lxc(
+            node_name=self.node,
+            vmid=vmid,
+            hostname=self.hostname,
+            ostemplate=context["ostemplate"],
+            password=self._root_password,
+            memory=context["memory"],
+            cores=context["cores"],
+            disk_size=context["disk_size"],
+        )
+        self._wait(upid)
+        return {"create_upid": upid if isinstance(upid, str) else None}
+
+    def _step_lxc_configure(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        # Must happen before the first start (AppArmor: unconfined for Docker)
+        self.proxmox.configure_lxc_for_docker(self.node, context["vmid"])
+        return {}
+
+    def _step_lxc_start(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        vmid = context["vmid"]
+        status = self._existing_container(vmid)
+        if status and status.get("status") == "running":
+            logger.info(f"[{self.app_id}] ✓ Container {vmid} already running")
+            return {"start_upid": None}
+
+        upid = self.proxmox.start_lxc(self.node, vmid)
+        if isinstance(upid, str) and upid.startswith("UPID:"):
+            self.proxmox.wait_for_task(self.node, upid)
+        time.sleep(BOOT_WAIT)
+        return {"start_upid": upid if isinstance(upid, str) else None}
+
+    def _docker_ready(self, vmid: int) -> bool:
+        try:
+            output = self.proxmox.execute_in_container(
+                self.node,
+                vmid,
+                "docker info >/dev/null 2>&1 && echo ready",
+                timeout=30,
+                allow_nonzero_exit=True,
+            )
+        except ProxmoxError:
+            return False
+        return "ready" in (output or "")
+
+    def _step_docker_setup(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        vmid = context["vmid"]
+        if self._docker_ready(vmid):
+            logger.info(f"[{self.app_id}] ✓ Docker already running in container {vmid}")
+            return {"docker": "present"}
+        if not self.docker.setup_docker_in_alpine(self.node, vmid):
+            raise DeploymentError("Failed to install Docker in container")
+        return {"docker": "installed"}
+
+    def _step_compose_write(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        # Only needs the container filesystem, so it overlaps the Docker install
+        self.docker.write_compose_file(self.node, context["vmid"], context["compose"])
+        return {}
+
+    def _step_image_pull(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.docker.pull_images(self.node, context["vmid"])
+        return {}
+
+    def _step_app_up(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.docker.compose_up(self.node, context["vmid"])
+        return {}
+
+    def _step_finalize(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        with transaction.atomic():
+            app = Application.objects.select_for_update().get(id=self.app_id)
+            app.status = "running"
+            app.updated_at = timezone.now()
+            app.save(update_fields=["status", "updated_at"])
+        return {}
+
+
+def steps_to_dict(app: Application) -> List[Dict[str, Any]]:
+    """Serialize the deployment steps of an application, in execution order."""
+    order = {name: position for position, name in enumerate(STEPS)}
+    steps = sorted(app.deploy_steps.all(), key=lambda step: order.get(step.name, len(order)))
+    return [
+        {
+            "name": step.name,
+            "status": step.status,
+            "attempts": step.attempts,
+            "depends_on": STEP_GRAPH.get(step.name, []),
+            "output": step.output,
+            "error": step.error,
+            "started_at": step.started_at.isoformat() if step.started_at else None,
+            "finished_at": step.finished_at.isoformat() if step.finished_at else None,
+            "duration_ms": step.duration_ms,
+        }
+        for step in steps
+    ]
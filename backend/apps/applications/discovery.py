@@ -0,0 +1,115 @@
+"""
+Discovery cache - Serves unmanaged LXC listings for the adoption UI.
+
+Discovery results are cached per host for DISCOVERY_CACHE_TTL seconds. Older
+entries are still served (up to DISCOVERY_CACHE_MAX_AGE) while a background
+task refreshes them, so the adoption page never waits on Proxmox once warm.
+Managed VMIDs are filtered out again on every read so freshly adopted
+containers disappear immediately.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.metrics import cache_lookup
+from apps.proxmox import ProxmoxService
+from apps.applications.models import Application
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_key(host_id: Optional[int]) -> str:
+    return f"discovery:unmanaged_lxc:{host_id or 'default'}"
+
+
+def refresh_discovery_cache(host_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Query Proxmox for unmanaged containers and store the result.
+
+    Args:
+        host_id: Proxmox host ID (uses default if not specified)
+
+    Returns:
+        Cache entry with 'containers' and 'fetched_at' (epoch seconds)
+
+    Raises:
+        ProxmoxError: If Proxmox cannot be queried
+    """
+    containers = ProxmoxService(host_id=host_id).discover_unmanaged_lxc()
+    entry = {"containers": containers, "fetched_at": time.time()}
+    cache.set(_cache_key(host_id), entry, settings.DISCOVERY_CACHE_MAX_AGE)
+    return entry
+
+
+def _schedule_refresh(host_id: Optional[int]) -> None:
+    """Enqueue one background refresh per host, however many readers see stale data."""
+    lock_key = f"{_cache_key(host_id)}:refreshing"
+    if not cache.add(lock_key, True, settings.DISCOVERY_CACHE_TTL):
+        return
+
+    from apps.applications.tasks import refresh_discovery_cache_task
+
+    try:
+        refresh_discovery_cache_task.delay(host_id)
+    except Exception as e:
+        # Broker unavailable - serve stale data and retry on a later request
+        cache.delete(lock_key)
+        logger.warning(f"Failed to schedule discovery refresh for host {host_id}: {e}")
+
+
+def get_unmanaged_containers(
+    host_id: Optional[int] = None, force_refresh: bool = False
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Get unmanaged containers for a host, from cache when possible.
+
+    Args:
+        host_id: Proxmox host ID (uses default if not specified)
+        force_refresh: Bypass the cache and query Proxmox now
+
+    Returns:
+        Tuple of (unmanaged containers, epoch seconds the data was fetched at)
+
+    Raises:
+        ProxmoxError: If the cache is cold and Proxmox cannot be queried
+    """
+    entry = None
+    if not force_refresh:
+        entry = cache.get(_cache_key(host_id))
+        cache_lookup("discovery", entry is not None)
+
+    if entry is None:
+        entry = refresh_discovery_cache(host_id)
+    elif time.time() - entry["fetched_at"] > settings.DISCOVERY_CACHE_TTL:
+        _schedule_refresh(host_id)
+
+    containers = entry["containers"]
+    adopted = set(
+        Application.objects.filter(lxc_id__in=[c["vmid"] for c in containers]).values_list(
+            "lxc_id", flat=True
+        )
+    )
+    return [c for c in containers if c["vmid"] not in adopted], entry["fetched_at"]
+
+
+def filter_containers(
+    containers: List[Dict[str, Any]],
+    node: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Filter discovered containers by node, status and name/VMID substring."""
+    if node:
+        containers = [c for c in containers if c["node"] == node]
+    if status:
+        containers = [c for c in containers if c["status"] == status]
+    if search:
+        needle = search.lower()
+        containers = [
+            c for c in containers if needle in str(c["name"]).lower() or needle in str(c["vmid"])
+        ]
+    return sorted(containers, key=lambda c: c["vmid"])
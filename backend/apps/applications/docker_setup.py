@@ -4,7 +4,6 @@ Handles Docker installation and app deployment inside LXC containers
 """
 
 import logging
-import yaml
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -158,57 +157,81 @@ class DockerSetupService:
         """
         try:
             logger.info(f"[VMID {vmid}] 🚀 Deploying {app_name} with Docker Compose...")
+            self.write_compose_file(node, vmid, docker_compose_config)
+            self.pull_images(node, vmid)
+            self.compose_up(node, vmid)
+            logger.info(f"[VMID {vmid}] ✓ {app_name} deployed successfully!")
+            return True
 
-            # Step 1: Create docker-compose.yml content
-            compose_yaml = yaml.dump(docker_compose_config, default_flow_style=False)
+        except Exception as e:
+            logger.error(f"[VMID {vmid}] ❌ Failed to deploy {app_name}: {e}")
+            return False
+
+    def write_compose_file(
+        self, node: str, vmid: int, docker_compose_config: Dict[str, Any]
+    ) -> None:
+        """
+        Write /root/docker-compose.yml into the container (Docker is not needed yet).
+
+        Raises:
+            ProxmoxError: If the file cannot be written
+        """
+        # yaml is only needed here
+        import yaml
 
-            # Step 2: Write docker-compose.yml to container using HERE document
-            # This is safer than embedding YAML in a command string
-            logger.info(f"[VMID {vmid}] 📝 Creating docker-compose.yml...")
+        compose_yaml = yaml.dump(docker_compose_config, default_flow_style=False)
 
-            # Use HERE document to safely pass YAML content without shell expansion
-            write_command = f"""cat > /root/docker-compose.yml <<'COMPOSEYAML'
+        # Use HERE document to safely pass YAML content without shell expansion
+        logger.info(f"[VMID {vmid}] 📝 Creating docker-compose.yml...")
+        write_command = f"""cat > /root/docker-compose.yml <<'COMPOSEYAML'
 {compose_yaml}
 COMPOSEYAML
 mkdir -p /root && ls -la /root/docker-compose.yml"""
-            self.proxmox.execute_in_container(node, vmid, write_command, timeout=30)
-
-            # Step 3: Pull Docker images
-            logger.info(f"[VMID {vmid}] 📥 Pulling Docker images (this may take a while)...")
-            self.proxmox.execute_in_container(
-                node,
-                vmid,
-                "sh -c 'cd /root && docker compose pull'",
-                timeout=600,  # 10 minutes for pulling images
-            )
-
-            # Step 4: Start services with Docker Compose
-            logger.info(f"[VMID {vmid}] ▶️  Starting Docker services...")
-            self.proxmox.execute_in_container(
-                node,
-                vmid,
-                "sh -c 'cd /root && docker compose up -d'",
-                timeout=300,  # 5 minutes for starting
-            )
+        self.proxmox.execute_in_container(node, vmid, write_command, timeout=30)
 
-            # Step 5: Verify services are running
-            logger.info(f"[VMID {vmid}] ✅ Verifying services...")
-            import time
-
-            time.sleep(5)
-
-            ps_output = self.proxmox.execute_in_container(
-                node, vmid, "sh -c 'cd /root && docker compose ps'", timeout=30
-            )
+    def pull_images(self, node: str, vmid: int) -> None:
+        """
+        Pull the images of the compose file.
 
-            logger.info(f"[VMID {vmid}] ✓ {app_name} deployed successfully!")
-            logger.info(f"[VMID {vmid}] 📊 Docker services:\n{ps_output}")
+        Raises:
+            ProxmoxError: If the pull fails
+        """
+        logger.info(f"[VMID {vmid}] 📥 Pulling Docker images (this may take a while)...")
+        self.proxmox.execute_in_container(
+            node,
+            vmid,
+            "sh -c 'cd /root && docker compose pull'",
+            timeout=600,  # 10 minutes for pulling images
+        )
+
+    def compose_up(self, node: str, vmid: int) -> str:
+        """
+        Start the compose services and verify they run.
 
-            return True
+        Returns:
+            Output of `docker compose ps`
 
-        except Exception as e:
-            logger.error(f"[VMID {vmid}] ❌ Failed to deploy {app_name}: {e}")
-            return False
+        Raises:
+            ProxmoxError: If the services cannot be started
+        """
+        logger.info(f"[VMID {vmid}] ▶️  Starting Docker services...")
+        self.proxmox.execute_in_container(
+            node,
+            vmid,
+            "sh -c 'cd /root && docker compose up -d'",
+            timeout=300,  # 5 minutes for starting
+        )
+
+        logger.info(f"[VMID {vmid}] ✅ Verifying services...")
+        import time
+
+        time.sleep(5)
+
+        ps_output = self.proxmox.execute_in_container(
+            node, vmid, "sh -c 'cd /root && docker compose ps'", timeout=30
+        )
+        logger.info(f"[VMID {vmid}] 📊 Docker services:\n{ps_output}")
+        return ps_output
 
     def generate_adminer_compose(self, port: int = 80) -> Dict[str, Any]:
         """
@@ -0,0 +1,123 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0005_add_state_changed_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="application",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("deploying", "Deploying"),
+                    ("cloning", "Cloning"),
+                    ("migrating", "Migrating"),
+                    ("running", "Running"),
+                    ("stopped", "Stopped"),
+                    ("error", "Error"),
+                    ("updating", "Updating"),
+                    ("removing", "Removing"),
+                ],
+                db_index=True,
+                default="deploying",
+                max_length=50,
+            ),
+        ),
+        migrations.CreateModel(
+            name="AppMigration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source_node", models.CharField(max_length=100)),
+                ("target_node", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "progress",
+                    models.PositiveSmallIntegerField(default=0, help_text="Percent complete"),
+                ),
+                ("message", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[("manual", "Manual"), ("rebalance", "Rebalance")],
+                        default="manual",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "restart",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Container was running and is restarted on the target",
+                    ),
+                ),
+                (
+                    "previous_status",
+                    models.CharField(blank=True, default="", max_length=50),
+                ),
+                (
+                    "upid",
+                    models.CharField(
+                        blank=True, help_text="Proxmox task", max_length=255, null=True
+                    ),
+                ),
+                ("error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="node_migrations",
+                        to="applications.application",
+                    ),
+                ),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Application Migration",
+                "verbose_name_plural": "Application Migrations",
+                "db_table": "app_migrations",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0006_app_migrations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResourceRecommendation",
+            fields=[
+                (
+                    "application",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="resource_recommendation",
+                        serialize=False,
+                        to="applications.application",
+                    ),
+                ),
+                (
+                    "current_memory",
+                    models.PositiveIntegerField(help_text="Memory in MB"),
+                ),
+                ("current_cores", models.PositiveSmallIntegerField()),
+                (
+                    "recommended_memory",
+                    models.PositiveIntegerField(help_text="Memory in MB"),
+                ),
+                ("recommended_cores", models.PositiveSmallIntegerField()),
+                (
+                    "memory_percentile",
+                    models.PositiveIntegerField(default=0, help_text="Memory in MB"),
+                ),
+                (
+                    "memory_peak",
+                    models.PositiveIntegerField(default=0, help_text="Memory in MB"),
+                ),
+                (
+                    "cpu_percentile",
+                    models.FloatField(default=0.0, help_text="Cores busy"),
+                ),
+                ("samples", models.PositiveIntegerField(default=0)),
+                ("timeframe", models.CharField(default="week", max_length=10)),
+                (
+                    "computed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("applied_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Resource Recommendation",
+                "verbose_name_plural": "Resource Recommendations",
+                "db_table": "resource_recommendations",
+            },
+        ),
+    ]
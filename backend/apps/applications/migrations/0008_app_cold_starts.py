@@ -0,0 +1,94 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0007_resource_recommendations"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="application",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("deploying", "Deploying"),
+                    ("cloning", "Cloning"),
+                    ("migrating", "Migrating"),
+                    ("running", "Running"),
+                    ("stopped", "Stopped"),
+                    ("suspended", "Suspended"),
+                    ("error", "Error"),
+                    ("updating", "Updating"),
+                    ("removing", "Removing"),
+                ],
+                db_index=True,
+                default="deploying",
+                max_length=50,
+            ),
+        ),
+        migrations.CreateModel(
+            name="AppColdStart",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "trigger",
+                    models.CharField(
+                        choices=[
+                            ("request", "Incoming request"),
+                            ("manual", "Manual start"),
+                        ],
+                        default="request",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("ready", "Ready"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("suspended_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "requested_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+                ("ready_at", models.DateTimeField(blank=True, null=True)),
+                ("duration_ms", models.PositiveIntegerField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cold_starts",
+                        to="applications.application",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Application Cold Start",
+                "verbose_name_plural": "Application Cold Starts",
+                "db_table": "app_cold_starts",
+                "ordering": ["-requested_at"],
+            },
+        ),
+    ]
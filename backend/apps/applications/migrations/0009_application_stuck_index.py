@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0008_app_cold_starts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["status", "state_changed_at"],
+                name="application_status_065110_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0009_application_stuck_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeploymentStep",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "output",
+                    models.JSONField(
+                        default=dict, help_text="Values later steps and retries reuse"
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("duration_ms", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deploy_steps",
+                        to="applications.application",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Deployment Step",
+                "verbose_name_plural": "Deployment Steps",
+                "db_table": "deployment_steps",
+                "ordering": ["id"],
+                "unique_together": {("application", "name")},
+            },
+        ),
+    ]
@@ -28,8 +28,10 @@ class Application(models.Model):
         choices=[
             ("deploying", "Deploying"),
             ("cloning", "Cloning"),
+            ("migrating", "Migrating"),
             ("running", "Running"),
             ("stopped", "Stopped"),
+            ("suspended", "Suspended"),
             ("error", "Error"),
             ("updating", "Updating"),
             ("removing", "Removing"),
@@ -73,6 +75,10 @@ class Application(models.Model):
         verbose_name = "Application"
         verbose_name_plural = "Applications"
         ordering = ["-created_at"]
+        indexes = [
+            # Janitor: apps in a transitional status since before a cutoff
+            models.Index(fields=["status", "state_changed_at"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.status})"
@@ -123,3 +129,197 @@ class DeploymentLog(models.Model):
 
     def __str__(self):
         return f"{self.application.name} - {self.level} - {self.timestamp}"
+
+
+class DeploymentStep(models.Model):
+    """
+    One step of an application's deployment, with what it produced.
+
+    Completed steps are skipped when a failed deployment is retried, so the
+    retry resumes where the last attempt stopped (see deploy_engine).
+    """
+
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name="deploy_steps"
+    )
+    name = models.CharField(max_length=50)
+    status = models.CharField(
+        max_length=20,
+        default="pending",
+        choices=[
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("completed", "Completed"),
+            ("failed", "Failed"),
+        ],
+    )
+    output = models.JSONField(default=dict, help_text="Values later steps and retries reuse")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = "deployment_steps"
+        verbose_name = "Deployment Step"
+        verbose_name_plural = "Deployment Steps"
+        unique_together = [["application", "name"]]
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.name} ({self.status})"
+
+
+class AppMigration(models.Model):
+    """
+    Move of an application's container to another node of its cluster.
+
+    Tracks the Proxmox migrate task so clients can follow its progress.
+    """
+
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name="node_migrations"
+    )
+    source_node = models.CharField(max_length=100)
+    target_node = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=20,
+        default="pending",
+        db_index=True,
+        choices=[
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("completed", "Completed"),
+            ("failed", "Failed"),
+        ],
+    )
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    message = models.CharField(max_length=255, blank=True, default="")
+    reason = models.CharField(
+        max_length=20,
+        default="manual",
+        choices=[("manual", "Manual"), ("rebalance", "Rebalance")],
+    )
+    restart = models.BooleanField(
+        default=False, help_text="Container was running and is restarted on the target"
+    )
+    previous_status = models.CharField(max_length=50, blank=True, default="")
+    upid = models.CharField(max_length=255, null=True, blank=True, help_text="Proxmox task")
+    error = models.TextField(null=True, blank=True)
+    requested_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "app_migrations"
+        verbose_name = "Application Migration"
+        verbose_name_plural = "Application Migrations"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.source_node} → {self.target_node} ({self.status})"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    @property
+    def duration_seconds(self):
+        if not self.started_at or not self.finished_at:
+            return None
+        return round((self.finished_at - self.started_at).total_seconds(), 1)
+
+
+class AppColdStart(models.Model):
+    """
+    Wake-up of a suspended application, from the first request to a running container.
+    """
+
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name="cold_starts"
+    )
+    trigger = models.CharField(
+        max_length=20,
+        default="request",
+        choices=[("request", "Incoming request"), ("manual", "Manual start")],
+    )
+    status = models.CharField(
+        max_length=20,
+        default="pending",
+        db_index=True,
+        choices=[("pending", "Pending"), ("ready", "Ready"), ("failed", "Failed")],
+    )
+    suspended_at = models.DateTimeField(null=True, blank=True)
+    requested_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    ready_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        db_table = "app_cold_starts"
+        verbose_name = "Application Cold Start"
+        verbose_name_plural = "Application Cold Starts"
+        ordering = ["-requested_at"]
+
+    def __str__(self):
+        return f"{self.application_id}: cold start {self.status} ({self.duration_ms}ms)"
+
+
+class ResourceRecommendation(models.Model):
+    """
+    Right-sizing advice for an application, computed from its observed usage.
+    """
+
+    application = models.OneToOneField(
+        Application,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="resource_recommendation",
+    )
+
+    # Allocation when the advice was computed
+    current_memory = models.PositiveIntegerField(help_text="Memory in MB")
+    current_cores = models.PositiveSmallIntegerField()
+
+    # Advice
+    recommended_memory = models.PositiveIntegerField(help_text="Memory in MB")
+    recommended_cores = models.PositiveSmallIntegerField()
+
+    # Observed usage the advice is based on
+    memory_percentile = models.PositiveIntegerField(default=0, help_text="Memory in MB")
+    memory_peak = models.PositiveIntegerField(default=0, help_text="Memory in MB")
+    cpu_percentile = models.FloatField(default=0.0, help_text="Cores busy")
+    samples = models.PositiveIntegerField(default=0)
+    timeframe = models.CharField(max_length=10, default="week")
+
+    computed_at = models.DateTimeField(default=timezone.now)
+    applied_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "resource_recommendations"
+        verbose_name = "Resource Recommendation"
+        verbose_name_plural = "Resource Recommendations"
+
+    def __str__(self):
+        return (
+            f"{self.application_id}: {self.current_memory}MB/{self.current_cores}c → "
+            f"{self.recommended_memory}MB/{self.recommended_cores}c"
+        )
+
+    @property
+    def has_changes(self) -> bool:
+        return (self.recommended_memory, self.recommended_cores) != (
+            self.current_memory,
+            self.current_cores,
+        )
+
+    @property
+    def memory_savings(self) -> int:
+        """MB freed on the node if the advice is applied (negative when growing)."""
+        return self.current_memory - self.recommended_memory
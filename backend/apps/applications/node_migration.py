@@ -0,0 +1,328 @@
+"""
+Node Migration - move an application's container to another node.
+
+LXC containers cannot be live-migrated, so a running container is moved in
+Proxmox restart mode: shut down on the source, volumes transferred, started
+on the target. Stopped containers are moved as they are.
+
+Every move is recorded as an AppMigration. The task follows the Proxmox
+migrate task, turning its log into a progress percentage, and only touches
+the Application once Proxmox reports where the container actually is: the
+new node and the restored status are written in the same transaction that
+completes the AppMigration row.
+"""
+
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.proxmox import ProxmoxService, ProxmoxError
+from apps.applications.models import Application, AppMigration
+from apps.applications.placement import PlacementService
+
+logger = logging.getLogger(__name__)
+
+MIGRATABLE_STATUSES = ("running", "stopped")
+
+# Log markers of a restart-mode migration, in the order they appear
+_PHASES = [
+    (re.compile(r"shutdown CT", re.I), 5, "Shutting down container"),
+    (re.compile(r"starting migration", re.I), 10, "Migration started"),
+    (re.compile(r"(copy|transfer|found local volume)", re.I), 15, "Transferring volumes"),
+    (re.compile(r"start (final cleanup|container on target)", re.I), 90, "Finishing"),
+    (re.compile(r"restart container on target", re.I), 95, "Starting container on target"),
+    (re.compile(r"migration finished successfully", re.I), 100, "Migration finished"),
+]
+_PERCENT_RE = re.compile(r"(\d{1,3}(?:\.\d+)?)%")
+
+
+class MigrationError(Exception):
+    """Raised when a migration cannot be started."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def estimate_progress(lines: List[str], progress: int = 0, message: str = "") -> Tuple[int, str]:
+    """
+    Advance a migration's progress from new lines of the Proxmox task log.
+
+    Phase markers set fixed milestones; transfer percentages printed while
+    volumes are copied are mapped onto the 15-90% range. Progress never goes
+    backwards (each volume restarts its own percentage).
+
+    Args:
+        lines: New task log lines
+        progress: Current progress percentage
+        message: Current progress message
+
+    Returns:
+        Tuple of (progress, message)
+    """
+    for line in lines:
+        for pattern, milestone, phase in _PHASES:
+            if pattern.search(line) and milestone > progress:
+                progress, message = milestone, phase
+
+        percent = _PERCENT_RE.search(line)
+        if percent and 15 <= progress < 90:
+            transfer = 15 + int(float(percent.group(1)) * 0.75)
+            if transfer > progress:
+                progress, message = min(transfer, 89), "Transferring volumes"
+
+    return progress, message
+
+
+class MigrationService:
+    """
+    Starts and runs node migrations of applications.
+    """
+
+    def __init__(self, placement: Optional[PlacementService] = None):
+        self.placement = placement or PlacementService()
+
+    def choose_target(self, app: Application) -> str:
+        """
+        Pick the node of the application's cluster with the most free memory.
+
+        Raises:
+            MigrationError: If the cluster has no other online node
+        """
+        candidates = [
+            node_obj
+            for node_obj in self.placement.get_online_nodes(app.host_id)
+            if node_obj.name != app.node
+        ]
+        target = self.placement.select_node(candidates) if candidates else None
+        if not target:
+            raise MigrationError(
+                f"No other online node in the cluster of '{app.hostname}'", status_code=409
+            )
+        return target.name
+
+    def start_migration(
+        self,
+        app: Application,
+        target_node: Optional[str] = None,
+        requested_by=None,
+        reason: str = "manual",
+        target_storage: Optional[str] = None,
+    ) -> AppMigration:
+        """
+        Validate a move, mark the application as migrating and enqueue the task.
+
+        Args:
+            app: Application to move
+            target_node: Destination node (None lets placement choose)
+            requested_by: User that asked for the move
+            reason: "manual" or "rebalance"
+            target_storage: Storage on the target for local volumes
+
+        Returns:
+            The pending AppMigration
+
+        Raises:
+            MigrationError: If the application or the target cannot take part in a move
+        """
+        from apps.applications.tasks import migrate_app_task
+
+        if not app.lxc_id:
+            raise MigrationError(f"Application '{app.hostname}' has no container")
+
+        if target_node is None:
+            target_node = self.choose_target(app)
+        elif target_node == app.node:
+            raise MigrationError(f"Application '{app.hostname}' is already on '{target_node}'")
+        elif target_node not in {
+            node_obj.name for node_obj in self.placement.get_online_nodes(app.host_id)
+        }:
+            raise MigrationError(
+                f"Node '{target_node}' is not an online node of the application's cluster"
+            )
+
+        with transaction.atomic():
+            locked = Application.objects.select_for_update().get(id=app.id)
+            if locked.status not in MIGRATABLE_STATUSES:
+                raise MigrationError(
+                    f"Cannot migrate application in status '{locked.status}'. "
+                    f"Only running or stopped applications can be migrated.",
+                    status_code=409,
+                )
+
+            migration = AppMigration.objects.create(
+                application=locked,
+                source_node=locked.node,
+                target_node=target_node,
+                reason=reason,
+                restart=locked.status == "running",
+                previous_status=locked.status,
+                requested_by=requested_by,
+                message="Queued",
+            )
+            locked.status = "migrating"
+            locked.save(update_fields=["status", "state_changed_at", "updated_at"])
+
+            transaction.on_commit(
+                lambda: migrate_app_task.delay(
+                    migration_id=migration.id, app_id=locked.id, target_storage=target_storage
+                )
+            )
+
+        logger.info(
+            f"🚚 Migration {migration.id} queued: {locked.hostname} "
+            f"{migration.source_node} → {target_node} ({reason})"
+        )
+        return migration
+
+    def run(
+        self,
+        migration: AppMigration,
+        proxmox: Optional[ProxmoxService] = None,
+        target_storage: Optional[str] = None,
+        poll_interval: int = 2,
+    ) -> AppMigration:
+        """
+        Execute a pending migration and record its outcome.
+
+        Args:
+            migration: The AppMigration to run
+            proxmox: Proxmox service of the application's host
+            target_storage: Storage on the target for local volumes
+            poll_interval: Seconds between task status polls
+
+        Returns:
+            The finished AppMigration ('completed' or 'failed')
+        """
+        app = migration.application
+        proxmox = proxmox or ProxmoxService(host_id=app.host_id)
+
+        migration.status = "running"
+        migration.started_at = timezone.now()
+        migration.message = "Starting migration"
+        migration.save(update_fields=["status", "started_at", "message"])
+
+        error = None
+        try:
+            upid = proxmox.migrate_lxc(
+                migration.source_node,
+                app.lxc_id,
+                migration.target_node,
+                restart=migration.restart,
+                shutdown_timeout=settings.MIGRATION_SHUTDOWN_TIMEOUT,
+                target_storage=target_storage,
+            )
+            AppMigration.objects.filter(id=migration.id).update(upid=upid)
+            migration.upid = upid
+            self._follow(proxmox, migration, poll_interval)
+        except ProxmoxError as e:
+            error = str(e)
+
+        moved = error is None or self._is_on_target(proxmox, migration)
+        if error and moved:
+            logger.warning(
+                f"⚠️  Migration {migration.id} reported '{error}' but the container is on "
+                f"{migration.target_node}; recording the move"
+            )
+        self._finish(migration, moved, error)
+        return migration
+
+    def _follow(self, proxmox: ProxmoxService, migration: AppMigration, poll_interval: int):
+        """Poll the migrate task until it stops, saving progress from its log."""
+        deadline = time.monotonic() + settings.MIGRATION_TASK_TIMEOUT
+        progress, message = migration.progress, migration.message
+        log_offset = 0
+
+        while True:
+            status = proxmox.get_task_status(migration.source_node, migration.upid)
+
+            try:
+                lines = proxmox.get_task_log(
+                    migration.source_node, migration.upid, start=log_offset
+                )
+            except ProxmoxError:
+                lines = []
+            log_offset += len(lines)
+
+            new_progress, new_message = estimate_progress(lines, progress, message)
+            if (new_progress, new_message) != (progress, message):
+                progress, message = new_progress, new_message
+                AppMigration.objects.filter(id=migration.id).update(
+                    progress=progress, message=message
+                )
+
+            if status.get("status") == "stopped":
+                exitstatus = status.get("exitstatus", "unknown")
+                if exitstatus != "OK":
+                    raise ProxmoxError(f"Migration task failed: {exitstatus}")
+                return
+
+            if time.monotonic() > deadline:
+                raise ProxmoxError(
+                    f"Migration task timed out after {settings.MIGRATION_TASK_TIMEOUT}s"
+                )
+            time.sleep(poll_interval)
+
+    def _is_on_target(self, proxmox: ProxmoxService, migration: AppMigration) -> bool:
+        """Whether the container already lives on the target node."""
+        try:
+            proxmox.get_lxc_status(migration.target_node, migration.application.lxc_id)
+            return True
+        except ProxmoxError:
+            return False
+
+    def _finish(self, migration: AppMigration, moved: bool, error: Optional[str]) -> None:
+        """Write the outcome to the migration and the application in one transaction."""
+        now = timezone.now()
+
+        with transaction.atomic():
+            app = Application.objects.select_for_update().get(id=migration.application_id)
+            if moved:
+                app.node = migration.target_node
+            app.status = migration.previous_status or "stopped"
+            app.save(update_fields=["node", "status", "state_changed_at", "updated_at"])
+
+            migration.status = "completed" if moved else "failed"
+            migration.progress = 100 if moved else migration.progress
+            migration.message = (
+                f"Moved to {migration.target_node}"
+                if moved
+                else f"Still on {migration.source_node}"
+            )
+            migration.error = error
+            migration.finished_at = now
+            migration.save(update_fields=["status", "progress", "message", "error", "finished_at"])
+            migration.application = app
+
+        if moved:
+            logger.info(
+                f"✅ Migration {migration.id}: {app.hostname} now on {migration.target_node} "
+                f"({migration.duration_seconds}s)"
+            )
+        else:
+            logger.error(f"❌ Migration {migration.id} of {app.hostname} failed: {error}")
+
+    @staticmethod
+    def to_dict(migration: AppMigration) -> Dict[str, Any]:
+        """Serialize an AppMigration for MigrationResponse."""
+        return {
+            "id": migration.id,
+            "app_id": migration.application_id,
+            "source_node": migration.source_node,
+            "target_node": migration.target_node,
+            "status": migration.status,
+            "progress": migration.progress,
+            "message": migration.message,
+            "reason": migration.reason,
+            "restart": migration.restart,
+            "error": migration.error,
+            "created_at": migration.created_at.isoformat(),
+            "started_at": migration.started_at.isoformat() if migration.started_at else None,
+            "finished_at": migration.finished_at.isoformat() if migration.finished_at else None,
+            "duration_seconds": migration.duration_seconds,
+        }
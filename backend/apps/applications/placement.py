@@ -0,0 +1,192 @@
+"""
+Placement Service - Selects the Proxmox node that new applications land on.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from apps.proxmox.models import ProxmoxNode
+
+logger = logging.getLogger(__name__)
+
+# Memory assumed for an app whose config does not request a size (matches deploy_app_task)
+DEFAULT_APP_MEMORY_MB = 2048
+
+
+class PlacementError(ValueError):
+    """Raised when a requested placement is impossible (unknown or offline node)."""
+
+    pass
+
+
+class NoOnlineNodesError(PlacementError):
+    """Raised when no online node is available to place an application on."""
+
+    pass
+
+
+class PlacementService:
+    """
+    Chooses target nodes for deployments.
+
+    Strategy: the online node (on an active host) with the most free memory wins.
+    For batches, each placed app reduces the projected free memory of its node so
+    a large batch spreads across the cluster instead of piling onto one node.
+    """
+
+    def get_online_nodes(self, host_id: Optional[int] = None) -> List[ProxmoxNode]:
+        """Get all online nodes across all active hosts (or of one host)."""
+        nodes = ProxmoxNode.objects.filter(status="online", host__is_active=True)
+        if host_id is not None:
+            nodes = nodes.filter(host_id=host_id)
+        return list(nodes.select_related("host"))
+
+    def get_explicit_node(self, node_name: str) -> ProxmoxNode:
+        """
+        Resolve an explicitly requested node.
+
+        Raises:
+            PlacementError: If the node does not exist or is not online
+        """
+        node_obj = (
+            ProxmoxNode.objects.filter(name=node_name, status="online")
+            .select_related("host")
+            .first()
+        )
+        if node_obj:
+            return node_obj
+
+        offline_node = ProxmoxNode.objects.filter(name=node_name).first()
+        if offline_node:
+            raise PlacementError(
+                f"The specified node '{node_name}' is not online (status: {offline_node.status})"
+            )
+        raise PlacementError(f"The specified node '{node_name}' does not exist")
+
+    def select_node(self, nodes: Optional[List[ProxmoxNode]] = None) -> Optional[ProxmoxNode]:
+        """
+        Select the online node with the most available memory.
+
+        Args:
+            nodes: Candidate nodes (defaults to all online nodes)
+
+        Returns:
+            The selected node, or None if no node is online
+        """
+        if nodes is None:
+            nodes = self.get_online_nodes()
+
+        if not nodes:
+            return None
+
+        best_node = None
+        max_available_memory = -1
+
+        for node_obj in nodes:
+            if node_obj.memory_total and node_obj.memory_used is not None:
+                available = node_obj.memory_total - node_obj.memory_used
+                if available > max_available_memory:
+                    max_available_memory = available
+                    best_node = node_obj
+
+        if not best_node:
+            # No memory info available, just pick the first online node
+            logger.warning("⚠️  No memory info available, using first online node")
+            return nodes[0]
+
+        logger.info(
+            f"✅ Selected node '{best_node.name}' with "
+            f"{max_available_memory / (1024**3):.2f}GB free memory (host: {best_node.host.name})"
+        )
+        return best_node
+
+    def place_batch(self, specs: List[Dict], host_id: Optional[int] = None) -> List[ProxmoxNode]:
+        """
+        Place a whole set of deployments in one pass.
+
+        Args:
+            specs: Deployment specs with optional 'node' and 'config' keys
+            host_id: Only place on nodes of this host (clones cannot leave their cluster)
+
+        Returns:
+            List of nodes, one per spec, in the same order
+
+        Raises:
+            PlacementError: If an explicit node is invalid or no node is online
+        """
+        online_nodes = self.get_online_nodes(host_id)
+        nodes_by_name = {node_obj.name: node_obj for node_obj in online_nodes}
+
+        # Projected free memory per node, updated as apps are placed
+        projected_free = {
+            node_obj.name: (
+                node_obj.memory_total - node_obj.memory_used
+                if node_obj.memory_total and node_obj.memory_used is not None
+                else None
+            )
+            for node_obj in online_nodes
+        }
+
+        placements = []
+        for spec in specs:
+            requested_bytes = int(
+                (spec.get("config") or {}).get("memory", DEFAULT_APP_MEMORY_MB) * 1024**2
+            )
+
+            if spec.get("node"):
+                node_obj = nodes_by_name.get(spec["node"]) or self.get_explicit_node(spec["node"])
+            else:
+                if not online_nodes:
+                    raise NoOnlineNodesError("No online Proxmox nodes available for deployment")
+                known = {name: free for name, free in projected_free.items() if free is not None}
+                if known:
+                    node_obj = nodes_by_name[max(known, key=known.get)]
+                else:
+                    node_obj = online_nodes[len(placements) % len(online_nodes)]
+
+            if projected_free.get(node_obj.name) is not None:
+                projected_free[node_obj.name] -= requested_bytes
+
+            placements.append(node_obj)
+
+        summary: Dict[str, int] = {}
+        for node_obj in placements:
+            summary[node_obj.name] = summary.get(node_obj.name, 0) + 1
+        logger.info(f"Batch placement for {len(specs)} app(s): {summary}")
+
+        return placements
+
+    def select_storages(
+        self, storages: List[Dict[str, Any]], sizes: List[int]
+    ) -> List[Optional[str]]:
+        """
+        Pick a target storage for each of several volumes on one node.
+
+        Each volume goes to the active storage with the most free space that
+        still fits it; placed volumes reduce the projected free space, so many
+        clones spread over the node's storages.
+
+        Args:
+            storages: Storage status dicts of the node (storage, active, avail)
+            sizes: Volume sizes in bytes
+
+        Returns:
+            Storage ID per size, or None where nothing fits
+        """
+        projected_free = {
+            storage["storage"]: storage.get("avail") or 0
+            for storage in storages
+            if storage.get("active", 1)
+        }
+
+        selected: List[Optional[str]] = []
+        for size in sizes:
+            fitting = {name: free for name, free in projected_free.items() if free >= size}
+            if not fitting:
+                selected.append(None)
+                continue
+            name = max(fitting, key=fitting.get)
+            projected_free[name] -= size
+            selected.append(name)
+
+        return selected
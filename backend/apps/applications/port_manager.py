@@ -3,7 +3,7 @@ Port Manager Service - Allocates and releases unique ports for applications.
 """
 
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
@@ -57,6 +57,48 @@ class PortManagerService:
         logger.info(f"Allocated ports: public={public_port}, internal={internal_port}")
         return public_port, internal_port
 
+    @transaction.atomic
+    def allocate_port_batch(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Allocate several unique public/internal port pairs at once.
+
+        Uses one query per port range regardless of how many pairs are needed.
+
+        Args:
+            count: Number of port pairs to allocate
+
+        Returns:
+            List of (public_port, internal_port) tuples
+
+        Raises:
+            ValueError: If the ranges cannot satisfy the request
+        """
+        from apps.applications.models import Application
+
+        public_ports = self._find_available_ports(
+            Application, "public_port", self.PUBLIC_PORT_START, self.PUBLIC_PORT_END, count
+        )
+        if len(public_ports) < count:
+            raise ValueError(
+                f"Not enough available public ports in range (requested {count}, "
+                f"available {len(public_ports)})"
+            )
+
+        internal_ports = self._find_available_ports(
+            Application, "internal_port", self.INTERNAL_PORT_START, self.INTERNAL_PORT_END, count
+        )
+        if len(internal_ports) < count:
+            raise ValueError(
+                f"Not enough available internal ports in range (requested {count}, "
+                f"available {len(internal_ports)})"
+            )
+
+        logger.info(
+            f"Allocated {count} port pairs: public={public_ports[0]}-{public_ports[-1]}, "
+            f"internal={internal_ports[0]}-{internal_ports[-1]}"
+        )
+        return list(zip(public_ports, internal_ports))
+
     def _find_next_available_port(
         self, model, field_name: str, start_port: int, end_port: int
     ) -> Optional[int]:
@@ -72,6 +114,25 @@ class PortManagerService:
         Returns:
             Available port number or None if no ports available
         """
+        ports = self._find_available_ports(model, field_name, start_port, end_port, 1)
+        return ports[0] if ports else None
+
+    def _find_available_ports(
+        self, model, field_name: str, start_port: int, end_port: int, count: int
+    ) -> List[int]:
+        """
+        Find up to `count` available ports in the given range.
+
+        Args:
+            model: Django model to query
+            field_name: Field name to check
+            start_port: Start of port range
+            end_port: End of port range
+            count: Maximum number of ports to return
+
+        Returns:
+            Sorted list of available ports (may be shorter than count)
+        """
         # Get all allocated ports in range
         allocated_ports = set(
             model.objects.filter(
@@ -82,12 +143,14 @@ class PortManagerService:
             ).values_list(field_name, flat=True)
         )
 
-        # Find first available port
+        available = []
         for port in range(start_port, end_port + 1):
             if port not in allocated_ports:
-                return port
+                available.append(port)
+                if len(available) == count:
+                    break
 
-        return None
+        return available
 
     def release_ports(self, public_port: Optional[int], internal_port: Optional[int]):
         """
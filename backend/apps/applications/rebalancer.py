@@ -0,0 +1,179 @@
+"""
+Rebalancer - propose and execute node migrations from utilization data.
+
+Utilization is the memory use Proxmox reports per node (refreshed with
+sync_nodes before a scheduled run). Moves stay inside a cluster. Each move
+takes a running app from the hottest node to the coolest one, preferring the
+app whose memory comes closest to evening out the two nodes. Moves stop once
+no node is above REBALANCE_HOT_THRESHOLD, the gap between the hottest and
+coolest node is below REBALANCE_MIN_GAP, or REBALANCE_MAX_MOVES is reached.
+Stopped apps use no memory and are never moved.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.applications.models import Application, AppMigration
+from apps.applications.node_migration import MigrationError, MigrationService
+from apps.applications.placement import DEFAULT_APP_MEMORY_MB, PlacementService
+
+logger = logging.getLogger(__name__)
+
+
+def app_memory_bytes(app: Application) -> int:
+    """Memory an application's container is configured with."""
+    return int((app.config or {}).get("memory", DEFAULT_APP_MEMORY_MB) * 1024**2)
+
+
+class RebalanceService:
+    """
+    Plans moves that flatten memory utilization across the nodes of a cluster.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        min_gap: Optional[float] = None,
+        max_moves: Optional[int] = None,
+    ):
+        self.threshold = settings.REBALANCE_HOT_THRESHOLD if threshold is None else threshold
+        self.min_gap = settings.REBALANCE_MIN_GAP if min_gap is None else min_gap
+        self.max_moves = settings.REBALANCE_MAX_MOVES if max_moves is None else max_moves
+        self.placement = PlacementService()
+
+    def propose(self, host_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compute the moves that would rebalance every cluster (or one).
+
+        Args:
+            host_id: Only rebalance the nodes of this host
+
+        Returns:
+            Dictionary with 'nodes' (utilization before and after the moves)
+            and 'moves' (app_id, hostname, source, target, memory)
+        """
+        nodes_by_host: Dict[int, list] = {}
+        for node_obj in self.placement.get_online_nodes(host_id):
+            if node_obj.memory_total and node_obj.memory_used is not None:
+                nodes_by_host.setdefault(node_obj.host_id, []).append(node_obj)
+
+        nodes, moves = [], []
+        for cluster_host_id, cluster_nodes in nodes_by_host.items():
+            cluster_moves, cluster_report = self._plan_cluster(
+                cluster_host_id, cluster_nodes, self.max_moves - len(moves)
+            )
+            moves.extend(cluster_moves)
+            nodes.extend(cluster_report)
+
+        return {"nodes": nodes, "moves": moves}
+
+    def _plan_cluster(
+        self, host_id: int, cluster_nodes: list, budget: int
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Greedy hottest-to-coolest moves within one cluster."""
+        total = {node_obj.name: node_obj.memory_total for node_obj in cluster_nodes}
+        used = {node_obj.name: node_obj.memory_used for node_obj in cluster_nodes}
+        before = {name: used[name] / total[name] for name in total}
+
+        busy = set(
+            AppMigration.objects.filter(
+                application__host_id=host_id, status__in=("pending", "running")
+            ).values_list("application_id", flat=True)
+        )
+        apps_by_node: Dict[str, List[Application]] = {name: [] for name in total}
+        for app in Application.objects.filter(
+            host_id=host_id, node__in=list(total), status="running", lxc_id__isnull=False
+        ).order_by("id"):
+            if app.id not in busy:
+                apps_by_node[app.node].append(app)
+
+        moves: List[Dict[str, Any]] = []
+        exhausted = set()
+
+        while len(moves) < budget and len(total) > 1:
+            utilization = {name: used[name] / total[name] for name in total}
+            hot_candidates = [name for name in total if name not in exhausted]
+            if not hot_candidates:
+                break
+            hot = max(hot_candidates, key=utilization.get)
+            cold = min(total, key=utilization.get)
+            if (
+                hot == cold
+                or utilization[hot] < self.threshold
+                or utilization[hot] - utilization[cold] < self.min_gap
+            ):
+                break
+
+            # Memory that would leave both nodes equally utilized
+            ideal = (used[hot] * total[cold] - used[cold] * total[hot]) / (total[hot] + total[cold])
+            candidates = [
+                app
+                for app in apps_by_node[hot]
+                if used[cold] + app_memory_bytes(app) <= total[cold]
+                and (used[cold] + app_memory_bytes(app)) / total[cold] < utilization[hot]
+            ]
+            if not candidates:
+                exhausted.add(hot)
+                continue
+
+            app = min(candidates, key=lambda a: abs(app_memory_bytes(a) - ideal))
+            memory = app_memory_bytes(app)
+            apps_by_node[hot].remove(app)
+            used[hot] -= memory
+            used[cold] += memory
+            moves.append(
+                {
+                    "app_id": app.id,
+                    "hostname": app.hostname,
+                    "host_id": host_id,
+                    "source_node": hot,
+                    "target_node": cold,
+                    "memory": memory,
+                }
+            )
+
+        report = [
+            {
+                "host_id": host_id,
+                "node": name,
+                "utilization": round(before[name], 3),
+                "projected_utilization": round(used[name] / total[name], 3),
+            }
+            for name in sorted(total)
+        ]
+        return moves, report
+
+    def execute(self, moves: List[Dict[str, Any]], requested_by=None) -> Dict[str, Any]:
+        """
+        Start the migrations of a proposal.
+
+        Moves whose application changed since the proposal (moved, stopped,
+        busy) are skipped rather than failing the whole run.
+
+        Returns:
+            Dictionary with the started AppMigrations and the skipped moves
+        """
+        service = MigrationService(self.placement)
+        started, skipped = [], []
+
+        for move in moves:
+            app = Application.objects.filter(id=move["app_id"]).first()
+            if not app or app.node != move["source_node"]:
+                skipped.append({**move, "reason": "Application moved or was removed"})
+                continue
+            try:
+                started.append(
+                    service.start_migration(
+                        app,
+                        target_node=move["target_node"],
+                        requested_by=requested_by,
+                        reason="rebalance",
+                    )
+                )
+            except MigrationError as e:
+                skipped.append({**move, "reason": str(e)})
+
+        logger.info(f"⚖️  Rebalance started {len(started)} migration(s), skipped {len(skipped)}")
+        return {"started": started, "skipped": skipped}
@@ -0,0 +1,347 @@
+"""
+Right-sizing - size containers from their observed CPU and memory usage.
+
+Containers are created with whatever the request, SystemSettings or the
+fallbacks asked for, and most of them never use it. The advisor reads each
+container's usage history from the Proxmox RRD (MAX per sample, so short
+peaks are not averaged away) and recommends:
+
+- memory: the usage percentile (RIGHTSIZE_PERCENTILE) plus RIGHTSIZE_HEADROOM,
+  never below the observed peak, rounded up to 64MB;
+- cores: the busy cores at the same percentile plus headroom, rounded up.
+
+Both are floored at the catalog's min_memory/min_cpu. Memory changes smaller
+than RIGHTSIZE_MIN_CHANGE are not worth a config change and are dropped.
+LXC memory and core limits apply without a restart, so advice can be
+applied to running containers (automatically when RIGHTSIZE_AUTO_APPLY is on).
+"""
+
+import logging
+import math
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.proxmox import ProxmoxService, ProxmoxError
+from apps.applications.models import Application, DeploymentLog, ResourceRecommendation
+
+logger = logging.getLogger(__name__)
+
+MB = 1024**2
+MEMORY_STEP_MB = 64
+
+_RECOMMENDATION_FIELDS = [
+    "current_memory",
+    "current_cores",
+    "recommended_memory",
+    "recommended_cores",
+    "memory_percentile",
+    "memory_peak",
+    "cpu_percentile",
+    "samples",
+    "timeframe",
+    "computed_at",
+    "applied_at",
+]
+
+
+class RightsizingError(Exception):
+    """Raised when a recommendation cannot be applied."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def default_resources() -> Dict[str, int]:
+    """Resources for a container whose config does not set them (SystemSettings)."""
+    from apps.core.models import SystemSettings
+
+    system = SystemSettings.load()
+    return {
+        "memory": system.default_memory_mb,
+        "cores": system.default_cpu_cores,
+        "disk_size": system.default_disk_gb,
+    }
+
+
+def resource_floor(catalog_id: str) -> Dict[str, int]:
+    """Smallest memory (MB) and cores an application may be given."""
+    from apps.catalog.services import catalog_service
+
+    entry = catalog_service.get_app_by_id(catalog_id)
+    return {
+        "memory": max(settings.RIGHTSIZE_MIN_MEMORY_MB, entry.min_memory if entry else 0),
+        "cores": max(1, entry.min_cpu if entry else 1),
+    }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def recommend(
+    samples: List[Dict[str, Any]], current: Dict[str, int], floor: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Compute the recommended allocation from usage samples.
+
+    Args:
+        samples: RRD samples with 'cpu', 'maxcpu' and 'mem'
+        current: Current 'memory' (MB) and 'cores'
+        floor: Minimum 'memory' (MB) and 'cores'
+
+    Returns:
+        Dictionary with recommended_memory, recommended_cores, memory_percentile,
+        memory_peak, cpu_percentile and samples. With too few samples the
+        recommendation equals the current allocation.
+    """
+    usable = [s for s in samples if s.get("mem") is not None and s.get("maxcpu")]
+    result = {
+        "recommended_memory": current["memory"],
+        "recommended_cores": current["cores"],
+        "memory_percentile": 0,
+        "memory_peak": 0,
+        "cpu_percentile": 0.0,
+        "samples": len(usable),
+    }
+    if len(usable) < settings.RIGHTSIZE_MIN_SAMPLES:
+        return result
+
+    memory = sorted(s["mem"] / MB for s in usable)
+    busy_cores = sorted((s.get("cpu") or 0) * s["maxcpu"] for s in usable)
+    memory_percentile = _percentile(memory, settings.RIGHTSIZE_PERCENTILE)
+    cpu_percentile = _percentile(busy_cores, settings.RIGHTSIZE_PERCENTILE)
+    headroom = 1 + settings.RIGHTSIZE_HEADROOM
+
+    target_memory = max(memory_percentile * headroom, memory[-1], floor["memory"])
+    target_memory = math.ceil(target_memory / MEMORY_STEP_MB) * MEMORY_STEP_MB
+    small_change = abs(target_memory - current["memory"]) < current["memory"] * (
+        settings.RIGHTSIZE_MIN_CHANGE
+    )
+    if small_change and current["memory"] >= floor["memory"]:
+        target_memory = current["memory"]
+
+    target_cores = max(floor["cores"], math.ceil(round(cpu_percentile * headroom, 3)), 1)
+
+    result.update(
+        recommended_memory=int(target_memory),
+        recommended_cores=int(target_cores),
+        memory_percentile=int(memory_percentile),
+        memory_peak=int(memory[-1]),
+        cpu_percentile=round(cpu_percentile, 3),
+    )
+    return result
+
+
+class RightsizingService:
+    """
+    Computes, stores and applies right-sizing recommendations.
+    """
+
+    def __init__(self, timeframe: Optional[str] = None):
+        self.timeframe = timeframe or settings.RIGHTSIZE_TIMEFRAME
+
+    def _build(self, app: Application, samples: List[Dict[str, Any]]) -> ResourceRecommendation:
+        """Turn usage samples into an (unsaved) recommendation."""
+        latest = next((s for s in reversed(samples) if s.get("maxmem") and s.get("maxcpu")), None)
+        if latest:
+            current = {"memory": int(latest["maxmem"] / MB), "cores": int(latest["maxcpu"])}
+        else:
+            defaults = default_resources()
+            current = {
+                "memory": int((app.config or {}).get("memory", defaults["memory"])),
+                "cores": int((app.config or {}).get("cores", defaults["cores"])),
+            }
+
+        advice = recommend(samples, current, resource_floor(app.catalog_id))
+        return ResourceRecommendation(
+            application=app,
+            current_memory=current["memory"],
+            current_cores=current["cores"],
+            timeframe=self.timeframe,
+            computed_at=timezone.now(),
+            applied_at=None,
+            **advice,
+        )
+
+    def analyze(
+        self, app: Application, proxmox: Optional[ProxmoxService] = None
+    ) -> ResourceRecommendation:
+        """
+        Compute and store the recommendation of one application.
+
+        Raises:
+            ProxmoxError: If the usage history cannot be fetched
+        """
+        proxmox = proxmox or ProxmoxService(host_id=app.host_id)
+        samples = proxmox.get_lxc_rrd_data(app.node, app.lxc_id, timeframe=self.timeframe)
+        recommendation = self._build(app, samples)
+        recommendation.save()
+        return recommendation
+
+    def analyze_all(self, host_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compute and store recommendations for every running application.
+
+        Usage histories are fetched concurrently (RIGHTSIZE_CONCURRENCY per
+        host) and all recommendations are written in one upsert.
+
+        Returns:
+            Dictionary with 'recommendations' and per-app 'errors'
+        """
+        apps = Application.objects.filter(status="running", lxc_id__isnull=False)
+        if host_id is not None:
+            apps = apps.filter(host_id=host_id)
+
+        apps_by_host: Dict[int, List[Application]] = defaultdict(list)
+        for app in apps:
+            apps_by_host[app.host_id].append(app)
+
+        recommendations, errors = [], {}
+        for app_host_id, host_apps in apps_by_host.items():
+            proxmox = ProxmoxService(host_id=app_host_id)
+
+            def fetch(app):
+                try:
+                    return proxmox.get_lxc_rrd_data(app.node, app.lxc_id, timeframe=self.timeframe)
+                except ProxmoxError as e:
+                    return e
+
+            with ThreadPoolExecutor(max_workers=settings.RIGHTSIZE_CONCURRENCY) as pool:
+                histories = list(pool.map(fetch, host_apps))
+
+            for app, samples in zip(host_apps, histories):
+                if isinstance(samples, Exception):
+                    errors[app.id] = str(samples)
+                    continue
+                recommendations.append(self._build(app, samples))
+
+        ResourceRecommendation.objects.bulk_create(
+            recommendations,
+            update_conflicts=True,
+            unique_fields=["application"],
+            update_fields=_RECOMMENDATION_FIELDS,
+        )
+        logger.info(
+            f"📐 Right-sizing analyzed {len(recommendations)} app(s), "
+            f"{sum(r.has_changes for r in recommendations)} with changes, "
+            f"{len(errors)} error(s)"
+        )
+        return {"recommendations": recommendations, "errors": errors}
+
+    def apply(
+        self, app: Application, proxmox: Optional[ProxmoxService] = None
+    ) -> ResourceRecommendation:
+        """
+        Apply the stored recommendation to the container and the app's config.
+
+        Raises:
+            RightsizingError: If there is nothing to apply or the app is busy
+            ProxmoxError: If Proxmox rejects the new limits
+        """
+        recommendation = ResourceRecommendation.objects.filter(application=app).first()
+        if not recommendation:
+            raise RightsizingError(f"No recommendation for '{app.hostname}' yet", 404)
+        if not recommendation.has_changes or recommendation.applied_at:
+            raise RightsizingError(f"Recommendation for '{app.hostname}' has nothing to apply")
+        if app.status not in ("running", "stopped"):
+            raise RightsizingError(
+                f"Cannot resize application in status '{app.status}'", status_code=409
+            )
+
+        proxmox = proxmox or ProxmoxService(host_id=app.host_id)
+        proxmox.update_lxc_config(
+            app.node,
+            app.lxc_id,
+            memory=recommendation.recommended_memory,
+            cores=recommendation.recommended_cores,
+        )
+
+        with transaction.atomic():
+            locked = Application.objects.select_for_update().get(id=app.id)
+            locked.config = {
+                **(locked.config or {}),
+                "memory": recommendation.recommended_memory,
+                "cores": recommendation.recommended_cores,
+            }
+            locked.save(update_fields=["config", "updated_at"])
+
+            recommendation.applied_at = timezone.now()
+            recommendation.save(update_fields=["applied_at"])
+
+            DeploymentLog.objects.create(
+                application=locked,
+                level="info",
+                message=(
+                    f"Resized from {recommendation.current_memory}MB/"
+                    f"{recommendation.current_cores} core(s) to "
+                    f"{recommendation.recommended_memory}MB/"
+                    f"{recommendation.recommended_cores} core(s)"
+                ),
+                step="rightsize",
+            )
+
+        app.config = locked.config
+        logger.info(f"📐 Right-sized {app.hostname}: {recommendation}")
+        return recommendation
+
+    def run(self, apply: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Analyze every running application and optionally apply the advice.
+
+        Args:
+            apply: Apply recommendations with changes (default: RIGHTSIZE_AUTO_APPLY)
+
+        Returns:
+            Summary with counts, memory that would be (or was) freed and errors
+        """
+        apply = settings.RIGHTSIZE_AUTO_APPLY if apply is None else apply
+        analysis = self.analyze_all()
+        changed = [r for r in analysis["recommendations"] if r.has_changes]
+        errors = dict(analysis["errors"])
+
+        applied = []
+        if apply:
+            for recommendation in changed:
+                try:
+                    applied.append(self.apply(recommendation.application))
+                except (RightsizingError, ProxmoxError) as e:
+                    errors[recommendation.application_id] = str(e)
+
+        return {
+            "success": True,
+            "analyzed": len(analysis["recommendations"]),
+            "with_changes": len(changed),
+            "applied": [r.application_id for r in applied],
+            "memory_savings_mb": sum(r.memory_savings for r in changed),
+            "errors": errors,
+        }
+
+    @staticmethod
+    def to_dict(recommendation: ResourceRecommendation) -> Dict[str, Any]:
+        """Serialize a ResourceRecommendation for RightsizingResponse."""
+        return {
+            "app_id": recommendation.application_id,
+            "current_memory": recommendation.current_memory,
+            "current_cores": recommendation.current_cores,
+            "recommended_memory": recommendation.recommended_memory,
+            "recommended_cores": recommendation.recommended_cores,
+            "memory_percentile": recommendation.memory_percentile,
+            "memory_peak": recommendation.memory_peak,
+            "cpu_percentile": recommendation.cpu_percentile,
+            "samples": recommendation.samples,
+            "timeframe": recommendation.timeframe,
+            "has_changes": recommendation.has_changes,
+            "memory_savings": recommendation.memory_savings,
+            "computed_at": recommendation.computed_at.isoformat(),
+            "applied_at": (
+                recommendation.applied_at.isoformat() if recommendation.applied_at else None
+            ),
+        }
@@ -97,6 +97,23 @@ class ApplicationResponse(BaseModel):
     disk_total: Optional[int] = None
 
 
+class ApplicationBatchCreate(BaseModel):
+    """Batch deploy request - provisions many applications at once."""
+
+    apps: List[ApplicationCreate] = Field(
+        ..., min_length=1, max_length=100, description="Deployment specs (1-100)"
+    )
+
+
+class ApplicationBatchResponse(BaseModel):
+    """Batch deploy response."""
+
+    batch_id: str
+    total: int
+    lanes: int
+    apps: List[ApplicationResponse]
+
+
 class ApplicationListResponse(BaseModel):
     """Paginated application list."""
 
@@ -121,6 +138,10 @@ class ApplicationClone(BaseModel):
         max_length=63,
         description="Hostname for the cloned application (RFC 1123 format)",
     )
+    mode: str = Field(
+        "auto",
+        description="auto (linked when possible), linked (fail if impossible) or full",
+    )
 
     @field_validator("new_hostname")
     @classmethod
@@ -133,6 +154,208 @@ class ApplicationClone(BaseModel):
             )
         return v
 
+    @field_validator("mode")
+    @classmethod
+    def validate_mode(cls, v):
+        """Validate clone mode."""
+        if v not in ("auto", "linked", "full"):
+            raise ValueError("Mode must be one of: auto, linked, full")
+        return v
+
+
+class ApplicationCloneBatch(BaseModel):
+    """Clone one application into many copies in one operation."""
+
+    hostnames: List[str] = Field(
+        ..., min_length=1, max_length=50, description="Hostname of every copy (1-50)"
+    )
+    mode: str = Field(
+        "auto",
+        description="auto (linked when possible), linked (fail if impossible) or full",
+    )
+
+    @field_validator("hostnames")
+    @classmethod
+    def validate_hostnames(cls, v):
+        """🔐 Validate hostname format (RFC 1123)."""
+        for hostname in v:
+            if not HOSTNAME_PATTERN.match(hostname):
+                raise ValueError(
+                    f"Invalid hostname '{hostname}': must contain only lowercase letters, "
+                    "numbers, and hyphens, and must start and end with an alphanumeric character"
+                )
+        return v
+
+    @field_validator("mode")
+    @classmethod
+    def validate_mode(cls, v):
+        """Validate clone mode."""
+        if v not in ("auto", "linked", "full"):
+            raise ValueError("Mode must be one of: auto, linked, full")
+        return v
+
+
+class ApplicationCloneBatchResponse(BaseModel):
+    """Multi-copy clone response."""
+
+    clone_id: str
+    total: int
+    mode: str
+    apps: List[ApplicationResponse]
+
+
+class ApplicationMigrate(BaseModel):
+    """Move an application to another node of its cluster."""
+
+    target_node: Optional[str] = Field(
+        None, description="Destination node (default: the node with the most free memory)"
+    )
+    target_storage: Optional[str] = Field(
+        None, description="Storage on the target node for local volumes"
+    )
+
+
+class MigrationResponse(BaseModel):
+    """Node migration with its progress."""
+
+    id: int
+    app_id: str
+    source_node: str
+    target_node: str
+    status: str
+    progress: int
+    message: str
+    reason: str
+    restart: bool
+    error: Optional[str]
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+    duration_seconds: Optional[float]
+
+
+class MigrationListResponse(BaseModel):
+    """Node migrations of an application, newest first."""
+
+    app_id: str
+    migrations: List[MigrationResponse]
+    total: int
+
+
+class RebalanceMove(BaseModel):
+    """Move proposed by the rebalancer."""
+
+    app_id: str
+    hostname: str
+    host_id: int
+    source_node: str
+    target_node: str
+    memory: int
+
+
+class RebalanceNode(BaseModel):
+    """Memory utilization of a node before and after the proposed moves."""
+
+    host_id: int
+    node: str
+    utilization: float
+    projected_utilization: float
+
+
+class RebalancePlanResponse(BaseModel):
+    """Rebalancer proposal."""
+
+    nodes: List[RebalanceNode]
+    moves: List[RebalanceMove]
+
+
+class RebalanceExecuteResponse(BaseModel):
+    """Migrations started by a rebalance run."""
+
+    migrations: List[MigrationResponse]
+    skipped: List[Dict[str, Any]]
+
+
+class RightsizingResponse(BaseModel):
+    """Right-sizing recommendation of an application (memory in MB)."""
+
+    app_id: str
+    current_memory: int
+    current_cores: int
+    recommended_memory: int
+    recommended_cores: int
+    memory_percentile: int
+    memory_peak: int
+    cpu_percentile: float
+    samples: int
+    timeframe: str
+    has_changes: bool
+    memory_savings: int
+    computed_at: str
+    applied_at: Optional[str]
+
+
+class RightsizingListResponse(BaseModel):
+    """Right-sizing recommendations with the memory they would free."""
+
+    recommendations: List[RightsizingResponse]
+    total: int
+    memory_savings: int
+
+
+class ColdStartResponse(BaseModel):
+    """Wake-up of a suspended application."""
+
+    id: int
+    app_id: str
+    trigger: str
+    status: str
+    suspended_at: Optional[str]
+    requested_at: str
+    ready_at: Optional[str]
+    duration_ms: Optional[int]
+    error: Optional[str]
+
+
+class ColdStartListResponse(BaseModel):
+    """Cold starts of an application, newest first, with latency stats (ms)."""
+
+    app_id: str
+    cold_starts: List[ColdStartResponse]
+    total: int
+    average_ms: Optional[int]
+    max_ms: Optional[int]
+
+
+class DeploymentStepResponse(BaseModel):
+    """A step of the deployment engine with its recorded outcome."""
+
+    name: str
+    status: str
+    attempts: int
+    depends_on: List[str]
+    output: Dict[str, Any]
+    error: Optional[str]
+    started_at: Optional[str]
+    finished_at: Optional[str]
+    duration_ms: Optional[int]
+
+
+class DeploymentStepListResponse(BaseModel):
+    """Deployment steps of an application, in execution order."""
+
+    app_id: str
+    steps: List[DeploymentStepResponse]
+
+
+class WakeResponse(BaseModel):
+    """Outcome of a wake request held while the container boots."""
+
+    app_id: str
+    status: str
+    url: Optional[str]
+    cold_start: Optional[ColdStartResponse]
+
 
 class ApplicationAdopt(BaseModel):
     """Adopt existing LXC container request."""
@@ -166,6 +389,15 @@ class ApplicationAdopt(BaseModel):
         return v
 
 
+class ApplicationBulkAdopt(BaseModel):
+    """Bulk adoption request - adopts many discovered containers in one job."""
+
+    items: List[ApplicationAdopt] = Field(
+        ..., min_length=1, max_length=500, description="Containers to adopt (1-500)"
+    )
+    host_id: Optional[int] = Field(None, description="Proxmox host ID (default host if omitted)")
+
+
 class DeploymentLogResponse(BaseModel):
     """Deployment log entry."""
 
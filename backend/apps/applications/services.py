@@ -2,19 +2,49 @@
 Application Services - Business logic for application lifecycle management.
 """
 
+import asyncio
 import logging
 from datetime import timedelta
-from typing import Dict, Any
+from typing import Any, Dict, List, Tuple
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from apps.proxmox import ProxmoxService
+from apps.proxmox import ProxmoxService, USE_MOCK
 from apps.proxmox.models import ProxmoxHost
-from apps.applications.models import Application
+from apps.applications.models import Application, DeploymentLog
+from apps.applications.batch_deploy import QUEUED_IN_BATCH
 from apps.applications.port_manager import PortManagerService
 
 logger = logging.getLogger(__name__)
 
+# States an application only passes through; the janitor fails apps stuck in one
+TRANSITIONAL_STATES = ["deploying", "cloning", "migrating", "removing", "updating"]
+
+
+def _scan_lxc_containers_serially(
+    hosts: List[ProxmoxHost],
+) -> Tuple[Dict[int, Dict[str, List[Dict[str, Any]]]], List[str]]:
+    """Same result as async_service.scan_lxc_containers, one node at a time via ProxmoxService."""
+    containers: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+    errors: List[str] = []
+    for host in hosts:
+        try:
+            proxmox_service = ProxmoxService(host_id=host.id)
+            node_names = [node["node"] for node in proxmox_service.get_nodes() if node.get("node")]
+        except Exception as e:
+            errors.append(f"Host {host.name}: {e}")
+            continue
+
+        containers[host.id] = {}
+        for node_name in node_names:
+            try:
+                containers[host.id][node_name] = proxmox_service.get_lxc_containers(node_name)
+            except Exception as e:
+                errors.append(f"Node {node_name}: {e}")
+    return containers, errors
+
 
 class ApplicationService:
     """
@@ -71,46 +101,31 @@ class ApplicationService:
             real_vmids = set()
 
             # Get all active Proxmox hosts
-            hosts = ProxmoxHost.objects.filter(is_active=True)
-            logger.info(f"[RECONCILIATION] Found {hosts.count()} active Proxmox host(s)")
+            hosts = list(ProxmoxHost.objects.filter(is_active=True))
+            logger.info(f"[RECONCILIATION] Found {len(hosts)} active Proxmox host(s)")
 
-            for host in hosts:
-                try:
-                    logger.info(f"[RECONCILIATION]   → Scanning host: {host.name} (ID: {host.id})")
-                    proxmox_service = ProxmoxService(host_id=host.id)
-
-                    # Get all nodes for this host
-                    nodes_data = proxmox_service.get_nodes()
-                    logger.info(f"[RECONCILIATION]     → Found {len(nodes_data)} node(s)")
-
-                    for node_data in nodes_data:
-                        node_name = node_data.get("node")
-                        try:
-                            logger.info(f"[RECONCILIATION]       → Scanning node: {node_name}")
+            if USE_MOCK:
+                # The mock service has no async client; it yields the same shape serially
+                containers_by_host, scan_errors = _scan_lxc_containers_serially(hosts)
+            else:
+                from apps.proxmox.async_service import scan_lxc_containers
 
-                            # Get all LXC containers on this node
-                            containers = proxmox_service.get_lxc_containers(node_name)
-                            logger.info(
-                                f"[RECONCILIATION]         → Found {len(containers)} LXC container(s)"
-                            )
+                # Scan every node of every host concurrently
+                containers_by_host, scan_errors = asyncio.run(scan_lxc_containers(hosts))
 
-                            # Collect VMIDs
-                            for container in containers:
-                                vmid = container.get("vmid")
-                                if vmid:
-                                    real_vmids.add(int(vmid))
-
-                        except Exception as node_error:
-                            logger.error(
-                                f"[RECONCILIATION]       ✗ Failed to scan node {node_name}: {node_error}"
-                            )
-                            errors.append(f"Node {node_name}: {str(node_error)}")
-
-                except Exception as host_error:
-                    logger.error(
-                        f"[RECONCILIATION]   ✗ Failed to scan host {host.name}: {host_error}"
+            for host_id, containers_by_node in containers_by_host.items():
+                for node_name, containers in containers_by_node.items():
+                    logger.info(
+                        f"[RECONCILIATION]   → Host {host_id} node {node_name}: "
+                        f"{len(containers)} LXC container(s)"
                     )
-                    errors.append(f"Host {host.name}: {str(host_error)}")
+                    real_vmids.update(
+                        int(container["vmid"]) for container in containers if container.get("vmid")
+                    )
+
+            for error in scan_errors:
+                logger.error(f"[RECONCILIATION]   ✗ Scan failed - {error}")
+            errors.extend(scan_errors)
 
             logger.info(
                 f"[RECONCILIATION] ✓ STEP 1 COMPLETE: Found {len(real_vmids)} real VMIDs across all hosts"
@@ -332,7 +347,6 @@ class ApplicationService:
                 "errors": errors + [f"Fatal error: {str(e)}"],
             }
 
-    @staticmethod
     @staticmethod
     def cleanup_stuck_applications() -> Dict[str, Any]:
         """
@@ -354,12 +368,19 @@ class ApplicationService:
         1. The Janitor handles INTERNAL state health (DB status)
         2. The Reconciler handles EXTERNAL state consistency (DB ↔ Proxmox)
 
-        Transitional states monitored:
-        - deploying: New deployment in progress
+        Transitional states monitored (see TRANSITIONAL_STATES):
+        - deploying: New deployment in progress (timed from when deploy_app_task
+          starts it; batch rows still queued in their lane are skipped)
         - cloning: Clone operation in progress
+        - migrating: Node migration in progress
         - removing: Deletion in progress
         - updating: Update operation in progress
 
+        The work is set-based, so it is cheap enough to run every few minutes:
+        one indexed query on (status, state_changed_at) locks the stuck rows,
+        one conditional UPDATE moves them to error and one bulk insert writes
+        the audit logs - regardless of how many apps are stuck.
+
         Returns:
             Dictionary with cleanup results:
                 - success: bool
@@ -368,159 +389,88 @@ class ApplicationService:
                 - stuck_marked_error: int (stuck apps marked as error)
                 - errors: list (any errors during cleanup)
         """
-        # Configuration
-        STUCK_TIMEOUT = timedelta(hours=1)  # Apps stuck for more than 1 hour
-        TRANSITIONAL_STATES = ["deploying", "cloning", "removing", "updating"]
-
-        logger.info("=" * 100)
-        logger.info("[JANITOR] Starting CONSERVATIVE stuck applications cleanup process...")
-        logger.info("[JANITOR] DOCTRINE: Doctor mode - diagnose and mark only, never delete")
-        logger.info(f"[JANITOR] Timeout threshold: {STUCK_TIMEOUT}")
-        logger.info(f"[JANITOR] Monitored states: {TRANSITIONAL_STATES}")
-        logger.info("=" * 100)
-
+        stuck_timeout = timedelta(minutes=settings.JANITOR_STUCK_TIMEOUT_MINUTES)
         stuck_found = 0
         stuck_marked_error = 0
-        errors = []
 
         try:
-            # Calculate the cutoff time
-            cutoff_time = timezone.now() - STUCK_TIMEOUT
-
-            # Find all apps in transitional states
-            transitional_apps = Application.objects.filter(status__in=TRANSITIONAL_STATES)
-            total_transitional = transitional_apps.count()
-
-            logger.info(
-                f"[JANITOR] STEP 1/2: Found {total_transitional} application(s) in transitional states"
-            )
-
-            if total_transitional == 0:
-                logger.info("[JANITOR] ✅ No transitional applications found - system is healthy")
-                return {
-                    "success": True,
-                    "total_transitional": 0,
-                    "stuck_found": 0,
-                    "stuck_marked_error": 0,
-                    "errors": [],
-                }
-
-            # Find stuck applications (state_changed_at older than cutoff)
-            stuck_apps = transitional_apps.filter(state_changed_at__lt=cutoff_time)
-            stuck_found = stuck_apps.count()
-
-            logger.info(
-                f"[JANITOR] STEP 2/2: Found {stuck_found} stuck application(s) requiring diagnosis"
+            now = timezone.now()
+            cutoff_time = now - stuck_timeout
+            # Batch rows waiting in their lane have not started deploying yet
+            stuck_filter = (
+                Q(status__in=TRANSITIONAL_STATES, state_changed_at__lt=cutoff_time)
+                & ~QUEUED_IN_BATCH
             )
 
-            if stuck_found == 0:
-                logger.info(
-                    "[JANITOR] ✅ No stuck applications found - all transitions are within timeout"
+            with transaction.atomic():
+                # Rows another janitor run is handling are skipped, not waited for
+                stuck = list(
+                    Application.objects.select_for_update(skip_locked=True)
+                    .filter(stuck_filter)
+                    .order_by()
+                    .values("id", "hostname", "status", "state_changed_at")
                 )
-                return {
-                    "success": True,
-                    "total_transitional": total_transitional,
-                    "stuck_found": 0,
-                    "stuck_marked_error": 0,
-                    "errors": [],
-                }
-
-            # DOCTRINE: Mark stuck applications as error (INTERNAL state management ONLY)
-            logger.info(
-                f"[JANITOR] Diagnosing and marking {stuck_found} stuck application(s) as ERROR..."
-            )
-            logger.info(
-                "[JANITOR] ⚠️  NOTE: Container cleanup (if needed) will be handled by ReconciliationService"
-            )
-
-            for app in stuck_apps:
-                try:
-                    time_stuck = timezone.now() - app.state_changed_at
-                    hours_stuck = int(time_stuck.total_seconds() / 3600)
-                    minutes_stuck = int((time_stuck.total_seconds() % 3600) / 60)
-
-                    logger.warning(
-                        f"[JANITOR]   🩺 DIAGNOSING: '{app.hostname}' "
-                        f"(ID: {app.id}, Status: {app.status}) - "
-                        f"Stuck for {hours_stuck}h {minutes_stuck}m"
-                    )
-
-                    with transaction.atomic():
-                        # Re-fetch to avoid race conditions
-                        app_to_update = Application.objects.select_for_update().get(pk=app.pk)
-
-                        # Only update if still in a transitional state
-                        if app_to_update.status in TRANSITIONAL_STATES:
-                            old_status = app_to_update.status
-
-                            # DOCTRINE: ONLY change status to error, NEVER touch containers
-                            app_to_update.status = "error"
-                            app_to_update.save(update_fields=["status"])
-
-                            logger.info(
-                                f"[JANITOR]     ✓ DIAGNOSED AS ERROR: {app.hostname} "
-                                f"(was: {old_status}, stuck since: {app.state_changed_at})"
-                            )
-                            logger.info(
-                                "[JANITOR]       → Container (if any) will be handled by ReconciliationService"
-                            )
-                            stuck_marked_error += 1
-
-                            # Log to deployment logs for audit trail
-                            from apps.applications.models import DeploymentLog
-
-                            DeploymentLog.objects.create(
-                                application=app_to_update,
+                stuck_found = len(stuck)
+
+                if stuck:
+                    # DOCTRINE: ONLY change status to error, NEVER touch containers
+                    stuck_marked_error = Application.objects.filter(
+                        stuck_filter, id__in=[app["id"] for app in stuck]
+                    ).update(status="error", state_changed_at=now, updated_at=now)
+
+                    logs = []
+                    for app in stuck:
+                        time_stuck = now - app["state_changed_at"]
+                        hours_stuck = int(time_stuck.total_seconds() / 3600)
+                        minutes_stuck = int((time_stuck.total_seconds() % 3600) / 60)
+                        logger.warning(
+                            f"[JANITOR]   🩺 DIAGNOSED AS ERROR: '{app['hostname']}' "
+                            f"(ID: {app['id']}, was: {app['status']}) - "
+                            f"Stuck for {hours_stuck}h {minutes_stuck}m"
+                        )
+                        logs.append(
+                            DeploymentLog(
+                                application_id=app["id"],
                                 level="error",
                                 message=f"Operation timed out after {hours_stuck}h {minutes_stuck}m. "
-                                f"Previous state: {old_status}. "
+                                f"Previous state: {app['status']}. "
                                 f"Container cleanup (if needed) will be handled by reconciliation.",
                                 step="janitor_diagnosis",
                             )
-                        else:
-                            logger.info(
-                                f"[JANITOR]     ⊘ Skipped (status changed): {app.hostname} "
-                                f"(now: {app_to_update.status})"
-                            )
+                        )
+                    DeploymentLog.objects.bulk_create(logs)
 
-                except Exception as diagnosis_error:
-                    logger.error(
-                        f"[JANITOR]     ✗ Failed to diagnose {app.hostname}: {diagnosis_error}",
-                        exc_info=True,
-                    )
-                    errors.append(f"Diagnosis {app.hostname}: {str(diagnosis_error)}")
+            total_transitional = Application.objects.filter(status__in=TRANSITIONAL_STATES).count()
 
-            # Final summary
-            logger.info("=" * 100)
-            logger.info("[JANITOR] ✅ CONSERVATIVE CLEANUP COMPLETE")
-            logger.info("[JANITOR] Summary:")
-            logger.info(f"[JANITOR]   - Total transitional apps: {total_transitional}")
-            logger.info(f"[JANITOR]   - Stuck apps found: {stuck_found}")
-            logger.info(f"[JANITOR]   - Stuck apps marked as error: {stuck_marked_error}")
-            logger.info(f"[JANITOR]   - Errors: {len(errors)}")
-            logger.info(
-                "[JANITOR] 📝 Next: ReconciliationService will handle any orphaned containers"
-            )
-            logger.info("=" * 100)
+            if stuck_found:
+                logger.info(
+                    f"[JANITOR] ✅ Marked {stuck_marked_error}/{stuck_found} stuck application(s) "
+                    f"as error (timeout {stuck_timeout}, {total_transitional} still transitional)"
+                )
+                logger.info(
+                    "[JANITOR] 📝 Next: ReconciliationService will handle any orphaned containers"
+                )
+            else:
+                logger.debug(
+                    f"[JANITOR] ✅ No stuck applications ({total_transitional} transitional)"
+                )
 
             return {
                 "success": True,
                 "total_transitional": total_transitional,
                 "stuck_found": stuck_found,
                 "stuck_marked_error": stuck_marked_error,
-                "errors": errors,
+                "errors": [],
             }
 
         except Exception as e:
-            logger.error("=" * 100)
             logger.error(f"[JANITOR] ❌ CLEANUP FAILED: {e}")
-            logger.error("=" * 100)
             logger.exception("[JANITOR] Full traceback:")
 
             return {
                 "success": False,
                 "total_transitional": 0,
                 "stuck_found": stuck_found,
-                "stuck_marked_error": stuck_marked_error,
-                "errors": errors + [f"Fatal error: {str(e)}"],
+                "stuck_marked_error": 0,
+                "errors": [f"Fatal error: {str(e)}"],
             }
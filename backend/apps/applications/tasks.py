@@ -5,7 +5,7 @@ All long-running operations are offloaded to Celery workers.
 
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from celery import shared_task
 from django.utils import timezone
 from django.conf import settings
@@ -14,6 +14,7 @@ from django.db import transaction
 from apps.proxmox import ProxmoxService, ProxmoxError
 from apps.applications.models import Application, DeploymentLog
 from apps.applications.port_manager import PortManagerService
+from apps.core.node_semaphore import throttle_per_node, app_node_slot
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ def log_deployment(app_id: str, level: str, message: str, step: Optional[str] =
 
 
 @shared_task(bind=True, max_retries=3)
+@throttle_per_node(lambda params: f"{params['host_id']}:{params['node']}")
 def deploy_app_task(
     self,
     app_id: str,
@@ -49,6 +51,7 @@ def deploy_app_task(
     config: Dict[str, Any],
     environment: Dict[str, str],
     owner_id: int,
+    vmid: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Deploy a new application as a Celery task.
@@ -65,6 +68,7 @@ def deploy_app_task(
         config: Application configuration
         environment: Environment variables
         owner_id: User ID who owns this app
+        vmid: VMID reserved up front (batch deploys); allocated here if None
 
     Returns:
         Deployment result dictionary
@@ -92,7 +96,9 @@ def deploy_app_task(
 
             logger.info(f"[{app_id}] → Setting status to 'deploying'...")
             app.status = "deploying"
-            app.save(update_fields=["status"])
+            # The janitor times the deploy from here, not from when the row was queued
+            app.state_changed_at = timezone.now()
+            app.save(update_fields=["status", "state_changed_at"])
             logger.info(f"[{app_id}] ✓ Database committed: status='deploying'")
 
         logger.info(f"[{app_id}] STEP 0 COMPLETE: Application status set to 'deploying'")
@@ -112,8 +118,8 @@ def deploy_app_task(
             time.sleep(2)  # Simulate deployment time
 
             # Assign unique fake VMID (find next available starting from 9000)
-            test_vmid = 9000
-            while Application.objects.filter(lxc_id=test_vmid).exists():
+            test_vmid = vmid or 9000
+            while not vmid and Application.objects.filter(lxc_id=test_vmid).exists():
                 test_vmid += 1
 
             logger.info(f"[{app_id}] 🔢 [TEST MODE] Allocated test VMID: {test_vmid}")
@@ -139,234 +145,21 @@ def deploy_app_task(
 
         # REAL DEPLOYMENT MODE
         logger.info(f"[{app_id}] STEP 1: REAL DEPLOYMENT MODE - Deploying to Proxmox!")
+        from apps.applications.deploy_engine import DeploymentEngine
 
-        # Initialize services
-        logger.info(f"[{app_id}] STEP 1.1: Initializing ProxmoxService for host_id={host_id}...")
-        try:
-            proxmox_service = ProxmoxService(host_id=host_id)
-            logger.info(f"[{app_id}] ✓ ProxmoxService initialized successfully")
-        except Exception as e:
-            logger.error(f"[{app_id}] ❌ Failed to initialize ProxmoxService: {e}", exc_info=True)
-            raise
-
-        log_deployment(app_id, "info", "Allocating VMID...", "vmid")
-
-        # 🔐 RACE CONDITION FIX: Use database transaction lock to prevent VMID conflicts
-        # Without locking, two concurrent tasks could get the same VMID:
-        # Task A: gets candidate_vmid=100, checks (unused)
-        # Task B: gets candidate_vmid=100, checks (unused)
-        # Task A: assigns 100
-        # Task B: assigns 100 (DUPLICATE!)
-        # Solution: Lock the Application record while allocating
-
-        logger.info(f"[{app_id}] 🔢 Requesting next available VMID from Proxmox...")
-        max_attempts = 10
-        vmid = None
-
-        # Lock the current application to prevent concurrent VMID allocation
-        with transaction.atomic():
-            app_locked = Application.objects.select_for_update().get(id=app_id)
-
-            for attempt in range(max_attempts):
-                candidate_vmid = proxmox_service.get_next_vmid()
-
-                # Check if this VMID is already in use in our database
-                # (this query is now protected by the row lock above)
-                existing_app = Application.objects.filter(lxc_id=candidate_vmid).first()
-
-                if not existing_app:
-                    # VMID is unique, use it
-                    vmid = candidate_vmid
-                    logger.info(f"[{app_id}] ✓ Allocated unique VMID: {vmid}")
-                    break
-                else:
-                    # VMID conflict - check if it's an orphaned record
-                    logger.warning(
-                        f"[{app_id}] ⚠️  VMID {candidate_vmid} already in use by {existing_app.hostname} "
-                        f"(status: {existing_app.status})"
-                    )
+        proxmox_service = ProxmoxService(host_id=host_id)
 
-                    if existing_app.status == "error":
-                        # Clear the lxc_id from the orphaned application
-                        logger.info(
-                            f"[{app_id}] 🧹 Clearing lxc_id from orphaned application: {existing_app.hostname}"
-                        )
-                        existing_app.lxc_id = None
-                        existing_app.save(update_fields=["lxc_id"])
-
-                        # Now we can use this VMID
-                        vmid = candidate_vmid
-                        logger.info(f"[{app_id}] ✓ Allocated VMID after cleanup: {vmid}")
-                        break
-                    else:
-                        # VMID is legitimately in use, try again
-                        logger.info(
-                            f"[{app_id}] 🔄 VMID {candidate_vmid} is in use, trying again..."
-                        )
-                        continue
-
-            if vmid is None:
-                raise Exception(f"Failed to allocate unique VMID after {max_attempts} attempts")
-
-            # Assign VMID within the same transaction to ensure atomicity
-            app_locked.lxc_id = vmid
-            app_locked.save(update_fields=["lxc_id"])
-            logger.info(f"[{app_id}] ✓ VMID {vmid} committed atomically to database")
-
-        log_deployment(app_id, "info", f"Allocated VMID: {vmid}", "vmid")
-
-        # Generate root password (TODO: Use encryption service from v1.0)
-        import secrets
-
-        root_password = secrets.token_urlsafe(16)
-        logger.info(f"[{app_id}] 🔐 Generated root password (length: {len(root_password)})")
-
-        log_deployment(app_id, "info", "Creating LXC container...", "lxc_create")
-
-        # Create LXC container with Alpine Linux
-        # Alpine is lightweight and perfect for Docker containers
-        # TODO: Get ostemplate from catalog configuration
-        ostemplate = config.get(
-            "ostemplate", "local:vztmpl/alpine-3.22-default_20250617_amd64.tar.xz"
-        )
-        memory = config.get("memory", 2048)
-        cores = config.get("cores", 2)
-        disk_size = config.get("disk_size", "8")
-
-        logger.info(f"[{app_id}] 📦 LXC Configuration:")
-        logger.info(f"[{app_id}]    - Template: {ostemplate}")
-        logger.info(f"[{app_id}]    - Memory: {memory}MB")
-        logger.info(f"[{app_id}]    - Cores: {cores}")
-        logger.info(f"[{app_id}]    - Disk: {disk_size}GB")
-        logger.info(f"[{app_id}]    - Hostname: {hostname}")
-        logger.info(f"[{app_id}]    - VMID: {vmid}")
-        logger.info(f"[{app_id}]    - Node: {node}")
-
-        logger.info(f"[{app_id}] 🏗️  Calling Proxmox API to create LXC container...")
-        create_result = proxmox_service.create_lxc(
-            node_name=node,
-            vmid=vmid,
+        # Resumes after the steps a previous attempt completed (VMID, container, Docker...);
+        # a VMID reserved by a batch deploy is already stored on the application
+        result = DeploymentEngine(
+            app_id=app_id,
+            catalog_id=catalog_id,
             hostname=hostname,
-            ostemplate=ostemplate,
-            password=root_password,
-            memory=memory,
-            cores=cores,
-            disk_size=disk_size,
-        )
-
-        logger.info(f"[{app_id}] ✓ LXC container created successfully!")
-        logger.info(f"[{app_id}] 📋 Create result: {create_result}")
-        log_deployment(app_id, "info", f"LXC container created: {create_result}", "lxc_create")
-
-        # Wait for container to be ready
-        logger.info(f"[{app_id}] ⏳ Waiting 5 seconds for container to be ready...")
-        time.sleep(5)
-
-        # Configure container for Docker BEFORE starting it
-        logger.info(f"[{app_id}] 🔧 Configuring LXC for Docker support (AppArmor: unconfined)...")
-        proxmox_service.configure_lxc_for_docker(node, vmid)
-        logger.info(f"[{app_id}] ✓ LXC configured for Docker!")
-
-        log_deployment(app_id, "info", "Starting LXC container...", "lxc_start")
-
-        # Start container
-        logger.info(f"[{app_id}] ▶️  Starting LXC container (VMID: {vmid})...")
-        proxmox_service.start_lxc(node, vmid)
-        logger.info(f"[{app_id}] ✓ LXC container started successfully!")
-
-        # Wait for container to start
-        logger.info(f"[{app_id}] ⏳ Waiting 10 seconds for container to fully start...")
-        time.sleep(10)
-
-        log_deployment(app_id, "info", "Container started, checking Docker...", "docker_setup")
-
-        # STEP 4: Setup Docker inside the container
-        logger.info(f"[{app_id}] STEP 4: Setting up Docker in Alpine LXC container...")
-        logger.info(f"[{app_id}] STEP 4.1: Importing DockerSetupService...")
-        from apps.applications.docker_setup import DockerSetupService
-
-        logger.info(f"[{app_id}] STEP 4.2: Initializing DockerSetupService...")
-        docker_service = DockerSetupService(proxmox_service)
-
-        logger.info(
-            f"[{app_id}] STEP 4.3: Installing Docker in Alpine container (VMID={vmid}, Node={node})..."
-        )
-        try:
-            docker_installed = docker_service.setup_docker_in_alpine(node, vmid)
-            logger.info(f"[{app_id}] ✓ Docker installation returned: {docker_installed}")
-
-            if not docker_installed:
-                logger.error(f"[{app_id}] ❌ Docker installation returned False!")
-                raise Exception("Failed to install Docker in container")
-
-            logger.info(f"[{app_id}] STEP 4 COMPLETE: Docker installed successfully")
-            log_deployment(app_id, "info", "Docker installed successfully", "docker_setup")
-        except Exception as e:
-            logger.error(
-                f"[{app_id}] ❌ STEP 4 FAILED: Docker installation error: {e}", exc_info=True
-            )
-            raise
-
-        # STEP 5: Deploy application with Docker Compose
-        logger.info(f"[{app_id}] STEP 5: Deploying application with Docker Compose...")
-        log_deployment(app_id, "info", "Docker ready, deploying application...", "app_deploy")
-
-        logger.info(
-            f"[{app_id}] STEP 5.1: Generating docker-compose configuration for {catalog_id}..."
-        )
-        if catalog_id == "adminer":
-            docker_compose_config = docker_service.generate_adminer_compose(port=80)
-            logger.info(
-                f"[{app_id}] ✓ Generated Adminer docker-compose config: {docker_compose_config}"
-            )
-        else:
-            # TODO: Get docker-compose from catalog
-            logger.error(f"[{app_id}] ❌ Unsupported catalog_id: {catalog_id}")
-            raise Exception(f"Unsupported app: {catalog_id}")
-
-        logger.info(
-            f"[{app_id}] STEP 5.2: Deploying with docker-compose (VMID={vmid}, Node={node})..."
-        )
-        try:
-            app_deployed = docker_service.deploy_app_with_docker_compose(
-                node, vmid, catalog_id, docker_compose_config
-            )
-            logger.info(f"[{app_id}] ✓ Docker compose deployment returned: {app_deployed}")
-
-            if not app_deployed:
-                logger.error(f"[{app_id}] ❌ Docker compose deployment returned False!")
-                raise Exception("Failed to deploy application")
-
-            logger.info(f"[{app_id}] STEP 5 COMPLETE: Application deployed successfully")
-        except Exception as e:
-            logger.error(
-                f"[{app_id}] ❌ STEP 5 FAILED: Docker compose deployment error: {e}", exc_info=True
-            )
-            raise
-
-        # STEP 6: Update application status to 'running'
-        logger.info(f"[{app_id}] STEP 6: Updating application status to 'running'...")
-        try:
-            with transaction.atomic():
-                # Re-fetch to get latest state
-                app = Application.objects.select_for_update().get(id=app_id)
-                logger.info(
-                    f"[{app_id}] ✓ Re-fetched app: current_status={app.status}, lxc_id={app.lxc_id}"
-                )
-
-                logger.info(
-                    f"[{app_id}] → Setting status='running', lxc_root_password=<hidden>, updated_at=now"
-                )
-                app.status = "running"
-                app.lxc_root_password = root_password  # TODO: Encrypt this
-                app.updated_at = timezone.now()
-                app.save(update_fields=["status", "lxc_root_password", "updated_at"])
-                logger.info(f"[{app_id}] ✓ Database committed: status='running'")
-
-            logger.info(f"[{app_id}] STEP 6 COMPLETE: Application status updated to 'running'")
-        except Exception as e:
-            logger.error(f"[{app_id}] ❌ STEP 6 FAILED: Status update error: {e}", exc_info=True)
-            raise
+            node=node,
+            config=config,
+            proxmox=proxmox_service,
+        ).run()
+        vmid = result["vmid"]
 
         log_deployment(app_id, "info", f"Deployment complete: {hostname}", "complete")
 
@@ -432,30 +225,71 @@ def deploy_app_task(
             raise
 
 
+@shared_task
+def advance_deploy_lane_task(lane: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Deploy the next application of a batch lane.
+
+    A lane is the ordered list of deploy_app_task kwargs that share one slot of
+    a node's batch concurrency. The head is dispatched with this task linked as
+    both its success and error callback, so the rest of the lane continues once
+    the head finishes - whether it succeeded or exhausted its retries.
+
+    Args:
+        lane: Remaining deploy_app_task kwargs for this lane
+
+    Returns:
+        Dispatch result with the app ID started and how many remain
+    """
+    if not lane:
+        return {"success": True, "dispatched": None, "remaining": 0}
+
+    head, rest = lane[0], lane[1:]
+    options = {}
+    if rest:
+        next_step = advance_deploy_lane_task.si(rest)
+        options = {"link": next_step, "link_error": next_step}
+
+    deploy_app_task.apply_async(kwargs=head, **options)
+    logger.info(f"[BATCH LANE] Dispatched {head['app_id']} ({len(rest)} remaining in lane)")
+
+    return {"success": True, "dispatched": head["app_id"], "remaining": len(rest)}
+
+
 @shared_task(bind=True)
-def start_app_task(self, app_id: str) -> Dict[str, Any]:
+def start_app_task(self, app_id: str, cold_start_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Start an application (start its LXC container).
 
     Args:
         app_id: Application ID
+        cold_start_id: AppColdStart to complete when waking a suspended app
 
     Returns:
         Operation result
     """
+    from apps.applications.autosuspend import AutosuspendService
+
     try:
         app = Application.objects.get(id=app_id)
         log_deployment(app_id, "info", "Starting application...", "start")
 
         proxmox_service = ProxmoxService(host_id=app.host_id)
-        proxmox_service.start_lxc(app.node, app.lxc_id)
+        upid = proxmox_service.start_lxc(app.node, app.lxc_id)
 
-        # Wait for container to start
-        time.sleep(5)
+        # Running (and a cold start ready) only once Proxmox reports the start task OK;
+        # a failed task raises ProxmoxError
+        if isinstance(upid, str):
+            proxmox_service.wait_for_task(app.node, upid, timeout=120)
+        else:
+            time.sleep(5)
 
         app.status = "running"
         app.updated_at = timezone.now()
-        app.save(update_fields=["status", "updated_at"])
+        app.save(update_fields=["status", "state_changed_at", "updated_at"])
+
+        if cold_start_id:
+            AutosuspendService.finish(cold_start_id)
 
         log_deployment(app_id, "info", "Application started", "start")
 
@@ -464,6 +298,8 @@ def start_app_task(self, app_id: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Failed to start app {app_id}: {e}")
         log_deployment(app_id, "error", f"Start failed: {str(e)}", "start")
+        if cold_start_id:
+            AutosuspendService.finish(cold_start_id, error=str(e))
         raise
 
 
@@ -535,7 +371,10 @@ def restart_app_task(self, app_id: str) -> Dict[str, Any]:
 
 
 @shared_task(bind=True, max_retries=3)
-def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -> Dict[str, Any]:
+@throttle_per_node(lambda params: app_node_slot(params["source_app_id"]))
+def clone_app_task(
+    self, source_app_id: str, new_hostname: str, owner_id: int, mode: str = "auto"
+) -> Dict[str, Any]:
     """
     Clone an existing application to create a duplicate with a new hostname.
 
@@ -553,12 +392,15 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
         source_app_id: ID of the application to clone
         new_hostname: Hostname for the cloned application
         owner_id: User ID who owns the new clone
+        mode: "auto", "linked" or "full" (see apps.applications.clone_engine)
 
     Returns:
         Clone operation result with new app_id
     """
     import uuid
 
+    from apps.applications.clone_engine import CloneEngine
+
     new_app = None
     new_lxc_created = False
 
@@ -593,6 +435,11 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
         new_vmid = proxmox_service.get_next_vmid()
         logger.info(f"[CLONE] ✓ Next available VMID: {new_vmid}")
 
+        # Pick linked/full clone, target node and storage from the source's storage
+        engine = CloneEngine(proxmox_service)
+        plan = engine.plan(source_app, 1, mode)
+        target = plan["targets"][0]
+
         # Create new Application record
         new_app = Application.objects.create(
             id=new_app_id,
@@ -605,7 +452,7 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
             lxc_id=new_vmid,
             lxc_root_password=source_app.lxc_root_password,  # Copy same password
             host=source_app.host,
-            node=source_app.node,
+            node=target["node"],
             config=source_app.config.copy() if source_app.config else {},
             ports=source_app.ports.copy() if source_app.ports else {},
             volumes=source_app.volumes.copy() if source_app.volumes else [],
@@ -621,14 +468,14 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
             new_app.id, "info", "Cloning LXC container (may take several minutes)...", "clone"
         )
 
-        proxmox_service.clone_lxc(
-            node_name=source_app.node,
-            source_vmid=source_app.lxc_id,
-            new_vmid=new_vmid,
-            new_hostname=new_hostname,
-            full=True,  # Full clone (not linked)
-            timeout=600,  # 10 minutes timeout
-        )
+        clone_error = engine.execute(
+            source_app,
+            [{"vmid": new_vmid, "hostname": new_hostname, **target}],
+            mode=plan["mode"],
+            snapshot=plan["snapshot"],
+        )[new_vmid]
+        if clone_error:
+            raise ProxmoxError(clone_error)
         new_lxc_created = True
         logger.info("[CLONE] ✓ LXC cloned successfully")
         log_deployment(new_app.id, "info", "Container cloned successfully", "clone")
@@ -637,16 +484,16 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
         logger.info("[CLONE] STEP 4/6: Configuring cloned container...")
         if source_app.config.get("supports_docker", False):
             logger.info("[CLONE]   → Source app supports Docker, configuring clone...")
-            proxmox_service.configure_lxc_for_docker(new_vmid)
+            proxmox_service.configure_lxc_for_docker(new_app.node, new_vmid)
             logger.info("[CLONE]   ✓ Docker configuration applied")
 
         # STEP 5: Start the cloned container
         logger.info(f"[CLONE] STEP 5/6: Starting cloned container {new_vmid}...")
         log_deployment(new_app.id, "info", "Starting cloned container...", "clone")
 
-        start_task = proxmox_service.start_lxc(source_app.node, new_vmid)
+        start_task = proxmox_service.start_lxc(new_app.node, new_vmid)
         if start_task:
-            proxmox_service.wait_for_task(source_app.node, start_task, timeout=120)
+            proxmox_service.wait_for_task(new_app.node, start_task, timeout=120)
         logger.info("[CLONE] ✓ Container started successfully")
 
         # Wait for container to be fully running
@@ -684,7 +531,7 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
                 if new_lxc_created:
                     try:
                         logger.warning(f"[CLONE]   → Deleting LXC {new_app.lxc_id}...")
-                        proxmox_service.delete_lxc(source_app.node, new_app.lxc_id, force=True)
+                        proxmox_service.delete_lxc(new_app.node, new_app.lxc_id, force=True)
                         logger.warning("[CLONE]   ✓ LXC deleted")
                     except Exception as lxc_error:
                         logger.error(
@@ -718,6 +565,233 @@ def clone_app_task(self, source_app_id: str, new_hostname: str, owner_id: int) -
         raise
 
 
+@shared_task(bind=True)
+@throttle_per_node(lambda params: app_node_slot(params["source_app_id"]))
+def clone_apps_task(
+    self, source_app_id: str, clones: List[Dict[str, Any]], mode: str, snapshot: bool
+) -> Dict[str, Any]:
+    """
+    Create several clones of an application provisioned by CloneService.
+
+    The Application rows already exist in 'cloning' status. Copies are made by
+    the clone engine's fan-out, then started together; copies that do not start
+    are kept in 'error' status. Failed copies are rolled back (ports released,
+    rows deleted) without affecting the others.
+
+    Args:
+        source_app_id: ID of the application to clone
+        clones: Dicts with 'app_id', 'vmid', 'hostname', 'node', 'storage' and 'shared'
+        mode: "linked" or "full"
+        snapshot: Clone from one shared temporary snapshot of the source
+
+    Returns:
+        Result with the IDs of the created and failed copies
+    """
+    from apps.applications.clone_engine import CloneEngine
+
+    source_app = Application.objects.get(id=source_app_id)
+    proxmox_service = ProxmoxService(host_id=source_app.host_id)
+    started_at = time.monotonic()
+
+    try:
+        errors = CloneEngine(proxmox_service).execute(source_app, clones, mode, snapshot)
+    except Exception as e:
+        logger.error(f"[CLONE] ❌ Clone of {source_app.name} failed: {e}")
+        errors = {clone["vmid"]: str(e) for clone in clones}
+
+    created = [clone for clone in clones if not errors.get(clone["vmid"])]
+    failed = [clone for clone in clones if errors.get(clone["vmid"])]
+
+    # Start every copy, then wait for all of them at once
+    start_errors: Dict[str, str] = {}
+    start_tasks = {}
+    for clone in created:
+        try:
+            upid = proxmox_service.start_lxc(clone["node"], clone["vmid"])
+            if isinstance(upid, str):
+                start_tasks[upid] = clone
+        except ProxmoxError as e:
+            logger.warning(f"[CLONE] Could not start clone {clone['vmid']}: {e}")
+            start_errors[clone["app_id"]] = f"Start not accepted: {e}"
+    if start_tasks:
+        outcome = proxmox_service.wait_for_tasks(
+            [(clone["node"], upid) for upid, clone in start_tasks.items()], timeout=120
+        )
+        for upid, clone in start_tasks.items():
+            if outcome.get(upid):
+                logger.warning(f"[CLONE] Clone {clone['vmid']} did not start: {outcome[upid]}")
+                start_errors[clone["app_id"]] = f"Start failed: {outcome[upid]}"
+
+    for clone in created:
+        app = Application.objects.get(id=clone["app_id"])
+        # The copy exists either way; only copies that actually started are running
+        app.status = "error" if clone["app_id"] in start_errors else "running"
+        app.url = f"http://{app.hostname}:{app.public_port}"
+        app.save(update_fields=["status", "url", "state_changed_at"])
+        log_deployment(app.id, "info", f"Cloned from {source_app.name} ({mode})", "clone")
+        if clone["app_id"] in start_errors:
+            log_deployment(app.id, "error", start_errors[clone["app_id"]], "clone")
+
+    port_manager = PortManagerService()
+    for clone in failed:
+        logger.error(f"[CLONE] ❌ Clone {clone['hostname']} failed: {errors[clone['vmid']]}")
+        try:
+            app = Application.objects.get(id=clone["app_id"])
+            port_manager.release_ports(app.public_port, app.internal_port)
+            app.delete()
+        except Exception as rollback_error:
+            logger.error(f"[CLONE] ✗ Rollback of {clone['hostname']} failed: {rollback_error}")
+
+    duration = time.monotonic() - started_at
+    logger.info(
+        f"[CLONE] ✅ {len(created)}/{len(clones)} clone(s) of {source_app.name} "
+        f"ready in {duration:.1f}s"
+    )
+    return {
+        "success": not failed,
+        "source_app_id": source_app_id,
+        "created": [clone["app_id"] for clone in created],
+        "failed": {clone["hostname"]: errors[clone["vmid"]] for clone in failed},
+        "not_started": {
+            clone["hostname"]: start_errors[clone["app_id"]]
+            for clone in created
+            if clone["app_id"] in start_errors
+        },
+        "duration_seconds": round(duration, 1),
+    }
+
+
+@shared_task(bind=True)
+@throttle_per_node(lambda params: app_node_slot(params["app_id"]))
+def migrate_app_task(
+    self, migration_id: int, app_id: str, target_storage: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Move an application's container to another node (queued by MigrationService).
+
+    Args:
+        migration_id: AppMigration to run
+        app_id: Application being moved (resolves the source node's job slot)
+        target_storage: Storage on the target for local volumes
+
+    Returns:
+        Migration result with the final status and node
+    """
+    from apps.applications.models import AppMigration
+    from apps.applications.node_migration import MigrationService
+
+    migration = AppMigration.objects.select_related("application").get(id=migration_id)
+    log_deployment(
+        app_id,
+        "info",
+        f"Migrating from {migration.source_node} to {migration.target_node}...",
+        "migrate",
+    )
+
+    migration = MigrationService().run(migration, target_storage=target_storage)
+
+    if migration.status == "completed":
+        log_deployment(
+            app_id,
+            "info",
+            f"Migrated to {migration.target_node} in {migration.duration_seconds}s",
+            "migrate",
+        )
+    else:
+        log_deployment(app_id, "error", f"Migration failed: {migration.error}", "migrate")
+
+    return {
+        "success": migration.status == "completed",
+        "migration_id": migration.id,
+        "app_id": app_id,
+        "status": migration.status,
+        "node": migration.application.node,
+        "duration_seconds": migration.duration_seconds,
+        "error": migration.error,
+    }
+
+
+@shared_task(bind=True)
+def rebalance_nodes_task(self) -> Dict[str, Any]:
+    """
+    Periodic rebalancer: refresh node utilization and propose moves.
+
+    Moves are only started when REBALANCE_AUTO_EXECUTE is enabled; otherwise
+    the proposal is logged and returned for review.
+
+    Returns:
+        The proposal, plus started/skipped counts when executed
+    """
+    from apps.applications.rebalancer import RebalanceService
+    from apps.proxmox.models import ProxmoxHost
+
+    for host in ProxmoxHost.objects.filter(is_active=True):
+        try:
+            ProxmoxService(host_id=host.id).sync_nodes()
+        except Exception as e:
+            logger.warning(f"⚖️  [REBALANCE] Could not refresh nodes of {host.name}: {e}")
+
+    service = RebalanceService()
+    proposal = service.propose()
+    result = {"success": True, "moves": proposal["moves"], "nodes": proposal["nodes"]}
+
+    if not proposal["moves"]:
+        logger.info("⚖️  [REBALANCE] Cluster is balanced, nothing to move")
+        return result
+
+    if not settings.REBALANCE_AUTO_EXECUTE:
+        logger.info(
+            f"⚖️  [REBALANCE] {len(proposal['moves'])} move(s) proposed "
+            f"(REBALANCE_AUTO_EXECUTE is off)"
+        )
+        return result
+
+    outcome = service.execute(proposal["moves"])
+    result["started"] = [migration.id for migration in outcome["started"]]
+    result["skipped"] = outcome["skipped"]
+    return result
+
+
+@shared_task(bind=True)
+def rightsize_apps_task(self) -> Dict[str, Any]:
+    """
+    Periodic right-sizing: refresh recommendations from usage history.
+
+    Recommendations are applied only when RIGHTSIZE_AUTO_APPLY is enabled.
+
+    Returns:
+        Right-sizing summary
+    """
+    from apps.applications.rightsizing import RightsizingService
+
+    result = RightsizingService().run()
+    logger.info(
+        f"📐 [RIGHTSIZE] {result['with_changes']}/{result['analyzed']} app(s) over- or "
+        f"under-provisioned, {len(result['applied'])} applied, "
+        f"{result['memory_savings_mb']}MB reclaimable"
+    )
+    return result
+
+
+@shared_task(bind=True)
+def autosuspend_idle_apps_task(self) -> Dict[str, Any]:
+    """
+    Periodic autosuspend: shut down applications idle for AUTOSUSPEND_IDLE_MINUTES.
+
+    Returns:
+        Autosuspend summary
+    """
+    from apps.applications.autosuspend import AutosuspendService
+
+    result = AutosuspendService().run()
+    if result["suspended"] or result["errors"]:
+        logger.info(
+            f"💤 [AUTOSUSPEND] Suspended {len(result['suspended'])} idle app(s), "
+            f"{result['memory_freed_mb']}MB freed, {len(result['errors'])} error(s)"
+        )
+    return result
+
+
 @shared_task(bind=True)
 def delete_app_task(self, app_id: str, force: bool = True) -> Dict[str, Any]:
     """
@@ -962,37 +1036,60 @@ def reconciliation_task(self) -> Dict[str, Any]:
         return {"success": False, "error": str(e)}
 
 
+@shared_task(bind=True)
+def refresh_discovery_cache_task(self, host_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Refresh the cached list of unmanaged containers for a host.
+
+    Scheduled by GET /apps/discover when it serves stale cache entries.
+
+    Args:
+        host_id: Proxmox host ID (uses default if not specified)
+
+    Returns:
+        Refresh result dictionary
+    """
+    from apps.applications.discovery import refresh_discovery_cache
+
+    try:
+        entry = refresh_discovery_cache(host_id)
+        return {"success": True, "host_id": host_id, "containers": len(entry["containers"])}
+    except Exception as e:
+        logger.warning(f"Discovery cache refresh failed for host {host_id}: {e}")
+        return {"success": False, "host_id": host_id, "error": str(e)}
+
+
 @shared_task(bind=True)
 def janitor_task(self) -> Dict[str, Any]:
     """
     Periodic janitor task to clean up applications stuck in transitional states.
 
     This task scans for applications that have been in transitional states
-    (deploying, cloning, removing, updating) for longer than the allowed timeout
-    period (1 hour). These "zombie" applications are marked as error to prevent
-    them from being stuck in limbo indefinitely.
+    (deploying, cloning, migrating, removing, updating) for longer than
+    JANITOR_STUCK_TIMEOUT_MINUTES. These "zombie" applications are marked as
+    error to prevent them from being stuck in limbo indefinitely.
 
     The reconciliation service will handle actual cleanup of orphaned containers.
     This service focuses on ending transitional states safely.
 
-    Scheduled to run every 6 hours via Celery Beat.
+    Scheduled to run every 5 minutes via Celery Beat.
 
     Returns:
         Cleanup result dictionary
     """
-    logger.info("🧹 [JANITOR TASK] Starting scheduled stuck applications cleanup...")
+    logger.debug("🧹 [JANITOR TASK] Starting scheduled stuck applications cleanup...")
 
     try:
         from apps.applications.services import ApplicationService
 
         result = ApplicationService.cleanup_stuck_applications()
 
-        if result["success"]:
+        if result["success"] and result["stuck_found"]:
             logger.info(
                 f"✅ [JANITOR TASK] Completed successfully - "
                 f"Marked {result['stuck_marked_error']}/{result['stuck_found']} stuck app(s) as error"
             )
-        else:
+        elif not result["success"]:
             logger.error(f"❌ [JANITOR TASK] Failed - Errors: {result.get('errors', [])}")
 
         return result
@@ -1366,3 +1463,37 @@ def adopt_app_task(self, adoption_data: Dict[str, Any]) -> Dict[str, Any]:
             f"[ADOPT {vmid}] ❌ Not retrying unexpected error - this likely requires developer investigation"
         )
         raise
+
+
+@shared_task(bind=True, max_retries=2)
+def bulk_adopt_task(
+    self, items: List[Dict[str, Any]], host_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Adopt many existing LXC containers into Proximity management at once.
+
+    Args:
+        items: List of adoption requests (vmid, node_name, suggested_type, port_to_expose)
+        host_id: Proxmox host ID (uses default if not specified)
+
+    Returns:
+        Bulk adoption result dictionary with 'adopted', 'skipped' and 'failed' lists
+    """
+    from apps.applications.bulk_adopt import BulkAdoptionService
+
+    logger.info(f"[BULK ADOPT] Starting bulk adoption of {len(items)} container(s)")
+
+    try:
+        return BulkAdoptionService(host_id=host_id).adopt(items)
+
+    except ProxmoxError as e:
+        logger.error(f"[BULK ADOPT] ❌ Proxmox error during bulk adoption: {e}", exc_info=True)
+
+        # Retry Proxmox errors (likely transient); nothing was written yet
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=min(2**self.request.retries * 60, 600))
+        return {"success": False, "error": str(e)}
+
+    except ValueError as e:
+        logger.error(f"[BULK ADOPT] ❌ Port allocation failed: {e}")
+        return {"success": False, "error": str(e)}
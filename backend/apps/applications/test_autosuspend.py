@@ -0,0 +1,250 @@
+"""
+Tests for idle autosuspend and on-demand wake.
+"""
+
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications.autosuspend import (
+    AutosuspendError,
+    AutosuspendService,
+    is_idle,
+    rrd_timeframe,
+)
+from apps.applications.models import AppColdStart, Application, DeploymentLog
+from apps.proxmox import ProxmoxError
+
+
+def _samples(minutes=70, cpu=0.001, traffic=300, burst_at=None):
+    """One sample per minute up to now; an optional busy minute `burst_at` ago."""
+    now = time.time()
+    samples = [
+        {"time": now - i * 60, "cpu": cpu, "maxcpu": 2, "netin": traffic, "netout": traffic}
+        for i in range(minutes, 0, -1)
+    ]
+    if burst_at is not None:
+        samples[-burst_at]["netin"] = 50_000
+    return samples
+
+
+class FakeProxmox:
+    def __init__(self, samples, failing_tasks=()):
+        self.samples = samples
+        self.failing_tasks = set(failing_tasks)
+        self.stopped = []
+        self.waited = []
+
+    def get_lxc_rrd_data(self, node_name, vmid, timeframe="week", cf="MAX"):
+        return self.samples
+
+    def stop_lxc(self, node_name, vmid, force=False):
+        self.stopped.append(vmid)
+        return f"UPID:{node_name}:vzshutdown:{vmid}:"
+
+    def start_lxc(self, node_name, vmid):
+        return f"UPID:{node_name}:vzstart:{vmid}:"
+
+    def wait_for_task(self, node_name, upid, timeout=600, poll_interval=2):
+        self.waited.append(upid)
+        if upid in self.failing_tasks:
+            raise ProxmoxError(f"Task {upid} failed with status: command failed")
+        return {"status": "stopped", "exitstatus": "OK"}
+
+
+@pytest.fixture
+def idle_app(make_app, owner):
+    """Factory for apps whose state last changed `idle_for` ago."""
+
+    def make(index, status="running", config=None, idle_for=timedelta(hours=2)):
+        return make_app(
+            f"sleep-{index}",
+            status=status,
+            lxc_id=500 + index,
+            public_port=30500 + index,
+            owner=owner,
+            url=f"http://sleep-{index}:{30500 + index}",
+            config={"memory": 1024, **(config or {})},
+            changed_ago=idle_for,
+        )
+
+    return make
+
+
+def test_idle_detection_over_the_window():
+    since = time.time() - 60 * 60
+
+    assert is_idle(_samples(), since)
+    assert not is_idle(_samples(burst_at=10), since)
+    assert not is_idle(_samples(cpu=0.2), since)
+    # History that does not reach back over the whole window is not proof of idleness
+    assert not is_idle(_samples(minutes=30), since)
+    assert not is_idle([], since)
+
+
+def test_timeframe_covers_the_window():
+    assert rrd_timeframe(30) == "hour"
+    assert rrd_timeframe(240) == "day"
+    assert rrd_timeframe(2880) == "week"
+
+
+@pytest.mark.django_db
+def test_run_suspends_only_enabled_idle_apps(settings, idle_app):
+    settings.AUTOSUSPEND_ENABLED = True
+    idle = idle_app(1)
+    opted_out = idle_app(2, config={"autosuspend": False})
+    just_started = idle_app(3, idle_for=timedelta(minutes=5))
+    proxmox = FakeProxmox(_samples())
+
+    with patch("apps.applications.autosuspend.ProxmoxService", return_value=proxmox):
+        summary = AutosuspendService(idle_minutes=60).run()
+
+    assert summary["suspended"] == [idle.id]
+    assert summary["memory_freed_mb"] == 1024
+    assert proxmox.stopped == [idle.lxc_id]
+    assert proxmox.waited == [f"UPID:pve1:vzshutdown:{idle.lxc_id}:"]
+    assert Application.objects.get(id=idle.id).status == "suspended"
+    assert Application.objects.get(id=opted_out.id).status == "running"
+    assert Application.objects.get(id=just_started.id).status == "running"
+    assert DeploymentLog.objects.filter(application=idle, step="autosuspend").exists()
+
+
+@pytest.mark.django_db
+def test_app_config_opts_in_when_disabled_globally(settings, idle_app):
+    settings.AUTOSUSPEND_ENABLED = False
+    idle_app(1)
+    opted_in = idle_app(2, config={"autosuspend": True})
+
+    assert AutosuspendService(idle_minutes=60).candidates() == [opted_in]
+
+
+@pytest.mark.django_db
+def test_concurrent_wakes_share_one_cold_start(idle_app, django_capture_on_commit_callbacks):
+    app = idle_app(1, status="suspended")
+
+    with patch("apps.applications.tasks.start_app_task.delay") as mock_delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            first = AutosuspendService().wake(app)
+            second = AutosuspendService().wake(app)
+
+    assert first.id == second.id
+    mock_delay.assert_called_once_with(app.id, cold_start_id=first.id)
+
+    AutosuspendService.finish(first.id)
+    first.refresh_from_db()
+    assert first.status == "ready"
+    assert first.duration_ms is not None
+
+    with pytest.raises(AutosuspendError):
+        AutosuspendService().wake(idle_app(2, status="stopped"))
+
+
+@pytest.mark.django_db
+def test_stale_pending_cold_start_is_replaced(
+    settings, idle_app, django_capture_on_commit_callbacks
+):
+    settings.AUTOSUSPEND_WAKE_STALE_AFTER = 180
+    app = idle_app(1, status="suspended")
+    # The start task of this cold start was lost and never reported back
+    lost = AppColdStart.objects.create(application=app)
+    AppColdStart.objects.filter(id=lost.id).update(
+        requested_at=timezone.now() - timedelta(minutes=5)
+    )
+
+    with patch("apps.applications.tasks.start_app_task.delay") as mock_delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            cold_start = AutosuspendService().wake(app)
+            again = AutosuspendService().wake(app)
+
+    assert cold_start.id != lost.id
+    assert again.id == cold_start.id
+    mock_delay.assert_called_once_with(app.id, cold_start_id=cold_start.id)
+    lost.refresh_from_db()
+    assert lost.status == "failed"
+    assert "no outcome" in lost.error
+
+
+@pytest.mark.django_db
+def test_start_task_completes_the_cold_start(idle_app):
+    from apps.applications.tasks import start_app_task
+
+    app = idle_app(1, status="suspended")
+    cold_start = AppColdStart.objects.create(application=app)
+
+    proxmox = FakeProxmox([])
+
+    with patch("apps.applications.tasks.ProxmoxService", return_value=proxmox):
+        start_app_task.apply(args=[app.id], kwargs={"cold_start_id": cold_start.id})
+
+    assert proxmox.waited == [f"UPID:pve1:vzstart:{app.lxc_id}:"]
+    app.refresh_from_db()
+    assert app.status == "running"
+    # A woken app gets a full idle window before it can be suspended again
+    assert timezone.now() - app.state_changed_at < timedelta(minutes=1)
+    cold_start.refresh_from_db()
+    assert cold_start.status == "ready"
+
+
+@pytest.mark.django_db
+def test_failed_start_task_fails_the_cold_start(idle_app):
+    from apps.applications.tasks import start_app_task
+
+    app = idle_app(1, status="suspended")
+    cold_start = AppColdStart.objects.create(application=app)
+    proxmox = FakeProxmox([], failing_tasks=[f"UPID:pve1:vzstart:{app.lxc_id}:"])
+
+    with patch("apps.applications.tasks.ProxmoxService", return_value=proxmox):
+        start_app_task.apply(args=[app.id], kwargs={"cold_start_id": cold_start.id})
+
+    assert Application.objects.get(id=app.id).status == "suspended"
+    cold_start.refresh_from_db()
+    assert cold_start.status == "failed"
+    assert "command failed" in cold_start.error
+    assert cold_start.duration_ms is None
+
+
+@pytest.mark.django_db
+def test_failed_shutdown_does_not_suspend(idle_app):
+    app = idle_app(1)
+    proxmox = FakeProxmox([], failing_tasks=[f"UPID:pve1:vzshutdown:{app.lxc_id}:"])
+
+    with pytest.raises(ProxmoxError):
+        AutosuspendService().suspend(app, proxmox=proxmox)
+
+    assert Application.objects.get(id=app.id).status == "running"
+
+
+@pytest.mark.django_db
+def test_wake_endpoint_for_proxy_and_owner(settings, idle_app, owner):
+    settings.AUTOSUSPEND_WAKE_TOKEN = "proxy-secret"
+    settings.AUTOSUSPEND_WAKE_TIMEOUT = 0
+    app = idle_app(1, status="suspended")
+    client = Client()
+
+    assert client.post(f"/api/apps/wake?public_port={app.public_port}").status_code == 401
+
+    with patch("apps.applications.tasks.start_app_task.delay"):
+        response = client.post(
+            f"/api/apps/wake?public_port={app.public_port}",
+            HTTP_X_PROXIMITY_WAKE_TOKEN="proxy-secret",
+        )
+    assert response.status_code == 202
+    assert response.json()["status"] == "starting"
+
+    AutosuspendService.finish(response.json()["cold_start"]["id"])
+    Application.objects.filter(id=app.id).update(status="running")
+
+    client.force_login(owner)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(owner))
+    response = client.post(f"/api/apps/wake?hostname={app.hostname}")
+    assert response.status_code == 200
+    assert response.json()["url"] == app.url
+
+    listing = client.get(f"/api/{app.id}/cold-starts").json()
+    assert listing["total"] == 1
+    assert listing["cold_starts"][0]["status"] == "ready"
@@ -0,0 +1,126 @@
+"""
+Tests for batch deployment: placement, bulk allocation and per-node lanes.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from apps.applications.batch_deploy import BatchDeployService, BatchDeployError
+from apps.applications.models import Application
+from apps.applications.services import ApplicationService
+from apps.applications.placement import PlacementService
+from apps.proxmox.models import ProxmoxNode
+
+GB = 1024**3
+
+
+@pytest.fixture
+def cluster(host):
+    big = ProxmoxNode.objects.create(
+        host=host, name="big", status="online", memory_total=16 * GB, memory_used=4 * GB
+    )
+    small = ProxmoxNode.objects.create(
+        host=host, name="small", status="online", memory_total=8 * GB, memory_used=4 * GB
+    )
+    ProxmoxNode.objects.create(
+        host=host, name="down", status="offline", memory_total=64 * GB, memory_used=0
+    )
+    return host, big, small
+
+
+def _specs(count, **extra):
+    return [
+        {"catalog_id": "nginx", "hostname": f"batch-{i}", "config": {"memory": 2048}, **extra}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_place_batch_spreads_by_projected_memory(cluster):
+    """Placing apps consumes projected memory so large batches spread out."""
+    placements = PlacementService().place_batch(_specs(6))
+    names = [node.name for node in placements]
+
+    # big starts with 12GB free, small with 4GB: big takes five before small gets one
+    assert names.count("big") == 5
+    assert names.count("small") == 1
+    assert "down" not in names
+
+
+@pytest.mark.django_db
+def test_create_batch_bulk_allocates_and_builds_lanes(cluster, owner, settings):
+    settings.BATCH_DEPLOY_NODE_CONCURRENCY = 2
+
+    with patch("apps.applications.batch_deploy.ProxmoxService") as mock_service, patch.object(
+        BatchDeployService, "dispatch"
+    ):
+        mock_service.return_value.get_used_vmids.return_value = {101}
+        mock_service.return_value.get_next_vmid.return_value = 100
+
+        result = BatchDeployService().create_batch(_specs(5), owner=owner)
+
+    apps = Application.objects.filter(config__batch_id=result["batch_id"])
+    assert apps.count() == 5
+
+    # Reserved, not assigned: no container exists until each deploy runs
+    assert not apps.filter(lxc_id__isnull=False).exists()
+    vmids = sorted(app.config["reserved_vmid"] for app in apps)
+    assert vmids == [100, 102, 103, 104, 105]
+    assert len(set(apps.values_list("public_port", flat=True))) == 5
+    assert len(set(apps.values_list("internal_port", flat=True))) == 5
+
+    # VMIDs are looked up once per host, not once per app
+    assert mock_service.return_value.get_next_vmid.call_count == 1
+
+    lanes = BatchDeployService().build_lanes(list(apps), owner_id=owner.id)
+    per_node = {}
+    for lane in lanes:
+        assert len({item["node"] for item in lane}) == 1
+        per_node[lane[0]["node"]] = per_node.get(lane[0]["node"], 0) + 1
+    assert all(count <= 2 for count in per_node.values())
+    assert sum(len(lane) for lane in lanes) == 5
+    assert sorted(item["vmid"] for lane in lanes for item in lane) == vmids
+
+
+@pytest.mark.django_db
+def test_reconcile_keeps_queued_batch_rows(cluster, owner):
+    """A batch row waiting in its lane has no container yet and is not an orphan."""
+    with patch("apps.applications.batch_deploy.ProxmoxService") as mock_service, patch.object(
+        BatchDeployService, "dispatch"
+    ):
+        mock_service.return_value.get_used_vmids.return_value = set()
+        mock_service.return_value.get_next_vmid.return_value = 987654
+
+        result = BatchDeployService().create_batch(_specs(1), owner=owner)
+
+    with patch("apps.applications.services.ProxmoxService") as mock_service:
+        mock_service.return_value.get_nodes.return_value = [{"node": "big"}]
+        mock_service.return_value.get_lxc_containers.return_value = []
+
+        outcome = ApplicationService.reconcile_applications()
+
+    assert outcome["orphans_purged"] == 0
+    app = Application.objects.get(config__batch_id=result["batch_id"])
+    assert app.status == "deploying"
+    assert app.config["reserved_vmid"] == 987654
+
+
+@pytest.mark.django_db
+def test_create_batch_rejects_duplicate_hostnames(cluster, owner):
+    specs = _specs(2)
+    specs[1]["hostname"] = specs[0]["hostname"]
+
+    with pytest.raises(BatchDeployError) as exc_info:
+        BatchDeployService().create_batch(specs, owner=owner)
+
+    assert exc_info.value.status_code == 400
+    assert Application.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_create_batch_without_online_nodes(owner):
+    with pytest.raises(BatchDeployError) as exc_info:
+        BatchDeployService().create_batch(_specs(1), owner=owner)
+
+    assert exc_info.value.status_code == 503
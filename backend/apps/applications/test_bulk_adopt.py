@@ -0,0 +1,111 @@
+"""
+Tests for bulk adoption of discovered containers.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.applications.bulk_adopt import BulkAdoptionService
+from apps.applications.models import Application, DeploymentLog
+from apps.applications.port_manager import PortManagerService
+from apps.proxmox.models import ProxmoxNode
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def host(host):
+    ProxmoxNode.objects.create(host=host, name="pve1", status="online")
+    return host
+
+
+@pytest.fixture
+def proxmox(host, make_container):
+    """Patch Proxmox access for both discovery and config fetches."""
+    discovered = [
+        make_container(101, "legacy-web"),
+        make_container(102, "legacy-db", status="stopped"),
+        make_container(103, "taken-name"),
+    ]
+    with patch("apps.applications.discovery.ProxmoxService") as discovery_service, patch(
+        "apps.applications.bulk_adopt.ProxmoxService"
+    ) as adopt_service:
+        discovery_service.return_value.discover_unmanaged_lxc.return_value = discovered
+        adopt_service.return_value.get_lxc_config.side_effect = lambda node, vmid: {
+            "hostname": f"ct{vmid}",
+            "memory": 512,
+        }
+        yield adopt_service.return_value
+
+
+@pytest.mark.django_db
+def test_bulk_adopt_creates_apps_and_logs(host, proxmox):
+    Application.objects.create(
+        id="existing", catalog_id="nginx", name="x", hostname="taken-name", lxc_id=900, host=host
+    )
+
+    items = [
+        {"vmid": 101, "node_name": "pve1", "suggested_type": "nginx", "port_to_expose": 8080},
+        {"vmid": 102, "node_name": "pve1"},
+        {"vmid": 103, "node_name": "pve1"},
+        {"vmid": 104, "node_name": "pve1"},
+    ]
+
+    result = BulkAdoptionService(host_id=host.id).adopt(items)
+
+    assert sorted(a["vmid"] for a in result["adopted"]) == [101, 102]
+    assert sorted(s["vmid"] for s in result["skipped"]) == [103, 104]
+    assert proxmox.get_lxc_config.call_count == 2
+
+    web = Application.objects.get(lxc_id=101)
+    assert web.catalog_id == "nginx"
+    assert web.status == "running"
+    assert web.config["container_port"] == 8080
+    assert web.config["proxmox_config_snapshot"] == {"hostname": "ct101", "memory": 512}
+    assert Application.objects.get(lxc_id=102).status == "stopped"
+
+    adopted = Application.objects.filter(lxc_id__in=[101, 102])
+    assert len(set(adopted.values_list("public_port", flat=True))) == 2
+    assert (
+        DeploymentLog.objects.filter(application__in=adopted, step="adoption_complete").count() == 2
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_adopt_keeps_going_when_config_fetch_fails(host, proxmox):
+    proxmox.get_lxc_config.side_effect = Exception("timeout")
+
+    result = BulkAdoptionService(host_id=host.id).adopt([{"vmid": 101, "node_name": "pve1"}])
+
+    assert len(result["adopted"]) == 1
+    app = Application.objects.get(lxc_id=101)
+    assert app.config["proxmox_config_snapshot"] == {"error": "timeout"}
+
+
+@pytest.mark.django_db
+def test_bulk_adopt_reports_rows_taken_concurrently(host, proxmox):
+    items = [{"vmid": 101, "node_name": "pve1"}, {"vmid": 102, "node_name": "pve1"}]
+    allocate = PortManagerService.allocate_port_batch
+
+    def racing_allocate(self, count):
+        # Another request claims a hostname after the clash check but before the insert
+        Application.objects.create(
+            id="racer", catalog_id="nginx", name="x", hostname="legacy-db", host=host
+        )
+        return allocate(self, count)
+
+    with patch.object(PortManagerService, "allocate_port_batch", racing_allocate):
+        result = BulkAdoptionService(host_id=host.id).adopt(items)
+
+    assert [a["vmid"] for a in result["adopted"]] == [101]
+    assert [f["vmid"] for f in result["failed"]] == [102]
+    assert Application.objects.filter(lxc_id=101).exists()
+    assert not Application.objects.filter(lxc_id=102).exists()
+    assert DeploymentLog.objects.filter(step="adoption_complete").count() == 1
@@ -0,0 +1,324 @@
+"""
+Tests for the clone engine: storage detection, planning and multi-copy fan-out.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications.clone_engine import (
+    CloneEngine,
+    CloneError,
+    CloneService,
+    parse_volumes,
+)
+from apps.applications.models import Application
+from apps.applications.tasks import clone_apps_task
+from apps.proxmox import ProxmoxError
+from apps.proxmox.models import ProxmoxNode
+
+GB = 1024**3
+
+
+class FakeProxmox:
+    """Records clone calls; every task succeeds unless its VMID is in fail_vmids."""
+
+    def __init__(self, storage_type="lvmthin", shared=False, template=False, running=True):
+        self.storage_type = storage_type
+        self.shared = shared
+        self.template = template
+        self.running = running
+        self.fail_vmids = set()
+        self.start_fail_vmids = set()
+        self.start_refused_vmids = set()
+        self.clones = []
+        self.rounds = []
+        self.snapshots = []
+        self.deleted_snapshots = []
+        self.storages = [
+            {"storage": "fast", "active": 1, "avail": 100 * GB},
+            {"storage": "bulk", "active": 1, "avail": 60 * GB},
+        ]
+
+    def get_lxc_config(self, node_name, vmid):
+        config = {
+            "rootfs": "vmdata:vm-100-disk-0,size=8G",
+            "mp0": "vmdata:vm-100-disk-1,mp=/data,size=2G",
+            "mp1": "/srv/share,mp=/share",
+        }
+        if self.template:
+            config["template"] = 1
+        return config
+
+    def get_storage_status(self, node_name, storage):
+        return {"type": self.storage_type, "shared": int(self.shared)}
+
+    def get_lxc_status(self, node_name, vmid):
+        return {"status": "running" if self.running else "stopped"}
+
+    def list_node_storages(self, node_name, content="rootdir"):
+        return self.storages
+
+    def create_snapshot(self, node_name, vmid, snapname, description=""):
+        self.snapshots.append(snapname)
+        return f"UPID:snap:{snapname}"
+
+    def delete_snapshot(self, node_name, vmid, snapname):
+        self.deleted_snapshots.append(snapname)
+        return f"UPID:delsnap:{snapname}"
+
+    def wait_for_task(self, node_name, upid, timeout=600, poll_interval=2):
+        return {"status": "stopped", "exitstatus": "OK"}
+
+    def start_clone_lxc(self, node_name, source_vmid, new_vmid, new_hostname, full=True, **kwargs):
+        self.clones.append({"source": source_vmid, "new": new_vmid, "full": full, **kwargs})
+        return f"UPID:clone:{new_vmid}"
+
+    def wait_for_tasks(self, tasks, timeout=600, poll_interval=2):
+        self.rounds.append(len(tasks))
+        results = {}
+        for _, upid in tasks:
+            _, kind, vmid = upid.rsplit(":", 2)
+            failing = self.start_fail_vmids if kind == "start" else self.fail_vmids
+            results[upid] = "failed" if int(vmid) in failing else None
+        return results
+
+    def start_lxc(self, node_name, vmid):
+        if vmid in self.start_refused_vmids:
+            raise ProxmoxError(f"CT {vmid} is locked")
+        return f"UPID:start:{vmid}"
+
+
+@pytest.fixture
+def source_app(make_app, host, owner):
+    ProxmoxNode.objects.create(
+        host=host, name="pve1", status="online", memory_total=32 * GB, memory_used=4 * GB
+    )
+    ProxmoxNode.objects.create(
+        host=host, name="pve2", status="online", memory_total=32 * GB, memory_used=6 * GB
+    )
+    return make_app("source-app", name="workshop", hostname="workshop", lxc_id=100, owner=owner)
+
+
+def _clones(count):
+    return [
+        {
+            "vmid": 200 + i,
+            "hostname": f"copy-{i}",
+            "node": "pve1",
+            "storage": "fast",
+            "shared": False,
+        }
+        for i in range(count)
+    ]
+
+
+def test_parse_volumes_skips_bind_mounts():
+    volumes = parse_volumes(FakeProxmox().get_lxc_config("pve1", 100))
+
+    assert volumes == [
+        {"key": "rootfs", "storage": "vmdata", "size": 8 * GB},
+        {"key": "mp0", "storage": "vmdata", "size": 2 * GB},
+    ]
+
+
+@pytest.mark.django_db
+def test_template_on_cow_storage_gets_linked_clones(source_app):
+    proxmox = FakeProxmox(storage_type="zfspool", template=True)
+
+    plan = CloneEngine(proxmox).plan(source_app, 2)
+
+    assert plan["mode"] == "linked"
+    assert plan["snapshot"] is False
+    assert [target["storage"] for target in plan["targets"]] == [None, None]
+
+
+@pytest.mark.django_db
+def test_full_clones_spread_over_node_storages(source_app):
+    proxmox = FakeProxmox(storage_type="lvmthin")
+
+    plan = CloneEngine(proxmox).plan(source_app, 6)
+
+    assert plan["mode"] == "full"
+    assert plan["snapshot"] is True
+    # Not shared: every copy stays on the source node
+    assert {target["node"] for target in plan["targets"]} == {"pve1"}
+    # 10GB per copy: "fast" (100GB) takes copies until it has no more room than "bulk" (60GB)
+    assert [target["storage"] for target in plan["targets"]] == ["fast"] * 5 + ["bulk"]
+
+
+@pytest.mark.django_db
+def test_shared_storage_places_copies_across_nodes(source_app):
+    proxmox = FakeProxmox(storage_type="rbd", shared=True)
+    proxmox.storages = [
+        {"storage": "ceph", "active": 1, "avail": 100 * GB, "shared": 1},
+        {"storage": "local-lvm", "active": 1, "avail": 20 * GB, "shared": 0},
+    ]
+
+    plan = CloneEngine(proxmox).plan(source_app, 3)
+
+    assert {target["node"] for target in plan["targets"]} == {"pve1", "pve2"}
+    assert all(target["shared"] for target in plan["targets"] if target["storage"] == "ceph")
+
+
+@pytest.mark.django_db
+def test_copies_on_local_storage_only_seed_their_own_node(settings, source_app):
+    settings.CLONE_NODE_CONCURRENCY = 8
+    proxmox = FakeProxmox(storage_type="rbd", shared=True)
+    clones = [
+        {"vmid": 200 + i, "hostname": f"copy-{i}", "node": node, "storage": "local-lvm"}
+        for i, node in enumerate(["pve2", "pve1", "pve2", "pve1", "pve2", "pve2"])
+    ]
+    for clone in clones:
+        clone["shared"] = False
+    node_of = {100: "pve1", **{clone["vmid"]: clone["node"] for clone in clones}}
+
+    errors = CloneEngine(proxmox).execute(source_app, clones, "full", snapshot=False)
+
+    assert all(error is None for error in errors.values())
+    for clone in proxmox.clones:
+        assert clone["source"] == 100 or node_of[clone["source"]] == clone["target_node"]
+    # Copies still fan out within each node
+    assert any(clone["source"] != 100 for clone in proxmox.clones)
+
+    # Copies on shared storage seed any node
+    proxmox.clones = []
+    for clone in clones:
+        clone["shared"] = True
+    CloneEngine(proxmox).execute(source_app, clones, "full", snapshot=False)
+    assert any(
+        clone["source"] != 100 and node_of[clone["source"]] != clone["target_node"]
+        for clone in proxmox.clones
+    )
+
+
+@pytest.mark.django_db
+def test_impossible_clones_are_rejected(source_app):
+    with pytest.raises(CloneError):
+        CloneEngine(FakeProxmox(storage_type="dir", template=True)).plan(source_app, 1, "linked")
+
+    with pytest.raises(CloneError) as exc:
+        CloneEngine(FakeProxmox(storage_type="dir", running=True)).plan(source_app, 1)
+    assert exc.value.status_code == 409
+
+
+@pytest.mark.django_db
+def test_copies_fan_out_from_one_snapshot(settings, source_app):
+    settings.CLONE_NODE_CONCURRENCY = 8
+    proxmox = FakeProxmox()
+
+    errors = CloneEngine(proxmox).execute(source_app, _clones(10), "full", snapshot=True)
+
+    assert all(error is None for error in errors.values())
+    # 1, 2, 4, then the remaining 3: four rounds instead of ten sequential clones
+    assert proxmox.rounds == [1, 2, 4, 3]
+    assert len(proxmox.snapshots) == 1
+    assert proxmox.deleted_snapshots == proxmox.snapshots
+    # Only clones taken from the source use the snapshot
+    from_source = [clone for clone in proxmox.clones if clone["source"] == 100]
+    assert all(clone["snapname"] == proxmox.snapshots[0] for clone in from_source)
+    assert all(clone["snapname"] is None for clone in proxmox.clones if clone["source"] != 100)
+
+
+@pytest.mark.django_db
+def test_failed_copy_is_not_used_as_seed(settings, source_app):
+    settings.CLONE_NODE_CONCURRENCY = 8
+    proxmox = FakeProxmox()
+    proxmox.fail_vmids = {200}
+
+    errors = CloneEngine(proxmox).execute(source_app, _clones(3), "full", snapshot=False)
+
+    assert errors[200] == "failed"
+    assert errors[201] is None and errors[202] is None
+    assert all(clone["source"] != 200 for clone in proxmox.clones)
+
+
+@pytest.mark.django_db
+def test_linked_clones_all_come_from_the_template(source_app):
+    proxmox = FakeProxmox(storage_type="zfspool", template=True)
+
+    CloneEngine(proxmox).execute(source_app, _clones(3), "linked", snapshot=False)
+
+    assert {clone["source"] for clone in proxmox.clones} == {100}
+    assert not any(clone["full"] for clone in proxmox.clones)
+
+
+@pytest.mark.django_db
+def test_clone_service_provisions_and_task_finishes(
+    source_app, owner, django_capture_on_commit_callbacks
+):
+    proxmox = FakeProxmox()
+    proxmox.fail_vmids = set()
+
+    with patch("apps.applications.clone_engine.ProxmoxService", return_value=proxmox), patch(
+        "apps.applications.batch_deploy.ProxmoxService"
+    ) as MockBatchProxmox, patch("apps.applications.tasks.clone_apps_task.delay") as mock_delay:
+        MockBatchProxmox.return_value.get_used_vmids.return_value = set()
+        MockBatchProxmox.return_value.get_next_vmid.return_value = 300
+        with django_capture_on_commit_callbacks(execute=True):
+            result = CloneService().create_clones(source_app, ["a-1", "a-2"], owner=owner)
+
+    apps = result["apps"]
+    assert [app.lxc_id for app in apps] == [300, 301]
+    assert all(app.status == "cloning" for app in apps)
+    kwargs = mock_delay.call_args.kwargs
+    assert kwargs["mode"] == "full" and kwargs["snapshot"] is True
+
+    proxmox.fail_vmids = {301}
+    with patch("apps.applications.tasks.ProxmoxService", return_value=proxmox), patch(
+        "apps.applications.clone_engine.ProxmoxService", return_value=proxmox
+    ):
+        outcome = clone_apps_task(**kwargs)
+
+    assert outcome["created"] == [apps[0].id]
+    assert list(outcome["failed"]) == ["a-2"]
+    assert Application.objects.get(id=apps[0].id).status == "running"
+    assert not Application.objects.filter(id=apps[1].id).exists()
+
+
+@pytest.mark.django_db
+def test_copies_that_do_not_start_are_not_running(settings, source_app):
+    settings.CLONE_NODE_CONCURRENCY = 8
+    proxmox = FakeProxmox()
+    proxmox.start_fail_vmids = {201}
+    proxmox.start_refused_vmids = {202}
+    clones = _clones(3)
+    for clone in clones:
+        clone["app_id"] = Application.objects.create(
+            id=f"copy-{clone['vmid']}",
+            catalog_id="nginx",
+            name="workshop-clone",
+            hostname=clone["hostname"],
+            status="cloning",
+            lxc_id=clone["vmid"],
+            host=source_app.host,
+            node="pve1",
+        ).id
+
+    with patch("apps.applications.tasks.ProxmoxService", return_value=proxmox):
+        outcome = clone_apps_task(
+            source_app_id=source_app.id, clones=clones, mode="full", snapshot=False
+        )
+
+    statuses = dict(Application.objects.filter(id__startswith="copy-").values_list("id", "status"))
+    assert statuses == {"copy-200": "running", "copy-201": "error", "copy-202": "error"}
+    assert sorted(outcome["not_started"]) == ["copy-1", "copy-2"]
+    assert len(outcome["created"]) == 3
+
+
+@pytest.mark.django_db
+def test_clone_copies_endpoint_rejects_existing_hostname(source_app, owner):
+    client = Client()
+    client.force_login(owner)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(owner))
+
+    response = client.post(
+        f"/api/{source_app.id}/clones",
+        data=json.dumps({"hostnames": ["workshop"]}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 409
@@ -0,0 +1,289 @@
+"""
+Tests for the resumable, step-based deployment engine.
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications.deploy_engine import (
+    STEP_GRAPH,
+    STEPS,
+    DeploymentEngine,
+    DeploymentError,
+)
+from apps.applications.models import Application, DeploymentLog, DeploymentStep
+from apps.proxmox import ProxmoxError
+
+
+class FakeProxmox:
+    def __init__(self, next_vmid=300):
+        self.next_vmid = next_vmid
+        self.containers = {}
+        self.created = []
+        self.started = []
+        self.templates = set()
+        self.downloads = []
+
+    def get_next_vmid(self):
+        return self.next_vmid
+
+    def ensure_template(self, node_name, ostemplate):
+        if ostemplate in self.templates:
+            return None
+        self.templates.add(ostemplate)
+        self.downloads.append(ostemplate)
+        return f"UPID:{node_name}:download:"
+
+    def get_lxc_status(self, node_name, vmid):
+        if vmid not in self.containers:
+            raise ProxmoxError(f"Failed to get LXC {vmid} status: does not exist")
+        return self.containers[vmid]
+
+    def create_lxc(self, node_name, vmid, hostname, password, **kwargs):
+        self.created.append(vmid)
+        self.containers[vmid] = {"name": hostname, "status": "stopped"}
+        return f"UPID:{node_name}:create:{vmid}:"
+
+    def wait_for_task(self, node_name, upid):
+        return {"status": "stopped", "exitstatus": "OK"}
+
+    def configure_lxc_for_docker(self, node_name, vmid):
+        pass
+
+    def start_lxc(self, node_name, vmid):
+        self.started.append(vmid)
+        self.containers[vmid]["status"] = "running"
+        return f"UPID:{node_name}:start:{vmid}:"
+
+    def execute_in_container(self, node_name, vmid, command, **kwargs):
+        return ""
+
+
+class FakeDocker:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.installs = 0
+        self.written = []
+        self.pulled = []
+        self.deployed = []
+
+    def setup_docker_in_alpine(self, node, vmid):
+        self.installs += 1
+        if self.failures:
+            self.failures -= 1
+            raise ProxmoxError("apk: temporary error")
+        return True
+
+    def generate_adminer_compose(self, port=80):
+        return {"services": {"adminer": {"image": "adminer"}}}
+
+    def write_compose_file(self, node, vmid, compose):
+        self.written.append(vmid)
+
+    def pull_images(self, node, vmid):
+        self.pulled.append(vmid)
+
+    def compose_up(self, node, vmid):
+        self.deployed.append(vmid)
+        return "adminer   running"
+
+
+def _deploying(make_app, app_id, **fields):
+    return make_app(app_id, catalog_id="adminer", status="deploying", node="pve", **fields)
+
+
+@pytest.fixture
+def app(make_app, owner):
+    return _deploying(make_app, "step-app", owner=owner)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("apps.applications.deploy_engine.time.sleep"):
+        yield
+
+
+def _engine(app, proxmox, docker):
+    return DeploymentEngine(
+        app_id=app.id,
+        catalog_id=app.catalog_id,
+        hostname=app.hostname,
+        node=app.node,
+        config={},
+        proxmox=proxmox,
+        docker=docker,
+    )
+
+
+@pytest.mark.django_db
+def test_retry_resumes_from_failed_step(app):
+    proxmox, docker = FakeProxmox(), FakeDocker(failures=1)
+
+    with pytest.raises(ProxmoxError):
+        _engine(app, proxmox, docker).run()
+
+    steps = {step.name: step for step in DeploymentStep.objects.filter(application=app)}
+    assert {name for name in STEPS if steps[name].status == "completed"} == {
+        "vmid",
+        "resources",
+        "template",
+        "compose",
+        "lxc_create",
+        "lxc_configure",
+        "lxc_start",
+        "compose_write",
+    }
+    assert steps["docker_setup"].status == "failed"
+    assert "temporary error" in steps["docker_setup"].error
+    assert steps["image_pull"].status == "pending"
+
+    # The next VMID Proxmox hands out changed: the retry must not care
+    proxmox.next_vmid = 301
+    result = _engine(app, proxmox, docker).run()
+
+    assert result["vmid"] == 300
+    assert proxmox.created == [300]
+    assert proxmox.started == [300]
+    assert len(proxmox.downloads) == 1
+    assert docker.installs == 2
+    assert docker.written == [300]
+    assert docker.deployed == [300]
+
+    app.refresh_from_db()
+    assert app.status == "running"
+    assert app.lxc_id == 300
+    assert app.lxc_root_password
+
+    steps = {step.name: step for step in DeploymentStep.objects.filter(application=app)}
+    assert all(step.status == "completed" for step in steps.values())
+    assert steps["vmid"].attempts == 1
+    assert steps["docker_setup"].attempts == 2
+    assert steps["lxc_create"].output == {"create_upid": "UPID:pve:create:300:"}
+    assert steps["docker_setup"].output == {"docker": "installed"}
+    assert steps["compose_write"].attempts == 1
+    assert steps["finalize"].duration_ms is not None
+    assert DeploymentLog.objects.filter(application=app, step="docker_setup").count() == 4
+
+
+@pytest.mark.django_db
+def test_batch_reservation_becomes_lxc_id_when_deploy_runs(app, make_app):
+    Application.objects.filter(id=app.id).update(config={"reserved_vmid": 310})
+    # Another queued batch row holds the VMID Proxmox hands out next
+    _deploying(make_app, "queued-app", config={"reserved_vmid": 300})
+    proxmox, docker = FakeProxmox(), FakeDocker()
+
+    assert _engine(app, proxmox, docker).run()["vmid"] == 310
+    app.refresh_from_db()
+    assert app.lxc_id == 310
+
+    # A single deploy skips VMIDs reserved for the queue
+    other = _deploying(make_app, "single-app")
+    proxmox.get_used_vmids = lambda: {310}
+    assert _engine(other, proxmox, FakeDocker()).run()["vmid"] == 301
+
+
+@pytest.mark.django_db
+def test_steps_are_idempotent_when_work_was_not_recorded(app):
+    # A worker died after creating and starting the container, before recording it
+    Application.objects.filter(id=app.id).update(lxc_id=300, lxc_root_password="kept")
+    proxmox, docker = FakeProxmox(), FakeDocker()
+    proxmox.containers[300] = {"name": "step-app", "status": "running"}
+    proxmox.templates.add("local:vztmpl/alpine-3.22-default_20250617_amd64.tar.xz")
+    proxmox.execute_in_container = lambda *args, **kwargs: "ready\n"
+
+    _engine(app, proxmox, docker).run()
+
+    assert proxmox.created == []
+    assert proxmox.started == []
+    assert proxmox.downloads == []
+    assert docker.installs == 0
+    assert docker.deployed == [300]
+    app.refresh_from_db()
+    assert app.lxc_root_password == "kept"
+    assert DeploymentStep.objects.get(application=app, name="docker_setup").output == {
+        "docker": "present"
+    }
+
+
+@pytest.mark.django_db
+def test_independent_steps_overlap(app):
+    compose_written = threading.Event()
+
+    class SlowDocker(FakeDocker):
+        def setup_docker_in_alpine(self, node, vmid):
+            # Only finishes if the compose file is written while Docker installs
+            assert compose_written.wait(timeout=5)
+            return super().setup_docker_in_alpine(node, vmid)
+
+        def write_compose_file(self, node, vmid, compose):
+            super().write_compose_file(node, vmid, compose)
+            compose_written.set()
+
+    _engine(app, FakeProxmox(), SlowDocker()).run()
+
+    steps = {step.name: step for step in DeploymentStep.objects.filter(application=app)}
+    assert all(step.status == "completed" for step in steps.values())
+    for name, dependencies in STEP_GRAPH.items():
+        for dependency in dependencies:
+            assert steps[dependency].finished_at <= steps[name].started_at
+
+
+@pytest.mark.django_db
+def test_steps_are_traced_and_timed(app):
+    def observations(step, result):
+        labels = {"step": step, "node": "pve", "catalog_id": "adminer", "result": result}
+        return (
+            REGISTRY.get_sample_value("proximity_deploy_step_duration_seconds_count", labels) or 0
+        )
+
+    before = {step: observations(step, "ok") for step in STEPS}
+    failed_before = observations("docker_setup", "error")
+
+    with patch("apps.core.metrics.sentry_sdk.start_span") as start_span:
+        with pytest.raises(ProxmoxError):
+            _engine(app, FakeProxmox(), FakeDocker(failures=1)).run()
+
+    assert observations("docker_setup", "error") == failed_before + 1
+    assert observations("lxc_create", "ok") == before["lxc_create"] + 1
+    assert observations("image_pull", "ok") == before["image_pull"]
+
+    root = start_span.return_value
+    start_span.assert_called_once_with(op="deploy", name="deploy adminer")
+    traced = {call.kwargs["name"] for call in root.start_child.call_args_list}
+    assert "docker_setup" in traced and "compose_write" in traced
+    assert "image_pull" not in traced
+
+
+@pytest.mark.django_db
+def test_vmid_used_by_another_container_fails(app):
+    Application.objects.filter(id=app.id).update(lxc_id=300)
+    proxmox = FakeProxmox()
+    proxmox.containers[300] = {"name": "someone-else", "status": "running"}
+
+    with pytest.raises(DeploymentError, match="another container"):
+        _engine(app, proxmox, FakeDocker()).run()
+
+    assert proxmox.created == []
+    assert DeploymentStep.objects.get(application=app, name="lxc_create").status == "failed"
+
+
+@pytest.mark.django_db
+def test_deploy_steps_endpoint(client, app, owner):
+    _engine(app, FakeProxmox(), FakeDocker()).run()
+
+    assert client.get(f"/api/{app.id}/deploy-steps").status_code == 401
+
+    client.force_login(owner)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(owner))
+    response = client.get(f"/api/{app.id}/deploy-steps")
+
+    assert response.status_code == 200
+    steps = response.json()["steps"]
+    assert [step["name"] for step in steps] == STEPS
+    assert steps[0]["output"] == {"vmid": 300}
+    assert steps[STEPS.index("lxc_create")]["depends_on"] == ["vmid", "resources", "template"]
+    assert all(step["attempts"] == 1 for step in steps)
@@ -0,0 +1,109 @@
+"""
+Tests for cached, cluster-wide discovery of unmanaged containers.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.applications import discovery
+from apps.applications.models import Application
+from apps.proxmox.models import ProxmoxNode
+from apps.proxmox.services import ProxmoxService as RealProxmoxService
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def host(host):
+    ProxmoxNode.objects.create(host=host, name="pve1", status="online")
+    ProxmoxNode.objects.create(host=host, name="pve2", status="offline")
+    return host
+
+
+@pytest.mark.django_db
+def test_discover_uses_one_cluster_resources_call(host):
+    Application.objects.create(
+        id="managed", catalog_id="nginx", name="nginx", hostname="managed", lxc_id=100, host=host
+    )
+    resources = [
+        {"vmid": 100, "type": "lxc", "node": "pve1", "name": "managed"},
+        {"vmid": 101, "type": "lxc", "node": "pve1", "name": "legacy", "maxcpu": 2},
+        {"vmid": 102, "type": "qemu", "node": "pve1", "name": "a-vm"},
+        {"vmid": 103, "type": "lxc", "node": "pve2", "name": "on-offline-node"},
+    ]
+
+    service = RealProxmoxService(host_id=host.id)
+    with patch.object(service, "get_cluster_resources", return_value=resources) as mock_resources:
+        containers = service.discover_unmanaged_lxc()
+
+    mock_resources.assert_called_once_with(resource_type="vm")
+    assert [c["vmid"] for c in containers] == [101]
+    assert containers[0]["cpus"] == 2
+
+
+@pytest.mark.django_db
+def test_cached_results_drop_adopted_containers(host, make_container):
+    with patch("apps.applications.discovery.ProxmoxService") as mock_service:
+        mock_service.return_value.discover_unmanaged_lxc.return_value = [
+            make_container(101, "legacy"),
+            make_container(102, "old-db"),
+        ]
+
+        discovery.get_unmanaged_containers(host.id)
+        Application.objects.create(
+            id="adopted",
+            catalog_id="custom",
+            name="old-db",
+            hostname="old-db",
+            lxc_id=102,
+            host=host,
+        )
+        containers, _ = discovery.get_unmanaged_containers(host.id)
+
+    # Second read was served from cache
+    assert mock_service.return_value.discover_unmanaged_lxc.call_count == 1
+    assert [c["vmid"] for c in containers] == [101]
+
+
+@pytest.mark.django_db
+def test_stale_cache_is_served_while_refreshing(host, settings, make_container):
+    settings.DISCOVERY_CACHE_TTL = 30
+    cache.set(
+        discovery._cache_key(host.id),
+        {"containers": [make_container(101, "legacy")], "fetched_at": time.time() - 60},
+        600,
+    )
+
+    with patch("apps.applications.discovery.ProxmoxService") as mock_service, patch(
+        "apps.applications.tasks.refresh_discovery_cache_task.delay"
+    ) as mock_delay:
+        containers, _ = discovery.get_unmanaged_containers(host.id)
+        discovery.get_unmanaged_containers(host.id)
+
+    mock_service.assert_not_called()
+    mock_delay.assert_called_once_with(host.id)
+    assert [c["vmid"] for c in containers] == [101]
+
+
+def test_filter_containers(make_container):
+    containers = [
+        make_container(103, "web-nginx", node="pve2"),
+        make_container(101, "nginx-proxy", status="stopped"),
+        make_container(102, "postgres"),
+    ]
+
+    assert [c["vmid"] for c in discovery.filter_containers(containers, search="nginx")] == [
+        101,
+        103,
+    ]
+    assert [c["vmid"] for c in discovery.filter_containers(containers, node="pve1")] == [101, 102]
+    assert [c["vmid"] for c in discovery.filter_containers(containers, status="stopped")] == [101]
+    assert [c["vmid"] for c in discovery.filter_containers(containers, search="102")] == [102]
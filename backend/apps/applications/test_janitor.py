@@ -0,0 +1,123 @@
+"""
+Tests for the set-based janitor that fails applications stuck in transitional states.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.applications.deploy_engine import DeploymentEngine
+from apps.applications.models import Application, DeploymentLog
+from apps.applications.services import TRANSITIONAL_STATES, ApplicationService
+from apps.applications.tasks import deploy_app_task
+
+
+@pytest.mark.django_db
+def test_stuck_apps_are_marked_error_with_audit_logs(settings, make_app):
+    settings.JANITOR_STUCK_TIMEOUT_MINUTES = 60
+    for i, status in enumerate(TRANSITIONAL_STATES):
+        make_app(f"stuck-{status}", status=status, changed_ago=timedelta(minutes=90 + i))
+    make_app("fresh-deploy", status="deploying", changed_ago=timedelta(minutes=5))
+    make_app("old-running", status="running", changed_ago=timedelta(minutes=600))
+
+    result = ApplicationService.cleanup_stuck_applications()
+
+    assert result["success"] is True
+    assert result["stuck_found"] == len(TRANSITIONAL_STATES)
+    assert result["stuck_marked_error"] == len(TRANSITIONAL_STATES)
+    assert result["total_transitional"] == 1
+
+    stuck = Application.objects.filter(id__startswith="stuck-")
+    assert set(stuck.values_list("status", flat=True)) == {"error"}
+    assert all(app.state_changed_at > timezone.now() - timedelta(minutes=1) for app in stuck)
+    assert Application.objects.get(id="fresh-deploy").status == "deploying"
+    assert Application.objects.get(id="old-running").status == "running"
+
+    log = DeploymentLog.objects.get(application_id="stuck-migrating")
+    assert log.step == "janitor_diagnosis"
+    assert log.level == "error"
+    assert "Previous state: migrating" in log.message
+    assert "1h 3" in log.message
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_grow_with_stuck_apps(make_app):
+    for i in range(10):
+        make_app(f"stuck-{i}", status="deploying", changed_ago=timedelta(minutes=120))
+
+    with CaptureQueriesContext(connection) as queries:
+        result = ApplicationService.cleanup_stuck_applications()
+
+    assert result["stuck_marked_error"] == 10
+    assert DeploymentLog.objects.filter(step="janitor_diagnosis").count() == 10
+    # select, update, bulk insert, count (+ savepoint statements)
+    statements = [q["sql"] for q in queries.captured_queries if "SAVEPOINT" not in q["sql"]]
+    assert len(statements) == 4
+
+
+@pytest.mark.django_db
+def test_nothing_stuck(make_app):
+    make_app("fresh-deploy", status="deploying", changed_ago=timedelta(minutes=5))
+
+    result = ApplicationService.cleanup_stuck_applications()
+
+    assert result == {
+        "success": True,
+        "total_transitional": 1,
+        "stuck_found": 0,
+        "stuck_marked_error": 0,
+        "errors": [],
+    }
+    assert not DeploymentLog.objects.exists()
+
+
+@pytest.mark.django_db
+def test_queued_batch_rows_are_not_stuck(settings, make_app):
+    settings.JANITOR_STUCK_TIMEOUT_MINUTES = 60
+    batch = {"batch_id": "b1", "reserved_vmid": 700}
+    make_app("queued", status="deploying", changed_ago=timedelta(minutes=240), config=batch)
+    make_app(
+        "started", status="deploying", changed_ago=timedelta(minutes=240), config=batch, lxc_id=700
+    )
+
+    result = ApplicationService.cleanup_stuck_applications()
+
+    assert result["stuck_found"] == 1
+    assert Application.objects.get(id="queued").status == "deploying"
+    assert Application.objects.get(id="started").status == "error"
+
+
+@pytest.mark.django_db
+def test_deploy_start_resets_the_stuck_clock(settings, monkeypatch, make_app):
+    settings.JANITOR_STUCK_TIMEOUT_MINUTES = 60
+    settings.TESTING_MODE = False
+    monkeypatch.delenv("USE_MOCK_PROXMOX", raising=False)
+    app = make_app("long-queued", status="deploying", changed_ago=timedelta(minutes=240))
+    seen = {}
+
+    def run(engine):
+        # A deploy in progress, queued for hours before it started
+        seen["stuck"] = ApplicationService.cleanup_stuck_applications()["stuck_found"]
+        return {"vmid": 700}
+
+    with patch("apps.applications.tasks.ProxmoxService"), patch.object(
+        DeploymentEngine, "run", run
+    ):
+        deploy_app_task.apply(
+            kwargs={
+                "app_id": app.id,
+                "catalog_id": "nginx",
+                "hostname": app.hostname,
+                "host_id": app.host_id,
+                "node": "pve",
+                "config": {},
+                "environment": {},
+                "owner_id": None,
+            }
+        )
+
+    assert seen["stuck"] == 0
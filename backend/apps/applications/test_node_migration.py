@@ -0,0 +1,242 @@
+"""
+Tests for node migrations and the rebalancer.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications.models import AppMigration, Application
+from apps.applications.node_migration import (
+    MigrationError,
+    MigrationService,
+    estimate_progress,
+)
+from apps.applications.rebalancer import RebalanceService
+from apps.proxmox import ProxmoxError
+from apps.proxmox.models import ProxmoxNode
+
+User = get_user_model()
+
+GB = 1024**3
+
+MIGRATE_LOG = [
+    "shutdown CT 100",
+    "starting migration of CT 100 to node 'pve2' (192.168.1.32)",
+    "found local volume 'local-lvm:vm-100-disk-0' (in current VM config)",
+    "transferred 2.0 GiB of 8.0 GiB (25.00%)",
+    "transferred 8.0 GiB of 8.0 GiB (100.00%)",
+    "start final cleanup",
+    "restart container on target node",
+    "migration finished successfully (duration 00:01:12)",
+]
+
+
+class FakeProxmox:
+    """Replays a migrate task log; the task fails when exitstatus is not OK."""
+
+    def __init__(self, exitstatus="OK", lands_on_target=False):
+        self.exitstatus = exitstatus
+        self.lands_on_target = lands_on_target
+        self.migrations = []
+        self.polls = 0
+
+    def migrate_lxc(self, node_name, vmid, target_node, restart=True, **kwargs):
+        self.migrations.append((node_name, vmid, target_node, restart))
+        return "UPID:pve1:migrate"
+
+    def get_task_status(self, node_name, upid):
+        self.polls += 1
+        if self.polls < 3:
+            return {"status": "running"}
+        return {"status": "stopped", "exitstatus": self.exitstatus}
+
+    def get_task_log(self, node_name, upid, start=0, limit=100):
+        # Three lines per poll, like a log growing while the task runs
+        end = min(self.polls * 3, len(MIGRATE_LOG))
+        return MIGRATE_LOG[start:end]
+
+    def get_lxc_status(self, node_name, vmid):
+        if self.lands_on_target:
+            return {"status": "running"}
+        raise ProxmoxError(f"Container {vmid} not found on {node_name}")
+
+
+@pytest.fixture
+def cluster(host):
+    ProxmoxNode.objects.create(
+        host=host, name="pve1", status="online", memory_total=32 * GB, memory_used=30 * GB
+    )
+    ProxmoxNode.objects.create(
+        host=host, name="pve2", status="online", memory_total=32 * GB, memory_used=8 * GB
+    )
+    ProxmoxNode.objects.create(
+        host=host, name="pve3", status="offline", memory_total=64 * GB, memory_used=0
+    )
+    return host
+
+
+def test_progress_follows_the_task_log():
+    progress, message = estimate_progress(MIGRATE_LOG[:4])
+    assert (progress, message) == (33, "Transferring volumes")
+
+    # A later volume restarting at 0% never moves progress backwards
+    assert estimate_progress(["transferred 0 B of 2.0 GiB (0.00%)"], progress)[0] == 33
+    assert estimate_progress(MIGRATE_LOG[4:], progress)[0] == 100
+
+
+@pytest.mark.django_db
+def test_start_migration_marks_app_and_queues_task(
+    cluster, make_app, owner, django_capture_on_commit_callbacks
+):
+    app = make_app("move-1", lxc_id=301, owner=owner, config={"memory": 2048})
+
+    with patch("apps.applications.tasks.migrate_app_task.delay") as mock_delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            migration = MigrationService().start_migration(app, requested_by=owner)
+
+    # pve2 has the most free memory; offline pve3 is never chosen
+    assert migration.target_node == "pve2"
+    assert migration.restart is True
+    assert Application.objects.get(id=app.id).status == "migrating"
+    mock_delay.assert_called_once_with(
+        migration_id=migration.id, app_id=app.id, target_storage=None
+    )
+
+
+@pytest.mark.django_db
+def test_start_migration_rejects_invalid_moves(cluster, make_app, owner):
+    app = make_app("move-1", lxc_id=301, owner=owner, config={"memory": 2048})
+
+    with pytest.raises(MigrationError):
+        MigrationService().start_migration(app, target_node="pve1")
+    with pytest.raises(MigrationError):
+        MigrationService().start_migration(app, target_node="pve3")
+
+    Application.objects.filter(id=app.id).update(status="deploying")
+    with pytest.raises(MigrationError) as exc:
+        MigrationService().start_migration(app, target_node="pve2")
+    assert exc.value.status_code == 409
+    assert not AppMigration.objects.exists()
+
+
+@pytest.mark.django_db
+def test_run_moves_app_and_records_progress(settings, cluster, make_app, owner):
+    settings.MIGRATION_TASK_TIMEOUT = 60
+    app = make_app("move-1", lxc_id=301, owner=owner, config={"memory": 2048})
+    migration = AppMigration.objects.create(
+        application=app,
+        source_node="pve1",
+        target_node="pve2",
+        restart=True,
+        previous_status="running",
+    )
+    Application.objects.filter(id=app.id).update(status="migrating")
+    proxmox = FakeProxmox()
+
+    MigrationService().run(migration, proxmox=proxmox, poll_interval=0)
+
+    assert proxmox.migrations == [("pve1", 301, "pve2", True)]
+    migration.refresh_from_db()
+    assert migration.status == "completed"
+    assert migration.progress == 100
+    assert migration.upid == "UPID:pve1:migrate"
+    app.refresh_from_db()
+    assert (app.node, app.status) == ("pve2", "running")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("lands_on_target, expected_node", [(False, "pve1"), (True, "pve2")])
+def test_failed_task_records_where_the_container_is(
+    settings, cluster, make_app, owner, lands_on_target, expected_node
+):
+    settings.MIGRATION_TASK_TIMEOUT = 60
+    app = make_app("move-1", lxc_id=301, owner=owner, status="migrating", config={"memory": 2048})
+    migration = AppMigration.objects.create(
+        application=app, source_node="pve1", target_node="pve2", previous_status="stopped"
+    )
+
+    MigrationService().run(
+        migration,
+        proxmox=FakeProxmox(exitstatus="migration aborted", lands_on_target=lands_on_target),
+        poll_interval=0,
+    )
+
+    app.refresh_from_db()
+    assert (app.node, app.status) == (expected_node, "stopped")
+    assert migration.status == ("completed" if lands_on_target else "failed")
+    assert "migration aborted" in migration.error
+
+
+@pytest.mark.django_db
+def test_rebalancer_moves_running_apps_off_the_hot_node(cluster, make_app, owner):
+    for index in range(4):
+        make_app(f"move-{index}", lxc_id=300 + index, owner=owner, config={"memory": 4096})
+    make_app("move-9", lxc_id=309, owner=owner, status="stopped", config={"memory": 8192})
+
+    proposal = RebalanceService(threshold=0.8, min_gap=0.15).propose()
+
+    # pve1 starts at 93.75%; two 4GB moves bring it under the 80% threshold
+    assert [move["target_node"] for move in proposal["moves"]] == ["pve2"] * 2
+    assert all(move["app_id"] != "move-9" for move in proposal["moves"])
+    projected = {node["node"]: node["projected_utilization"] for node in proposal["nodes"]}
+    assert projected == {"pve1": 0.688, "pve2": 0.5}
+
+
+@pytest.mark.django_db
+def test_rebalancer_leaves_cool_clusters_alone(cluster, make_app, owner):
+    ProxmoxNode.objects.filter(name="pve1").update(memory_used=20 * GB)
+    make_app("move-1", lxc_id=301, owner=owner, config={"memory": 4096})
+
+    assert RebalanceService(threshold=0.8).propose()["moves"] == []
+
+
+@pytest.mark.django_db
+def test_rebalance_endpoint_starts_migrations_for_admins(cluster, make_app):
+    # The first user created becomes an admin (apps.core.signals)
+    admin = User.objects.create_superuser(username="moveadmin", password="test")
+    owner = User.objects.create_user(username="moveuser", password="testpass123")
+    make_app("move-1", lxc_id=301, owner=owner, config={"memory": 8192})
+    client = Client()
+
+    client.force_login(owner)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(owner))
+    assert client.post("/api/apps/rebalance").status_code == 403
+
+    client.force_login(admin)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(admin))
+    with patch("apps.applications.tasks.migrate_app_task.delay"):
+        response = client.post("/api/apps/rebalance")
+
+    assert response.status_code == 202
+    [migration] = response.json()["migrations"]
+    assert (migration["target_node"], migration["reason"]) == ("pve2", "rebalance")
+
+
+@pytest.mark.django_db
+def test_migrate_endpoint_and_progress_listing(cluster, make_app, owner):
+    app = make_app("move-1", lxc_id=301, owner=owner, config={"memory": 2048})
+    client = Client()
+    client.force_login(owner)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(owner))
+
+    with patch("apps.applications.tasks.migrate_app_task.delay"):
+        response = client.post(
+            f"/api/{app.id}/migrate",
+            data=json.dumps({"target_node": "pve2"}),
+            content_type="application/json",
+        )
+    assert response.status_code == 202
+
+    again = client.post(
+        f"/api/{app.id}/migrate", data=json.dumps({}), content_type="application/json"
+    )
+    assert again.status_code == 409
+
+    listing = client.get(f"/api/{app.id}/migrations").json()
+    assert listing["total"] == 1
+    assert listing["migrations"][0]["status"] == "pending"
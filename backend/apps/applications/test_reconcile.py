@@ -0,0 +1,37 @@
+"""
+Tests for reconciliation of application rows with the containers on Proxmox.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from apps.applications.models import Application
+from apps.applications.services import ApplicationService
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("use_mock", [True, False])
+def test_reconcile_purges_apps_whose_container_is_gone(host, make_app, use_mock):
+    """The mock and the async scan feed the same reconcile loop."""
+    make_app("alive", lxc_id=801)
+    make_app("gone", lxc_id=802)
+    make_app("removed", lxc_id=803, status="removing")
+
+    async def scan(hosts):
+        return {host.id: {"pve": [{"vmid": 801}]}}, []
+
+    with patch("apps.applications.services.USE_MOCK", use_mock), patch(
+        "apps.applications.services.ProxmoxService"
+    ) as mock_service, patch("apps.proxmox.async_service.scan_lxc_containers", scan):
+        mock_service.return_value.get_nodes.return_value = [{"node": "pve"}]
+        mock_service.return_value.get_lxc_containers.return_value = [{"vmid": 801}]
+
+        result = ApplicationService.reconcile_applications()
+
+    assert result["real_vmids_count"] == 1
+    assert result["orphans_found"] == 2
+    assert result["expected_orphans"] == 1
+    assert result["anomalous_orphans"] == 1
+    assert result["orphans_purged"] == 2
+    assert list(Application.objects.values_list("id", flat=True)) == ["alive"]
@@ -0,0 +1,163 @@
+"""
+Tests for right-sizing recommendations from usage history.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications.models import DeploymentLog, ResourceRecommendation
+from apps.applications.rightsizing import (
+    RightsizingError,
+    RightsizingService,
+    recommend,
+    resource_floor,
+)
+
+MB = 1024**2
+
+
+def _samples(count=100, mem_mb=300, peak_mb=None, cpu=0.1, cores=4, maxmem_mb=4096):
+    """Flat usage with an optional single peak (cpu is a fraction of all cores)."""
+    samples = [
+        {"time": i, "cpu": cpu, "maxcpu": cores, "mem": mem_mb * MB, "maxmem": maxmem_mb * MB}
+        for i in range(count)
+    ]
+    if peak_mb:
+        samples[count // 2]["mem"] = peak_mb * MB
+    return samples
+
+
+class FakeProxmox:
+    def __init__(self, samples):
+        self.samples = samples
+        self.updates = []
+
+    def get_lxc_rrd_data(self, node_name, vmid, timeframe="week", cf="MAX"):
+        return self.samples
+
+    def update_lxc_config(self, node_name, vmid, **config):
+        self.updates.append((vmid, config))
+
+
+@pytest.fixture
+def app(make_app, owner):
+    return make_app("size-app", lxc_id=400, owner=owner, config={"memory": 4096, "cores": 4})
+
+
+def test_over_provisioned_container_is_shrunk():
+    advice = recommend(_samples(), {"memory": 4096, "cores": 4}, {"memory": 128, "cores": 1})
+
+    # 300MB * 1.25 headroom, rounded up to 64MB; 0.4 busy cores * 1.25 → 1 core
+    assert advice["recommended_memory"] == 384
+    assert advice["recommended_cores"] == 1
+    assert advice["memory_percentile"] == 300
+
+
+def test_peak_and_catalog_floor_are_respected():
+    advice = recommend(
+        _samples(peak_mb=900), {"memory": 4096, "cores": 4}, {"memory": 1024, "cores": 2}
+    )
+    assert advice["recommended_memory"] == 1024
+    assert advice["recommended_cores"] == 2
+
+    advice = recommend(
+        _samples(peak_mb=900), {"memory": 4096, "cores": 4}, {"memory": 128, "cores": 1}
+    )
+    # A single 900MB peak outweighs the 300MB percentile: never size below the peak
+    assert advice["recommended_memory"] == 960
+
+
+def test_small_changes_and_short_histories_keep_the_allocation():
+    current = {"memory": 512, "cores": 1}
+    floor = {"memory": 128, "cores": 1}
+
+    assert recommend(_samples(mem_mb=380), current, floor)["recommended_memory"] == 512
+    assert recommend(_samples(count=10), current, floor)["recommended_memory"] == 512
+
+
+def test_under_provisioned_container_grows():
+    advice = recommend(
+        _samples(mem_mb=1000, cpu=0.9, cores=2, maxmem_mb=1024),
+        {"memory": 1024, "cores": 2},
+        {"memory": 128, "cores": 1},
+    )
+    assert advice["recommended_memory"] == 1280
+    assert advice["recommended_cores"] == 3
+
+
+@pytest.mark.django_db
+def test_floor_reads_catalog_minimums():
+    catalog_entry = type("Entry", (), {"min_memory": 512, "min_cpu": 2})()
+    with patch("apps.catalog.services.catalog_service.get_app_by_id", return_value=catalog_entry):
+        assert resource_floor("adminer") == {"memory": 512, "cores": 2}
+    with patch("apps.catalog.services.catalog_service.get_app_by_id", return_value=None):
+        assert resource_floor("unknown") == {"memory": 128, "cores": 1}
+
+
+@pytest.mark.django_db
+def test_analyze_then_apply_updates_container_and_config(app):
+    proxmox = FakeProxmox(_samples())
+    service = RightsizingService()
+
+    recommendation = service.analyze(app, proxmox=proxmox)
+    assert (recommendation.current_memory, recommendation.recommended_memory) == (4096, 384)
+    assert recommendation.memory_savings == 3712
+
+    service.apply(app, proxmox=proxmox)
+
+    assert proxmox.updates == [(400, {"memory": 384, "cores": 1})]
+    app.refresh_from_db()
+    assert (app.config["memory"], app.config["cores"]) == (384, 1)
+    assert DeploymentLog.objects.filter(application=app, step="rightsize").exists()
+
+    with pytest.raises(RightsizingError):
+        service.apply(app, proxmox=proxmox)
+
+
+@pytest.mark.django_db
+def test_run_upserts_all_and_applies_only_when_enabled(settings, app):
+    ResourceRecommendation.objects.create(
+        application=app,
+        current_memory=1,
+        current_cores=1,
+        recommended_memory=1,
+        recommended_cores=1,
+    )
+    proxmox = FakeProxmox(_samples())
+
+    with patch("apps.applications.rightsizing.ProxmoxService", return_value=proxmox):
+        settings.RIGHTSIZE_AUTO_APPLY = False
+        summary = RightsizingService().run()
+        assert summary["with_changes"] == 1 and summary["applied"] == []
+        assert ResourceRecommendation.objects.get(application=app).recommended_memory == 384
+
+        settings.RIGHTSIZE_AUTO_APPLY = True
+        summary = RightsizingService().run()
+
+    assert summary["applied"] == [app.id]
+    assert summary["memory_savings_mb"] == 3712
+    assert proxmox.updates == [(400, {"memory": 384, "cores": 1})]
+
+
+@pytest.mark.django_db
+def test_rightsizing_endpoints(app):
+    client = Client()
+    client.force_login(app.owner)
+    client.cookies["proximity-auth-cookie"] = str(AccessToken.for_user(app.owner))
+    proxmox = FakeProxmox(_samples())
+
+    with patch("apps.applications.rightsizing.ProxmoxService", return_value=proxmox):
+        response = client.get(f"/api/{app.id}/rightsizing")
+        assert response.status_code == 200
+        assert response.json()["recommended_memory"] == 384
+
+        listing = client.get("/api/apps/rightsizing?changes_only=true").json()
+        assert listing["total"] == 1 and listing["memory_savings"] == 3712
+
+        applied = client.post(f"/api/{app.id}/rightsizing/apply")
+
+    assert applied.status_code == 200
+    assert applied.json()["applied_at"] is not None
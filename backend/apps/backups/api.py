@@ -6,24 +6,51 @@ All endpoints are nested under /api/apps/{app_id}/backups
 
 import logging
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum, Avg, Count, Q
-from ninja import Router
+from typing import List
+
+from ninja import Query, Router
 from ninja.errors import HttpError
 
 # TODO: Implement proper authentication
 # from apps.core.auth import AuthBearer
 from apps.applications.models import Application
-from apps.backups.models import Backup
+from apps.backups.export import ExportError, create_export, get_export_target
+from apps.backups.models import Backup, BackupExport, BackupPolicy
+from apps.backups.policies import parse_schedule
 from apps.backups.schemas import (
     BackupSchema,
     BackupListSchema,
     BackupCreateRequest,
     BackupCreateResponse,
     BackupRestoreResponse,
+    BackupRestorePlanSchema,
     BackupDeleteResponse,
     BackupStatsSchema,
+    BulkBackupStatsSchema,
+    BackupPolicySchema,
+    BackupPolicyCreateRequest,
+    BackupPolicyListSchema,
+    BackupExportSchema,
+    BackupExportListSchema,
+    BackupExportRequest,
+    BackupImportRequest,
+)
+from apps.backups.incremental import CHUNK_STORE_STORAGE
+from apps.backups.stats import get_backup_stats as load_backup_stats
+from apps.backups.restore_planner import (
+    STRATEGY_AUTO,
+    STRATEGY_SNAPSHOT,
+    STRATEGY_VZDUMP,
+    plan_restore,
+)
+from apps.proxmox import ProxmoxService
+from apps.backups.tasks import (
+    create_backup_task,
+    restore_backup_task,
+    delete_backup_task,
+    export_backup_task,
+    import_backup_task,
 )
-from apps.backups.tasks import create_backup_task, restore_backup_task, delete_backup_task
 
 logger = logging.getLogger(__name__)
 router = Router()  # TODO: Add auth=AuthBearer() when implemented
@@ -100,26 +127,35 @@ def create_app_backup(request, app_id: str, payload: BackupCreateRequest = None)
     # Get backup parameters
     backup_type = "snapshot"
     compression = "zstd"
+    incremental = False
 
     if payload:
         backup_type = payload.backup_type
         compression = payload.compression
+        incremental = payload.incremental
 
-    logger.info(f"Creating backup for app {app.name} (type={backup_type}, compress={compression})")
+    logger.info(
+        f"Creating backup for app {app.name} "
+        f"(type={backup_type}, compress={compression}, incremental={incremental})"
+    )
 
     # Create backup record
     backup = Backup.objects.create(
         application=app,
         file_name="",  # Will be filled by task
-        storage_name="local",
+        storage_name=CHUNK_STORE_STORAGE if incremental else "local",
         backup_type=backup_type,
-        compression=compression,
+        compression="none" if incremental else compression,
         status="creating",
     )
 
     # Trigger async backup task
     create_backup_task.delay(
-        application_id=app_id, backup_type=backup_type, compression=compression
+        application_id=app_id,
+        backup_type=backup_type,
+        compression=compression,
+        incremental=incremental,
+        backup_id=backup.id,
     )
 
     return 202, BackupCreateResponse(
@@ -127,6 +163,43 @@ def create_app_backup(request, app_id: str, payload: BackupCreateRequest = None)
     )
 
 
+def _stats_schema(stats) -> BackupStatsSchema:
+    """Convert a BackupStats row to its API schema."""
+    return BackupStatsSchema(
+        total_backups=stats.total_backups,
+        completed_backups=stats.completed_backups,
+        failed_backups=stats.failed_backups,
+        in_progress_backups=stats.in_progress_backups,
+        total_size_gb=round(stats.total_size / (1024**3), 2),
+        average_size_mb=round(stats.average_size / (1024**2), 2),
+        last_backup_at=stats.last_backup_at,
+    )
+
+
+@router.get(
+    "/backups/stats",
+    response=BulkBackupStatsSchema,
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="Get backup statistics for many applications",
+    description="Get backup statistics for the given applications (all owned applications if app_ids is omitted) in one request.",
+)
+def get_bulk_backup_stats(request, app_ids: List[str] = Query(None)):
+    """Get backup statistics for many applications at once."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    apps = Application.objects.filter(owner=request.user)
+    if app_ids:
+        apps = apps.filter(id__in=app_ids)
+    owned_ids = list(apps.values_list("id", flat=True))
+
+    stats = load_backup_stats(owned_ids)
+    return BulkBackupStatsSchema(
+        stats={app_id: _stats_schema(row) for app_id, row in stats.items()}
+    )
+
+
 @router.get(
     "/apps/{app_id}/backups/stats",
     response=BackupStatsSchema,
@@ -143,28 +216,57 @@ def get_backup_stats(request, app_id: str):
     # Verify application exists and user has permission
     app = get_object_or_404(Application.objects.filter(owner=request.user), id=app_id)
 
-    # Aggregate statistics
-    stats = Backup.objects.filter(application=app).aggregate(
-        total=Count("id"),
-        completed=Count("id", filter=Q(status="completed")),
-        failed=Count("id", filter=Q(status="failed")),
-        in_progress=Count("id", filter=Q(status__in=["creating", "restoring", "deleting"])),
-        total_size=Sum("size", filter=Q(status="completed")),
-        avg_size=Avg("size", filter=Q(status="completed")),
-    )
+    # Counters are materialized in BackupStats
+    return _stats_schema(load_backup_stats([app.id])[app.id])
 
-    # Convert sizes to GB/MB
-    total_size_gb = (stats["total_size"] or 0) / (1024**3)
-    avg_size_mb = (stats["avg_size"] or 0) / (1024**2)
 
-    return BackupStatsSchema(
-        total_backups=stats["total"] or 0,
-        completed_backups=stats["completed"] or 0,
-        failed_backups=stats["failed"] or 0,
-        in_progress_backups=stats["in_progress"] or 0,
-        total_size_gb=round(total_size_gb, 2),
-        average_size_mb=round(avg_size_mb, 2),
-    )
+@router.get(
+    "/apps/{app_id}/backups/exports",
+    response=BackupExportListSchema,
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="List backup exports",
+    description="List off-node copies of an application's backups.",
+)
+def list_backup_exports(request, app_id: str):
+    """List backup exports of an application."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    app = get_object_or_404(Application.objects.filter(owner=request.user), id=app_id)
+
+    exports = [
+        BackupExportSchema.model_validate(export)
+        for export in BackupExport.objects.filter(application=app)
+    ]
+    return BackupExportListSchema(exports=exports, total=len(exports))
+
+
+@router.post(
+    "/apps/{app_id}/backups/exports/{export_id}/import",
+    response={202: BackupExportSchema},
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="Import an exported backup",
+    description="Stream an exported archive back onto Proxmox storage, optionally restoring it. Returns 202 Accepted.",
+)
+def import_backup_export(request, app_id: str, export_id: int, payload: BackupImportRequest = None):
+    """Import an exported backup archive back to Proxmox."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    app = get_object_or_404(Application.objects.filter(owner=request.user), id=app_id)
+    export = get_object_or_404(BackupExport.objects.filter(application=app), id=export_id)
+
+    if export.status != "completed":
+        raise HttpError(400, f"Cannot import export in '{export.status}' state")
+
+    restore = payload.restore if payload else False
+    logger.info(f"Importing export {export.key} for app {app.name} (restore={restore})")
+
+    import_backup_task.delay(export_id=export.id, restore=restore)
+
+    return 202, BackupExportSchema.model_validate(export)
 
 
 @router.get(
@@ -188,14 +290,37 @@ def get_backup_details(request, app_id: str, backup_id: int):
     return BackupSchema.model_validate(backup)
 
 
+@router.get(
+    "/apps/{app_id}/backups/{backup_id}/restore-plan",
+    response=BackupRestorePlanSchema,
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="Preview restore path",
+    description="Show whether a restore would roll back a storage snapshot or restore the vzdump archive.",
+)
+def get_restore_plan(request, app_id: str, backup_id: int):
+    """Preview how a backup would be restored."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    app = get_object_or_404(Application.objects.filter(owner=request.user), id=app_id)
+    backup = get_object_or_404(Backup.objects.filter(application=app), id=backup_id)
+
+    try:
+        plan = plan_restore(ProxmoxService(host_id=app.host_id), backup)
+    except ValueError as e:
+        raise HttpError(409, str(e))
+    return BackupRestorePlanSchema(backup_id=backup.id, **plan)
+
+
 @router.post(
     "/apps/{app_id}/backups/{backup_id}/restore",
     response={202: BackupRestoreResponse},
     auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
     summary="Restore from backup",
-    description="Restore an application from a backup. This is a DESTRUCTIVE operation. Returns 202 Accepted.",
+    description="Restore an application from a backup. This is a DESTRUCTIVE operation. The optional strategy query parameter is auto, snapshot_rollback or vzdump_restore. Returns 202 Accepted.",
 )
-def restore_from_backup(request, app_id: str, backup_id: int):
+def restore_from_backup(request, app_id: str, backup_id: int, strategy: str = STRATEGY_AUTO):
     """
     Restore an application from a backup.
 
@@ -228,16 +353,27 @@ def restore_from_backup(request, app_id: str, backup_id: int):
             409, "A backup or restore operation is already in progress for this application"
         )
 
-    logger.info(f"Initiating restore for app {app.name} from backup {backup.file_name}")
+    if strategy not in (STRATEGY_AUTO, STRATEGY_SNAPSHOT, STRATEGY_VZDUMP):
+        raise HttpError(
+            400,
+            f"Invalid strategy: {strategy}. Must be one of: "
+            f"{STRATEGY_AUTO}, {STRATEGY_SNAPSHOT}, {STRATEGY_VZDUMP}",
+        )
+
+    logger.info(
+        f"Initiating restore for app {app.name} from backup {backup.file_name} "
+        f"(strategy={strategy})"
+    )
 
     # Trigger async restore task
-    restore_backup_task.delay(backup_id=backup_id)
+    restore_backup_task.delay(backup_id=backup_id, strategy=strategy)
 
     return 202, BackupRestoreResponse(
         backup_id=backup_id,
         application_id=app_id,
         status="restoring",
         message=f"Restore operation started for {app.name} from {backup.file_name}",
+        restore_path=None if strategy == STRATEGY_AUTO else strategy,
     )
 
 
@@ -278,3 +414,105 @@ def delete_backup(request, app_id: str, backup_id: int):
         status="deleting",
         message=f"Backup deletion started for {backup.file_name}",
     )
+
+
+@router.get(
+    "/backups/policies",
+    response=BackupPolicyListSchema,
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="List backup policies",
+    description="List the scheduled backup policies of the current user.",
+)
+def list_backup_policies(request):
+    """List backup policies owned by the current user."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    policies = [
+        BackupPolicySchema.model_validate(policy)
+        for policy in BackupPolicy.objects.filter(owner=request.user)
+    ]
+    return BackupPolicyListSchema(policies=policies, total=len(policies))
+
+
+@router.post(
+    "/backups/policies",
+    response={201: BackupPolicySchema},
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="Create a backup policy",
+    description="Schedule backups with retention for one application or a catalog category.",
+)
+def create_backup_policy(request, payload: BackupPolicyCreateRequest):
+    """Create a scheduled backup policy."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    if bool(payload.application_id) == bool(payload.catalog_category):
+        raise HttpError(400, "Specify exactly one of application_id or catalog_category")
+
+    try:
+        parse_schedule(payload.schedule)
+    except ValueError as e:
+        raise HttpError(400, f"Invalid schedule: {e}")
+
+    if payload.application_id:
+        get_object_or_404(Application.objects.filter(owner=request.user), id=payload.application_id)
+
+    policy = BackupPolicy.objects.create(owner=request.user, **payload.model_dump())
+
+    logger.info(f"Created backup policy {policy.name} ({policy.schedule})")
+
+    return 201, BackupPolicySchema.model_validate(policy)
+
+
+@router.delete(
+    "/backups/policies/{policy_id}",
+    response={204: None},
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="Delete a backup policy",
+    description="Delete a backup policy. Backups it created are kept as manual backups.",
+)
+def delete_backup_policy(request, policy_id: int):
+    """Delete a backup policy."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    policy = get_object_or_404(BackupPolicy.objects.filter(owner=request.user), id=policy_id)
+    policy.delete()
+
+    return 204, None
+
+
+@router.post(
+    "/apps/{app_id}/backups/{backup_id}/export",
+    response={202: BackupExportSchema},
+    auth=None,  # TODO: Add proper authentication once AuthBearer is implemented
+    summary="Export a backup",
+    description="Stream a backup archive to the external export target. Returns 202 Accepted.",
+)
+def export_backup(request, app_id: str, backup_id: int, payload: BackupExportRequest = None):
+    """Copy a completed backup to the external export target."""
+    # Check authentication
+    if not request.user or not request.user.is_authenticated:
+        raise HttpError(401, "Authentication required")
+
+    app = get_object_or_404(Application.objects.filter(owner=request.user), id=app_id)
+    backup = get_object_or_404(Backup.objects.filter(application=app), id=backup_id)
+
+    if backup.status != "completed":
+        raise HttpError(400, f"Cannot export backup in '{backup.status}' state")
+
+    try:
+        target = get_export_target(payload.target if payload else None)
+    except ExportError as e:
+        raise HttpError(400, str(e))
+
+    export = create_export(backup, target)
+    logger.info(f"Exporting backup {backup.file_name} to {target.kind}:{export.key}")
+
+    export_backup_task.delay(export_id=export.id)
+
+    return 202, BackupExportSchema.model_validate(export)
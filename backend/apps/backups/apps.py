@@ -5,3 +5,7 @@ class BackupsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.backups"
     verbose_name = "Backups"
+
+    def ready(self):
+        """Import signals when the app is ready."""
+        import apps.backups.signals  # noqa: F401
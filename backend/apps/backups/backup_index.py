@@ -0,0 +1,158 @@
+"""
+Per-storage backup index - cached view of the archives on a Proxmox storage.
+
+Listing a backup storage returns every archive on it, which gets slow once a
+storage holds thousands of them. The index is built from one listing and kept
+in Redis as one hash per storage (volid -> entry), then updated incrementally
+as backups are created and deleted: each update is a single HSET or HDEL, so
+bookkeeping after a backup is O(1) and concurrent tasks never overwrite each
+other's entries. Restores look their archive up here before stopping the
+container. Hashes expire after BACKUP_INDEX_TTL, which also bounds drift from
+archives created or removed outside Proximity.
+"""
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _redis() -> "redis.Redis":
+    return redis.Redis.from_url(settings.CACHE_REDIS_URL)
+
+
+def _index_key(host_id: Optional[int], node_name: str, storage: str) -> str:
+    return f"proximity:backup_index:{host_id or 'default'}:{node_name}:{storage}"
+
+
+def _vmid_of(entry: Dict[str, Any]) -> Optional[int]:
+    vmid = entry.get("vmid")
+    return int(vmid) if vmid is not None else None
+
+
+def refresh_backup_index(
+    proxmox, host_id: Optional[int], node_name: str, storage: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Rebuild the index of a storage from a full listing.
+
+    Args:
+        proxmox: ProxmoxService for the host
+        host_id: Proxmox host ID
+        node_name: Proxmox node name
+        storage: Storage name
+
+    Returns:
+        Index mapping volid to its storage content entry
+
+    Raises:
+        ProxmoxError: If the storage cannot be listed
+    """
+    index = {entry["volid"]: entry for entry in proxmox.list_backups(node_name, storage)}
+    key = _index_key(host_id, node_name, storage)
+
+    # Replace the hash atomically; an empty storage keeps no hash (read as not cached)
+    pipe = _redis().pipeline()
+    pipe.delete(key)
+    if index:
+        pipe.hset(key, mapping={volid: json.dumps(entry) for volid, entry in index.items()})
+        pipe.expire(key, settings.BACKUP_INDEX_TTL)
+    pipe.execute()
+
+    logger.debug(f"Rebuilt backup index for {node_name}/{storage}: {len(index)} archive(s)")
+    return index
+
+
+def list_storage_backups(
+    proxmox,
+    host_id: Optional[int],
+    node_name: str,
+    storage: str,
+    vmid: Optional[int] = None,
+    force_refresh: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    List archives on a storage, newest first, from the index when possible.
+
+    Args:
+        proxmox: ProxmoxService for the host
+        host_id: Proxmox host ID
+        node_name: Proxmox node name
+        storage: Storage name
+        vmid: Only return archives of this guest
+        force_refresh: Rebuild the index from Proxmox first
+
+    Returns:
+        Storage content entries
+    """
+    raw = {} if force_refresh else _redis().hgetall(_index_key(host_id, node_name, storage))
+    if raw:
+        entries = [json.loads(value) for value in raw.values()]
+    else:
+        entries = list(refresh_backup_index(proxmox, host_id, node_name, storage).values())
+
+    if vmid is not None:
+        entries = [entry for entry in entries if _vmid_of(entry) == vmid]
+    return sorted(entries, key=lambda entry: entry.get("ctime") or 0, reverse=True)
+
+
+def find_backup(
+    proxmox, host_id: Optional[int], node_name: str, storage: str, volid: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up one archive, from the index when it has it.
+
+    A miss rebuilds the index once before the archive is reported missing, so an
+    index that lost an update (or predates the archive) cannot hide it.
+
+    Args:
+        proxmox: ProxmoxService for the host
+        host_id: Proxmox host ID
+        node_name: Proxmox node name
+        storage: Storage name
+        volid: Volume ID of the archive (e.g., 'local:backup/vzdump-lxc-101-....tar.zst')
+
+    Returns:
+        Storage content entry, or None if the archive is not on the storage
+
+    Raises:
+        ProxmoxError: If the index has to be rebuilt and the storage cannot be listed
+    """
+    value = _redis().hget(_index_key(host_id, node_name, storage), volid)
+    if value is not None:
+        return json.loads(value)
+    return refresh_backup_index(proxmox, host_id, node_name, storage).get(volid)
+
+
+def record_backup(
+    host_id: Optional[int], node_name: str, storage: str, entry: Dict[str, Any]
+) -> None:
+    """Add a newly created archive to the index (no-op if the index is not cached)."""
+    key = _index_key(host_id, node_name, storage)
+
+    def add_entry(pipe):
+        # Never turn a missing index into a partial one that looks complete
+        if not pipe.exists(key):
+            return
+        pipe.multi()
+        pipe.hset(key, entry["volid"], json.dumps(entry))
+
+    try:
+        _redis().transaction(add_entry, key)
+    except redis.RedisError as e:
+        # Bookkeeping must never fail a backup; find_backup rebuilds on a miss
+        logger.warning(f"Could not update backup index for {node_name}/{storage}: {e}")
+
+
+def forget_backup(host_id: Optional[int], node_name: str, storage: str, volid: str) -> None:
+    """Drop a deleted archive from the index (no-op if the index is not cached)."""
+    try:
+        _redis().hdel(_index_key(host_id, node_name, storage), volid)
+    except redis.RedisError as e:
+        logger.warning(f"Could not update backup index for {node_name}/{storage}: {e}")
@@ -0,0 +1,410 @@
+"""
+Backup export/import - streaming copies of backup archives to external storage.
+
+Archives are streamed from their source (the Proxmox storage over SSH, or the
+chunk store for incremental backups) straight into a multipart upload on the
+target, one fixed-size part at a time, so memory use is bounded by the part
+size whatever the archive size. Every finished part is recorded on the
+BackupExport row with its SHA-256; a retried export resumes after the last
+recorded part and restarts the source stream at that offset.
+
+Imports stream the object back onto a Proxmox storage, verifying each part
+against its recorded digest, and create a regular Backup that the existing
+restore path (restore_lxc_backup) can use. The imported archive gets a fresh
+vzdump-style name, so it never replaces the archive it was exported from.
+
+Targets:
+    FilesystemExportTarget  directory (local disk, NFS mount, ...)
+    S3ExportTarget          any S3-compatible service (AWS, MinIO, Ceph RGW)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.proxmox import ProxmoxService
+from apps.backups.backup_index import record_backup
+from apps.backups.chunk_store import fixed_chunks, get_chunk_store, read_manifest
+from apps.backups.models import Backup, BackupExport
+
+logger = logging.getLogger(__name__)
+
+
+class ExportError(Exception):
+    """Raised when an export or import cannot be completed."""
+
+    pass
+
+
+class ExportTarget:
+    """Interface of an export target supporting resumable multipart uploads."""
+
+    kind = ""
+
+    def start_upload(self, key: str) -> str:
+        """Begin a multipart upload and return its upload id."""
+        raise NotImplementedError
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        """Store one part (numbered from 1) and return its ETag."""
+        raise NotImplementedError
+
+    def complete_upload(self, key: str, upload_id: str, parts: List[List[Any]]) -> None:
+        """Assemble the uploaded parts into the final object."""
+        raise NotImplementedError
+
+    def abort_upload(self, key: str, upload_id: str) -> None:
+        raise NotImplementedError
+
+    def read(self, key: str, block_size: int) -> Iterator[bytes]:
+        """Stream an object in blocks of at most block_size bytes."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class FilesystemExportTarget(ExportTarget):
+    """
+    Directory target: parts are files under <root>/.uploads/<upload id>/ and
+    are concatenated into <root>/<key> on completion.
+    """
+
+    kind = "filesystem"
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        return self.root / ".uploads" / upload_id
+
+    def start_upload(self, key: str) -> str:
+        upload_id = uuid.uuid4().hex
+        self._upload_dir(upload_id).mkdir(parents=True)
+        return upload_id
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        upload_dir = self._upload_dir(upload_id)
+        if not upload_dir.is_dir():
+            raise ExportError(f"Upload {upload_id} does not exist")
+        tmp_path = upload_dir / f".{part_number}.tmp"
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, upload_dir / str(part_number))
+        return hashlib.sha256(data).hexdigest()
+
+    def complete_upload(self, key: str, upload_id: str, parts: List[List[Any]]) -> None:
+        upload_dir = self._upload_dir(upload_id)
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.tmp")
+
+        with open(tmp_path, "wb") as out:
+            for part in parts:
+                with open(upload_dir / str(part[0]), "rb") as src:
+                    shutil.copyfileobj(src, out)
+        os.replace(tmp_path, target)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    def abort_upload(self, key: str, upload_id: str) -> None:
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    def read(self, key: str, block_size: int) -> Iterator[bytes]:
+        try:
+            with open(self.root / key, "rb") as src:
+                while True:
+                    data = src.read(block_size)
+                    if not data:
+                        break
+                    yield data
+        except FileNotFoundError:
+            raise ExportError(f"Export {key} not found on target")
+
+    def delete(self, key: str) -> None:
+        try:
+            (self.root / key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class S3ExportTarget(ExportTarget):
+    """
+    S3-compatible target using the multipart upload API.
+
+    Parts other than the last must be at least 5 MiB (BACKUP_EXPORT_PART_SIZE
+    defaults to 8 MiB).
+    """
+
+    kind = "s3"
+
+    def __init__(self, bucket: str, prefix: str = "", client=None):
+        """
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix for every exported object
+            client: boto3 S3 client (built from BACKUP_EXPORT_S3_* settings if omitted)
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = client or self._build_client()
+
+    @staticmethod
+    def _build_client():
+        try:
+            import boto3
+        except ImportError:
+            raise ExportError("S3 export requires boto3 (pip install boto3)")
+
+        return boto3.client(
+            "s3",
+            endpoint_url=settings.BACKUP_EXPORT_S3_ENDPOINT or None,
+            region_name=settings.BACKUP_EXPORT_S3_REGION or None,
+            aws_access_key_id=settings.BACKUP_EXPORT_S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.BACKUP_EXPORT_S3_SECRET_KEY or None,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def start_upload(self, key: str) -> str:
+        response = self.client.create_multipart_upload(Bucket=self.bucket, Key=self._key(key))
+        return response["UploadId"]
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return response["ETag"]
+
+    def complete_upload(self, key: str, upload_id: str, parts: List[List[Any]]) -> None:
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": part[0], "ETag": part[3]} for part in parts]},
+        )
+
+    def abort_upload(self, key: str, upload_id: str) -> None:
+        self.client.abort_multipart_upload(
+            Bucket=self.bucket, Key=self._key(key), UploadId=upload_id
+        )
+
+    def read(self, key: str, block_size: int) -> Iterator[bytes]:
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+        except Exception as e:
+            raise ExportError(f"Export {key} could not be read: {e}")
+        yield from body.iter_chunks(block_size)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+def get_export_target(kind: Optional[str] = None) -> ExportTarget:
+    """
+    Get the configured export target.
+
+    Args:
+        kind: "s3" or "filesystem" (defaults to BACKUP_EXPORT_TARGET)
+
+    Raises:
+        ExportError: If the target kind is unknown or not configured
+    """
+    kind = kind or settings.BACKUP_EXPORT_TARGET
+    if kind == "filesystem":
+        return FilesystemExportTarget(settings.BACKUP_EXPORT_PATH)
+    if kind == "s3":
+        if not settings.BACKUP_EXPORT_S3_BUCKET:
+            raise ExportError("BACKUP_EXPORT_S3_BUCKET is not configured")
+        return S3ExportTarget(settings.BACKUP_EXPORT_S3_BUCKET, settings.BACKUP_EXPORT_S3_PREFIX)
+    raise ExportError(f"Unknown export target '{kind}'")
+
+
+def _skip(stream: Iterable[bytes], offset: int) -> Iterator[bytes]:
+    """Drop the first offset bytes of a stream."""
+    for block in stream:
+        if offset >= len(block):
+            offset -= len(block)
+            continue
+        yield block[offset:] if offset else block
+        offset = 0
+
+
+class BackupExporter:
+    """
+    Moves backup archives between Proxmox/chunk store and an export target.
+    """
+
+    def __init__(self, target: ExportTarget, proxmox: Optional[ProxmoxService] = None):
+        """
+        Args:
+            target: Export target
+            proxmox: ProxmoxService for the application's host (required for
+                full vzdump archives and for imports)
+        """
+        self.target = target
+        self.proxmox = proxmox
+
+    def _source(self, export: BackupExport, offset: int) -> Iterable[bytes]:
+        backup = export.backup
+        if backup is None:
+            raise ExportError("Source backup no longer exists")
+
+        if backup.is_incremental:
+            return _skip(read_manifest(get_chunk_store(), backup.manifest), offset)
+
+        return self.proxmox.stream_backup_archive(
+            export.application.node, backup.storage_name, backup.file_name, offset=offset
+        )
+
+    def export(self, export: BackupExport) -> BackupExport:
+        """
+        Upload (or resume uploading) a backup archive.
+
+        Args:
+            export: BackupExport row; its recorded parts are kept on resume
+
+        Returns:
+            The completed export
+
+        Raises:
+            ExportError, ProxmoxError, ChunkStoreError: If the transfer fails
+                (recorded parts are kept for the next attempt)
+        """
+        if not export.upload_id:
+            export.upload_id = self.target.start_upload(export.key)
+            export.parts = []
+        export.status = "uploading"
+        export.save(update_fields=["upload_id", "parts", "status", "updated_at"])
+
+        offset = export.uploaded_bytes
+        if offset:
+            logger.info(
+                f"Resuming export {export.id} at part {len(export.parts) + 1} ({offset} bytes)"
+            )
+
+        part_number = len(export.parts)
+        for data in fixed_chunks(self._source(export, offset), export.part_size):
+            part_number += 1
+            etag = self.target.upload_part(export.key, export.upload_id, part_number, data)
+            export.parts.append([part_number, len(data), hashlib.sha256(data).hexdigest(), etag])
+            export.save(update_fields=["parts", "updated_at"])
+
+        self.target.complete_upload(export.key, export.upload_id, export.parts)
+
+        export.size = export.uploaded_bytes
+        export.checksum = hashlib.sha256(
+            "".join(part[2] for part in export.parts).encode()
+        ).hexdigest()
+        export.upload_id = None
+        export.status = "completed"
+        export.completed_at = timezone.now()
+        export.save()
+
+        logger.info(
+            f"📤 Exported {export.file_name} to {export.target}:{export.key} "
+            f"({export.size} bytes, {len(export.parts)} part(s))"
+        )
+        return export
+
+    def verified_stream(self, export: BackupExport) -> Iterator[bytes]:
+        """
+        Stream an exported archive back, checking every part's digest.
+
+        Raises:
+            ExportError: If the object does not match the recorded parts
+        """
+        parts = iter(export.parts)
+        for data in fixed_chunks(self.target.read(export.key, export.part_size), export.part_size):
+            part = next(parts, None)
+            if part is None or len(data) != part[1] or hashlib.sha256(data).hexdigest() != part[2]:
+                raise ExportError(f"Export {export.key} is corrupt (part {part and part[0]})")
+            yield data
+
+        if next(parts, None) is not None:
+            raise ExportError(f"Export {export.key} is truncated")
+
+    def import_archive(self, export: BackupExport, storage: str = "local") -> Backup:
+        """
+        Stream an exported archive onto Proxmox storage and register it.
+
+        Args:
+            export: Completed BackupExport
+            storage: Proxmox storage to write the archive to
+
+        Returns:
+            New completed Backup pointing at the imported archive
+
+        Raises:
+            ExportError, ProxmoxError: If the transfer fails
+        """
+        app = export.application
+        file_name = import_file_name(export)
+        # Written to a temporary file and linked into place only if the name is free;
+        # a failed upload leaves nothing behind on the storage
+        volid = self.proxmox.upload_backup_archive(
+            app.node, storage, file_name, self.verified_stream(export)
+        )
+
+        backup = Backup.objects.create(
+            application=app,
+            file_name=file_name,
+            storage_name=storage,
+            size=export.size,
+            backup_type=export.backup_type,
+            compression=export.compression,
+            status="completed",
+            completed_at=timezone.now(),
+        )
+        record_backup(
+            app.host_id,
+            app.node,
+            storage,
+            {
+                "volid": volid,
+                "vmid": app.lxc_id,
+                "size": export.size,
+                "ctime": int(backup.completed_at.timestamp()),
+                "content": "backup",
+            },
+        )
+
+        logger.info(
+            f"📥 Imported {export.file_name} into {storage} as {file_name} (backup {backup.id})"
+        )
+        return backup
+
+
+def import_file_name(export: BackupExport) -> str:
+    """vzdump-style name for an imported archive: vzdump-lxc-<vmid>-<now><extension>."""
+    match = re.search(r"\.tar(\.\w+)?$", export.file_name)
+    extension = match.group(0) if match else ".tar"
+    stamp = timezone.localtime().strftime("%Y_%m_%d-%H_%M_%S")
+    return f"vzdump-lxc-{export.application.lxc_id}-{stamp}{extension}"
+
+
+def create_export(backup: Backup, target: ExportTarget) -> BackupExport:
+    """Create the export record for a completed backup."""
+    app = backup.application
+    return BackupExport.objects.create(
+        backup=backup,
+        application=app,
+        file_name=backup.file_name,
+        backup_type=backup.backup_type,
+        compression=backup.compression,
+        target=target.kind,
+        key=f"{app.id}/{backup.file_name}",
+        part_size=settings.BACKUP_EXPORT_PART_SIZE,
+    )
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backups", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="backup",
+            name="manifest",
+            field=models.JSONField(
+                blank=True,
+                help_text="Chunk manifest of an incremental backup (None for full vzdump archives)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="backup",
+            name="stored_size",
+            field=models.BigIntegerField(
+                blank=True,
+                help_text="Bytes this backup added to the chunk store (incremental backups only)",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="backup",
+            name="compression",
+            field=models.CharField(
+                choices=[
+                    ("zstd", "Zstandard"),
+                    ("gzip", "Gzip"),
+                    ("lzo", "LZO"),
+                    ("none", "None"),
+                ],
+                default="zstd",
+                help_text="Compression algorithm",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0005_add_state_changed_at"),
+        ("backups", "0002_incremental_chunk_store"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackupPolicy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(help_text="Policy name", max_length=100)),
+                (
+                    "catalog_category",
+                    models.CharField(
+                        blank=True,
+                        help_text="Catalog category this policy applies to (e.g. Database)",
+                        max_length=100,
+                        null=True,
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.CharField(
+                        default="0 3 * * *",
+                        help_text="Cron expression: minute hour day-of-month month day-of-week",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "window_minutes",
+                    models.PositiveIntegerField(
+                        default=60,
+                        help_text="Backups of one run are spread over this many minutes",
+                    ),
+                ),
+                ("enabled", models.BooleanField(db_index=True, default=True)),
+                (
+                    "backup_type",
+                    models.CharField(default="snapshot", help_text="Backup mode", max_length=50),
+                ),
+                (
+                    "compression",
+                    models.CharField(default="zstd", help_text="Compression", max_length=20),
+                ),
+                (
+                    "incremental",
+                    models.BooleanField(default=False, help_text="Use the chunk store"),
+                ),
+                (
+                    "keep_last",
+                    models.PositiveIntegerField(default=0, help_text="Keep the N newest backups"),
+                ),
+                (
+                    "keep_daily",
+                    models.PositiveIntegerField(default=7, help_text="Keep one backup per day"),
+                ),
+                (
+                    "keep_weekly",
+                    models.PositiveIntegerField(default=4, help_text="Keep one backup per week"),
+                ),
+                (
+                    "keep_monthly",
+                    models.PositiveIntegerField(default=6, help_text="Keep one backup per month"),
+                ),
+                (
+                    "last_run_at",
+                    models.DateTimeField(blank=True, help_text="Last scheduled run", null=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Application this policy applies to",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="backup_policies",
+                        to="applications.application",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        help_text="User who owns this policy",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="backup_policies",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Backup Policy",
+                "verbose_name_plural": "Backup Policies",
+                "db_table": "backup_policies",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="backup",
+            name="policy",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Policy that created this backup (None for manual backups)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="backups",
+                to="backups.backuppolicy",
+            ),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0005_add_state_changed_at"),
+        ("backups", "0003_backup_policies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackupExport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "file_name",
+                    models.CharField(help_text="Archive filename", max_length=500),
+                ),
+                ("backup_type", models.CharField(default="snapshot", max_length=50)),
+                ("compression", models.CharField(default="zstd", max_length=20)),
+                (
+                    "target",
+                    models.CharField(
+                        help_text="Export target kind: s3 or filesystem", max_length=20
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Object key / relative path on the target",
+                        max_length=500,
+                    ),
+                ),
+                (
+                    "upload_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="Multipart upload in progress",
+                        max_length=255,
+                        null=True,
+                    ),
+                ),
+                ("part_size", models.BigIntegerField(help_text="Part size in bytes")),
+                (
+                    "parts",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Uploaded parts: [part_number, size, sha256, etag]",
+                    ),
+                ),
+                (
+                    "size",
+                    models.BigIntegerField(default=0, help_text="Archive size in bytes"),
+                ),
+                (
+                    "checksum",
+                    models.CharField(
+                        blank=True,
+                        help_text="SHA-256 over the part digests",
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("uploading", "Uploading"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("importing", "Importing"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        help_text="Current export status",
+                        max_length=50,
+                    ),
+                ),
+                ("error_message", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        help_text="The application the archive belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="backup_exports",
+                        to="applications.application",
+                    ),
+                ),
+                (
+                    "backup",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Source backup (kept as None once the backup is pruned)",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="exports",
+                        to="backups.backup",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Backup Export",
+                "verbose_name_plural": "Backup Exports",
+                "db_table": "backup_exports",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
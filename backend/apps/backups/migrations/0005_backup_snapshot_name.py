@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backups", "0004_backup_exports"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="backup",
+            name="snapshot_name",
+            field=models.CharField(
+                blank=True,
+                help_text="Container snapshot taken alongside this backup (enables rollback restores)",
+                max_length=40,
+                null=True,
+            ),
+        ),
+    ]
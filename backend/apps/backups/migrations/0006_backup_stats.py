@@ -0,0 +1,89 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def populate_backup_stats(apps, schema_editor):
+    """Materialize counters for applications that already have backups."""
+    Backup = apps.get_model("backups", "Backup")
+    BackupStats = apps.get_model("backups", "BackupStats")
+
+    rows = (
+        Backup.objects.values("application_id")
+        .annotate(
+            total_backups=Count("id"),
+            completed_backups=Count("id", filter=Q(status="completed")),
+            failed_backups=Count("id", filter=Q(status="failed")),
+            in_progress_backups=Count(
+                "id", filter=Q(status__in=["creating", "restoring", "deleting"])
+            ),
+            total_size=Sum("size", filter=Q(status="completed")),
+            last_backup_at=Max("completed_at", filter=Q(status="completed")),
+        )
+        .order_by()
+    )
+    BackupStats.objects.bulk_create(
+        [
+            BackupStats(
+                application_id=row["application_id"],
+                total_backups=row["total_backups"],
+                completed_backups=row["completed_backups"],
+                failed_backups=row["failed_backups"],
+                in_progress_backups=row["in_progress_backups"],
+                total_size=row["total_size"] or 0,
+                last_backup_at=row["last_backup_at"],
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0005_add_state_changed_at"),
+        ("backups", "0005_backup_snapshot_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackupStats",
+            fields=[
+                (
+                    "application",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="backup_stats",
+                        serialize=False,
+                        to="applications.application",
+                    ),
+                ),
+                ("total_backups", models.PositiveIntegerField(default=0)),
+                ("completed_backups", models.PositiveIntegerField(default=0)),
+                ("failed_backups", models.PositiveIntegerField(default=0)),
+                ("in_progress_backups", models.PositiveIntegerField(default=0)),
+                (
+                    "total_size",
+                    models.BigIntegerField(default=0, help_text="Bytes of completed backups"),
+                ),
+                (
+                    "last_backup_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the newest completed backup finished",
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Backup Stats",
+                "verbose_name_plural": "Backup Stats",
+                "db_table": "backup_stats",
+            },
+        ),
+        migrations.RunPython(populate_backup_stats, migrations.RunPython.noop),
+    ]
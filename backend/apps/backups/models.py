@@ -2,10 +2,80 @@
 Backup models - Application backup management
 """
 
+from django.conf import settings
 from django.db import models
 from apps.applications.models import Application
 
 
+class BackupPolicy(models.Model):
+    """
+    Scheduled backup policy with retention.
+
+    Applies either to one application or to every application of the owner
+    whose catalog entry belongs to catalog_category.
+    """
+
+    name = models.CharField(max_length=100, help_text="Policy name")
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="backup_policies",
+        help_text="User who owns this policy",
+    )
+
+    # Target: one application, or a catalog category
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="backup_policies",
+        help_text="Application this policy applies to",
+    )
+    catalog_category = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        help_text="Catalog category this policy applies to (e.g. Database)",
+    )
+
+    # Schedule
+    schedule = models.CharField(
+        max_length=100,
+        default="0 3 * * *",
+        help_text="Cron expression: minute hour day-of-month month day-of-week",
+    )
+    window_minutes = models.PositiveIntegerField(
+        default=60, help_text="Backups of one run are spread over this many minutes"
+    )
+    enabled = models.BooleanField(default=True, db_index=True)
+
+    # Backup options
+    backup_type = models.CharField(max_length=50, default="snapshot", help_text="Backup mode")
+    compression = models.CharField(max_length=20, default="zstd", help_text="Compression")
+    incremental = models.BooleanField(default=False, help_text="Use the chunk store")
+
+    # Retention (0 disables a rule; all zero keeps everything)
+    keep_last = models.PositiveIntegerField(default=0, help_text="Keep the N newest backups")
+    keep_daily = models.PositiveIntegerField(default=7, help_text="Keep one backup per day")
+    keep_weekly = models.PositiveIntegerField(default=4, help_text="Keep one backup per week")
+    keep_monthly = models.PositiveIntegerField(default=6, help_text="Keep one backup per month")
+
+    last_run_at = models.DateTimeField(null=True, blank=True, help_text="Last scheduled run")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "backup_policies"
+        verbose_name = "Backup Policy"
+        verbose_name_plural = "Backup Policies"
+        ordering = ["name"]
+
+    def __str__(self):
+        target = self.application_id or f"category:{self.catalog_category}"
+        return f"{self.name} ({target}, {self.schedule})"
+
+
 class Backup(models.Model):
     """
     Application backup record.
@@ -18,6 +88,14 @@ class Backup(models.Model):
         related_name="backups",
         help_text="The application this backup belongs to",
     )
+    policy = models.ForeignKey(
+        BackupPolicy,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="backups",
+        help_text="Policy that created this backup (None for manual backups)",
+    )
 
     # File information
     file_name = models.CharField(max_length=500, help_text="Backup filename on Proxmox storage")
@@ -25,6 +103,22 @@ class Backup(models.Model):
         max_length=100, default="local", help_text="Proxmox storage name where backup is stored"
     )
     size = models.BigIntegerField(null=True, blank=True, help_text="Backup size in bytes")
+    stored_size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Bytes this backup added to the chunk store (incremental backups only)",
+    )
+    manifest = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Chunk manifest of an incremental backup (None for full vzdump archives)",
+    )
+    snapshot_name = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True,
+        help_text="Container snapshot taken alongside this backup (enables rollback restores)",
+    )
 
     # Backup metadata
     backup_type = models.CharField(
@@ -44,6 +138,7 @@ class Backup(models.Model):
             ("zstd", "Zstandard"),
             ("gzip", "Gzip"),
             ("lzo", "LZO"),
+            ("none", "None"),
         ],
         help_text="Compression algorithm",
     )
@@ -104,6 +199,11 @@ class Backup(models.Model):
             return round(self.size / (1024 * 1024 * 1024), 2)
         return 0.0
 
+    @property
+    def is_incremental(self) -> bool:
+        """Check if backup lives in the chunk store rather than as a vzdump archive."""
+        return self.manifest is not None
+
     @property
     def is_completed(self) -> bool:
         """Check if backup is completed and available for restore."""
@@ -113,3 +213,124 @@ class Backup(models.Model):
     def is_in_progress(self) -> bool:
         """Check if backup operation is in progress."""
         return self.status in ["creating", "restoring", "deleting"]
+
+
+class BackupExport(models.Model):
+    """
+    Off-node copy of a backup archive on an external target (S3 or filesystem).
+
+    The archive is uploaded in fixed-size parts; every finished part is
+    recorded, so an interrupted export resumes after the last stored part.
+    """
+
+    backup = models.ForeignKey(
+        Backup,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="exports",
+        help_text="Source backup (kept as None once the backup is pruned)",
+    )
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name="backup_exports",
+        help_text="The application the archive belongs to",
+    )
+
+    # Archive identity (copied from the backup so the export outlives it)
+    file_name = models.CharField(max_length=500, help_text="Archive filename")
+    backup_type = models.CharField(max_length=50, default="snapshot")
+    compression = models.CharField(max_length=20, default="zstd")
+
+    # Target location
+    target = models.CharField(max_length=20, help_text="Export target kind: s3 or filesystem")
+    key = models.CharField(max_length=500, help_text="Object key / relative path on the target")
+    upload_id = models.CharField(
+        max_length=255, null=True, blank=True, help_text="Multipart upload in progress"
+    )
+
+    # Transfer state
+    part_size = models.BigIntegerField(help_text="Part size in bytes")
+    parts = models.JSONField(
+        default=list, blank=True, help_text="Uploaded parts: [part_number, size, sha256, etag]"
+    )
+    size = models.BigIntegerField(default=0, help_text="Archive size in bytes")
+    checksum = models.CharField(
+        max_length=64, null=True, blank=True, help_text="SHA-256 over the part digests"
+    )
+
+    status = models.CharField(
+        max_length=50,
+        default="pending",
+        db_index=True,
+        choices=[
+            ("pending", "Pending"),
+            ("uploading", "Uploading"),
+            ("completed", "Completed"),
+            ("failed", "Failed"),
+            ("importing", "Importing"),
+        ],
+        help_text="Current export status",
+    )
+    error_message = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "backup_exports"
+        verbose_name = "Backup Export"
+        verbose_name_plural = "Backup Exports"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.file_name} -> {self.target}:{self.key} ({self.status})"
+
+    @property
+    def uploaded_bytes(self) -> int:
+        """Bytes already stored on the target."""
+        return sum(part[1] for part in self.parts)
+
+
+class BackupStats(models.Model):
+    """
+    Denormalized per-application backup counters.
+
+    Kept in sync with the Backup table by apps.backups.stats so dashboards
+    read one row per application instead of aggregating backups per request.
+    """
+
+    application = models.OneToOneField(
+        Application,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="backup_stats",
+    )
+
+    total_backups = models.PositiveIntegerField(default=0)
+    completed_backups = models.PositiveIntegerField(default=0)
+    failed_backups = models.PositiveIntegerField(default=0)
+    in_progress_backups = models.PositiveIntegerField(default=0)
+    total_size = models.BigIntegerField(default=0, help_text="Bytes of completed backups")
+    last_backup_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the newest completed backup finished"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "backup_stats"
+        verbose_name = "Backup Stats"
+        verbose_name_plural = "Backup Stats"
+
+    def __str__(self):
+        return f"{self.application_id}: {self.completed_backups}/{self.total_backups} backups"
+
+    @property
+    def average_size(self) -> float:
+        """Average size of completed backups in bytes."""
+        if self.completed_backups:
+            return self.total_size / self.completed_backups
+        return 0.0
@@ -0,0 +1,259 @@
+"""
+Backup policies - scheduled backups with staggered execution and pruning.
+
+run_due_policies() is called every few minutes by Celery beat. For every
+policy whose cron schedule fired since its last run it queues one backup per
+target application, spread over the policy's window so that a node never gets
+all of its backups at the same moment. create_backup_task is additionally
+throttled per node (NODE_MAX_CONCURRENT_JOBS), so the window only shapes load,
+it never lets a node exceed its cap.
+
+prune_policy_backups() applies each policy's retention rules to the backups
+that policy created (manual backups are never pruned) and deletes the
+surplus in batches.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from celery.schedules import crontab
+from django.conf import settings
+from django.utils import timezone
+
+from apps.proxmox import ProxmoxService
+from apps.applications.models import Application
+from apps.backups.backup_index import forget_backup
+from apps.backups.incremental import CHUNK_STORE_STORAGE
+from apps.backups.models import Backup, BackupPolicy
+from apps.backups.retention import select_backups_to_prune
+from apps.backups.stats import refresh_backup_stats
+
+logger = logging.getLogger(__name__)
+
+# Applications in these states can be backed up
+BACKUPABLE_STATUSES = ("running", "stopped")
+
+
+def parse_schedule(expression: str, now: Optional[datetime] = None) -> crontab:
+    """
+    Parse a 5-field cron expression.
+
+    Args:
+        expression: "minute hour day-of-month month day-of-week"
+        now: Reference time for due checks (defaults to the current time)
+
+    Returns:
+        celery crontab schedule
+
+    Raises:
+        ValueError: If the expression is not a valid 5-field cron expression
+    """
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron expression must have 5 fields, got {len(fields)}")
+
+    minute, hour, day_of_month, month_of_year, day_of_week = fields
+    return crontab(
+        minute=minute,
+        hour=hour,
+        day_of_month=day_of_month,
+        month_of_year=month_of_year,
+        day_of_week=day_of_week,
+        nowfun=(lambda: now) if now else None,
+    )
+
+
+def is_policy_due(policy: BackupPolicy, now: datetime) -> bool:
+    """Check if the policy's schedule fired since its last run (or creation)."""
+    last_run = policy.last_run_at or policy.created_at
+    try:
+        return parse_schedule(policy.schedule, now).is_due(last_run).is_due
+    except ValueError as e:
+        logger.error(f"Backup policy {policy.id} has an invalid schedule: {e}")
+        return False
+
+
+def resolve_policy_targets(policy: BackupPolicy) -> List[Application]:
+    """Get the applications a policy currently covers."""
+    apps = Application.objects.filter(owner=policy.owner, status__in=BACKUPABLE_STATUSES)
+
+    if policy.application_id:
+        return list(apps.filter(id=policy.application_id))
+
+    from apps.catalog.services import catalog_service
+
+    catalog_ids = [app.id for app in catalog_service.filter_by_category(policy.catalog_category)]
+    return list(apps.filter(catalog_id__in=catalog_ids))
+
+
+def stagger_runs(apps: Iterable[Application], window_seconds: int) -> List[Tuple[Any, int]]:
+    """
+    Assign each application a start delay within the window.
+
+    Backups of one node are spaced evenly across the window, and nodes are
+    phase-shifted against each other so shared storage does not see every
+    node's first backup at once.
+
+    Returns:
+        List of (application, countdown seconds), ordered by countdown
+    """
+    by_node: Dict[Tuple, List[Application]] = defaultdict(list)
+    for app in apps:
+        by_node[(app.host_id, app.node)].append(app)
+
+    runs = []
+    node_count = len(by_node)
+    for node_index, node_apps in enumerate(by_node.values()):
+        spacing = window_seconds / len(node_apps)
+        phase = spacing * node_index / node_count
+        for position, app in enumerate(node_apps):
+            runs.append((app, int(phase + position * spacing)))
+
+    return sorted(runs, key=lambda run: run[1])
+
+
+def run_due_policies(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Queue backups for every enabled policy that is due.
+
+    Returns:
+        Dictionary with the number of policies run and backups queued
+    """
+    from apps.backups.tasks import create_backup_task
+
+    now = now or timezone.now()
+    policies = [
+        policy for policy in BackupPolicy.objects.filter(enabled=True) if is_policy_due(policy, now)
+    ]
+
+    queued = 0
+    for policy in policies:
+        apps = resolve_policy_targets(policy)
+        busy = set(
+            Backup.objects.filter(
+                application__in=apps, status__in=["creating", "restoring"]
+            ).values_list("application_id", flat=True)
+        )
+
+        for app, countdown in stagger_runs(
+            [app for app in apps if app.id not in busy], policy.window_minutes * 60
+        ):
+            backup = Backup.objects.create(
+                application=app,
+                policy=policy,
+                file_name="",  # Will be filled by task
+                storage_name=CHUNK_STORE_STORAGE if policy.incremental else "local",
+                backup_type=policy.backup_type,
+                compression="none" if policy.incremental else policy.compression,
+                status="creating",
+            )
+            create_backup_task.apply_async(
+                kwargs={
+                    "application_id": app.id,
+                    "backup_type": policy.backup_type,
+                    "compression": policy.compression,
+                    "incremental": policy.incremental,
+                    "backup_id": backup.id,
+                },
+                countdown=countdown,
+            )
+            queued += 1
+
+        if busy:
+            logger.info(f"Backup policy {policy.name}: skipped {len(busy)} busy app(s)")
+
+        policy.last_run_at = now
+        policy.save(update_fields=["last_run_at", "updated_at"])
+
+    if policies:
+        logger.info(f"🗓️  Ran {len(policies)} backup policy(ies), queued {queued} backup(s)")
+
+    return {"policies_run": len(policies), "backups_queued": queued}
+
+
+def prune_policy_backups(batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Apply retention of every enabled policy and delete pruned backups.
+
+    Args:
+        batch_size: Backups deleted per batch (defaults to BACKUP_PRUNE_BATCH_SIZE)
+
+    Returns:
+        Dictionary with deleted and failed counts
+    """
+    to_prune: List[Backup] = []
+
+    for policy in BackupPolicy.objects.filter(enabled=True):
+        per_app: Dict[str, List[Backup]] = defaultdict(list)
+        for backup in Backup.objects.filter(policy=policy, status="completed").select_related(
+            "application"
+        ):
+            per_app[backup.application_id].append(backup)
+
+        for backups in per_app.values():
+            _, pruned = select_backups_to_prune(
+                backups,
+                keep_last=policy.keep_last,
+                keep_daily=policy.keep_daily,
+                keep_weekly=policy.keep_weekly,
+                keep_monthly=policy.keep_monthly,
+            )
+            to_prune.extend(pruned)
+
+    if not to_prune:
+        return {"deleted": 0, "failed": 0}
+
+    return delete_backups_in_batches(to_prune, batch_size or settings.BACKUP_PRUNE_BATCH_SIZE)
+
+
+def delete_backups_in_batches(backups: List[Backup], batch_size: int) -> Dict[str, Any]:
+    """
+    Delete backup archives and records, batch by batch.
+
+    Archives are removed with delete_backup_file using one ProxmoxService per
+    host; records are removed with one query per batch. Incremental backups
+    only lose their record (chunks are reclaimed by gc_chunk_store_task).
+
+    Returns:
+        Dictionary with deleted and failed counts
+    """
+    deleted = 0
+    failed = 0
+    services: Dict[int, ProxmoxService] = {}
+
+    for start in range(0, len(backups), batch_size):
+        batch = backups[start : start + batch_size]
+        Backup.objects.filter(id__in=[b.id for b in batch]).update(status="deleting")
+
+        done = []
+        for backup in batch:
+            app = backup.application
+            if not backup.is_incremental:
+                proxmox = services.setdefault(app.host_id, ProxmoxService(host_id=app.host_id))
+                try:
+                    proxmox.delete_backup_file(app.node, backup.storage_name, backup.file_name)
+                except Exception as e:
+                    error_msg = str(e).lower()
+                    if "not found" not in error_msg and "does not exist" not in error_msg:
+                        logger.warning(f"Failed to prune backup {backup.id}: {e}")
+                        failed += 1
+                        continue
+                forget_backup(
+                    app.host_id,
+                    app.node,
+                    backup.storage_name,
+                    f"{backup.storage_name}:backup/{backup.file_name}",
+                )
+            done.append(backup.id)
+
+        Backup.objects.filter(id__in=done).delete()
+        Backup.objects.filter(id__in=[b.id for b in batch], status="deleting").update(
+            status="completed"
+        )
+        refresh_backup_stats({b.application_id for b in batch})
+        deleted += len(done)
+
+    logger.info(f"🧹 Pruned {deleted} backup(s), {failed} failed")
+    return {"deleted": deleted, "failed": failed}
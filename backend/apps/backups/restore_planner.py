@@ -0,0 +1,268 @@
+"""
+Restore planner - picks the fastest safe way to bring a container back.
+
+A vzdump restore rewrites the whole root filesystem and takes minutes on big
+containers. When the container still has a storage snapshot (ZFS, LVM-thin,
+Ceph, btrfs) taken right after the selected backup, rolling back to it
+reaches the same state in seconds.
+
+Every backup takes such a companion snapshot when BACKUP_COMPANION_SNAPSHOTS
+is on (its name is stored on the Backup). Any other snapshot taken within
+RESTORE_SNAPSHOT_MAX_GAP seconds after the backup is accepted too. If no
+snapshot qualifies, or the rollback is refused (ZFS only rolls back to the
+newest snapshot), the restore falls back to vzdump.
+
+A rollback discards the current state, so it is preceded by a pre-operation
+snapshot (AUTO_SNAPSHOT_BEFORE_RESTORE) that keeps the discarded state around.
+vzdump restores replace the container's volumes, snapshots included, so
+they get no pre-operation snapshot. Their archive is looked up in the backup
+index first, so a restore from an archive deleted on the storage fails before
+the container is stopped.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from redis import RedisError
+
+from apps.backups.backup_index import find_backup
+from apps.proxmox import ProxmoxError
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_AUTO = "auto"
+STRATEGY_SNAPSHOT = "snapshot_rollback"
+STRATEGY_VZDUMP = "vzdump_restore"
+
+# Proxmox snapshot names: start with a letter, max 40 characters
+AUTO_SNAPSHOT_PREFIX = "proximity-pre-"
+COMPANION_SNAPSHOT_PREFIX = "proximity-bk-"
+
+
+def _backup_epoch(backup) -> float:
+    return (backup.completed_at or backup.created_at).timestamp()
+
+
+def plan_restore(proxmox, backup, strategy: str = STRATEGY_AUTO) -> Dict[str, Any]:
+    """
+    Decide how to restore an application from a backup.
+
+    Args:
+        proxmox: ProxmoxService for the application's host
+        backup: Completed Backup to restore
+        strategy: "auto", "snapshot_rollback" (fail if impossible) or
+            "vzdump_restore" (never roll back)
+
+    Returns:
+        Dictionary with 'strategy' (snapshot_rollback or vzdump_restore),
+        'snapshot' (name or None) and 'reason'
+
+    Raises:
+        ValueError: If snapshot_rollback is forced but no snapshot qualifies
+    """
+    if strategy == STRATEGY_VZDUMP:
+        _check_archive(proxmox, backup)
+        return {"strategy": STRATEGY_VZDUMP, "snapshot": None, "reason": "vzdump restore requested"}
+
+    app = backup.application
+    try:
+        snapshots = proxmox.list_snapshots(app.node, app.lxc_id)
+    except ProxmoxError as e:
+        logger.warning(f"Could not list snapshots of LXC {app.lxc_id}: {e}")
+        snapshots = []
+
+    backup_time = _backup_epoch(backup)
+    candidate = None
+    reason = "no snapshot matches the backup"
+
+    for snap in snapshots:
+        if backup.snapshot_name and snap.get("name") == backup.snapshot_name:
+            candidate = snap
+            reason = "companion snapshot of the backup is still present"
+            break
+
+    if candidate is None:
+        # Oldest snapshot taken after the backup within the allowed gap
+        # (pre-operation snapshots hold later, discarded states and never qualify)
+        matching = [
+            snap
+            for snap in snapshots
+            if not snap.get("name", "").startswith(AUTO_SNAPSHOT_PREFIX)
+            and 0 <= snap.get("snaptime", 0) - backup_time <= settings.RESTORE_SNAPSHOT_MAX_GAP
+        ]
+        if matching:
+            candidate = min(matching, key=lambda snap: snap["snaptime"])
+            reason = f"snapshot taken {int(candidate['snaptime'] - backup_time)}s after the backup"
+
+    if candidate is None:
+        if strategy == STRATEGY_SNAPSHOT:
+            raise ValueError(f"Snapshot rollback is not possible: {reason}")
+        _check_archive(proxmox, backup)
+        return {"strategy": STRATEGY_VZDUMP, "snapshot": None, "reason": reason}
+
+    return {"strategy": STRATEGY_SNAPSHOT, "snapshot": candidate["name"], "reason": reason}
+
+
+def _check_archive(proxmox, backup) -> None:
+    """
+    Make sure the vzdump archive of a backup is still on its storage.
+
+    Raises:
+        ValueError: If the storage no longer holds the archive
+    """
+    if backup.is_incremental:
+        return  # Restored from the chunk store, not from a storage archive
+
+    app = backup.application
+    volid = f"{backup.storage_name}:backup/{backup.file_name}"
+    try:
+        entry = find_backup(proxmox, app.host_id, app.node, backup.storage_name, volid)
+    except (ProxmoxError, RedisError) as e:
+        # Storage or index unavailable: let the restore itself report real problems
+        logger.warning(f"Could not check backup archive {volid}: {e}")
+        return
+    if entry is None:
+        raise ValueError(f"Backup archive {volid} is no longer on storage {backup.storage_name}")
+
+
+def _create_snapshot(proxmox, app, name: str, description: str) -> Optional[str]:
+    """Create a snapshot and wait for it; None if the storage cannot snapshot."""
+    try:
+        upid = proxmox.create_snapshot(app.node, app.lxc_id, name, description=description)
+        proxmox.wait_for_task(app.node, upid, timeout=300, poll_interval=1)
+        return name
+    except ProxmoxError as e:
+        logger.warning(f"Could not snapshot LXC {app.lxc_id} ({name}): {e}")
+        return None
+
+
+def _prune_snapshots(proxmox, app, prefix: str, keep: int) -> None:
+    """Delete all but the newest `keep` snapshots whose name starts with prefix."""
+    try:
+        ours = [
+            snap
+            for snap in proxmox.list_snapshots(app.node, app.lxc_id)
+            if snap.get("name", "").startswith(prefix)
+        ]
+        for snap in ours[keep:]:
+            upid = proxmox.delete_snapshot(app.node, app.lxc_id, snap["name"])
+            proxmox.wait_for_task(app.node, upid, timeout=300, poll_interval=1)
+    except ProxmoxError as e:
+        logger.warning(f"Could not prune snapshots of LXC {app.lxc_id}: {e}")
+
+
+def take_companion_snapshot(proxmox, backup) -> Optional[str]:
+    """
+    Snapshot the container right after a backup so it can be restored by rollback.
+
+    Only the newest companion snapshot is kept: storage snapshots pin changed
+    blocks, and ZFS can only roll back to the newest snapshot anyway.
+
+    Returns:
+        Snapshot name, or None if snapshots are disabled or unsupported
+    """
+    if not settings.BACKUP_COMPANION_SNAPSHOTS:
+        return None
+
+    app = backup.application
+    name = _create_snapshot(
+        proxmox,
+        app,
+        f"{COMPANION_SNAPSHOT_PREFIX}{backup.id}",
+        f"Proximity: state of backup {backup.id}",
+    )
+    if name:
+        _prune_snapshots(proxmox, app, COMPANION_SNAPSHOT_PREFIX, keep=1)
+    return name
+
+
+def take_pre_operation_snapshot(proxmox, app, operation: str) -> Optional[str]:
+    """
+    Snapshot the container before a destructive operation.
+
+    Returns:
+        Snapshot name, or None if auto snapshots are disabled or unsupported
+    """
+    if not settings.AUTO_SNAPSHOT_BEFORE_RESTORE:
+        return None
+
+    name = _create_snapshot(
+        proxmox,
+        app,
+        f"{AUTO_SNAPSHOT_PREFIX}{timezone.now():%Y%m%d%H%M%S}",
+        f"Proximity: before {operation}",
+    )
+    if name:
+        _prune_snapshots(proxmox, app, AUTO_SNAPSHOT_PREFIX, keep=settings.AUTO_SNAPSHOT_KEEP)
+    return name
+
+
+def execute_restore(proxmox, backup, plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Carry out a restore plan, falling back to vzdump if the rollback fails.
+
+    Args:
+        proxmox: ProxmoxService for the application's host
+        backup: Backup being restored
+        plan: Result of plan_restore
+
+    Returns:
+        Dictionary with 'restore_path' actually taken, 'snapshot',
+        'pre_restore_snapshot', 'reason' and 'duration_seconds'
+    """
+    from apps.backups.incremental import IncrementalBackupEngine
+
+    app = backup.application
+    started = timezone.now()
+    result = {
+        "restore_path": plan["strategy"],
+        "snapshot": plan["snapshot"],
+        "pre_restore_snapshot": None,
+        "reason": plan["reason"],
+    }
+
+    if plan["strategy"] == STRATEGY_SNAPSHOT:
+        pre_snapshot = take_pre_operation_snapshot(proxmox, app, f"restore of backup {backup.id}")
+        try:
+            try:
+                proxmox.rollback_snapshot(app.node, app.lxc_id, plan["snapshot"])
+            except ProxmoxError:
+                if not pre_snapshot:
+                    raise
+                # ZFS only rolls back to the newest snapshot: drop ours and retry
+                upid = proxmox.delete_snapshot(app.node, app.lxc_id, pre_snapshot)
+                proxmox.wait_for_task(app.node, upid, timeout=300, poll_interval=1)
+                pre_snapshot = None
+                proxmox.rollback_snapshot(app.node, app.lxc_id, plan["snapshot"])
+            result["pre_restore_snapshot"] = pre_snapshot
+        except ProxmoxError as e:
+            logger.warning(f"Snapshot rollback of LXC {app.lxc_id} failed, using vzdump: {e}")
+            result["restore_path"] = STRATEGY_VZDUMP
+            result["snapshot"] = None
+            result["reason"] = f"rollback failed: {e}"
+
+    if result["restore_path"] == STRATEGY_VZDUMP:
+        if backup.is_incremental:
+            IncrementalBackupEngine(proxmox).restore(
+                node_name=app.node,
+                vmid=app.lxc_id,
+                file_name=backup.file_name,
+                manifest=backup.manifest,
+            )
+        else:
+            proxmox.restore_lxc_backup(
+                node_name=app.node,
+                vmid=app.lxc_id,
+                backup_file=backup.file_name,
+                storage=backup.storage_name,
+                force=True,
+            )
+
+    result["duration_seconds"] = round((timezone.now() - started).total_seconds(), 1)
+    logger.info(
+        f"⏪ Restored LXC {app.lxc_id} via {result['restore_path']} "
+        f"in {result['duration_seconds']}s ({result['reason']})"
+    )
+    return result
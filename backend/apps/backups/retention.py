@@ -0,0 +1,74 @@
+"""
+Backup retention - keep-last/daily/weekly/monthly pruning selection.
+
+Follows the Proxmox prune semantics: rules are applied in order (last, daily,
+weekly, monthly); each rule keeps the newest backup of each of its N most
+recent periods, skipping periods already covered by a backup an earlier rule
+kept. Everything no rule keeps is pruned.
+"""
+
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+def _mark(
+    backups: Sequence,
+    marks: Dict[int, bool],
+    keep: int,
+    period_of: Callable[[object], Tuple],
+) -> None:
+    if keep <= 0:
+        return
+
+    covered = {period_of(b) for b in backups if marks.get(b.id) is True}
+    selected = set()
+
+    for backup in backups:
+        if backup.id in marks:
+            continue
+        period = period_of(backup)
+        if period in covered:
+            continue
+        if period not in selected:
+            if len(selected) >= keep:
+                break
+            selected.add(period)
+            marks[backup.id] = True
+        else:
+            marks[backup.id] = False
+
+
+def select_backups_to_prune(
+    backups: Iterable,
+    keep_last: int = 0,
+    keep_daily: int = 0,
+    keep_weekly: int = 0,
+    keep_monthly: int = 0,
+) -> Tuple[List, List]:
+    """
+    Split backups into the ones to keep and the ones to prune.
+
+    Args:
+        backups: Completed backups (objects with id and created_at)
+        keep_last: Keep the N newest backups
+        keep_daily: Keep the newest backup of each of the last N days
+        keep_weekly: Keep the newest backup of each of the last N ISO weeks
+        keep_monthly: Keep the newest backup of each of the last N months
+
+    Returns:
+        Tuple of (kept, pruned), both newest first. If every rule is 0 nothing
+        is pruned.
+    """
+    ordered = sorted(backups, key=lambda b: b.created_at, reverse=True)
+
+    if not any((keep_last, keep_daily, keep_weekly, keep_monthly)):
+        return ordered, []
+
+    marks: Dict[int, bool] = {}
+    _mark(ordered, marks, keep_last, lambda b: (b.id,))
+    _mark(ordered, marks, keep_daily, lambda b: (b.created_at.date(),))
+    _mark(ordered, marks, keep_weekly, lambda b: tuple(b.created_at.isocalendar())[:2])
+    _mark(ordered, marks, keep_monthly, lambda b: (b.created_at.year, b.created_at.month))
+
+    kept = [b for b in ordered if marks.get(b.id) is True]
+    pruned = [b for b in ordered if marks.get(b.id) is not True]
+    return kept, pruned
@@ -19,6 +19,9 @@ class BackupSchema(BaseModel):
     size: Optional[int] = None
     size_mb: Optional[float] = None
     size_gb: Optional[float] = None
+    stored_size: Optional[int] = None
+    is_incremental: bool = False
+    snapshot_name: Optional[str] = None
     backup_type: str
     compression: str
     status: str
@@ -61,6 +64,10 @@ class BackupCreateRequest(BaseModel):
     compression: str = Field(
         default="zstd", description="Compression algorithm: zstd, gzip, or lzo"
     )
+    incremental: bool = Field(
+        default=False,
+        description="Store as deduplicated chunks; only data changed since earlier backups is stored",
+    )
 
 
 class BackupCreateResponse(BaseModel):
@@ -78,6 +85,16 @@ class BackupRestoreResponse(BaseModel):
     application_id: str
     status: str
     message: str
+    restore_path: Optional[str] = None
+
+
+class BackupRestorePlanSchema(BaseModel):
+    """Schema for the restore path a backup would take."""
+
+    backup_id: int
+    strategy: str
+    snapshot: Optional[str] = None
+    reason: str
 
 
 class BackupDeleteResponse(BaseModel):
@@ -97,3 +114,107 @@ class BackupStatsSchema(BaseModel):
     in_progress_backups: int
     total_size_gb: float
     average_size_mb: float
+    last_backup_at: Optional[datetime] = None
+
+
+class BulkBackupStatsSchema(BaseModel):
+    """Schema for backup statistics of many applications, keyed by application ID."""
+
+    stats: dict[str, BackupStatsSchema]
+
+
+class BackupPolicySchema(BaseModel):
+    """Schema for backup policy responses."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    application_id: Optional[str] = None
+    catalog_category: Optional[str] = None
+    schedule: str
+    window_minutes: int
+    enabled: bool
+    backup_type: str
+    compression: str
+    incremental: bool
+    keep_last: int
+    keep_daily: int
+    keep_weekly: int
+    keep_monthly: int
+    last_run_at: Optional[datetime] = None
+    created_at: datetime
+
+
+class BackupPolicyCreateRequest(BaseModel):
+    """Request schema for creating a backup policy."""
+
+    name: str = Field(..., min_length=1, max_length=100)
+    application_id: Optional[str] = Field(default=None, description="Target application")
+    catalog_category: Optional[str] = Field(
+        default=None, description="Target catalog category (instead of application_id)"
+    )
+    schedule: str = Field(
+        default="0 3 * * *", description="Cron expression (minute hour dom month dow)"
+    )
+    window_minutes: int = Field(
+        default=60, ge=1, le=1440, description="Spread the run's backups over this many minutes"
+    )
+    enabled: bool = True
+    backup_type: str = Field(default="snapshot", description="snapshot, suspend, or stop")
+    compression: str = Field(default="zstd", description="zstd, gzip, or lzo")
+    incremental: bool = False
+    keep_last: int = Field(default=0, ge=0)
+    keep_daily: int = Field(default=7, ge=0)
+    keep_weekly: int = Field(default=4, ge=0)
+    keep_monthly: int = Field(default=6, ge=0)
+
+
+class BackupPolicyListSchema(BaseModel):
+    """Schema for list of backup policies."""
+
+    policies: list[BackupPolicySchema]
+    total: int
+
+
+class BackupExportSchema(BaseModel):
+    """Schema for backup export responses."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    backup_id: Optional[int] = None
+    application_id: str
+    file_name: str
+    target: str
+    key: str
+    size: int
+    uploaded_bytes: int
+    checksum: Optional[str] = None
+    status: str
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class BackupExportListSchema(BaseModel):
+    """Schema for list of backup exports."""
+
+    exports: list[BackupExportSchema]
+    total: int
+
+
+class BackupExportRequest(BaseModel):
+    """Request schema for exporting a backup."""
+
+    target: Optional[str] = Field(
+        default=None, description="Export target: s3 or filesystem (defaults to configured)"
+    )
+
+
+class BackupImportRequest(BaseModel):
+    """Request schema for importing an exported backup."""
+
+    restore: bool = Field(
+        default=False, description="Restore the application once the archive is imported"
+    )
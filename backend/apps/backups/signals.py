@@ -0,0 +1,29 @@
+"""
+Backup signals that keep the materialized BackupStats in sync.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.applications.models import Application
+from apps.backups.models import Backup
+from apps.backups.stats import refresh_backup_stats
+
+
+@receiver(post_save, sender=Backup)
+def update_stats_on_backup_save(sender, instance, **kwargs):
+    """Recompute the application's backup counters after a backup changes."""
+    refresh_backup_stats([instance.application_id])
+
+
+@receiver(post_delete, sender=Backup)
+def update_stats_on_backup_delete(sender, instance, origin=None, **kwargs):
+    """
+    Recompute the application's backup counters after a backup is deleted.
+
+    Skipped when the application itself is being deleted: its stats row goes
+    away in the same cascade.
+    """
+    if isinstance(origin, Application):
+        return
+    refresh_backup_stats([instance.application_id])
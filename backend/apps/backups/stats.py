@@ -0,0 +1,131 @@
+"""
+Materialized backup statistics.
+
+BackupStats holds per-application counters so the app grid can render
+backup badges from a single query. Counters are recomputed from the Backup
+table inside the writer's transaction, with the stats row locked, whenever
+backups of an application change (see apps.backups.signals). Bulk queryset
+updates bypass signals, so their callers refresh the affected applications
+explicitly.
+"""
+
+import logging
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.backups.models import Backup, BackupStats
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS_STATUSES = ("creating", "restoring", "deleting")
+
+
+def _aggregate(application_ids: List[str]) -> Dict[str, dict]:
+    """Counters for the given applications, computed in one grouped query."""
+    rows = (
+        Backup.objects.filter(application_id__in=application_ids)
+        .values("application_id")
+        .annotate(
+            total_backups=Count("id"),
+            completed_backups=Count("id", filter=Q(status="completed")),
+            failed_backups=Count("id", filter=Q(status="failed")),
+            in_progress_backups=Count("id", filter=Q(status__in=IN_PROGRESS_STATUSES)),
+            total_size=Sum("size", filter=Q(status="completed")),
+            last_backup_at=Max("completed_at", filter=Q(status="completed")),
+        )
+        .order_by()
+    )
+    return {row.pop("application_id"): row for row in rows}
+
+
+def refresh_backup_stats(application_ids: Iterable[str]) -> None:
+    """
+    Recompute the stats rows of the given applications.
+
+    Runs in (or joins) a transaction and locks the stats rows first, so
+    concurrent backup updates of the same application serialize and the last
+    writer always sees every committed change.
+
+    Args:
+        application_ids: Applications whose backups changed
+    """
+    application_ids = sorted(set(application_ids))
+    if not application_ids:
+        return
+
+    with transaction.atomic():
+        existing = set(
+            Application.objects.filter(id__in=application_ids).values_list("id", flat=True)
+        )
+        application_ids = [app_id for app_id in application_ids if app_id in existing]
+        if not application_ids:
+            return
+
+        BackupStats.objects.bulk_create(
+            [BackupStats(application_id=app_id) for app_id in application_ids],
+            ignore_conflicts=True,
+        )
+        rows = list(
+            BackupStats.objects.select_for_update()
+            .filter(application_id__in=application_ids)
+            .order_by("application_id")
+        )
+
+        counters = _aggregate(application_ids)
+        now = timezone.now()
+        for stats in rows:
+            values = counters.get(stats.application_id, {})
+            stats.total_backups = values.get("total_backups", 0)
+            stats.completed_backups = values.get("completed_backups", 0)
+            stats.failed_backups = values.get("failed_backups", 0)
+            stats.in_progress_backups = values.get("in_progress_backups", 0)
+            stats.total_size = values.get("total_size") or 0
+            stats.last_backup_at = values.get("last_backup_at")
+            stats.updated_at = now
+
+        BackupStats.objects.bulk_update(
+            rows,
+            [
+                "total_backups",
+                "completed_backups",
+                "failed_backups",
+                "in_progress_backups",
+                "total_size",
+                "last_backup_at",
+                "updated_at",
+            ],
+        )
+
+
+def get_backup_stats(application_ids: List[str]) -> Dict[str, BackupStats]:
+    """
+    Stats rows for the given applications, keyed by application ID.
+
+    Applications that never had a backup have no row and get an empty
+    (unsaved) BackupStats.
+    """
+    stats = {
+        row.application_id: row
+        for row in BackupStats.objects.filter(application_id__in=application_ids)
+    }
+    for app_id in application_ids:
+        stats.setdefault(app_id, BackupStats(application_id=app_id))
+    return stats
+
+
+def rebuild_all_backup_stats() -> int:
+    """
+    Recompute the stats of every application (repairs drift from raw SQL).
+
+    Returns:
+        Number of applications refreshed
+    """
+    application_ids = list(Application.objects.values_list("id", flat=True))
+    for start in range(0, len(application_ids), 500):
+        refresh_backup_stats(application_ids[start : start + 500])
+    logger.info(f"📊 Rebuilt backup stats for {len(application_ids)} application(s)")
+    return len(application_ids)
@@ -9,15 +9,42 @@ from django.utils import timezone
 from django.db import transaction
 
 from apps.proxmox import ProxmoxService, ProxmoxError
-from apps.backups.models import Backup
+from apps.backups.models import Backup, BackupExport
+from apps.backups.backup_index import forget_backup, record_backup
+from apps.backups.chunk_store import ChunkStoreError, collect_garbage, get_chunk_store
+from apps.backups.incremental import CHUNK_STORE_STORAGE, IncrementalBackupEngine
+from apps.backups.stats import rebuild_all_backup_stats
+from apps.backups.restore_planner import (
+    STRATEGY_AUTO,
+    execute_restore,
+    plan_restore,
+    take_companion_snapshot,
+)
 from apps.applications.models import Application
+from apps.core.node_semaphore import throttle_per_node, app_node_slot
 
 logger = logging.getLogger(__name__)
 
 
+def _backup_node_slot(params):
+    """Resolve the node slot of the application a backup belongs to."""
+    app_id = (
+        Backup.objects.filter(id=params["backup_id"])
+        .values_list("application_id", flat=True)
+        .first()
+    )
+    return app_node_slot(app_id) if app_id else None
+
+
 @shared_task(bind=True, max_retries=2)
+@throttle_per_node(lambda params: app_node_slot(params["application_id"]))
 def create_backup_task(
-    self, application_id: str, backup_type: str = "snapshot", compression: str = "zstd"
+    self,
+    application_id: str,
+    backup_type: str = "snapshot",
+    compression: str = "zstd",
+    incremental: bool = False,
+    backup_id: int = None,
 ):
     """
     Create a backup of an application's LXC container.
@@ -25,7 +52,9 @@ def create_backup_task(
     Args:
         application_id: Application ID
         backup_type: Backup mode (snapshot, suspend, stop)
-        compression: Compression algorithm (zstd, gzip, lzo)
+        compression: Compression algorithm (zstd, gzip, lzo); ignored for incremental backups
+        incremental: Store the backup as deduplicated chunks in the chunk store
+        backup_id: Existing Backup record to fill in (created here if omitted)
 
     Returns:
         Dictionary with backup_id and status
@@ -40,15 +69,21 @@ def create_backup_task(
             logger.error(f"Application {application_id} not found")
             return {"success": False, "error": f"Application {application_id} not found"}
 
-        # Create backup record
-        backup = Backup.objects.create(
-            application=app,
-            file_name="",  # Will be updated after backup completes
-            storage_name="local",
-            backup_type=backup_type,
-            compression=compression,
-            status="creating",
-        )
+        # Use the record created by the API, or create one
+        if backup_id is not None:
+            backup = Backup.objects.filter(id=backup_id, application=app).first()
+            if backup is None:
+                logger.error(f"Backup {backup_id} not found")
+                return {"success": False, "error": f"Backup {backup_id} not found"}
+        else:
+            backup = Backup.objects.create(
+                application=app,
+                file_name="",  # Will be updated after backup completes
+                storage_name=CHUNK_STORE_STORAGE if incremental else "local",
+                backup_type=backup_type,
+                compression="none" if incremental else compression,
+                status="creating",
+            )
 
         logger.info(
             f"Starting backup for app {app.name} (LXC {app.lxc_id}), " f"backup_id={backup.id}"
@@ -58,19 +93,39 @@ def create_backup_task(
         proxmox = ProxmoxService(host_id=app.host.id)
 
         # Create the backup
-        result = proxmox.create_lxc_backup(
-            node_name=app.node,
-            vmid=app.lxc_id,
-            storage="local",
-            mode=backup_type,
-            compress=compression,
-        )
+        if incremental:
+            result = IncrementalBackupEngine(proxmox).backup(
+                node_name=app.node, vmid=app.lxc_id, mode=backup_type
+            )
+            backup.manifest = result["manifest"]
+            backup.stored_size = result["stored_size"]
+        else:
+            result = proxmox.create_lxc_backup(
+                node_name=app.node,
+                vmid=app.lxc_id,
+                storage="local",
+                mode=backup_type,
+                compress=compression,
+            )
+            record_backup(
+                app.host_id,
+                app.node,
+                "local",
+                {
+                    "volid": result.get("volid") or f"local:backup/{result['file_name']}",
+                    "vmid": app.lxc_id,
+                    "size": result.get("size", 0),
+                    "ctime": result.get("ctime"),
+                    "content": "backup",
+                },
+            )
 
         # Update backup record with results
         backup.file_name = result["file_name"]
         backup.size = result.get("size", 0)
         backup.status = "completed"
         backup.completed_at = timezone.now()
+        backup.snapshot_name = take_companion_snapshot(proxmox, backup)
         backup.save()
 
         logger.info(f"Backup completed successfully: {backup.file_name} " f"({backup.size_mb} MB)")
@@ -82,7 +137,7 @@ def create_backup_task(
             "size": backup.size,
         }
 
-    except ProxmoxError as e:
+    except (ProxmoxError, ChunkStoreError) as e:
         logger.error(f"Proxmox error during backup creation: {e}")
 
         if backup:
@@ -108,17 +163,21 @@ def create_backup_task(
 
 
 @shared_task(bind=True, max_retries=2)
-def restore_backup_task(self, backup_id: int):
+@throttle_per_node(_backup_node_slot)
+def restore_backup_task(self, backup_id: int, strategy: str = STRATEGY_AUTO):
     """
     Restore an application from a backup.
 
     This is a DESTRUCTIVE operation that will overwrite the current container.
+    A storage snapshot matching the backup is rolled back to when available;
+    otherwise the vzdump archive is restored.
 
     Args:
         backup_id: Backup ID to restore from
+        strategy: "auto", "snapshot_rollback" or "vzdump_restore"
 
     Returns:
-        Dictionary with restore status
+        Dictionary with restore status and the restore path taken
     """
     try:
         # Get backup and related application
@@ -143,6 +202,15 @@ def restore_backup_task(self, backup_id: int):
             f"from backup {backup.file_name}"
         )
 
+        # Initialize Proxmox service
+        proxmox = ProxmoxService(host_id=app.host.id)
+
+        try:
+            plan = plan_restore(proxmox, backup, strategy)
+        except ValueError as e:
+            logger.error(f"Cannot restore backup {backup_id}: {e}")
+            return {"success": False, "backup_id": backup_id, "error": str(e)}
+
         # Update statuses
         with transaction.atomic():
             backup.status = "restoring"
@@ -151,9 +219,6 @@ def restore_backup_task(self, backup_id: int):
             app.status = "updating"
             app.save()
 
-        # Initialize Proxmox service
-        proxmox = ProxmoxService(host_id=app.host.id)
-
         # Stop the container if it's running
         try:
             status = proxmox.get_lxc_status(app.node, app.lxc_id)
@@ -163,14 +228,8 @@ def restore_backup_task(self, backup_id: int):
         except Exception as e:
             logger.warning(f"Could not stop container before restore: {e}")
 
-        # Perform the restore
-        result = proxmox.restore_lxc_backup(
-            node_name=app.node,
-            vmid=app.lxc_id,
-            backup_file=backup.file_name,
-            storage=backup.storage_name,
-            force=True,
-        )
+        # Perform the restore (snapshot rollback or vzdump)
+        result = execute_restore(proxmox, backup, plan)
 
         # Update statuses back to normal
         with transaction.atomic():
@@ -188,9 +247,13 @@ def restore_backup_task(self, backup_id: int):
             "backup_id": backup.id,
             "application_id": app.id,
             "message": "Restore completed successfully",
+            "restore_path": result["restore_path"],
+            "snapshot": result["snapshot"],
+            "reason": result["reason"],
+            "duration_seconds": result["duration_seconds"],
         }
 
-    except ProxmoxError as e:
+    except (ProxmoxError, ChunkStoreError) as e:
         logger.error(f"Proxmox error during restore: {e}")
 
         # Update backup status back to completed (it's still usable)
@@ -260,11 +323,19 @@ def delete_backup_task(self, backup_id: int):
         # Initialize Proxmox service
         proxmox = ProxmoxService(host_id=app.host.id)
 
-        # Delete the backup file from storage
+        # Delete the backup file from storage. Chunks of incremental backups
+        # may be shared, so they are left for gc_chunk_store_task to reclaim.
         try:
-            proxmox.delete_backup_file(
-                node_name=app.node, storage=backup.storage_name, backup_file=backup.file_name
-            )
+            if not backup.is_incremental:
+                proxmox.delete_backup_file(
+                    node_name=app.node, storage=backup.storage_name, backup_file=backup.file_name
+                )
+                forget_backup(
+                    app.host_id,
+                    app.node,
+                    backup.storage_name,
+                    f"{backup.storage_name}:backup/{backup.file_name}",
+                )
         except (ProxmoxError, Exception) as e:
             # If file doesn't exist, that's okay - we still want to delete the record
             error_msg = str(e).lower()
@@ -314,3 +385,184 @@ def delete_backup_task(self, backup_id: int):
             )
 
         return {"success": False, "backup_id": backup_id, "error": str(e)}
+
+
+@shared_task
+def gc_chunk_store_task():
+    """
+    Remove chunk store chunks that no incremental backup references any more.
+
+    Returns:
+        Dictionary with removed chunk count and reclaimed bytes
+    """
+    manifests = Backup.objects.filter(manifest__isnull=False).values_list("manifest", flat=True)
+
+    try:
+        result = collect_garbage(get_chunk_store(), manifests.iterator())
+    except Exception as e:
+        logger.exception(f"Chunk store GC failed: {e}")
+        return {"success": False, "error": str(e)}
+
+    return {"success": True, **result}
+
+
+@shared_task
+def rebuild_backup_stats_task():
+    """
+    Recompute materialized backup stats of every application.
+
+    Signals keep the counters current; this repairs drift from writes that
+    bypass them (raw SQL, manual database edits).
+    """
+    try:
+        return {"success": True, "applications": rebuild_all_backup_stats()}
+    except Exception as e:
+        logger.exception(f"Backup stats rebuild failed: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@shared_task
+def run_backup_policies_task():
+    """
+    Queue staggered backups for every backup policy that is due.
+
+    Returns:
+        Dictionary with policies run and backups queued
+    """
+    from apps.backups.policies import run_due_policies
+
+    try:
+        return {"success": True, **run_due_policies()}
+    except Exception as e:
+        logger.exception(f"Backup policy run failed: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@shared_task
+def prune_backups_task():
+    """
+    Apply backup policy retention and delete pruned backups in batches.
+
+    Returns:
+        Dictionary with deleted and failed counts
+    """
+    from apps.backups.policies import prune_policy_backups
+
+    try:
+        return {"success": True, **prune_policy_backups()}
+    except Exception as e:
+        logger.exception(f"Backup pruning failed: {e}")
+        return {"success": False, "error": str(e)}
+
+
+def _export_node_slot(params):
+    """Resolve the node slot of the application an export belongs to."""
+    app_id = (
+        BackupExport.objects.filter(id=params["export_id"])
+        .values_list("application_id", flat=True)
+        .first()
+    )
+    return app_node_slot(app_id) if app_id else None
+
+
+@shared_task(bind=True, max_retries=5)
+@throttle_per_node(_export_node_slot)
+def export_backup_task(self, export_id: int):
+    """
+    Stream a backup archive to the export target.
+
+    Uploaded parts are recorded as they complete, so a retry resumes where the
+    previous attempt stopped instead of starting over.
+
+    Args:
+        export_id: BackupExport ID
+
+    Returns:
+        Dictionary with export status, size and checksum
+    """
+    from apps.backups.export import BackupExporter, get_export_target
+
+    try:
+        export = BackupExport.objects.select_related("backup", "application").get(id=export_id)
+    except BackupExport.DoesNotExist:
+        logger.error(f"Backup export {export_id} not found")
+        return {"success": False, "error": f"Backup export {export_id} not found"}
+
+    try:
+        exporter = BackupExporter(
+            get_export_target(export.target),
+            ProxmoxService(host_id=export.application.host_id),
+        )
+        exporter.export(export)
+
+        return {
+            "success": True,
+            "export_id": export.id,
+            "size": export.size,
+            "checksum": export.checksum,
+        }
+
+    except Exception as e:
+        logger.error(f"Backup export {export_id} failed: {e}")
+
+        # Transient failures resume from the last uploaded part
+        if self.request.retries < self.max_retries and (
+            "timeout" in str(e).lower() or "connection" in str(e).lower()
+        ):
+            raise self.retry(exc=e, countdown=60)
+
+        export.status = "failed"
+        export.error_message = str(e)
+        export.save(update_fields=["status", "error_message", "updated_at"])
+        return {"success": False, "export_id": export_id, "error": str(e)}
+
+
+@shared_task(bind=True, max_retries=2)
+@throttle_per_node(_export_node_slot)
+def import_backup_task(self, export_id: int, restore: bool = False):
+    """
+    Stream an exported archive back onto Proxmox storage.
+
+    Args:
+        export_id: BackupExport ID (must be completed)
+        restore: Restore the application from the imported backup afterwards
+
+    Returns:
+        Dictionary with the new backup_id
+    """
+    from apps.backups.export import BackupExporter, get_export_target
+
+    try:
+        export = BackupExport.objects.select_related("application").get(id=export_id)
+    except BackupExport.DoesNotExist:
+        logger.error(f"Backup export {export_id} not found")
+        return {"success": False, "error": f"Backup export {export_id} not found"}
+
+    if export.status != "completed":
+        error = f"Backup export {export_id} is not completed (status: {export.status})"
+        logger.error(error)
+        return {"success": False, "error": error}
+
+    export.status = "importing"
+    export.save(update_fields=["status", "updated_at"])
+
+    try:
+        exporter = BackupExporter(
+            get_export_target(export.target),
+            ProxmoxService(host_id=export.application.host_id),
+        )
+        backup = exporter.import_archive(export)
+
+    except Exception as e:
+        logger.error(f"Import of backup export {export_id} failed: {e}")
+        if "timeout" in str(e).lower() or "connection" in str(e).lower():
+            raise self.retry(exc=e, countdown=60)
+        return {"success": False, "export_id": export_id, "error": str(e)}
+
+    finally:
+        BackupExport.objects.filter(id=export_id).update(status="completed")
+
+    if restore:
+        restore_backup_task.delay(backup_id=backup.id)
+
+    return {"success": True, "export_id": export_id, "backup_id": backup.id, "restore": restore}
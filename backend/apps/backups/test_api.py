@@ -154,7 +154,7 @@ class TestBackupAPIEndpoints:
             assert data["status"] == "restoring"
 
             # Verify task was triggered
-            mock_task.delay.assert_called_once_with(backup_id=sample_backup.id)
+            mock_task.delay.assert_called_once_with(backup_id=sample_backup.id, strategy="auto")
 
     def test_restore_backup_not_completed(self, auth_client, sample_application):
         """Test that only completed backups can be restored."""
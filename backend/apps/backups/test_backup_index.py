@@ -0,0 +1,170 @@
+"""
+Tests for targeted backup archive lookup and the per-storage backup index.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.backups import backup_index
+from apps.backups.tasks import create_backup_task, delete_backup_task
+from apps.proxmox.services import ProxmoxService
+
+
+def _archive(vmid, ctime, storage="local"):
+    return {
+        "volid": f"{storage}:backup/vzdump-lxc-{vmid}-{ctime}.tar.zst",
+        "vmid": vmid,
+        "ctime": ctime,
+        "size": 100,
+        "content": "backup",
+    }
+
+
+def _service_with_client():
+    service = ProxmoxService()
+    service._client = MagicMock()
+    return service, service._client
+
+
+def test_create_backup_resolves_archive_from_task_log():
+    service, client = _service_with_client()
+    node = client.nodes.return_value
+    node.vzdump.post.return_value = "UPID:pve:1"
+    node.tasks.return_value.log.get.return_value = [
+        {"n": 1, "t": "INFO: starting new backup job: vzdump 101"},
+        {
+            "n": 2,
+            "t": "INFO: creating vzdump archive "
+            "'/var/lib/vz/dump/vzdump-lxc-101-2025_10_18-10_30_00.tar.zst'",
+        },
+    ]
+    node.storage.return_value.content.return_value.get.return_value = {
+        "size": 2048,
+        "ctime": 1760783400,
+    }
+
+    with patch.object(service, "wait_for_task", return_value={"exitstatus": "OK"}):
+        result = service.create_lxc_backup("pve", 101)
+
+    assert result["file_name"] == "vzdump-lxc-101-2025_10_18-10_30_00.tar.zst"
+    assert result["volid"] == "local:backup/vzdump-lxc-101-2025_10_18-10_30_00.tar.zst"
+    assert result["size"] == 2048
+    node.storage.return_value.content.return_value.get.assert_called_once()
+    node.storage.return_value.content.get.assert_not_called()
+
+
+def test_create_backup_falls_back_to_vmid_filtered_listing():
+    service, client = _service_with_client()
+    node = client.nodes.return_value
+    node.vzdump.post.return_value = "UPID:pve:1"
+    node.tasks.return_value.log.get.return_value = [{"n": 1, "t": "INFO: no archive line"}]
+    node.storage.return_value.content.get.return_value = [_archive(101, 10), _archive(101, 20)]
+
+    with patch.object(service, "wait_for_task", return_value={"exitstatus": "OK"}):
+        result = service.create_lxc_backup("pve", 101)
+
+    assert result["file_name"] == "vzdump-lxc-101-20.tar.zst"
+    node.storage.return_value.content.get.assert_called_once_with(content="backup", vmid=101)
+
+
+def test_index_is_built_once_and_updated_incrementally():
+    proxmox = MagicMock()
+    proxmox.list_backups.return_value = [_archive(101, 10), _archive(102, 15)]
+
+    assert len(backup_index.list_storage_backups(proxmox, 1, "pve", "local")) == 2
+
+    backup_index.record_backup(1, "pve", "local", _archive(101, 30))
+    backup_index.forget_backup(1, "pve", "local", _archive(102, 15)["volid"])
+
+    entries = backup_index.list_storage_backups(proxmox, 1, "pve", "local", vmid=101)
+
+    assert [entry["ctime"] for entry in entries] == [30, 10]
+    assert backup_index.list_storage_backups(proxmox, 1, "pve", "local", vmid=102) == []
+    proxmox.list_backups.assert_called_once_with("pve", "local")
+
+
+def test_record_backup_without_index_is_noop(fake_redis):
+    backup_index.record_backup(1, "pve", "local", _archive(101, 30))
+
+    assert fake_redis.keys() == []
+
+
+def test_updates_touch_single_entries(fake_redis):
+    proxmox = MagicMock()
+    proxmox.list_backups.return_value = [_archive(101, 10)]
+    backup_index.refresh_backup_index(proxmox, 1, "pve", "local")
+    key = backup_index._index_key(1, "pve", "local")
+
+    # Two tasks updating the same storage do not overwrite each other
+    backup_index.record_backup(1, "pve", "local", _archive(102, 20))
+    backup_index.record_backup(1, "pve", "local", _archive(103, 30))
+    backup_index.forget_backup(1, "pve", "local", _archive(101, 10)["volid"])
+
+    assert sorted(fake_redis.hkeys(key)) == [
+        _archive(102, 20)["volid"].encode(),
+        _archive(103, 30)["volid"].encode(),
+    ]
+    assert 0 < fake_redis.ttl(key)
+
+
+def test_find_backup_rebuilds_index_on_miss():
+    proxmox = MagicMock()
+    proxmox.list_backups.return_value = [_archive(101, 10)]
+    volid = _archive(101, 10)["volid"]
+
+    assert backup_index.find_backup(proxmox, 1, "pve", "local", volid)["ctime"] == 10
+    assert backup_index.find_backup(proxmox, 1, "pve", "local", volid)["ctime"] == 10
+    proxmox.list_backups.assert_called_once()
+
+    # Created outside Proximity after the index was built
+    proxmox.list_backups.return_value = [_archive(101, 10), _archive(101, 40)]
+    found = backup_index.find_backup(proxmox, 1, "pve", "local", _archive(101, 40)["volid"])
+
+    assert found["ctime"] == 40
+    assert backup_index.find_backup(proxmox, 1, "pve", "local", "local:backup/gone") is None
+
+
+@pytest.mark.django_db
+def test_backup_tasks_keep_index_in_sync(sample_application):
+    proxmox = MagicMock()
+    proxmox.list_backups.return_value = [_archive(101, 10)]
+    args = (sample_application.host_id, sample_application.node, "local")
+    backup_index.list_storage_backups(proxmox, *args)
+
+    with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+        MockProxmox.return_value.create_lxc_backup.return_value = {
+            "file_name": "vzdump-lxc-101-new.tar.zst",
+            "volid": "local:backup/vzdump-lxc-101-new.tar.zst",
+            "size": 10,
+            "ctime": 50,
+        }
+        result = create_backup_task(application_id=sample_application.id)
+
+        assert [e["volid"] for e in backup_index.list_storage_backups(proxmox, *args)] == [
+            "local:backup/vzdump-lxc-101-new.tar.zst",
+            _archive(101, 10)["volid"],
+        ]
+
+        delete_backup_task(backup_id=result["backup_id"])
+
+    assert backup_index.list_storage_backups(proxmox, *args) == [_archive(101, 10)]
+    proxmox.list_backups.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_create_backup_task_fills_existing_record(sample_backup):
+    sample_backup.status = "creating"
+    sample_backup.save()
+
+    with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+        MockProxmox.return_value.create_lxc_backup.return_value = {
+            "file_name": "vzdump-lxc-101-new.tar.zst",
+            "size": 10,
+        }
+        result = create_backup_task(
+            application_id=sample_backup.application_id, backup_id=sample_backup.id
+        )
+
+    assert result["backup_id"] == sample_backup.id
+    assert sample_backup.application.backups.count() == 1
@@ -0,0 +1,203 @@
+"""
+Tests for the deduplicating chunk store and incremental backups.
+"""
+
+import os
+import time
+
+import pytest
+from unittest.mock import patch
+
+from apps.backups.chunk_store import (
+    ChunkStore,
+    ChunkStoreError,
+    LocalChunkStore,
+    collect_garbage,
+    ingest_stream,
+    read_manifest,
+)
+from apps.backups.models import Backup
+from apps.backups.tasks import create_backup_task, delete_backup_task, restore_backup_task
+
+CHUNK = 1024
+
+
+def _blocks(data, size=300):
+    """Split data into odd-sized blocks, like an SSH channel would deliver it."""
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalChunkStore(str(tmp_path / "store"))
+
+
+def test_ingest_round_trip(store):
+    data = os.urandom(CHUNK * 3 + 17)
+
+    manifest = ingest_stream(store, _blocks(data), chunk_size=CHUNK)
+
+    assert manifest["size"] == len(data)
+    assert len(manifest["chunks"]) == 4
+    assert manifest["new_bytes"] == len(data)
+    assert b"".join(read_manifest(store, manifest)) == data
+
+
+def test_second_backup_only_stores_changed_chunks(store):
+    first = os.urandom(CHUNK * 4)
+    second = first[: CHUNK * 2] + os.urandom(CHUNK) + first[CHUNK * 3 :]
+
+    ingest_stream(store, _blocks(first), chunk_size=CHUNK)
+    manifest = ingest_stream(store, _blocks(second), chunk_size=CHUNK)
+
+    assert manifest["new_chunks"] == 1
+    assert manifest["new_bytes"] == CHUNK
+    assert len(list(store.iter_chunks())) == 5
+    assert b"".join(read_manifest(store, manifest)) == second
+
+
+def test_incomplete_store_cannot_be_created():
+    class WriteOnlyStore(ChunkStore):
+        def put_chunk(self, digest, data):
+            pass
+
+    with pytest.raises(TypeError, match="has_chunk"):
+        WriteOnlyStore()
+
+
+def test_read_manifest_detects_corruption(store):
+    manifest = ingest_stream(store, [os.urandom(CHUNK * 2)], chunk_size=CHUNK)
+    digest = manifest["chunks"][1][0]
+    store.put_chunk(digest, b"x" * CHUNK)
+
+    with pytest.raises(ChunkStoreError):
+        list(read_manifest(store, manifest))
+
+
+def test_read_manifest_detects_missing_chunk(store):
+    manifest = ingest_stream(store, [os.urandom(CHUNK)], chunk_size=CHUNK)
+    store.delete_chunk(manifest["chunks"][0][0])
+
+    with pytest.raises(ChunkStoreError):
+        list(read_manifest(store, manifest))
+
+
+def test_gc_keeps_referenced_and_recent_chunks(store):
+    kept = ingest_stream(store, [os.urandom(CHUNK)], chunk_size=CHUNK)
+    dropped = ingest_stream(store, [os.urandom(CHUNK)], chunk_size=CHUNK)
+
+    # Within the grace period nothing is removed
+    assert collect_garbage(store, [kept])["removed_chunks"] == 0
+
+    old = time.time() - 7 * 3600
+    for digest, _ in kept["chunks"] + dropped["chunks"]:
+        os.utime(store._path(digest), (old, old))
+
+    result = collect_garbage(store, [kept])
+
+    assert result["removed_chunks"] == 1
+    assert result["reclaimed_bytes"] == CHUNK
+    assert store.has_chunk(kept["chunks"][0][0])
+    assert not store.has_chunk(dropped["chunks"][0][0])
+
+
+def test_gc_keeps_chunk_reused_while_it_runs(store):
+    data = os.urandom(CHUNK)
+    orphan = ingest_stream(store, [data], chunk_size=CHUNK)
+    digest = orphan["chunks"][0][0]
+    old = time.time() - 7 * 3600
+    os.utime(store._path(digest), (old, old))
+
+    reused = {}
+    list_chunks = store.iter_chunks
+
+    def iter_chunks():
+        yield from list_chunks()
+        # A backup reuses the orphan after GC listed it as unreferenced
+        reused["manifest"] = ingest_stream(store, [data], chunk_size=CHUNK)
+
+    with patch.object(store, "iter_chunks", iter_chunks):
+        result = collect_garbage(store, [])
+
+    assert result["removed_chunks"] == 0
+    assert reused["manifest"]["new_chunks"] == 0
+    assert b"".join(read_manifest(store, reused["manifest"])) == data
+
+
+@pytest.mark.django_db
+class TestIncrementalBackupTasks:
+    """Incremental backups through the Celery tasks."""
+
+    @pytest.fixture(autouse=True)
+    def chunk_settings(self, settings, tmp_path):
+        settings.BACKUP_CHUNK_STORE_PATH = str(tmp_path / "chunks")
+        settings.BACKUP_CHUNK_SIZE = CHUNK
+
+    def test_incremental_backup_and_restore(self, sample_application):
+        archive = os.urandom(CHUNK * 3)
+        uploaded = []
+
+        with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+            mock_service = MockProxmox.return_value
+            mock_service.create_lxc_backup.return_value = {
+                "file_name": "vzdump-lxc-101-2025_10_18-10_30_00.tar",
+                "size": len(archive),
+            }
+            mock_service.stream_backup_archive.return_value = _blocks(archive)
+            mock_service.upload_backup_archive.side_effect = (
+                lambda node, storage, name, blocks: uploaded.append(b"".join(blocks))
+            )
+            mock_service.get_lxc_status.return_value = {"status": "stopped"}
+
+            result = create_backup_task(
+                application_id=sample_application.id, backup_type="snapshot", incremental=True
+            )
+
+            assert result["success"] is True
+            backup = Backup.objects.get(id=result["backup_id"])
+            assert backup.is_incremental
+            assert backup.storage_name == "chunkstore"
+            assert backup.compression == "none"
+            assert backup.size == len(archive)
+            assert backup.stored_size == len(archive)
+
+            mock_service.create_lxc_backup.assert_called_once_with(
+                node_name="pve",
+                vmid=sample_application.lxc_id,
+                storage="local",
+                mode="snapshot",
+                compress="0",
+            )
+            # Staged archive is removed once chunked
+            mock_service.delete_backup_file.assert_called_once_with(
+                "pve", "local", "vzdump-lxc-101-2025_10_18-10_30_00.tar"
+            )
+
+            restore = restore_backup_task(backup_id=backup.id)
+
+            assert restore["success"] is True
+            assert uploaded == [archive]
+            mock_service.restore_lxc_backup.assert_called_once_with(
+                node_name="pve",
+                vmid=sample_application.lxc_id,
+                backup_file="vzdump-lxc-101-2025_10_18-10_30_00.tar",
+                storage="local",
+                force=True,
+            )
+
+    def test_delete_incremental_backup_keeps_chunks(self, sample_application):
+        backup = Backup.objects.create(
+            application=sample_application,
+            file_name="vzdump-lxc-101.tar",
+            storage_name="chunkstore",
+            compression="none",
+            status="completed",
+            manifest={"chunks": []},
+        )
+
+        with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+            result = delete_backup_task(backup_id=backup.id)
+
+        assert result["success"] is True
+        MockProxmox.return_value.delete_backup_file.assert_not_called()
+        assert not Backup.objects.filter(id=backup.id).exists()
@@ -0,0 +1,305 @@
+"""
+Tests for streaming backup export/import.
+
+S3 is exercised against an in-memory stand-in implementing the subset of the
+S3 multipart API that MinIO/AWS expose to boto3.
+"""
+
+import hashlib
+import os
+import subprocess
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.backups.export import (
+    BackupExporter,
+    ExportError,
+    FilesystemExportTarget,
+    S3ExportTarget,
+    create_export,
+    get_export_target,
+)
+from apps.backups.models import Backup
+from apps.backups.tasks import export_backup_task, import_backup_task
+from apps.proxmox.services import ProxmoxError, ProxmoxService
+
+PART = 1024
+
+
+class FakeS3Client:
+    """In-memory S3 multipart API stand-in."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.fail_on_part = None
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            self.fail_on_part = None
+            raise ConnectionError("connection reset by peer")
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": hashlib.md5(Body).hexdigest()}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[(Bucket, Key)] = b"".join(
+            parts[p["PartNumber"]] for p in MultipartUpload["Parts"]
+        )
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+    def get_object(self, Bucket, Key):
+        body = MagicMock()
+        data = self.objects[(Bucket, Key)]
+        body.iter_chunks.side_effect = lambda size: (
+            data[i : i + size] for i in range(0, len(data), size)
+        )
+        return {"Body": body}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def _stream(data, offset=0, size=300):
+    data = data[offset:]
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.fixture
+def archive():
+    return os.urandom(PART * 3 + 100)
+
+
+@pytest.fixture
+def proxmox(archive):
+    service = MagicMock()
+    service.stream_backup_archive.side_effect = lambda node, storage, name, offset=0: _stream(
+        archive, offset
+    )
+    return service
+
+
+@pytest.fixture
+def export_settings(settings, tmp_path):
+    settings.BACKUP_EXPORT_PART_SIZE = PART
+    settings.BACKUP_EXPORT_PATH = str(tmp_path / "exports")
+    settings.BACKUP_EXPORT_TARGET = "filesystem"
+
+
+@pytest.mark.django_db
+def test_filesystem_export_round_trip(export_settings, sample_backup, proxmox, archive, tmp_path):
+    target = FilesystemExportTarget(str(tmp_path / "exports"))
+    export = create_export(sample_backup, target)
+
+    BackupExporter(target, proxmox).export(export)
+
+    export.refresh_from_db()
+    assert export.status == "completed"
+    assert export.size == len(archive)
+    assert len(export.parts) == 4
+    assert (tmp_path / "exports" / export.key).read_bytes() == archive
+
+    uploaded = []
+    proxmox.upload_backup_archive.side_effect = lambda node, storage, name, blocks: uploaded.append(
+        b"".join(blocks)
+    )
+    backup = BackupExporter(target, proxmox).import_archive(export)
+
+    assert uploaded == [archive]
+    assert backup.status == "completed"
+    assert backup.size == len(archive)
+
+
+@pytest.mark.django_db
+def test_import_never_replaces_the_original_archive(
+    export_settings, sample_backup, proxmox, tmp_path
+):
+    # The backup the export was taken from is still on the storage
+    target = FilesystemExportTarget(str(tmp_path / "exports"))
+    export = create_export(sample_backup, target)
+    BackupExporter(target, proxmox).export(export)
+    proxmox.upload_backup_archive.side_effect = (
+        lambda node, storage, name, blocks: f"{storage}:backup/{name}"
+    )
+
+    backup = BackupExporter(target, proxmox).import_archive(export)
+
+    uploaded_name = proxmox.upload_backup_archive.call_args.args[2]
+    assert uploaded_name == backup.file_name
+    assert uploaded_name != sample_backup.file_name
+    assert uploaded_name.startswith(f"vzdump-lxc-{sample_backup.application.lxc_id}-")
+    assert uploaded_name.endswith(".tar.zst")
+    sample_backup.refresh_from_db()
+    assert sample_backup.status == "completed"
+
+    # A failed upload (e.g. the name is taken) deletes nothing
+    proxmox.upload_backup_archive.side_effect = ProxmoxError("File exists")
+    with pytest.raises(ProxmoxError):
+        BackupExporter(target, proxmox).import_archive(export)
+    proxmox.delete_backup_file.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_s3_export_resumes_after_failure(export_settings, sample_backup, proxmox, archive):
+    client = FakeS3Client()
+    client.fail_on_part = 3
+    target = S3ExportTarget("backups", prefix="proximity", client=client)
+    export = create_export(sample_backup, target)
+
+    with pytest.raises(ConnectionError):
+        BackupExporter(target, proxmox).export(export)
+
+    export.refresh_from_db()
+    assert [part[0] for part in export.parts] == [1, 2]
+    assert export.upload_id
+
+    BackupExporter(target, proxmox).export(export)
+
+    # Second attempt restarted the source after the two stored parts
+    assert proxmox.stream_backup_archive.call_args.kwargs["offset"] == 2 * PART
+    assert client.objects[("backups", f"proximity/{export.key}")] == archive
+    assert export.status == "completed"
+    assert export.upload_id is None
+
+
+@pytest.mark.django_db
+def test_import_detects_corrupt_object(export_settings, sample_backup, proxmox, tmp_path):
+    target = FilesystemExportTarget(str(tmp_path / "exports"))
+    export = create_export(sample_backup, target)
+    BackupExporter(target, proxmox).export(export)
+
+    path = tmp_path / "exports" / export.key
+    data = bytearray(path.read_bytes())
+    data[PART + 5] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    proxmox.upload_backup_archive.side_effect = lambda node, storage, name, blocks: b"".join(blocks)
+    with pytest.raises(ExportError):
+        BackupExporter(target, proxmox).import_archive(export)
+
+    # No backup is registered (the upload discards its temporary file)
+    assert not Backup.objects.exclude(id=sample_backup.id).exists()
+
+
+@pytest.mark.django_db
+def test_export_incremental_backup_from_chunk_store(
+    export_settings, settings, sample_application, tmp_path
+):
+    from apps.backups.chunk_store import get_chunk_store, ingest_stream
+
+    settings.BACKUP_CHUNK_STORE_PATH = str(tmp_path / "chunks")
+    data = os.urandom(PART * 2 + 10)
+    manifest = ingest_stream(get_chunk_store(), [data], chunk_size=512)
+    backup = Backup.objects.create(
+        application=sample_application,
+        file_name="vzdump-lxc-101.tar",
+        storage_name="chunkstore",
+        compression="none",
+        status="completed",
+        manifest=manifest,
+    )
+    target = FilesystemExportTarget(str(tmp_path / "exports"))
+    export = create_export(backup, target)
+
+    # Resume from the middle of a chunk-store backup
+    export.upload_id = target.start_upload(export.key)
+    target.upload_part(export.key, export.upload_id, 1, data[:PART])
+    export.parts = [[1, PART, hashlib.sha256(data[:PART]).hexdigest(), ""]]
+    export.save()
+
+    BackupExporter(target, proxmox=None).export(export)
+
+    assert (tmp_path / "exports" / export.key).read_bytes() == data
+
+
+@pytest.mark.django_db
+def test_export_and_import_tasks(export_settings, sample_backup, archive):
+    with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+        service = MockProxmox.return_value
+        service.stream_backup_archive.side_effect = lambda node, storage, name, offset=0: _stream(
+            archive, offset
+        )
+        export = create_export(sample_backup, get_export_target())
+
+        result = export_backup_task(export_id=export.id)
+
+        assert result["success"] is True
+        assert result["size"] == len(archive)
+
+        service.upload_backup_archive.side_effect = lambda node, storage, name, blocks: b"".join(
+            blocks
+        )
+        with patch("apps.backups.tasks.restore_backup_task.delay") as mock_restore:
+            result = import_backup_task(export_id=export.id, restore=True)
+
+        assert result["success"] is True
+        mock_restore.assert_called_once_with(backup_id=result["backup_id"])
+        export.refresh_from_db()
+        assert export.status == "completed"
+
+
+class LocalShell:
+    """SSH client stand-in running commands with sh, `pvesm path` mapped to a directory."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def exec_command(self, command):
+        pvesm = f'pvesm() {{ echo "{self.root}/${{2#*/}}"; }}; '
+        process = subprocess.Popen(
+            ["sh", "-c", pvesm + command],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stdin = MagicMock()
+        stdin.write.side_effect = process.stdin.write
+        stdin.channel.shutdown_write.side_effect = process.stdin.close
+        stdout = MagicMock()
+        stdout.channel.recv_exit_status.side_effect = process.wait
+        stderr = MagicMock()
+        stderr.read.side_effect = process.stderr.read
+        return stdin, stdout, stderr
+
+    def close(self):
+        pass
+
+
+def test_upload_never_overwrites_or_leaves_partial_archives(tmp_path):
+    service = ProxmoxService()
+    storage = tmp_path / "dump"
+    storage.mkdir()
+    existing = storage / "vzdump-lxc-101-old.tar.zst"
+    existing.write_bytes(b"original")
+
+    def failing_stream():
+        yield b"partial"
+        raise ExportError("part 2 is corrupt")
+
+    with patch.object(service, "_connect_host_ssh", return_value=LocalShell(storage)):
+        volid = service.upload_backup_archive(
+            "pve", "local", "vzdump-lxc-101-new.tar.zst", [b"new"]
+        )
+        with pytest.raises(ProxmoxError, match="File exists"):
+            service.upload_backup_archive("pve", "local", existing.name, [b"replacement"])
+        with pytest.raises(ProxmoxError, match="corrupt"):
+            service.upload_backup_archive(
+                "pve", "local", "vzdump-lxc-101-bad.tar.zst", failing_stream()
+            )
+
+    assert volid == "local:backup/vzdump-lxc-101-new.tar.zst"
+    assert (storage / "vzdump-lxc-101-new.tar.zst").read_bytes() == b"new"
+    assert existing.read_bytes() == b"original"
+    assert sorted(path.name for path in storage.iterdir()) == [
+        "vzdump-lxc-101-new.tar.zst",
+        "vzdump-lxc-101-old.tar.zst",
+    ]
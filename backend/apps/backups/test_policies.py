@@ -0,0 +1,252 @@
+"""
+Tests for scheduled backup policies, staggering and retention pruning.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from apps.backups.models import Backup, BackupPolicy
+from apps.backups.policies import (
+    is_policy_due,
+    prune_policy_backups,
+    run_due_policies,
+    stagger_runs,
+)
+from apps.backups.retention import select_backups_to_prune
+
+NOW = datetime(2026, 3, 31, 3, 2, tzinfo=dt_timezone.utc)
+
+
+def _daily_backups(days, per_day=1):
+    backups = []
+    for day in range(days):
+        for n in range(per_day):
+            backups.append(
+                SimpleNamespace(id=len(backups) + 1, created_at=NOW - timedelta(days=day, hours=n))
+            )
+    return backups
+
+
+def test_keep_last_keeps_newest():
+    backups = _daily_backups(5)
+
+    kept, pruned = select_backups_to_prune(backups, keep_last=2)
+
+    assert [b.id for b in kept] == [1, 2]
+    assert [b.id for b in pruned] == [3, 4, 5]
+
+
+def test_keep_daily_keeps_newest_per_day():
+    backups = _daily_backups(4, per_day=2)
+
+    kept, pruned = select_backups_to_prune(backups, keep_daily=3)
+
+    assert [b.id for b in kept] == [1, 3, 5]
+    assert len(pruned) == 5
+
+
+def test_rules_combine_without_double_counting():
+    # 70 daily backups ending Tue 2026-03-31
+    backups = _daily_backups(70)
+
+    kept, _ = select_backups_to_prune(backups, keep_daily=7, keep_weekly=4, keep_monthly=3)
+
+    assert [b.created_at.strftime("%m-%d") for b in kept] == [
+        # daily: last 7 days
+        "03-31", "03-30", "03-29", "03-28", "03-27", "03-26", "03-25",
+        # weekly: newest of the 4 ISO weeks before those already covered
+        "03-22", "03-15", "03-08", "03-01",
+        # monthly: March is covered; Feb 23-28 were already pruned by the
+        # weekly rule (same ISO week as 03-01); only two earlier months exist
+        "02-22", "01-31",
+    ]  # fmt: skip
+
+
+def test_no_rules_keeps_everything():
+    backups = _daily_backups(3)
+
+    kept, pruned = select_backups_to_prune(backups)
+
+    assert len(kept) == 3
+    assert pruned == []
+
+
+def test_stagger_spreads_each_node_over_window():
+    apps = [SimpleNamespace(id=f"a{i}", host_id=1, node="pve1") for i in range(4)] + [
+        SimpleNamespace(id=f"b{i}", host_id=1, node="pve2") for i in range(2)
+    ]
+
+    runs = stagger_runs(apps, 3600)
+    offsets = {app.id: countdown for app, countdown in runs}
+
+    assert [offsets[f"a{i}"] for i in range(4)] == [0, 900, 1800, 2700]
+    # Second node is phase-shifted, not started together with the first
+    assert offsets["b0"] > 0
+    assert offsets["b1"] - offsets["b0"] == 1800
+    assert all(countdown < 3600 for _, countdown in runs)
+
+
+@pytest.fixture
+def policy(sample_application, sample_user):
+    policy = BackupPolicy.objects.create(
+        name="nightly",
+        owner=sample_user,
+        application=sample_application,
+        schedule="0 3 * * *",
+        keep_last=0,
+        keep_daily=2,
+        keep_weekly=0,
+        keep_monthly=0,
+    )
+    BackupPolicy.objects.filter(id=policy.id).update(created_at=NOW - timedelta(days=1))
+    policy.refresh_from_db()
+    return policy
+
+
+@pytest.mark.django_db
+def test_policy_due_only_once_per_occurrence(policy):
+    assert is_policy_due(policy, NOW)
+
+    policy.last_run_at = NOW
+    assert not is_policy_due(policy, NOW + timedelta(minutes=5))
+    assert is_policy_due(policy, NOW + timedelta(days=1))
+
+
+@pytest.mark.django_db
+def test_run_due_policies_queues_staggered_backups(policy, sample_application):
+    with patch("apps.backups.tasks.create_backup_task.apply_async") as mock_apply:
+        result = run_due_policies(now=NOW)
+
+    assert result == {"policies_run": 1, "backups_queued": 1}
+    backup = Backup.objects.get(policy=policy)
+    assert backup.status == "creating"
+    kwargs = mock_apply.call_args.kwargs
+    assert kwargs["kwargs"]["backup_id"] == backup.id
+    assert kwargs["countdown"] == 0
+
+    policy.refresh_from_db()
+    assert policy.last_run_at == NOW
+
+    # Not due again in the same occurrence
+    with patch("apps.backups.tasks.create_backup_task.apply_async") as mock_apply:
+        assert run_due_policies(now=NOW + timedelta(minutes=5))["policies_run"] == 0
+    mock_apply.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_run_due_policies_skips_busy_apps(policy, sample_application):
+    Backup.objects.create(application=sample_application, file_name="", status="creating")
+
+    with patch("apps.backups.tasks.create_backup_task.apply_async") as mock_apply:
+        result = run_due_policies(now=NOW)
+
+    assert result["backups_queued"] == 0
+    mock_apply.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_category_policy_targets_catalog_category(sample_user, sample_application):
+    policy = BackupPolicy.objects.create(
+        name="databases", owner=sample_user, catalog_category="Database"
+    )
+    BackupPolicy.objects.filter(id=policy.id).update(created_at=NOW - timedelta(days=1))
+
+    with patch("apps.catalog.services.catalog_service.filter_by_category") as mock_filter, patch(
+        "apps.backups.tasks.create_backup_task.apply_async"
+    ):
+        mock_filter.return_value = [SimpleNamespace(id=sample_application.catalog_id)]
+        result = run_due_policies(now=NOW)
+
+    mock_filter.assert_called_once_with("Database")
+    assert result["backups_queued"] == 1
+
+
+@pytest.mark.django_db
+def test_prune_deletes_surplus_policy_backups(policy, sample_application):
+    backups = []
+    for day in range(4):
+        backup = Backup.objects.create(
+            application=sample_application,
+            policy=policy,
+            file_name=f"vzdump-lxc-{day}.tar.zst",
+            status="completed",
+        )
+        Backup.objects.filter(id=backup.id).update(created_at=NOW - timedelta(days=day))
+        backups.append(backup)
+    manual = Backup.objects.create(
+        application=sample_application, file_name="manual.tar.zst", status="completed"
+    )
+    Backup.objects.filter(id=manual.id).update(created_at=NOW - timedelta(days=30))
+
+    with patch("apps.backups.policies.ProxmoxService") as MockProxmox:
+        result = prune_policy_backups(batch_size=1)
+
+    assert result == {"deleted": 2, "failed": 0}
+    assert MockProxmox.return_value.delete_backup_file.call_count == 2
+    remaining = set(Backup.objects.values_list("id", flat=True))
+    assert remaining == {backups[0].id, backups[1].id, manual.id}
+
+
+@pytest.mark.django_db
+def test_prune_keeps_record_when_delete_fails(policy, sample_application):
+    for day in range(3):
+        backup = Backup.objects.create(
+            application=sample_application,
+            policy=policy,
+            file_name=f"vzdump-lxc-{day}.tar.zst",
+            status="completed",
+        )
+        Backup.objects.filter(id=backup.id).update(created_at=NOW - timedelta(days=day))
+
+    with patch("apps.backups.policies.ProxmoxService") as MockProxmox:
+        MockProxmox.return_value.delete_backup_file.side_effect = Exception("storage offline")
+        result = prune_policy_backups()
+
+    assert result == {"deleted": 0, "failed": 1}
+    assert Backup.objects.filter(status="completed").count() == 3
+
+
+@pytest.mark.django_db
+class TestBackupPolicyAPI:
+    def test_create_policy(self, auth_client, sample_application):
+        response = auth_client.post(
+            "/api/backups/policies",
+            data=json.dumps(
+                {"name": "nightly", "application_id": sample_application.id, "keep_last": 3}
+            ),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 201
+        assert response.json()["keep_last"] == 3
+        assert BackupPolicy.objects.filter(application=sample_application).exists()
+
+    def test_create_policy_rejects_bad_schedule(self, auth_client, sample_application):
+        response = auth_client.post(
+            "/api/backups/policies",
+            data=json.dumps(
+                {"name": "x", "application_id": sample_application.id, "schedule": "every day"}
+            ),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+
+    def test_create_policy_requires_one_target(self, auth_client, sample_application):
+        response = auth_client.post(
+            "/api/backups/policies",
+            data=json.dumps(
+                {
+                    "name": "x",
+                    "application_id": sample_application.id,
+                    "catalog_category": "Database",
+                }
+            ),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
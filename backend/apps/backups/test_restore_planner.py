@@ -0,0 +1,206 @@
+"""
+Tests for snapshot-aware restore planning.
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.backups.models import Backup
+from apps.backups.restore_planner import (
+    STRATEGY_SNAPSHOT,
+    STRATEGY_VZDUMP,
+    execute_restore,
+    plan_restore,
+)
+from apps.backups.tasks import create_backup_task, restore_backup_task
+from apps.proxmox import ProxmoxError
+
+
+@pytest.fixture
+def backup(sample_backup):
+    sample_backup.completed_at = sample_backup.created_at
+    sample_backup.save()
+    return sample_backup
+
+
+def _snapshot(name, backup, delta):
+    return {"name": name, "snaptime": backup.completed_at.timestamp() + delta}
+
+
+@pytest.fixture
+def proxmox(backup):
+    service = MagicMock()
+    service.list_snapshots.return_value = []
+    service.list_backups.return_value = [
+        {"volid": f"{backup.storage_name}:backup/{backup.file_name}", "vmid": 101}
+    ]
+    return service
+
+
+@pytest.mark.django_db
+def test_plan_prefers_companion_snapshot(backup, proxmox):
+    backup.snapshot_name = "proximity-bk-1"
+    proxmox.list_snapshots.return_value = [
+        _snapshot("manual", backup, 10),
+        _snapshot("proximity-bk-1", backup, 60),
+    ]
+
+    plan = plan_restore(proxmox, backup)
+
+    assert plan["strategy"] == STRATEGY_SNAPSHOT
+    assert plan["snapshot"] == "proximity-bk-1"
+
+
+@pytest.mark.django_db
+def test_plan_accepts_snapshot_within_gap(settings, backup, proxmox):
+    settings.RESTORE_SNAPSHOT_MAX_GAP = 900
+    proxmox.list_snapshots.return_value = [
+        _snapshot("proximity-pre-20260101000000", backup, 5),
+        _snapshot("too-late", backup, 3600),
+        _snapshot("before-backup", backup, -30),
+        _snapshot("nightly", backup, 120),
+    ]
+
+    plan = plan_restore(proxmox, backup)
+
+    assert plan["snapshot"] == "nightly"
+    assert "120s" in plan["reason"]
+
+
+@pytest.mark.django_db
+def test_plan_falls_back_to_vzdump(backup, proxmox):
+    proxmox.list_snapshots.side_effect = ProxmoxError("storage does not support snapshots")
+
+    assert plan_restore(proxmox, backup)["strategy"] == STRATEGY_VZDUMP
+    with pytest.raises(ValueError):
+        plan_restore(proxmox, backup, STRATEGY_SNAPSHOT)
+
+
+@pytest.mark.django_db
+def test_plan_refuses_vzdump_restore_of_missing_archive(backup, proxmox):
+    proxmox.list_backups.return_value = []
+
+    with pytest.raises(ValueError, match="no longer on storage"):
+        plan_restore(proxmox, backup)
+    with pytest.raises(ValueError, match="no longer on storage"):
+        plan_restore(proxmox, backup, STRATEGY_VZDUMP)
+
+    # Listing failures do not block the restore
+    proxmox.list_backups.side_effect = ProxmoxError("storage offline")
+    assert plan_restore(proxmox, backup, STRATEGY_VZDUMP)["strategy"] == STRATEGY_VZDUMP
+
+
+@pytest.mark.django_db
+def test_rollback_takes_pre_operation_snapshot(settings, backup, proxmox):
+    settings.AUTO_SNAPSHOT_BEFORE_RESTORE = True
+    plan = {"strategy": STRATEGY_SNAPSHOT, "snapshot": "nightly", "reason": "test"}
+
+    result = execute_restore(proxmox, backup, plan)
+
+    assert result["restore_path"] == STRATEGY_SNAPSHOT
+    assert result["pre_restore_snapshot"].startswith("proximity-pre-")
+    proxmox.rollback_snapshot.assert_called_once_with(
+        backup.application.node, backup.application.lxc_id, "nightly"
+    )
+    proxmox.restore_lxc_backup.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_rollback_retries_without_pre_operation_snapshot(settings, backup, proxmox):
+    settings.AUTO_SNAPSHOT_BEFORE_RESTORE = True
+    # ZFS: refuses while a newer snapshot exists
+    proxmox.rollback_snapshot.side_effect = [ProxmoxError("not most recent snapshot"), None]
+    plan = {"strategy": STRATEGY_SNAPSHOT, "snapshot": "nightly", "reason": "test"}
+
+    result = execute_restore(proxmox, backup, plan)
+
+    assert result["restore_path"] == STRATEGY_SNAPSHOT
+    assert result["pre_restore_snapshot"] is None
+    proxmox.delete_snapshot.assert_called_once()
+    assert proxmox.rollback_snapshot.call_count == 2
+
+
+@pytest.mark.django_db
+def test_failed_rollback_falls_back_to_vzdump(settings, backup, proxmox):
+    settings.AUTO_SNAPSHOT_BEFORE_RESTORE = False
+    proxmox.rollback_snapshot.side_effect = ProxmoxError("snapshot is busy")
+    plan = {"strategy": STRATEGY_SNAPSHOT, "snapshot": "nightly", "reason": "test"}
+
+    result = execute_restore(proxmox, backup, plan)
+
+    assert result["restore_path"] == STRATEGY_VZDUMP
+    assert "rollback failed" in result["reason"]
+    proxmox.restore_lxc_backup.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_backup_task_records_companion_snapshot(settings, sample_application):
+    settings.BACKUP_COMPANION_SNAPSHOTS = True
+    with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+        service = MockProxmox.return_value
+        service.create_lxc_backup.return_value = {"file_name": "vzdump.tar.zst", "size": 1}
+        service.list_snapshots.return_value = []
+
+        result = create_backup_task(application_id=sample_application.id)
+
+    backup = Backup.objects.get(id=result["backup_id"])
+    assert backup.snapshot_name == f"proximity-bk-{backup.id}"
+    service.create_snapshot.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_restore_task_reports_rollback_path(settings, backup):
+    settings.AUTO_SNAPSHOT_BEFORE_RESTORE = False
+    backup.snapshot_name = f"proximity-bk-{backup.id}"
+    backup.save()
+    with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+        service = MockProxmox.return_value
+        service.get_lxc_status.return_value = {"status": "stopped"}
+        service.list_snapshots.return_value = [_snapshot(backup.snapshot_name, backup, 30)]
+
+        result = restore_backup_task(backup_id=backup.id)
+
+    assert result["success"] is True
+    assert result["restore_path"] == STRATEGY_SNAPSHOT
+    assert result["snapshot"] == backup.snapshot_name
+    service.restore_lxc_backup.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_forced_rollback_without_snapshot_leaves_app_untouched(backup):
+    with patch("apps.backups.tasks.ProxmoxService") as MockProxmox:
+        MockProxmox.return_value.list_snapshots.return_value = []
+
+        result = restore_backup_task(backup_id=backup.id, strategy=STRATEGY_SNAPSHOT)
+
+    assert result["success"] is False
+    MockProxmox.return_value.stop_lxc.assert_not_called()
+    backup.application.refresh_from_db()
+    assert backup.application.status == "running"
+
+
+@pytest.mark.django_db
+def test_restore_plan_endpoint(auth_client, sample_application, backup):
+    with patch("apps.backups.api.ProxmoxService") as MockProxmox:
+        MockProxmox.return_value.list_snapshots.return_value = [
+            _snapshot("nightly", backup, timedelta(minutes=2).total_seconds())
+        ]
+        response = auth_client.get(
+            f"/api/apps/{sample_application.id}/backups/{backup.id}/restore-plan"
+        )
+
+    assert response.status_code == 200
+    assert response.json()["strategy"] == STRATEGY_SNAPSHOT
+    assert response.json()["snapshot"] == "nightly"
+
+    with patch("apps.backups.api.ProxmoxService") as MockProxmox:
+        MockProxmox.return_value.list_snapshots.return_value = []
+        MockProxmox.return_value.list_backups.return_value = []
+        response = auth_client.get(
+            f"/api/apps/{sample_application.id}/backups/{backup.id}/restore-plan"
+        )
+
+    assert response.status_code == 409
+    assert "no longer on storage" in response.json()["detail"]
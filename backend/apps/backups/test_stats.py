@@ -0,0 +1,87 @@
+"""
+Tests for materialized per-application backup stats.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.backups.models import Backup, BackupStats
+from apps.backups.policies import delete_backups_in_batches
+from apps.backups.stats import rebuild_all_backup_stats
+
+
+@pytest.mark.django_db
+def test_counters_follow_backup_lifecycle(sample_application):
+    backup = Backup.objects.create(application=sample_application, file_name="", status="creating")
+
+    stats = BackupStats.objects.get(application=sample_application)
+    assert (stats.total_backups, stats.in_progress_backups) == (1, 1)
+
+    backup.status = "completed"
+    backup.size = 2048
+    backup.save()
+
+    stats.refresh_from_db()
+    assert stats.completed_backups == 1
+    assert stats.in_progress_backups == 0
+    assert stats.total_size == 2048
+
+    backup.delete()
+
+    stats.refresh_from_db()
+    assert stats.total_backups == 0
+    assert stats.total_size == 0
+
+
+@pytest.mark.django_db
+def test_bulk_delete_refreshes_counters(sample_application, sample_backup):
+    with patch("apps.backups.policies.ProxmoxService"):
+        delete_backups_in_batches([sample_backup], batch_size=10)
+
+    assert BackupStats.objects.get(application=sample_application).total_backups == 0
+
+
+@pytest.mark.django_db
+def test_application_delete_cascades(sample_application, sample_backup):
+    sample_application.delete()
+
+    assert not BackupStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_repairs_drift(sample_application, sample_backup):
+    BackupStats.objects.filter(application=sample_application).update(total_backups=42)
+
+    rebuild_all_backup_stats()
+
+    assert BackupStats.objects.get(application=sample_application).total_backups == 1
+
+
+@pytest.mark.django_db
+def test_bulk_stats_endpoint_uses_one_query_for_stats(
+    auth_client, sample_application, sample_backup, other_user_application
+):
+    Backup.objects.create(
+        application=other_user_application, file_name="x.tar.zst", status="completed"
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get("/api/backups/stats")
+
+    assert response.status_code == 200
+    stats = response.json()["stats"]
+    # Only the caller's applications are returned
+    assert list(stats) == [sample_application.id]
+    assert stats[sample_application.id]["completed_backups"] == 1
+    assert len([q for q in queries if "backup_stats" in q["sql"]]) == 1
+
+
+@pytest.mark.django_db
+def test_bulk_stats_endpoint_filters_and_fills_missing(auth_client, sample_application):
+    response = auth_client.get(f"/api/backups/stats?app_ids={sample_application.id}")
+
+    assert response.status_code == 200
+    assert response.json()["stats"][sample_application.id]["total_backups"] == 0
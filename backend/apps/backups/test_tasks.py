@@ -98,6 +98,9 @@ class TestRestoreBackupTask:
                 "task": {"status": "completed"},
                 "vmid": sample_application.lxc_id,
             }
+            mock_service.list_backups.return_value = [
+                {"volid": f"{sample_backup.storage_name}:backup/{sample_backup.file_name}"}
+            ]
 
             # Execute task
             result = restore_backup_task(backup_id=sample_backup.id)
@@ -151,6 +154,9 @@ class TestRestoreBackupTask:
             mock_service = MockProxmox.return_value
             mock_service.get_lxc_status.return_value = {"status": "stopped"}
             mock_service.restore_lxc_backup.side_effect = Exception("Restore failed")
+            mock_service.list_backups.return_value = [
+                {"volid": f"{sample_backup.storage_name}:backup/{sample_backup.file_name}"}
+            ]
 
             # Execute task
             result = restore_backup_task(backup_id=sample_backup.id)
@@ -2,31 +2,22 @@
 Catalog API endpoints.
 
 Provides REST API for browsing and searching the application catalog.
+
+Read endpoints are served from responses serialized once per catalog
+version, with ETag revalidation and gzip (see http_cache).
 """
 
 from ninja import Router
 from ninja.errors import HttpError
 
+from .http_cache import response_cache
 from .schemas import CatalogAppSchema, CatalogListResponse, CatalogCategoriesResponse
+from .services import get_catalog_service
 
 
 router = Router(tags=["Catalog"])
 
 
-# Lazy-load catalog_service to allow mocking in tests
-_catalog_service = None
-
-
-def get_catalog_service():
-    """Get the catalog service instance (lazy-loaded)."""
-    global _catalog_service
-    if _catalog_service is None:
-        from .services import catalog_service
-
-        _catalog_service = catalog_service
-    return _catalog_service
-
-
 @router.get("/", response=CatalogListResponse, summary="List all applications", auth=None)
 def list_apps(request):
     """
@@ -34,8 +25,13 @@ def list_apps(request):
 
     Returns a list of all available applications that can be deployed.
     """
-    apps = get_catalog_service().get_all_apps()
-    return {"total": len(apps), "applications": apps}
+    service = get_catalog_service()
+
+    def render():
+        apps = service.get_all_apps()
+        return CatalogListResponse(total=len(apps), applications=apps)
+
+    return response_cache.get(service, "list", render).respond(request)
 
 
 @router.get(
@@ -47,8 +43,12 @@ def list_categories(request):
 
     Returns a list of category names that can be used for filtering.
     """
-    categories = get_catalog_service().get_categories()
-    return {"categories": categories}
+    service = get_catalog_service()
+
+    def render():
+        return CatalogCategoriesResponse(categories=service.get_categories())
+
+    return response_cache.get(service, "categories", render).respond(request)
 
 
 @router.get("/search", response=CatalogListResponse, summary="Search applications", auth=None)
@@ -64,8 +64,13 @@ def search_apps(request, q: str = ""):
     Returns:
         List of matching applications
     """
-    apps = get_catalog_service().search_apps(q)
-    return {"total": len(apps), "applications": apps}
+    service = get_catalog_service()
+
+    def render():
+        apps = service.search_apps(q)
+        return CatalogListResponse(total=len(apps), applications=apps)
+
+    return response_cache.get(service, f"search:{q}", render).respond(request)
 
 
 @router.get(
@@ -81,8 +86,13 @@ def filter_by_category(request, category: str):
     Returns:
         List of applications in the category
     """
-    apps = get_catalog_service().filter_by_category(category)
-    return {"total": len(apps), "applications": apps}
+    service = get_catalog_service()
+
+    def render():
+        apps = service.filter_by_category(category)
+        return CatalogListResponse(total=len(apps), applications=apps)
+
+    return response_cache.get(service, f"category:{category.lower()}", render).respond(request)
 
 
 @router.get("/stats", summary="Get catalog statistics", auth=None)
@@ -129,9 +139,10 @@ def get_app(request, app_id: str):
     Raises:
         404: If the application is not found
     """
-    app = get_catalog_service().get_app_by_id(app_id)
+    service = get_catalog_service()
+    cached = response_cache.get(service, f"app:{app_id}", lambda: service.get_app_by_id(app_id))
 
-    if app is None:
+    if cached is None:
         raise HttpError(404, f"Application '{app_id}' not found in catalog")
 
-    return app
+    return cached.respond(request)
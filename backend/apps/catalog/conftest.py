@@ -0,0 +1,37 @@
+"""
+Pytest fixtures for catalog tests.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def make_definition():
+    """Factory for minimal valid catalog app definitions."""
+
+    def make(app_id: str, name: str = None, **extra) -> dict:
+        return {
+            "id": app_id,
+            "name": name or app_id.title(),
+            "version": "1.0.0",
+            "description": f"{app_id} service",
+            "category": "Tools",
+            "docker_compose": {"version": "3.8", "services": {}},
+            "min_memory": 256,
+            "min_cpu": 1,
+            **extra,
+        }
+
+    return make
+
+
+@pytest.fixture
+def write_definition(make_definition):
+    """Write an app definition as <app_id>.json into a catalog directory."""
+
+    def write(path, app_id: str, **extra) -> None:
+        (path / f"{app_id}.json").write_text(json.dumps(make_definition(app_id, **extra)))
+
+    return write
@@ -0,0 +1,129 @@
+"""
+HTTP caching for the catalog API.
+
+Catalog responses only change when the catalog version does, so each one is
+serialized (and gzipped) once per version and then served as stored bytes:
+
+- the ETag is a hash of the body, so it is valid across processes and
+  restarts; a matching If-None-Match is answered with 304 Not Modified;
+- Cache-Control lets browsers and proxies reuse a response for
+  CATALOG_HTTP_MAX_AGE seconds before revalidating;
+- clients that accept gzip get the pre-compressed body.
+
+The stored responses are dropped as soon as the catalog version changes.
+"""
+
+import gzip
+import hashlib
+import re
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from pydantic import BaseModel
+
+from apps.core.metrics import cache_lookup
+
+# Bodies smaller than this are not worth compressing
+MIN_GZIP_SIZE = 512
+
+# Stored responses per catalog version (search queries are open-ended)
+MAX_CACHED_RESPONSES = 512
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+class CachedResponse:
+    """A response body serialized once, with its gzip variant and ETag."""
+
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped = gzip.compress(body, mtime=0) if len(body) >= MIN_GZIP_SIZE else None
+        # Weak: the gzip variant shares the ETag of the plain body
+        self.etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "CachedResponse":
+        return cls(model.model_dump_json().encode())
+
+    def matches(self, request: HttpRequest) -> bool:
+        """Whether the client already holds this response (If-None-Match)."""
+        header = request.headers.get("If-None-Match")
+        if not header:
+            return False
+        etags = parse_etags(header)
+        if "*" in etags:
+            return True
+        own = self.etag.removeprefix("W/")
+        return any(etag.removeprefix("W/") == own for etag in etags)
+
+    def respond(self, request: HttpRequest) -> HttpResponse:
+        """Serve the stored body, a 304, or the gzip variant as the request allows."""
+        if self.matches(request):
+            response = HttpResponseNotModified()
+        elif self.gzipped and _ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(self.gzipped, content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(self.body, content_type="application/json")
+
+        response["ETag"] = self.etag
+        response["Cache-Control"] = f"public, max-age={settings.CATALOG_HTTP_MAX_AGE}"
+        response["Vary"] = "Accept-Encoding"
+        return response
+
+
+class CatalogResponseCache:
+    """
+    Serialized catalog responses of the current catalog version.
+    """
+
+    def __init__(self):
+        # (catalog version, {key: response}), replaced as a whole on a new version
+        self._state = (None, {})
+
+    def get(
+        self, service, key: str, render: Callable[[], Optional[BaseModel]]
+    ) -> Optional[CachedResponse]:
+        """
+        Stored response for `key`, rendered and stored on first use.
+
+        Args:
+            service: The CatalogService the response is rendered from
+            key: Identifies the response within a catalog version
+            render: Builds the response model (None when there is nothing to serve)
+
+        Returns:
+            The response, or None when `render` returned None
+        """
+        version = service.version
+        cached_version, entries = self._state
+        if cached_version != version:
+            entries: Dict[str, CachedResponse] = {}
+            self._state = (version, entries)
+
+        cached = entries.get(key)
+        cache_lookup("catalog_response", cached is not None)
+        if cached is not None:
+            return cached
+
+        model = render()
+        if model is None:
+            return None
+        cached = CachedResponse.from_model(model)
+
+        # Only keep it if the catalog did not change while it was rendered
+        if service.version == version:
+            if len(entries) >= MAX_CACHED_RESPONSES:
+                entries.clear()
+            entries[key] = cached
+        return cached
+
+    def clear(self) -> None:
+        self._state = (None, {})
+
+
+response_cache = CatalogResponseCache()
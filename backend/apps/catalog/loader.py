@@ -0,0 +1,260 @@
+"""
+Catalog loader - incremental loads of the catalog directory into snapshots.
+
+A CatalogSnapshot is the whole catalog as one read-only object: the apps,
+their search index, the state of every file they came from and a version
+hash of the file contents. CatalogService swaps snapshots with a single
+assignment, so a request never sees half of a reload.
+
+Reloads are incremental. A file whose mtime and size are unchanged is not
+read; a file whose content hash is unchanged (touched, copied over) is not
+parsed; only files that really changed are revalidated. When no content
+changed the previous snapshot - and its index - is reused.
+
+Apps synced from remote sources come from one compiled file (see sources);
+local files override them. Snapshots are also saved to a single pickle, so a
+starting process loads the validated catalog and its index in one read and
+only stats the local files.
+"""
+
+import hashlib
+import json
+import logging
+import pickle
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from pydantic import ValidationError
+
+from .schemas import CatalogAppSchema
+from .search_index import CatalogSearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_FORMAT = 1
+
+
+class CatalogSnapshot:
+    """
+    One consistent version of the catalog. Never modified after creation.
+    """
+
+    __slots__ = ("apps", "index", "files", "remote", "version")
+
+    def __init__(
+        self,
+        apps: Mapping[str, CatalogAppSchema],
+        index: CatalogSearchIndex,
+        files: Mapping[str, Dict[str, Any]],
+        version: str,
+        remote: Optional[Dict[str, Any]] = None,
+    ):
+        self.apps = MappingProxyType(dict(apps))
+        self.index = index
+        self.files = MappingProxyType(dict(files))
+        self.remote = remote
+        self.version = version
+
+    @classmethod
+    def empty(cls) -> "CatalogSnapshot":
+        return cls({}, CatalogSearchIndex({}), {}, catalog_version({}))
+
+    def save(self, path: Path, catalog_path: Path) -> None:
+        """Persist the snapshot for the next process start."""
+        from .sources import write_atomic
+
+        state = {
+            "format": SNAPSHOT_FORMAT,
+            "catalog_path": str(catalog_path),
+            "version": self.version,
+            "apps": dict(self.apps),
+            "index": self.index,
+            "files": dict(self.files),
+            "remote": self.remote,
+        }
+        try:
+            write_atomic(path, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            logger.warning(f"⚠️  Failed to save catalog snapshot: {e}")
+
+    @classmethod
+    def read(cls, path: Path, catalog_path: Path) -> Optional["CatalogSnapshot"]:
+        """Snapshot saved by save(), or None if missing, unreadable or for another catalog."""
+        try:
+            state = pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️  Ignoring unreadable catalog snapshot: {e}")
+            return None
+        if state.get("format") != SNAPSHOT_FORMAT or state["catalog_path"] != str(catalog_path):
+            return None
+        return cls(state["apps"], state["index"], state["files"], state["version"], state["remote"])
+
+
+def catalog_version(
+    files: Mapping[str, Dict[str, Any]], remote: Optional[Dict[str, Any]] = None
+) -> str:
+    """Hash of the names and content hashes of the catalog files (and remote version)."""
+    digest = hashlib.sha256()
+    if remote:
+        digest.update(f"@remote:{remote['version']}\n".encode())
+    for name in sorted(files):
+        digest.update(f"{name}:{files[name]['sha256']}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+class CatalogLoader:
+    """
+    Builds catalog snapshots from a directory of JSON app definitions.
+    """
+
+    def __init__(self, catalog_path: Path, remote_file: Optional[Path] = None):
+        self.catalog_path = catalog_path
+        self.remote_file = remote_file
+
+    def _remote_stat(self) -> Optional[tuple]:
+        try:
+            stat = self.remote_file.stat() if self.remote_file else None
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size) if stat else None
+
+    def _load_remote(self, previous: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Compiled remote apps, reusing `previous` when the file did not change."""
+        stat = self._remote_stat()
+        if stat is None:
+            return None
+        if previous and (previous["mtime_ns"], previous["size"]) == stat:
+            return previous
+
+        from .sources import read_remote
+
+        compiled = read_remote(self.remote_file)
+        if compiled is None:
+            return None
+        return {
+            "version": compiled["version"],
+            "apps": compiled["apps"],
+            "mtime_ns": stat[0],
+            "size": stat[1],
+        }
+
+    def _stat_files(self) -> Optional[Dict[str, Any]]:
+        """Stat of every JSON file, or None when the catalog directory is unusable."""
+        if not self.catalog_path.exists():
+            logger.warning(f"Catalog directory does not exist: {self.catalog_path}")
+            logger.info("Creating catalog directory...")
+            self.catalog_path.mkdir(parents=True, exist_ok=True)
+            return None
+
+        if not self.catalog_path.is_dir():
+            logger.error(f"Catalog path is not a directory: {self.catalog_path}")
+            return None
+
+        stats = {}
+        for json_file in self.catalog_path.glob("*.json"):
+            try:
+                stats[json_file.name] = json_file.stat()
+            except FileNotFoundError:
+                # Removed between the listing and the stat
+                continue
+        return stats
+
+    def has_changes(self, snapshot: CatalogSnapshot) -> bool:
+        """Whether any file was added, removed or modified since the snapshot (stat only)."""
+        remote = snapshot.remote
+        if self._remote_stat() != ((remote["mtime_ns"], remote["size"]) if remote else None):
+            return True
+        if not self.catalog_path.is_dir():
+            return bool(snapshot.files)
+
+        names = set()
+        for json_file in self.catalog_path.glob("*.json"):
+            names.add(json_file.name)
+            known = snapshot.files.get(json_file.name)
+            try:
+                stat = json_file.stat()
+            except FileNotFoundError:
+                return True
+            if not known or (known["mtime_ns"], known["size"]) != (stat.st_mtime_ns, stat.st_size):
+                return True
+        return names != set(snapshot.files)
+
+    def _parse(self, name: str, raw: bytes) -> Optional[CatalogAppSchema]:
+        """Validate one catalog file; invalid files are logged and skipped."""
+        try:
+            return CatalogAppSchema(**json.loads(raw))
+        except ValidationError as e:
+            logger.error(f"Validation error in {name}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to load {name}: {str(e)}")
+        return None
+
+    def load(self, previous: Optional[CatalogSnapshot] = None) -> CatalogSnapshot:
+        """
+        Load the catalog, reusing whatever did not change since `previous`.
+
+        Args:
+            previous: Snapshot to update (None loads everything)
+
+        Returns:
+            A new snapshot, or `previous` itself when nothing changed
+        """
+        previous = previous or CatalogSnapshot.empty()
+        remote = self._load_remote(previous.remote)
+        stats = self._stat_files() or {}
+        if not stats and not remote:
+            logger.warning(f"No JSON files found in {self.catalog_path}")
+
+        files: Dict[str, Dict[str, Any]] = {}
+        reparsed = 0
+        for name in sorted(stats):
+            stat = stats[name]
+            known = previous.files.get(name)
+            if known and (known["mtime_ns"], known["size"]) == (stat.st_mtime_ns, stat.st_size):
+                files[name] = known
+                continue
+
+            try:
+                raw = (self.catalog_path / name).read_bytes()
+            except OSError as e:
+                logger.error(f"Failed to read {name}: {e}")
+                continue
+            sha256 = hashlib.sha256(raw).hexdigest()
+            state = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256}
+
+            if known and known["sha256"] == sha256:
+                files[name] = {**known, **state}
+                continue
+
+            logger.debug(f"Loading {name}")
+            files[name] = {**state, "app": self._parse(name, raw)}
+            reparsed += 1
+
+        version = catalog_version(files, remote)
+        if version == previous.version:
+            if files == dict(previous.files) and remote is previous.remote:
+                return previous
+            # Only file stats moved: keep the apps and the index
+            return CatalogSnapshot(previous.apps, previous.index, files, version, remote)
+
+        # Local files override apps of the remote sources
+        apps: Dict[str, CatalogAppSchema] = dict(remote["apps"]) if remote else {}
+        remote_ids = set(apps)
+        for name, state in files.items():
+            app = state["app"]
+            if app is None:
+                continue
+            if app.id in apps and app.id not in remote_ids:
+                logger.warning(f"Duplicate app ID '{app.id}' in {name}, overwriting previous entry")
+            apps[app.id] = app
+            remote_ids.discard(app.id)
+
+        logger.info(
+            f"Catalog version {version}: {len(apps)} apps from {len(files)} files "
+            f"({reparsed} reparsed) and {len(remote['apps']) if remote else 0} remote apps"
+        )
+        return CatalogSnapshot(apps, CatalogSearchIndex(apps), files, version, remote)
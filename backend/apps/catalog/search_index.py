@@ -0,0 +1,220 @@
+"""
+In-memory search index for the application catalog.
+
+Built once per catalog load, so queries never touch the raw app definitions:
+
+- token postings: token → {app_id: field weight}, the weight of the best
+  field the token appears in (name > id > tags > category > description);
+- a prefix table (prefix → tokens) for search-as-you-type;
+- a trigram table (trigram → tokens) for matches inside words ("min" finds
+  "adminer") and for typo candidates;
+- the apps pre-sorted by name, overall and per category.
+
+Every query term must match (AND). A term scores the field weight of its
+best match, scaled by how it matched: exact token, prefix, infix, or - only
+when nothing else matched the term - a typo within one or two edits.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from .schemas import CatalogAppSchema
+
+FIELD_WEIGHTS = {
+    "name": 10.0,
+    "id": 8.0,
+    "tags": 6.0,
+    "category": 4.0,
+    "description": 1.0,
+}
+
+# Score multipliers per kind of match
+EXACT = 1.0
+PREFIX = 0.75
+INFIX = 0.5
+TYPO = 0.4
+
+MAX_CACHED_QUERIES = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of a text."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    """Character trigrams of a token (empty for tokens shorter than 3)."""
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance between two strings, counting a swap of neighbours as one edit.
+
+    Returns:
+        The distance, or limit + 1 once it is known to exceed `limit`
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i]
+        for j in range(1, len(b) + 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def max_typos(term: str) -> int:
+    """Edits tolerated for a query term: none below 4 chars, 2 from 8 chars."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+class CatalogSearchIndex:
+    """
+    Search structures over a set of catalog applications, built once.
+
+    Only the query cache changes after construction; a reload builds a new index.
+    """
+
+    def __init__(self, apps: Dict[str, CatalogAppSchema]):
+        self._apps = dict(apps)
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._prefixes: Dict[str, Set[str]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._cache: Dict[str, List[str]] = {}
+
+        for app in self._apps.values():
+            for field, texts in self._fields(app).items():
+                weight = FIELD_WEIGHTS[field]
+                for text in texts:
+                    for token in tokenize(text):
+                        postings = self._postings[token]
+                        postings[app.id] = max(postings.get(app.id, 0.0), weight)
+
+        for token in self._postings:
+            for end in range(1, len(token) + 1):
+                self._prefixes[token[:end]].add(token)
+            for trigram in trigrams(token):
+                self._trigrams[trigram].add(token)
+
+        self.sorted_ids: List[str] = sorted(
+            self._apps, key=lambda app_id: self._apps[app_id].name.lower()
+        )
+        categories: Dict[str, List[str]] = defaultdict(list)
+        for app_id in self.sorted_ids:
+            categories[self._apps[app_id].category.lower()].append(app_id)
+        self.category_ids: Dict[str, List[str]] = dict(categories)
+        self.categories: List[str] = sorted({app.category for app in self._apps.values()})
+
+    @staticmethod
+    def _fields(app: CatalogAppSchema) -> Dict[str, List[str]]:
+        """Searchable texts of an app, per weighted field."""
+        return {
+            "name": [app.name],
+            "id": [app.id],
+            "tags": list(app.tags),
+            "category": [app.category],
+            "description": [app.description],
+        }
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Saved with the catalog snapshot; cached queries are not worth keeping
+        return {**self.__dict__, "_cache": {}}
+
+    @property
+    def token_count(self) -> int:
+        return len(self._postings)
+
+    def _term_scores(self, term: str) -> Dict[str, float]:
+        """Best score of every app matching one query term."""
+        matches: Dict[str, float] = {}
+
+        def collect(tokens: Iterable[str], factor: float) -> None:
+            for token in tokens:
+                for app_id, weight in self._postings[token].items():
+                    score = weight * factor
+                    if score > matches.get(app_id, 0.0):
+                        matches[app_id] = score
+
+        if term in self._postings:
+            collect([term], EXACT)
+        collect((t for t in self._prefixes.get(term, ()) if t != term), PREFIX)
+
+        term_trigrams = trigrams(term)
+        if term_trigrams:
+            candidates = set.intersection(
+                *(self._trigrams.get(trigram, set()) for trigram in term_trigrams)
+            )
+            collect((t for t in candidates if term in t and not t.startswith(term)), INFIX)
+
+        if not matches and max_typos(term):
+            limit = max_typos(term)
+            # Tokens sharing a trigram or the first letter with the term
+            candidates = set(self._prefixes.get(term[0], ()))
+            for trigram in term_trigrams:
+                candidates |= self._trigrams.get(trigram, set())
+            for token in candidates:
+                distance = edit_distance(term, token, limit)
+                if distance <= limit:
+                    collect([token], TYPO / distance)
+
+        return matches
+
+    def search(self, query: str) -> Optional[List[str]]:
+        """
+        Rank the apps matching a query.
+
+        Args:
+            query: Free-text query (case-insensitive)
+
+        Returns:
+            App IDs, best match first (ties by name), or None when the query
+            has no searchable terms
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return None
+
+        key = " ".join(terms)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        scores: Optional[Dict[str, float]] = None
+        for term in terms:
+            term_scores = self._term_scores(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    app_id: score + term_scores[app_id]
+                    for app_id, score in scores.items()
+                    if app_id in term_scores
+                }
+            if not scores:
+                break
+
+        ranked = sorted(
+            scores or {},
+            key=lambda app_id: (-scores[app_id], self._apps[app_id].name.lower()),
+        )
+        if len(self._cache) >= MAX_CACHED_QUERIES:
+            self._cache.clear()
+        self._cache[key] = ranked
+        return ranked
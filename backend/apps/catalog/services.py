@@ -3,20 +3,43 @@ Catalog service for loading and managing application definitions.
 
 This service reads JSON files from the catalog directory and provides
 methods to query the catalog data.
+
+The catalog is held as one immutable CatalogSnapshot that reloads replace
+atomically. Every process watches the catalog on its own: at most every
+CATALOG_RELOAD_INTERVAL seconds it stats the catalog files and compares its
+version with the one published in Redis, reloading incrementally when
+either changed. A process that picks up a change publishes the new version,
+so all gunicorn and Celery workers converge within seconds.
+
+Nothing is loaded at import time: get_catalog_service() (or the
+`catalog_service` module attribute) creates the service on first use.
+
+Apps synced from remote sources (CATALOG_SOURCES) are merged in from the
+compiled cache, and every new snapshot is saved to CATALOG_CACHE_DIR, so a
+starting process reads one file instead of reparsing the whole catalog.
 """
 
-import json
 import logging
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from django.conf import settings
-from pydantic import ValidationError
 
 from .schemas import CatalogAppSchema
-
+from .loader import CatalogLoader, CatalogSnapshot
+from .sources import cache_dir, remote_path
 
 logger = logging.getLogger(__name__)
 
+# Redis key holding the newest catalog version any process has loaded
+CATALOG_VERSION_KEY = "proximity:catalog:version"
+
+# Seconds to stop asking Redis after it failed
+REDIS_RETRY_DELAY = 30
+
+SNAPSHOT_FILE = "snapshot.pickle"
+
 
 class CatalogService:
     """
@@ -46,14 +69,21 @@ class CatalogService:
         if CatalogService._initialized:
             return
 
-        self._apps: Dict[str, CatalogAppSchema] = {}
         self._catalog_path: Path = self._get_catalog_path()
+        self._loader = CatalogLoader(self._catalog_path, remote_path())
+        self._snapshot_path = cache_dir() / SNAPSHOT_FILE
+        self._snapshot = (
+            CatalogSnapshot.read(self._snapshot_path, self._catalog_path) or CatalogSnapshot.empty()
+        )
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._redis_retry_at = 0.0
 
         logger.info(f"Initializing CatalogService from {self._catalog_path}")
         self._load_catalog()
 
         CatalogService._initialized = True
-        logger.info(f"CatalogService initialized with {len(self._apps)} applications")
+        logger.info(f"CatalogService initialized with {len(self._snapshot.apps)} applications")
 
     def _get_catalog_path(self) -> Path:
         """
@@ -69,72 +99,85 @@ class CatalogService:
         # Default: catalog_data/ in project root
         return settings.BASE_DIR / "catalog_data"
 
-    def _load_catalog(self) -> None:
+    def _load_catalog(self) -> bool:
         """
-        Load all JSON files from the catalog directory.
+        Load the catalog directory and swap in the new snapshot.
 
-        Validates each file against the CatalogAppSchema and stores
-        valid applications in memory. Invalid files are logged and skipped.
+        Only files changed since the current snapshot are reparsed. Invalid
+        files are logged and skipped. A new snapshot is saved for the next start.
+
+        Returns:
+            True if the catalog version changed
         """
-        if not self._catalog_path.exists():
-            logger.warning(f"Catalog directory does not exist: {self._catalog_path}")
-            logger.info("Creating catalog directory...")
-            self._catalog_path.mkdir(parents=True, exist_ok=True)
+        with self._reload_lock:
+            snapshot = self._loader.load(self._snapshot)
+            changed = snapshot.version != self._snapshot.version
+            if snapshot is not self._snapshot:
+                snapshot.save(self._snapshot_path, self._catalog_path)
+            self._snapshot = snapshot
+        return changed
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current catalog, refreshed first if it may be stale."""
+        self._refresh_if_stale()
+        return self._snapshot
+
+    @property
+    def version(self) -> str:
+        """Hash of the loaded catalog files."""
+        return self.snapshot.version
+
+    def _refresh_if_stale(self) -> None:
+        """Reload when the files or the published version changed (throttled)."""
+        if not settings.CATALOG_HOT_RELOAD:
             return
 
-        if not self._catalog_path.is_dir():
-            logger.error(f"Catalog path is not a directory: {self._catalog_path}")
+        now = time.monotonic()
+        if now - self._last_check < settings.CATALOG_RELOAD_INTERVAL:
             return
-
-        # Find all JSON files
-        json_files = list(self._catalog_path.glob("*.json"))
-
-        if not json_files:
-            logger.warning(f"No JSON files found in {self._catalog_path}")
+        # Another thread is already checking or reloading: serve the current snapshot
+        if not self._reload_lock.acquire(blocking=False):
             return
-
-        logger.info(f"Found {len(json_files)} JSON files to load")
-
-        # Load and validate each file
-        for json_file in json_files:
-            try:
-                self._load_app_file(json_file)
-            except Exception as e:
-                logger.error(f"Failed to load {json_file.name}: {str(e)}")
-                continue
-
-    def _load_app_file(self, file_path: Path) -> None:
-        """
-        Load and validate a single catalog JSON file.
-
-        Args:
-            file_path: Path to the JSON file
-
-        Raises:
-            Exception: If the file cannot be read or validated
-        """
-        logger.debug(f"Loading {file_path.name}")
-
-        # Read JSON file
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Validate against schema
         try:
-            app = CatalogAppSchema(**data)
-        except ValidationError as e:
-            logger.error(f"Validation error in {file_path.name}: {e}")
-            raise
+            self._last_check = now
+            published = self._published_version()
+            stale = published not in (None, self._snapshot.version)
+            if not stale and not self._loader.has_changes(self._snapshot):
+                return
+        finally:
+            self._reload_lock.release()
+
+        if self._load_catalog() and self._snapshot.version != published:
+            logger.info(f"📚 Catalog changed on disk, now version {self._snapshot.version}")
+            self._publish_version()
+
+    def _published_version(self) -> Optional[str]:
+        """Catalog version published in Redis (None if unknown or unreachable)."""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+
+        from redis.exceptions import RedisError
+        from apps.core.node_semaphore import get_redis_client
 
-        # Check for duplicate IDs
-        if app.id in self._apps:
-            logger.warning(
-                f"Duplicate app ID '{app.id}' in {file_path.name}, overwriting previous entry"
-            )
+        try:
+            value = get_redis_client().get(CATALOG_VERSION_KEY)
+        except RedisError as e:
+            logger.debug(f"Catalog version check unavailable: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_DELAY
+            return None
+        return value.decode() if value else None
+
+    def _publish_version(self) -> None:
+        """Tell the other processes which catalog version to load."""
+        from redis.exceptions import RedisError
+        from apps.core.node_semaphore import get_redis_client
 
-        # Store in memory
-        self._apps[app.id] = app
-        logger.debug(f"Loaded {app.name} (ID: {app.id})")
+        try:
+            get_redis_client().set(CATALOG_VERSION_KEY, self._snapshot.version)
+        except RedisError as e:
+            logger.warning(f"⚠️  Failed to publish catalog version: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_DELAY
 
     def get_all_apps(self) -> List[CatalogAppSchema]:
         """
@@ -143,8 +186,8 @@ class CatalogService:
         Returns:
             List of all catalog applications, sorted by name
         """
-        apps = list(self._apps.values())
-        return sorted(apps, key=lambda x: x.name.lower())
+        snapshot = self.snapshot
+        return [snapshot.apps[app_id] for app_id in snapshot.index.sorted_ids]
 
     def get_app_by_id(self, app_id: str) -> Optional[CatalogAppSchema]:
         """
@@ -156,7 +199,7 @@ class CatalogService:
         Returns:
             The application if found, None otherwise
         """
-        return self._apps.get(app_id)
+        return self.snapshot.apps.get(app_id)
 
     def get_categories(self) -> List[str]:
         """
@@ -165,47 +208,29 @@ class CatalogService:
         Returns:
             Sorted list of unique category names
         """
-        categories = {app.category for app in self._apps.values()}
-        return sorted(categories)
+        return list(self.snapshot.index.categories)
 
     def search_apps(self, query: str) -> List[CatalogAppSchema]:
         """
         Search for applications matching the query.
 
-        Searches in:
-        - Application name
-        - Application description
-        - Application tags
+        Every word of the query must match the application's name, ID, tags,
+        category or description - as a whole word, a word prefix, a part of a
+        word, or (when nothing else matches) with a typo or two.
 
         Args:
             query: Search query string (case-insensitive)
 
         Returns:
-            List of matching applications, sorted by name
+            List of matching applications, best match first (name hits rank
+            above tag, category and description hits; ties sorted by name)
         """
-        if not query:
-            return self.get_all_apps()
-
-        query_lower = query.lower()
-        matching_apps = []
-
-        for app in self._apps.values():
-            # Search in name
-            if query_lower in app.name.lower():
-                matching_apps.append(app)
-                continue
-
-            # Search in description
-            if query_lower in app.description.lower():
-                matching_apps.append(app)
-                continue
-
-            # Search in tags
-            if any(query_lower in tag.lower() for tag in app.tags):
-                matching_apps.append(app)
-                continue
+        snapshot = self.snapshot
+        ranked = snapshot.index.search(query) if query else None
+        if ranked is None:
+            return [snapshot.apps[app_id] for app_id in snapshot.index.sorted_ids]
 
-        return sorted(matching_apps, key=lambda x: x.name.lower())
+        return [snapshot.apps[app_id] for app_id in ranked]
 
     def filter_by_category(self, category: str) -> List[CatalogAppSchema]:
         """
@@ -217,35 +242,61 @@ class CatalogService:
         Returns:
             List of applications in the category, sorted by name
         """
-        matching_apps = [
-            app for app in self._apps.values() if app.category.lower() == category.lower()
+        snapshot = self.snapshot
+        return [
+            snapshot.apps[app_id]
+            for app_id in snapshot.index.category_ids.get(category.lower(), [])
         ]
-        return sorted(matching_apps, key=lambda x: x.name.lower())
 
     def reload(self) -> None:
         """
-        Reload the catalog from disk.
+        Reload the catalog from disk and have every other process follow.
 
-        This can be called to refresh the catalog without restarting
-        the application.
+        Unchanged files are not reparsed. The resulting version is published
+        even when nothing changed here, so lagging processes catch up.
         """
         logger.info("Reloading catalog...")
-        self._apps.clear()
         self._load_catalog()
-        logger.info(f"Catalog reloaded with {len(self._apps)} applications")
-
-    def get_stats(self) -> Dict[str, int]:
+        self._last_check = time.monotonic()
+        self._publish_version()
+        logger.info(
+            f"Catalog reloaded with {len(self._snapshot.apps)} applications "
+            f"(version {self._snapshot.version})"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the catalog.
 
         Returns:
             Dictionary with catalog statistics
         """
+        snapshot = self.snapshot
         return {
-            "total_apps": len(self._apps),
-            "total_categories": len(self.get_categories()),
+            "total_apps": len(snapshot.apps),
+            "total_categories": len(snapshot.index.categories),
+            "version": snapshot.version,
         }
 
 
-# Singleton instance
-catalog_service = CatalogService()
+_service_lock = threading.Lock()
+
+
+def get_catalog_service() -> CatalogService:
+    """
+    The process-wide CatalogService, loaded on first use.
+
+    Importing this module is cheap: processes that never touch the catalog
+    (most Celery tasks, management commands) never load it.
+    """
+    if not CatalogService._initialized:
+        with _service_lock:
+            return CatalogService()
+    return CatalogService._instance
+
+
+def __getattr__(name: str):
+    # `catalog_service` is created on first access instead of at import time
+    if name == "catalog_service":
+        return get_catalog_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,333 @@
+"""
+Remote catalog sources - app definitions synced from git repositories or HTTP indexes.
+
+CATALOG_SOURCES lists the sources. They are merged in order, so later
+sources override earlier ones, and the local catalog directory overrides
+them all:
+
+    [
+        {"name": "community", "type": "http", "url": "https://example.org/catalog.json"},
+        {"name": "team", "type": "git", "url": "https://git.example.org/catalog.git",
+         "ref": "main", "path": "apps"}
+    ]
+
+An HTTP source serves a JSON list of app definitions (or {"apps": [...]}).
+A git source holds one JSON file per app under `path`, at branch or tag `ref`.
+
+Each source syncs into a versioned cache, CATALOG_CACHE_DIR/sources/<name>/:
+one <version>.json per fetched version and a meta.json that points at the
+current version. A sync asks for the ETag (HTTP) or the commit (git ls-remote)
+first and stops there when it is unchanged. A failing source keeps serving
+its last good version.
+
+The merged apps of all sources are compiled into a single pickle
+(remote.pickle) that CatalogLoader reads instead of re-validating every
+definition. The pickles are only ever written by Proximity into its own
+cache directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from pydantic import ValidationError
+
+from .schemas import CatalogAppSchema
+
+logger = logging.getLogger(__name__)
+
+REMOTE_FILE = "remote.pickle"
+REMOTE_FORMAT = 1
+
+
+class CatalogSourceError(Exception):
+    """Raised when a catalog source cannot be synced."""
+
+
+def cache_dir() -> Path:
+    return Path(settings.CATALOG_CACHE_DIR)
+
+
+def remote_path() -> Path:
+    """Compiled apps of all remote sources."""
+    return cache_dir() / REMOTE_FILE
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file so readers only ever see the old or the new content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def validate_definitions(definitions: List[Any], source: str) -> List[Dict[str, Any]]:
+    """Keep the definitions that pass CatalogAppSchema; log the others."""
+    valid = []
+    for definition in definitions:
+        try:
+            valid.append(CatalogAppSchema(**definition).model_dump())
+        except (ValidationError, TypeError) as e:
+            app_id = definition.get("id") if isinstance(definition, dict) else None
+            logger.error(f"Skipping invalid app '{app_id}' from catalog source '{source}': {e}")
+    return valid
+
+
+class CatalogSource:
+    """
+    A remote catalog with a versioned on-disk cache.
+    """
+
+    def __init__(self, name: str, url: str, **options):
+        self.name = name
+        self.url = url
+        self.options = options
+        self.directory = cache_dir() / "sources" / name
+
+    @property
+    def meta_path(self) -> Path:
+        return self.directory / "meta.json"
+
+    def read_meta(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.meta_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def version_path(self, version: str) -> Path:
+        return self.directory / f"{version}.json"
+
+    def has_version(self, meta: Dict[str, Any]) -> bool:
+        return bool(meta.get("version")) and self.version_path(meta["version"]).exists()
+
+    def definitions(self) -> List[Dict[str, Any]]:
+        """App definitions of the current cached version (empty before the first sync)."""
+        meta = self.read_meta()
+        if not self.has_version(meta):
+            return []
+        return json.loads(self.version_path(meta["version"]).read_text())
+
+    def fetch(self, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the source unless it is unchanged since `meta`.
+
+        Returns:
+            None when unchanged, otherwise a dict with 'version', 'definitions'
+            and extra meta fields (etag, commit)
+        """
+        raise NotImplementedError
+
+    def sync(self) -> Dict[str, Any]:
+        """
+        Bring the cache up to date with the source.
+
+        Returns:
+            Dictionary with the source 'version', whether it 'changed' and its 'apps'
+
+        Raises:
+            CatalogSourceError: If the source cannot be fetched
+        """
+        meta = self.read_meta()
+        fetched = self.fetch(meta if self.has_version(meta) else {})
+        if fetched is None or (
+            fetched["version"] == meta.get("version") and self.has_version(meta)
+        ):
+            if fetched:
+                meta.update({k: v for k, v in fetched.items() if k != "definitions"})
+                write_atomic(self.meta_path, json.dumps(meta).encode())
+            return {"version": meta["version"], "changed": False, "apps": meta.get("apps", 0)}
+
+        definitions = validate_definitions(fetched.pop("definitions"), self.name)
+        write_atomic(self.version_path(fetched["version"]), json.dumps(definitions).encode())
+        meta = {**fetched, "apps": len(definitions), "synced_at": timezone.now().isoformat()}
+        write_atomic(self.meta_path, json.dumps(meta).encode())
+        self._prune(meta["version"])
+
+        logger.info(
+            f"📚 Catalog source '{self.name}' now at version {meta['version']} "
+            f"({len(definitions)} apps)"
+        )
+        return {"version": meta["version"], "changed": True, "apps": len(definitions)}
+
+    def _prune(self, current: str) -> None:
+        """Keep the newest CATALOG_CACHE_KEEP_VERSIONS cached versions."""
+        versions = sorted(
+            (p for p in self.directory.glob("*.json") if p.name != "meta.json"),
+            key=lambda p: p.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for stale in versions[settings.CATALOG_CACHE_KEEP_VERSIONS :]:
+            if stale.stem != current:
+                stale.unlink(missing_ok=True)
+
+
+class HttpCatalogSource(CatalogSource):
+    """JSON index served over HTTP, revalidated with its ETag."""
+
+    def fetch(self, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # httpx is only needed here; importing it at startup costs more than the catalog
+        import httpx
+
+        headers = {"If-None-Match": meta["etag"]} if meta.get("etag") else {}
+        try:
+            response = httpx.get(
+                self.url,
+                headers=headers,
+                timeout=settings.CATALOG_SYNC_TIMEOUT,
+                follow_redirects=True,
+            )
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            index = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise CatalogSourceError(f"Failed to fetch catalog '{self.name}': {e}")
+
+        definitions = index.get("apps", []) if isinstance(index, dict) else index
+        if not isinstance(definitions, list):
+            raise CatalogSourceError(f"Catalog '{self.name}' is not a list of apps")
+
+        return {
+            "version": hashlib.sha256(response.content).hexdigest()[:16],
+            "etag": response.headers.get("ETag"),
+            "definitions": definitions,
+        }
+
+
+class GitCatalogSource(CatalogSource):
+    """One JSON file per app in a git repository, versioned by commit."""
+
+    def _git(self, *args: str, cwd: Optional[str] = None) -> str:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=cwd,
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=settings.CATALOG_SYNC_TIMEOUT,
+            )
+        except FileNotFoundError:
+            raise CatalogSourceError("git is not installed")
+        except subprocess.TimeoutExpired:
+            raise CatalogSourceError(f"git {args[0]} of catalog '{self.name}' timed out")
+        except subprocess.CalledProcessError as e:
+            raise CatalogSourceError(
+                f"git {args[0]} of catalog '{self.name}' failed: {e.stderr.strip()}"
+            )
+        return result.stdout
+
+    def fetch(self, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        ref = self.options.get("ref", "main")
+        refs = self._git("ls-remote", self.url, ref).split()
+        if not refs:
+            raise CatalogSourceError(f"Catalog '{self.name}' has no ref '{ref}'")
+        commit = refs[0]
+        if commit == meta.get("commit"):
+            return None
+
+        with tempfile.TemporaryDirectory() as tmp:
+            checkout = Path(tmp) / "repo"
+            self._git("clone", "--quiet", "--depth", "1", "--branch", ref, self.url, str(checkout))
+            definitions = []
+            for json_file in sorted((checkout / self.options.get("path", "")).glob("*.json")):
+                try:
+                    definitions.append(json.loads(json_file.read_text(encoding="utf-8")))
+                except ValueError as e:
+                    logger.error(f"Skipping {json_file.name} from catalog '{self.name}': {e}")
+
+        return {"version": commit[:12], "commit": commit, "definitions": definitions}
+
+
+SOURCE_TYPES = {"http": HttpCatalogSource, "git": GitCatalogSource}
+
+
+def configured_sources(config: Optional[List[Dict[str, Any]]] = None) -> List[CatalogSource]:
+    """Instantiate the sources of CATALOG_SOURCES (or `config`)."""
+    sources = []
+    for entry in settings.CATALOG_SOURCES if config is None else config:
+        options = dict(entry)
+        source_type = options.pop("type", "http")
+        if source_type not in SOURCE_TYPES:
+            raise CatalogSourceError(f"Unknown catalog source type '{source_type}'")
+        sources.append(SOURCE_TYPES[source_type](**options))
+    return sources
+
+
+def compile_remote(sources: List[CatalogSource]) -> Dict[str, Any]:
+    """
+    Merge the cached versions of all sources into remote.pickle.
+
+    Returns:
+        The compiled state: 'format', 'version', 'sources' and 'apps'
+    """
+    apps: Dict[str, CatalogAppSchema] = {}
+    versions: Dict[str, Optional[str]] = {}
+    for source in sources:
+        versions[source.name] = source.read_meta().get("version")
+        for definition in source.definitions():
+            app = CatalogAppSchema(**definition)
+            apps[app.id] = app
+
+    digest = hashlib.sha256(json.dumps(versions, sort_keys=True).encode()).hexdigest()[:16]
+    state = {"format": REMOTE_FORMAT, "version": digest, "sources": versions, "apps": apps}
+    write_atomic(remote_path(), pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    return state
+
+
+def read_remote(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Compiled remote apps, or None when there is no (readable) remote.pickle."""
+    try:
+        state = pickle.loads((path or remote_path()).read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️  Ignoring unreadable compiled catalog: {e}")
+        return None
+    return state if state.get("format") == REMOTE_FORMAT else None
+
+
+def sync_sources(config: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Sync every configured source and recompile the merged remote catalog.
+
+    Returns:
+        Summary with per-source results, the remote version and whether it
+        was recompiled
+    """
+    sources = configured_sources(config)
+    results: Dict[str, Dict[str, Any]] = {}
+    for source in sources:
+        try:
+            results[source.name] = source.sync()
+        except CatalogSourceError as e:
+            logger.error(f"❌ {e}")
+            results[source.name] = {"changed": False, "error": str(e)}
+
+    current = read_remote()
+    compiled_sources = current["sources"] if current else None
+    wanted = {source.name: source.read_meta().get("version") for source in sources}
+
+    compiled = compiled_sources != wanted and bool(sources or current)
+    if compiled:
+        current = compile_remote(sources)
+
+    return {
+        "sources": results,
+        "version": current["version"] if current else None,
+        "apps": len(current["apps"]) if current else 0,
+        "compiled": compiled,
+    }
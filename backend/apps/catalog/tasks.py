@@ -0,0 +1,26 @@
+"""
+Celery tasks for the application catalog.
+"""
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def sync_catalog_sources_task(self):
+    """
+    Sync the remote catalog sources and reload the catalog when they changed.
+
+    Unchanged sources cost one conditional request (HTTP) or ls-remote (git).
+    The reload publishes the new catalog version, so every worker follows.
+    """
+    from .services import get_catalog_service
+    from .sources import sync_sources
+
+    result = sync_sources()
+    if result["compiled"]:
+        get_catalog_service().reload()
+        logger.info(f"📚 Remote catalog recompiled: {result['apps']} apps")
+    return result
@@ -0,0 +1,85 @@
+"""
+Tests for the pre-serialized, revalidatable catalog responses.
+"""
+
+import gzip
+from unittest.mock import patch
+
+import pytest
+
+from apps.catalog.http_cache import response_cache
+from apps.catalog.services import CatalogService
+
+
+@pytest.fixture
+def catalog_dir(settings, tmp_path, write_definition):
+    settings.CATALOG_RELOAD_INTERVAL = 0
+    settings.CATALOG_HTTP_MAX_AGE = 30
+    for app_id in ("alpha", "bravo"):
+        # Long enough for the listing to be worth compressing
+        write_definition(tmp_path, app_id, description=f"{app_id} service " * 20)
+
+    CatalogService._instance = None
+    CatalogService._initialized = False
+    response_cache.clear()
+    with patch.object(CatalogService, "_get_catalog_path", return_value=tmp_path), patch.object(
+        CatalogService, "_published_version", return_value=None
+    ), patch.object(CatalogService, "_publish_version"):
+        CatalogService()
+        yield tmp_path
+    CatalogService._instance = None
+    CatalogService._initialized = False
+    response_cache.clear()
+
+
+def test_response_carries_etag_and_cache_control(client, catalog_dir):
+    response = client.get("/api/catalog/")
+
+    assert response.status_code == 200
+    assert response["ETag"].startswith('W/"')
+    assert response["Cache-Control"] == "public, max-age=30"
+    assert "Accept-Encoding" in response["Vary"]
+    assert [app["id"] for app in response.json()["applications"]] == ["alpha", "bravo"]
+
+
+def test_revalidation_returns_304(client, catalog_dir):
+    etag = client.get("/api/catalog/alpha")["ETag"]
+
+    response = client.get("/api/catalog/alpha", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response["ETag"] == etag
+
+    assert client.get("/api/catalog/alpha", HTTP_IF_NONE_MATCH='"other"').status_code == 200
+
+
+def test_gzip_variant(client, catalog_dir):
+    plain = client.get("/api/catalog/")
+    compressed = client.get("/api/catalog/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+    assert compressed["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.content) == plain.content
+    assert compressed["ETag"] == plain["ETag"]
+
+
+def test_responses_are_serialized_once_per_version(client, catalog_dir, write_definition):
+    service = CatalogService()
+    with patch.object(service, "get_all_apps", wraps=service.get_all_apps) as get_all_apps:
+        first = client.get("/api/catalog/")
+        client.get("/api/catalog/")
+        assert get_all_apps.call_count == 1
+
+        write_definition(catalog_dir, "charlie")
+        second = client.get("/api/catalog/", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert get_all_apps.call_count == 2
+
+    assert second.status_code == 200
+    assert second["ETag"] != first["ETag"]
+    assert second.json()["total"] == 3
+
+
+def test_unknown_app_is_not_cached(client, catalog_dir, write_definition):
+    assert client.get("/api/catalog/delta").status_code == 404
+
+    write_definition(catalog_dir, "delta")
+    assert client.get("/api/catalog/delta").status_code == 200
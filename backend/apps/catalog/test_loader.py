@@ -0,0 +1,118 @@
+"""
+Tests for incremental catalog loading and cross-process hot reload.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from apps.catalog.loader import CatalogLoader
+from apps.catalog.services import CATALOG_VERSION_KEY, CatalogService
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return value.encode() if value else None
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def catalog_dir(tmp_path, write_definition):
+    for app_id in ("alpha", "bravo", "charlie"):
+        write_definition(tmp_path, app_id)
+    return tmp_path
+
+
+@pytest.fixture
+def service(settings, catalog_dir):
+    settings.CATALOG_RELOAD_INTERVAL = 0
+    redis = FakeRedis()
+    CatalogService._instance = None
+    CatalogService._initialized = False
+    with patch.object(CatalogService, "_get_catalog_path", return_value=catalog_dir), patch(
+        "apps.core.node_semaphore.get_redis_client", return_value=redis
+    ):
+        service = CatalogService()
+        service.redis = redis
+        yield service
+    CatalogService._instance = None
+    CatalogService._initialized = False
+
+
+def test_only_changed_files_are_reparsed(catalog_dir, write_definition):
+    loader = CatalogLoader(catalog_dir)
+    first = loader.load()
+    assert sorted(first.apps) == ["alpha", "bravo", "charlie"]
+
+    # Nothing changed: the very same snapshot (and index) is kept
+    assert loader.load(first) is first
+
+    write_definition(catalog_dir, "bravo", name="Bravo Two")
+    with patch.object(CatalogLoader, "_parse", wraps=loader._parse) as parse:
+        second = loader.load(first)
+    assert parse.call_count == 1
+    assert second.version != first.version
+    assert second.apps["bravo"].name == "Bravo Two"
+    assert second.apps["alpha"] is first.apps["alpha"]
+    assert first.apps["bravo"].name == "Bravo"
+
+
+def test_touched_files_are_not_reparsed(catalog_dir):
+    loader = CatalogLoader(catalog_dir)
+    first = loader.load()
+    stat = (catalog_dir / "alpha.json").stat()
+    os.utime(catalog_dir / "alpha.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with patch.object(CatalogLoader, "_parse") as parse:
+        second = loader.load(first)
+
+    parse.assert_not_called()
+    assert second.version == first.version
+    assert second.index is first.index
+    assert not loader.has_changes(second)
+
+
+def test_removed_and_invalid_files(catalog_dir):
+    loader = CatalogLoader(catalog_dir)
+    first = loader.load()
+    (catalog_dir / "charlie.json").unlink()
+    (catalog_dir / "broken.json").write_text("{not json")
+
+    assert loader.has_changes(first)
+    second = loader.load(first)
+    assert sorted(second.apps) == ["alpha", "bravo"]
+
+    # The broken file is remembered and not retried until it changes
+    with patch.object(CatalogLoader, "_parse") as parse:
+        assert loader.load(second) is second
+    parse.assert_not_called()
+
+
+def test_disk_change_is_picked_up_and_published(service, catalog_dir, write_definition):
+    write_definition(catalog_dir, "delta")
+
+    assert service.get_app_by_id("delta") is not None
+    assert service.redis.values[CATALOG_VERSION_KEY] == service.version
+
+
+def test_published_version_triggers_reload(service, catalog_dir, write_definition):
+    # Another worker wrote the file and announced a version this process lacks
+    with patch.object(CatalogLoader, "has_changes", return_value=False):
+        write_definition(catalog_dir, "echo")
+        assert service.get_app_by_id("echo") is None
+
+        service.redis.values[CATALOG_VERSION_KEY] = "another-version"
+        assert service.get_app_by_id("echo") is not None
+
+
+def test_explicit_reload_publishes_version(service):
+    service.reload()
+
+    assert service.redis.values[CATALOG_VERSION_KEY] == service.get_stats()["version"]
@@ -0,0 +1,111 @@
+"""
+Tests for the catalog search index.
+"""
+
+import time
+
+from apps.catalog.schemas import CatalogAppSchema
+from apps.catalog.search_index import CatalogSearchIndex, edit_distance
+
+
+def _app(app_id, name, description, category="Tools", tags=()):
+    return CatalogAppSchema(
+        id=app_id,
+        name=name,
+        version="1.0.0",
+        description=description,
+        category=category,
+        docker_compose={"version": "3.8", "services": {}},
+        min_memory=256,
+        min_cpu=1,
+        tags=list(tags),
+    )
+
+
+APPS = {
+    app.id: app
+    for app in [
+        _app(
+            "adminer",
+            "Adminer",
+            "Database management in a single PHP file",
+            "Database",
+            ["database", "mysql", "postgres"],
+        ),
+        _app(
+            "nginx",
+            "Nginx",
+            "High performance web server and reverse proxy",
+            "Web Server",
+            ["web", "proxy"],
+        ),
+        _app(
+            "pgadmin",
+            "pgAdmin",
+            "Administration platform for PostgreSQL",
+            "Database",
+            ["postgres", "admin"],
+        ),
+        _app(
+            "gitea", "Gitea", "Self-hosted git service with a web interface", "Development", ["git"]
+        ),
+    ]
+}
+
+
+def test_name_hits_rank_above_description_hits():
+    index = CatalogSearchIndex(APPS)
+
+    # "web" is nginx's tag and only a description word of gitea
+    assert index.search("web") == ["nginx", "gitea"]
+    # pgadmin matches "postgres" by tag and by prefix of "postgresql"; adminer only by tag
+    assert index.search("postgres") == ["adminer", "pgadmin"]
+
+
+def test_prefix_infix_and_and_semantics():
+    index = CatalogSearchIndex(APPS)
+
+    assert index.search("ngi") == ["nginx"]
+    assert index.search("min") == ["adminer", "pgadmin"]
+    assert index.search("database php") == ["adminer"]
+    assert index.search("database rust") == []
+    assert index.search("  ") is None
+
+
+def test_typos_only_when_nothing_matches():
+    index = CatalogSearchIndex(APPS)
+
+    assert index.search("ngnix") == ["nginx"]
+    assert index.search("postgers") == ["adminer", "pgadmin"]
+    assert index.search("xyzzy") == []
+    assert edit_distance("adminer", "admin", 1) == 2
+
+
+def test_presorted_lists():
+    index = CatalogSearchIndex(APPS)
+
+    assert index.sorted_ids == ["adminer", "gitea", "nginx", "pgadmin"]
+    assert index.category_ids["database"] == ["adminer", "pgadmin"]
+    assert index.categories == ["Database", "Development", "Web Server"]
+
+
+def test_search_stays_fast_on_a_large_catalog():
+    apps = {
+        f"app-{i}": _app(
+            f"app-{i}",
+            f"Service {i} {['alpha', 'bravo', 'charlie', 'delta'][i % 4]}",
+            f"Self-hosted tool number {i} for monitoring, backups and dashboards",
+            f"Category {i % 12}",
+            [f"tag{i % 30}", "selfhosted"],
+        )
+        for i in range(500)
+    }
+    index = CatalogSearchIndex(apps)
+
+    start = time.perf_counter()
+    for i, query in enumerate(["charlie", "dash", "monitorng", "tag7 delta", "serv"] * 20):
+        index.search(f"{query} {i}")
+    per_query = (time.perf_counter() - start) / 100
+
+    assert len(index.search("charlie")) == 125
+    assert per_query < 0.01
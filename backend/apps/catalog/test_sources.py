@@ -0,0 +1,237 @@
+"""
+Tests for remote catalog sources, the compiled remote catalog and snapshots.
+"""
+
+import hashlib
+import json
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from apps.catalog.loader import CatalogLoader, CatalogSnapshot
+from apps.catalog.services import CatalogService
+from apps.catalog.sources import (
+    CatalogSourceError,
+    GitCatalogSource,
+    HttpCatalogSource,
+    read_remote,
+    remote_path,
+    sync_sources,
+)
+
+
+class IndexServer:
+    """Local HTTP server for a catalog index, honouring If-None-Match."""
+
+    def __init__(self):
+        self.apps = []
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps({"apps": server.apps}).encode()
+                etag = f'"{hashlib.sha256(body).hexdigest()[:8]}"'
+                server.requests.append(self.headers.get("If-None-Match"))
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.closed = False
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/catalog.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def cache(settings, tmp_path):
+    settings.CATALOG_CACHE_DIR = str(tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def index_server():
+    server = IndexServer()
+    yield server
+    server.close()
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.org", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repo(tmp_path, make_definition):
+    repo = tmp_path / "repo"
+    (repo / "apps").mkdir(parents=True)
+    _git(repo, "init", "--quiet", "--initial-branch", "main")
+    (repo / "apps" / "gitea.json").write_text(json.dumps(make_definition("gitea")))
+    _git(repo, "add", ".")
+    _git(repo, "commit", "--quiet", "-m", "Add gitea")
+    return repo
+
+
+def test_http_source_short_circuits_on_etag(cache, index_server, make_definition):
+    index_server.apps = [make_definition("nginx"), {"id": "broken"}]
+    source = HttpCatalogSource("community", index_server.url)
+
+    first = source.sync()
+    assert first["changed"] is True
+    assert first["apps"] == 1
+    assert [app["id"] for app in source.definitions()] == ["nginx"]
+
+    second = source.sync()
+    assert second == {"version": first["version"], "changed": False, "apps": 1}
+    assert index_server.requests[-1] is not None  # revalidated with the ETag
+
+    index_server.apps.append(make_definition("redis"))
+    third = source.sync()
+    assert third["changed"] is True
+    assert third["version"] != first["version"]
+    # The previous version stays cached next to the new one
+    assert source.version_path(first["version"]).exists()
+
+
+def test_http_source_errors(cache):
+    source = HttpCatalogSource("down", "http://127.0.0.1:9/catalog.json")
+    with pytest.raises(CatalogSourceError):
+        source.sync()
+
+
+def test_git_source_short_circuits_on_commit(cache, git_repo, make_definition):
+    source = GitCatalogSource("team", f"file://{git_repo}", ref="main", path="apps")
+
+    first = source.sync()
+    assert first["changed"] is True
+    assert [app["id"] for app in source.definitions()] == ["gitea"]
+
+    with patch.object(GitCatalogSource, "_git", wraps=source._git) as git:
+        second = source.sync()
+    assert second["changed"] is False
+    assert [call.args[0] for call in git.call_args_list] == ["ls-remote"]
+
+    (git_repo / "apps" / "forgejo.json").write_text(json.dumps(make_definition("forgejo")))
+    _git(git_repo, "add", ".")
+    _git(git_repo, "commit", "--quiet", "-m", "Add forgejo")
+    third = source.sync()
+    assert third["changed"] is True
+    assert sorted(app["id"] for app in source.definitions()) == ["forgejo", "gitea"]
+
+
+def test_sync_compiles_only_on_change(cache, index_server, git_repo, make_definition):
+    index_server.apps = [
+        make_definition("nginx"),
+        make_definition("gitea", name="Gitea (community)"),
+    ]
+    config = [
+        {"name": "community", "type": "http", "url": index_server.url},
+        {"name": "team", "type": "git", "url": f"file://{git_repo}", "path": "apps"},
+    ]
+
+    result = sync_sources(config)
+    assert result["compiled"] is True
+    compiled = read_remote()
+    # Later sources override earlier ones
+    assert compiled["apps"]["gitea"].name == "Gitea"
+    assert sorted(compiled["apps"]) == ["gitea", "nginx"]
+
+    assert sync_sources(config)["compiled"] is False
+    assert read_remote()["version"] == compiled["version"]
+
+
+def test_failing_source_keeps_last_good_version(cache, index_server, make_definition):
+    index_server.apps = [make_definition("nginx")]
+    config = [{"name": "community", "type": "http", "url": index_server.url}]
+    sync_sources(config)
+    index_server.close()
+
+    result = sync_sources(config)
+    assert "error" in result["sources"]["community"]
+    assert result["compiled"] is False
+    assert list(read_remote()["apps"]) == ["nginx"]
+
+
+def test_loader_merges_remote_apps_with_local_override(
+    cache, index_server, tmp_path, make_definition
+):
+    index_server.apps = [make_definition("nginx"), make_definition("adminer")]
+    sync_sources([{"name": "community", "type": "http", "url": index_server.url}])
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "nginx.json").write_text(json.dumps(make_definition("nginx", name="Nginx (local)")))
+
+    loader = CatalogLoader(local, remote_path())
+    first = loader.load()
+    assert first.apps["nginx"].name == "Nginx (local)"
+    assert "adminer" in first.apps
+    assert first.index.search("adminer") == ["adminer"]
+    assert not loader.has_changes(first)
+
+    index_server.apps.append(make_definition("redis"))
+    sync_sources([{"name": "community", "type": "http", "url": index_server.url}])
+    assert loader.has_changes(first)
+    second = loader.load(first)
+    assert "redis" in second.apps
+    assert second.version != first.version
+
+
+def test_startup_reads_snapshot_without_parsing(settings, cache, tmp_path, make_definition):
+    settings.CATALOG_HOT_RELOAD = False
+    local = tmp_path / "local"
+    local.mkdir()
+    for app_id in ("alpha", "bravo"):
+        (local / f"{app_id}.json").write_text(json.dumps(make_definition(app_id)))
+
+    CatalogService._instance = None
+    CatalogService._initialized = False
+    try:
+        with patch.object(CatalogService, "_get_catalog_path", return_value=local):
+            first = CatalogService()
+            version = first.version
+
+            CatalogService._instance = None
+            CatalogService._initialized = False
+            with patch.object(CatalogLoader, "_parse") as parse:
+                second = CatalogService()
+            parse.assert_not_called()
+            assert second.version == version
+            assert [app.id for app in second.search_apps("bravo")] == ["bravo"]
+    finally:
+        CatalogService._instance = None
+        CatalogService._initialized = False
+
+
+def test_snapshot_for_another_catalog_is_ignored(cache, tmp_path, make_definition):
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "alpha.json").write_text(json.dumps(make_definition("alpha")))
+    snapshot = CatalogLoader(local).load()
+    snapshot.save(cache / "snapshot.pickle", local)
+
+    assert CatalogSnapshot.read(cache / "snapshot.pickle", local).version == snapshot.version
+    assert CatalogSnapshot.read(cache / "snapshot.pickle", tmp_path / "other") is None
@@ -0,0 +1,161 @@
+"""
+Django Management Command: startup_profile
+
+Measures how long a fresh Proximity process takes to boot and which imports
+the time goes to. The measurement runs in a new interpreter with Python's
+-X importtime, so modules already imported by this command do not skew it.
+
+Reported:
+    - boot phases: Django setup, URL routes (web), Celery tasks (worker) and
+      the first catalog load
+    - import time per top-level package (own time, children excluded)
+    - the slowest Proximity modules (cumulative, including what they import)
+
+Usage:
+    python manage.py startup_profile
+    python manage.py startup_profile --limit 30
+    python manage.py startup_profile --json
+
+    # Docker usage
+    docker-compose exec backend python manage.py startup_profile
+"""
+
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots like a web worker plus a Celery worker, timing each phase
+PROBE = """
+import json, os, time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "proximity.settings")
+phases = {}
+start = last = time.perf_counter()
+
+def mark(name):
+    global last
+    now = time.perf_counter()
+    phases[name] = round((now - last) * 1000, 1)
+    last = now
+
+import django
+django.setup()
+mark("django_setup")
+
+import proximity.urls
+mark("url_routes")
+
+from proximity.celery import app
+app.loader.import_default_modules()
+mark("celery_tasks")
+
+from apps.catalog.services import get_catalog_service
+get_catalog_service()
+mark("catalog_load")
+
+phases["total"] = round((time.perf_counter() - start) * 1000, 1)
+print(json.dumps(phases))
+"""
+
+PROJECT_PACKAGES = ("apps", "proximity")
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Returns:
+        One dict per import with 'module', 'self_us' and 'cumulative_us'
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        imports.append(
+            {
+                "module": fields[2].strip(),
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+            }
+        )
+    return imports
+
+
+def summarize(imports: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """Import time per top-level package and the slowest project modules."""
+    packages: Dict[str, int] = defaultdict(int)
+    for entry in imports:
+        packages[entry["module"].split(".")[0]] += entry["self_us"]
+
+    project = [entry for entry in imports if entry["module"].split(".")[0] in PROJECT_PACKAGES]
+    return {
+        "modules": len(imports),
+        "packages": [
+            {"package": package, "ms": round(us / 1000, 1)}
+            for package, us in sorted(packages.items(), key=lambda item: -item[1])[:limit]
+        ],
+        "project_modules": [
+            {"module": entry["module"], "ms": round(entry["cumulative_us"] / 1000, 1)}
+            for entry in sorted(project, key=lambda entry: -entry["cumulative_us"])[:limit]
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Measures process startup time and the import cost per module"
+
+    def add_arguments(self, parser):
+        """Add command-line arguments."""
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=15,
+            help="Number of packages and modules to list (default: 15)",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the report as JSON",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Main command logic.
+
+        Boots a fresh interpreter with -X importtime and reports where the time went.
+        """
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup probe failed:\n{result.stderr[-2000:]}")
+
+        phases = json.loads(result.stdout.strip().splitlines()[-1])
+        report = {"phases": phases, **summarize(parse_importtime(result.stderr), options["limit"])}
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        lines = [f'{"=" * 70}', "⏱️  STARTUP PROFILE", f'{"=" * 70}']
+        for phase, ms in phases.items():
+            lines.append(f"{phase:<40} {ms:>10.1f} ms")
+        lines.append(f'\nImport time per package ({report["modules"]} modules imported):')
+        for entry in report["packages"]:
+            lines.append(f'  {entry["package"]:<38} {entry["ms"]:>10.1f} ms')
+        lines.append("\nSlowest Proximity modules (including their imports):")
+        for entry in report["project_modules"]:
+            lines.append(f'  {entry["module"]:<38} {entry["ms"]:>10.1f} ms')
+        lines.append("=" * 70)
+        self.stdout.write("\n".join(lines))
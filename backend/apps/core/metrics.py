@@ -0,0 +1,316 @@
+"""
+Prometheus metrics and Sentry performance spans.
+
+span() times a block once and reports it twice: as a Sentry span (a child of
+the current transaction, or of an explicit parent when the block runs on
+another thread) and as an observation of a Prometheus histogram, labelled
+with the result ('ok' or 'error').
+
+Deployments are timed per engine step and as a whole, by node and catalog app,
+so slow steps show up in the latency histograms instead of in log lines. Also
+measured: API requests (latency and DB queries per route), Celery task
+runtimes, Proxmox API and SSH latency, and cache hits; the application count
+per status and the Celery queue lengths are read when /metrics is scraped.
+
+Multiprocess: with PROMETHEUS_MULTIPROC_DIR set (before the process starts),
+every web and Celery worker process writes its samples to that directory and
+/metrics aggregates them, so a scrape sees all processes, not just the one
+that answers it. Point the web and worker containers at a shared directory,
+and run them in one PID namespace (docker-compose: pid: "service:backend"):
+sample files are named by PID, so two containers each with their own PID 1
+would write to - and process_exited() would delete - each other's files.
+
+The directory must be emptied when the stack starts, before any process
+writes to it (docker-compose runs the one-shot metrics_init service for this);
+otherwise samples of previous runs are mixed into every scrape. Worker
+processes that exit must be reported with process_exited(pid): Celery pool
+processes do this themselves (worker_process_shutdown), and a gunicorn
+deployment needs it in gunicorn.conf.py:
+
+    def child_exit(server, worker):
+        from apps.core.metrics import process_exited
+        process_exited(worker.pid)
+"""
+
+import hmac
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import sentry_sdk
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Deployment steps range from milliseconds (VMID) to minutes (image pull)
+DEPLOY_BUCKETS = (0.05, 0.25, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1200)
+
+DEPLOY_STEP_DURATION = Histogram(
+    "proximity_deploy_step_duration_seconds",
+    "Duration of a deployment step",
+    ["step", "node", "catalog_id", "result"],
+    buckets=DEPLOY_BUCKETS,
+)
+
+DEPLOY_DURATION = Histogram(
+    "proximity_deploy_duration_seconds",
+    "Duration of a deployment engine run (its critical path)",
+    ["node", "catalog_id", "result"],
+    buckets=DEPLOY_BUCKETS,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "proximity_http_request_duration_seconds",
+    "Duration of HTTP requests, by route",
+    ["method", "route", "status"],
+)
+
+HTTP_REQUEST_QUERIES = Histogram(
+    "proximity_http_request_db_queries",
+    "Database queries run by an HTTP request, by route",
+    ["method", "route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "proximity_celery_task_duration_seconds",
+    "Runtime of Celery tasks, by final state",
+    ["task", "state"],
+    buckets=DEPLOY_BUCKETS,
+)
+
+PROXMOX_API_DURATION = Histogram(
+    "proximity_proxmox_api_duration_seconds",
+    "Latency of Proxmox API calls; result is 'error' for HTTP errors",
+    ["host", "method", "endpoint", "result"],
+)
+
+SSH_COMMAND_DURATION = Histogram(
+    "proximity_ssh_command_duration_seconds",
+    "Duration of SSH commands run on Proxmox nodes",
+    ["host", "result"],
+    buckets=DEPLOY_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "proximity_cache_requests",
+    "Cache lookups, by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+
+# Path segments that name an instance rather than an endpoint
+_PROXMOX_PATH_IDS = re.compile(r"/(nodes|storage|tasks|lxc|qemu|snapshot)/[^/]+")
+
+
+@contextmanager
+def span(
+    op: str,
+    name: str,
+    histogram: Optional[Histogram] = None,
+    labels: Optional[Dict[str, str]] = None,
+    parent: Optional[Any] = None,
+    **data: Any,
+) -> Iterator[Any]:
+    """
+    Time a block as a Sentry span and a histogram observation.
+
+    Args:
+        op: Sentry span operation (e.g., 'deploy.step')
+        name: Sentry span name
+        histogram: Histogram to observe the duration in, labelled with `labels` and 'result'
+        labels: Histogram labels (also attached to the span)
+        parent: Span to attach to; spans started on pool threads need it, since the
+            current transaction does not follow them there
+        **data: Extra data attached to the span
+
+    Yields:
+        The Sentry span
+    """
+    labels = labels or {}
+    if parent is not None:
+        sentry_span = parent.start_child(op=op, name=name)
+    else:
+        sentry_span = sentry_sdk.start_span(op=op, name=name)
+    for key, value in {**labels, **data}.items():
+        sentry_span.set_data(key, value)
+
+    result = "error"
+    started = time.perf_counter()
+    try:
+        with sentry_span:
+            yield sentry_span
+            sentry_span.set_status("ok")
+        result = "ok"
+    finally:
+        duration = time.perf_counter() - started
+        if histogram is not None:
+            histogram.labels(**labels, result=result).observe(duration)
+        logger.debug(f"⏱️  {op} {name}: {result} in {duration * 1000:.0f}ms")
+
+
+def cache_lookup(cache_name: str, hit: bool) -> None:
+    """Count a lookup in one of the caches (hit ratio = hit / (hit + miss))."""
+    CACHE_REQUESTS.labels(cache=cache_name, result="hit" if hit else "miss").inc()
+
+
+def proxmox_endpoint(path: str) -> str:
+    """
+    Endpoint of a Proxmox API path, without node names, VMIDs and UPIDs.
+
+    '/api2/json/nodes/pve1/lxc/105/status/current' -> '/nodes/{id}/lxc/{id}/status/current'
+    """
+    path = path.split("/api2/json", 1)[-1]
+    return _PROXMOX_PATH_IDS.sub(lambda match: f"/{match.group(1)}/{{id}}", path)
+
+
+def observe_proxmox_response(response, *args, **kwargs):
+    """requests response hook on the proxmoxer session: time every API call."""
+    url = urlsplit(response.url)
+    PROXMOX_API_DURATION.labels(
+        host=url.hostname or "",
+        method=response.request.method,
+        endpoint=proxmox_endpoint(url.path),
+        result="ok" if response.status_code < 400 else "error",
+    ).observe(response.elapsed.total_seconds())
+    return response
+
+
+class MetricsMiddleware:
+    """Times each request and counts its database queries, by route."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        # The URL pattern, not the path: one series per endpoint, not per object
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        HTTP_REQUEST_DURATION.labels(request.method, route, str(response.status_code)).observe(
+            duration
+        )
+        HTTP_REQUEST_QUERIES.labels(request.method, route).observe(queries)
+        return response
+
+
+_task_started: Dict[str, float] = {}
+
+
+def task_started(task_id=None, **kwargs) -> None:
+    """Celery task_prerun handler."""
+    _task_started[task_id] = time.perf_counter()
+
+
+def task_finished(task_id=None, task=None, state=None, **kwargs) -> None:
+    """Celery task_postrun handler."""
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        CELERY_TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+class StateCollector:
+    """
+    Gauges read from the database and the broker at scrape time.
+
+    They describe shared state rather than one process, so they are collected by
+    the process answering the scrape and never written to the multiprocess files.
+    """
+
+    def collect(self):
+        from django.db.models import Count
+
+        from apps.applications.models import Application
+
+        apps = GaugeMetricFamily(
+            "proximity_applications", "Applications, by status", labels=["status"]
+        )
+        counts = dict(
+            Application.objects.values_list("status").annotate(total=Count("id")).order_by()
+        )
+        for status, _ in Application._meta.get_field("status").choices:
+            apps.add_metric([status], counts.get(status, 0))
+        yield apps
+
+        queues = GaugeMetricFamily(
+            "proximity_celery_queue_length", "Tasks waiting in a Celery queue", labels=["queue"]
+        )
+        try:
+            import redis
+
+            client = redis.Redis.from_url(
+                settings.CELERY_BROKER_URL, socket_connect_timeout=2, socket_timeout=2
+            )
+            for queue in celery_queues():
+                queues.add_metric([queue], client.llen(queue))
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read Celery queue lengths: {e}")
+            return
+        yield queues
+
+
+def celery_queues() -> list:
+    """Names of the Celery queues tasks are routed to."""
+    routed = {route["queue"] for route in settings.CELERY_TASK_ROUTES.values()}
+    return sorted(routed | {settings.CELERY_TASK_DEFAULT_QUEUE})
+
+
+def process_exited(pid: int) -> None:
+    """Drop the live-gauge files of an exited worker process (multiprocess mode only)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
+
+def render_metrics() -> bytes:
+    """All metrics in the Prometheus text format, aggregated across processes if needed."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    state = CollectorRegistry(auto_describe=False)
+    state.register(StateCollector())
+    return generate_latest(registry) + generate_latest(state)
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Prometheus scrape endpoint.
+
+    With METRICS_TOKEN set, scrapers must send it as a bearer token.
+    """
+    expected = settings.METRICS_TOKEN
+    if expected:
+        header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(header, f"Bearer {expected}"):
+            return HttpResponse("Unauthorized", status=401)
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,207 @@
+"""
+Distributed per-node concurrency limiter for Celery lifecycle tasks.
+
+Heavy operations (deploys, clones, vzdump backups, restores) saturate a Proxmox
+node's disk I/O when too many of them run at once. NodeSemaphore keeps a Redis
+sorted set of slot holders per node so that every worker in the cluster agrees
+on how many heavy jobs a node is currently running.
+
+Each slot is a lease: its score is the expiry timestamp, so a worker that dies
+mid-task cannot leak a slot for longer than the lease.
+"""
+
+import functools
+import inspect
+import logging
+import random
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = slot set, ARGV = now, limit, lease seconds, token
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], tonumber(ARGV[1]) + tonumber(ARGV[3]), ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+_redis_client = None
+
+
+def get_redis_client():
+    """Get (and lazily create) the shared Redis client for slot bookkeeping."""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_connect_timeout=2, socket_timeout=2
+        )
+    return _redis_client
+
+
+class NodeSemaphore:
+    """
+    Counting semaphore shared by all workers, scoped to one Proxmox node.
+
+    Redis being unavailable must never block lifecycle operations, so the
+    semaphore fails open: acquire() returns True and the job runs unthrottled.
+    """
+
+    KEY_PREFIX = "proximity:node-slots:"
+
+    def __init__(
+        self,
+        slot_name: str,
+        limit: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        client=None,
+    ):
+        """
+        Args:
+            slot_name: Node identifier, usually "<host_id>:<node>"
+            limit: Max concurrent holders (defaults to NODE_MAX_CONCURRENT_JOBS)
+            lease_seconds: Slot lease (defaults to the Celery hard time limit)
+            client: Redis client (defaults to the shared client)
+        """
+        self.slot_name = slot_name
+        self.key = f"{self.KEY_PREFIX}{slot_name}"
+        self.limit = limit if limit is not None else settings.NODE_MAX_CONCURRENT_JOBS
+        self.lease_seconds = lease_seconds or settings.CELERY_TASK_TIME_LIMIT
+        self.token = uuid.uuid4().hex
+        self._client = client
+        self._held = False
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_redis_client()
+        return self._client
+
+    def acquire(self) -> bool:
+        """
+        Try to take a slot without blocking.
+
+        Returns:
+            True if a slot was taken (or Redis is unavailable), False if the node is busy
+        """
+        if self.limit <= 0:
+            return True
+
+        from redis.exceptions import RedisError
+
+        try:
+            acquired = self.client.eval(
+                _ACQUIRE_SCRIPT,
+                1,
+                self.key,
+                time.time(),
+                self.limit,
+                self.lease_seconds,
+                self.token,
+            )
+        except RedisError as e:
+            logger.warning(f"⚠️  Node slot tracking unavailable for {self.slot_name}: {e}")
+            return True
+
+        self._held = bool(acquired)
+        return self._held
+
+    def release(self) -> None:
+        """Give the slot back. Safe to call when no slot is held."""
+        if not self._held:
+            return
+
+        from redis.exceptions import RedisError
+
+        try:
+            self.client.zrem(self.key, self.token)
+        except RedisError as e:
+            # The lease expires on its own; nothing else to do
+            logger.warning(f"⚠️  Failed to release node slot {self.slot_name}: {e}")
+        finally:
+            self._held = False
+
+    def in_use(self) -> int:
+        """Number of live slots currently held on this node."""
+        from redis.exceptions import RedisError
+
+        try:
+            self.client.zremrangebyscore(self.key, "-inf", time.time())
+            return int(self.client.zcard(self.key))
+        except RedisError:
+            return 0
+
+
+def throttle_per_node(resolve_slot: Callable[[Dict[str, Any]], Optional[str]]):
+    """
+    Limit a bound Celery task to NODE_MAX_CONCURRENT_JOBS concurrent runs per node.
+
+    Place it under @shared_task(bind=True). When the node is busy the task is
+    re-queued with the same task id, callbacks and retry count, so waiting for a
+    slot neither occupies a worker nor eats into the task's error retries.
+
+    Args:
+        resolve_slot: Called with the task's bound arguments; returns the slot
+            name (see NodeSemaphore) or None to run unthrottled
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(task, *args, **kwargs):
+            request = task.request
+
+            # Direct calls and eager execution (tests, scripts) cannot be re-queued
+            if request.called_directly or request.is_eager:
+                return func(task, *args, **kwargs)
+
+            bound = signature.bind(task, *args, **kwargs)
+            bound.apply_defaults()
+            slot_name = resolve_slot(bound.arguments)
+            if not slot_name:
+                return func(task, *args, **kwargs)
+
+            semaphore = NodeSemaphore(slot_name)
+            if not semaphore.acquire():
+                from celery.exceptions import Retry
+
+                # Jitter avoids every waiting task polling in lockstep
+                countdown = settings.NODE_SLOT_RETRY_DELAY + random.randint(0, 5)
+                logger.info(
+                    f"⏳ Node {slot_name} busy ({semaphore.limit} job(s) running), "
+                    f"re-queuing {task.name}[{request.id}] in {countdown}s"
+                )
+                sig = task.signature_from_request(
+                    request, countdown=countdown, retries=request.retries
+                )
+                sig.apply_async()
+                raise Retry(when=countdown, sig=sig)
+
+            try:
+                return func(task, *args, **kwargs)
+            finally:
+                semaphore.release()
+
+        return wrapper
+
+    return decorator
+
+
+def app_node_slot(app_id: str) -> Optional[str]:
+    """Resolve the node slot name of an existing application."""
+    from apps.applications.models import Application
+
+    row = Application.objects.filter(id=app_id).values_list("host_id", "node").first()
+    if not row or not row[1]:
+        return None
+    return f"{row[0]}:{row[1]}"
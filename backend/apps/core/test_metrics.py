@@ -0,0 +1,203 @@
+"""
+Tests for the Prometheus metrics, the /metrics endpoint and the span helper.
+"""
+
+import subprocess
+import sys
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from apps.applications.models import Application
+from apps.core.metrics import (
+    DEPLOY_STEP_DURATION,
+    observe_proxmox_response,
+    process_exited,
+    proxmox_endpoint,
+    render_metrics,
+    span,
+    task_finished,
+    task_started,
+)
+from apps.proxmox.models import ProxmoxHost
+
+
+def _count(**labels):
+    value = REGISTRY.get_sample_value("proximity_deploy_step_duration_seconds_count", labels)
+    return value or 0
+
+
+def test_span_observes_duration_by_result():
+    labels = {"step": "lxc_start", "node": "metrics-node", "catalog_id": "adminer"}
+
+    with span("deploy.step", "lxc_start", DEPLOY_STEP_DURATION, labels):
+        pass
+    with pytest.raises(RuntimeError):
+        with span("deploy.step", "lxc_start", DEPLOY_STEP_DURATION, labels):
+            raise RuntimeError("boom")
+
+    assert _count(**labels, result="ok") == 1
+    assert _count(**labels, result="error") == 1
+
+
+def test_span_attaches_to_explicit_parent():
+    parent = MagicMock()
+    child = parent.start_child.return_value
+
+    with patch("apps.core.metrics.sentry_sdk.start_span") as start_span:
+        with span("deploy.step", "image_pull", parent=parent, app_id="app-1"):
+            pass
+
+    start_span.assert_not_called()
+    parent.start_child.assert_called_once_with(op="deploy.step", name="image_pull")
+    child.set_data.assert_called_once_with("app_id", "app-1")
+    child.set_status.assert_called_once_with("ok")
+
+
+class FakeRedis:
+    def llen(self, queue):
+        return {"celery": 3, "long": 1}.get(queue, 0)
+
+
+@pytest.fixture
+def broker():
+    with patch("redis.Redis.from_url", return_value=FakeRedis()):
+        yield
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(client, settings, broker):
+    settings.METRICS_TOKEN = ""
+    host = ProxmoxHost.objects.create(
+        name="metrics-host", host="192.168.1.80", user="root@pam", password="secret"
+    )
+    for index, status in enumerate(["running", "running", "error"]):
+        Application.objects.create(
+            id=f"metrics-{index}",
+            catalog_id="nginx",
+            name=f"metrics-{index}",
+            hostname=f"metrics-{index}",
+            status=status,
+            host=host,
+            node="pve",
+        )
+    client.get("/api/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert 'proximity_applications{status="running"} 2.0' in body
+    assert 'proximity_applications{status="stopped"} 0.0' in body
+    assert 'proximity_celery_queue_length{queue="celery"} 3.0' in body
+    assert 'proximity_celery_queue_length{queue="interactive"} 0.0' in body
+    assert (
+        'proximity_http_request_duration_seconds_count{method="GET",route="api/health",status="200"}'
+        in body
+    )
+    assert 'proximity_http_request_db_queries_count{method="GET",route="api/health"}' in body
+
+
+def test_metrics_token(client, settings, broker):
+    settings.METRICS_TOKEN = "scrape-secret"
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+    with patch("apps.core.metrics.StateCollector.collect", return_value=iter([])):
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+    assert response.status_code == 200
+
+
+def test_multiprocess_samples_are_aggregated(tmp_path, monkeypatch):
+    # Another process (e.g. a Celery worker) writing to the shared directory
+    child = (
+        "from prometheus_client import Counter\n"
+        "Counter('proximity_cache_requests', '', ['cache', 'result'])"
+        ".labels('discovery', 'hit').inc(3)\n"
+    )
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, "-c", child],
+            env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+            check=True,
+        )
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    with patch("apps.core.metrics.StateCollector.collect", return_value=iter([])):
+        body = render_metrics().decode()
+
+    assert 'proximity_cache_requests_total{cache="discovery",result="hit"} 6.0' in body
+
+
+def test_exited_process_drops_live_gauges(tmp_path, monkeypatch):
+    child = (
+        "import os\n"
+        "from prometheus_client import Gauge\n"
+        "Gauge('proximity_probe', '', multiprocess_mode='livesum').set(1)\n"
+        "print(os.getpid())\n"
+    )
+    pid = int(
+        subprocess.run(
+            [sys.executable, "-c", child],
+            env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    )
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    assert [path.name for path in tmp_path.iterdir()] == [f"gauge_livesum_{pid}.db"]
+
+    process_exited(pid)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_proxmox_endpoint_drops_instance_ids():
+    assert (
+        proxmox_endpoint("/api2/json/nodes/pve1/lxc/105/status/current")
+        == "/nodes/{id}/lxc/{id}/status/current"
+    )
+    assert proxmox_endpoint("/api2/json/nodes/pve1/tasks/UPID:pve1:0001:/status") == (
+        "/nodes/{id}/tasks/{id}/status"
+    )
+    assert proxmox_endpoint("/api2/json/cluster/nextid") == "/cluster/nextid"
+
+
+def test_proxmox_response_hook():
+    def response(status_code):
+        return SimpleNamespace(
+            url="https://10.0.0.5:8006/api2/json/nodes/pve/lxc/100/status/start",
+            request=SimpleNamespace(method="POST"),
+            status_code=status_code,
+            elapsed=timedelta(milliseconds=120),
+        )
+
+    labels = {
+        "host": "10.0.0.5",
+        "method": "POST",
+        "endpoint": "/nodes/{id}/lxc/{id}/status/start",
+    }
+    name = "proximity_proxmox_api_duration_seconds"
+
+    observe_proxmox_response(response(200))
+    observe_proxmox_response(response(500))
+
+    assert REGISTRY.get_sample_value(f"{name}_count", {**labels, "result": "ok"}) == 1
+    assert REGISTRY.get_sample_value(f"{name}_count", {**labels, "result": "error"}) == 1
+    assert REGISTRY.get_sample_value(f"{name}_sum", {**labels, "result": "ok"}) == 0.12
+
+
+def test_celery_task_runtime():
+    task = SimpleNamespace(name="apps.applications.tasks.metrics_probe_task")
+
+    task_started(task_id="t-1", task=task)
+    task_finished(task_id="t-1", task=task, state="SUCCESS")
+    task_finished(task_id="unknown", task=task, state="SUCCESS")
+
+    labels = {"task": task.name, "state": "SUCCESS"}
+    assert REGISTRY.get_sample_value("proximity_celery_task_duration_seconds_count", labels) == 1
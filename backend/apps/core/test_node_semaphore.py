@@ -0,0 +1,103 @@
+"""
+Tests for the Redis-backed per-node concurrency limiter.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from celery.exceptions import Retry
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from apps.core.node_semaphore import NodeSemaphore, throttle_per_node
+
+
+def _fake_task(called_directly=False, retries=1):
+    task = MagicMock()
+    task.name = "apps.fake.task"
+    task.request = SimpleNamespace(
+        called_directly=called_directly, is_eager=False, retries=retries, id="task-1"
+    )
+    return task
+
+
+def test_acquire_and_release_use_lease_token():
+    client = MagicMock()
+    client.eval.return_value = 1
+
+    semaphore = NodeSemaphore("1:pve", limit=2, lease_seconds=60, client=client)
+    assert semaphore.acquire() is True
+
+    args = client.eval.call_args.args
+    assert args[2] == "proximity:node-slots:1:pve"
+    assert args[4:] == (2, 60, semaphore.token)
+
+    semaphore.release()
+    client.zrem.assert_called_once_with("proximity:node-slots:1:pve", semaphore.token)
+
+
+def test_busy_node_is_not_acquired():
+    client = MagicMock()
+    client.eval.return_value = 0
+
+    semaphore = NodeSemaphore("1:pve", limit=2, lease_seconds=60, client=client)
+    assert semaphore.acquire() is False
+
+    semaphore.release()
+    client.zrem.assert_not_called()
+
+
+def test_fails_open_when_redis_is_down():
+    client = MagicMock()
+    client.eval.side_effect = RedisConnectionError("down")
+
+    assert NodeSemaphore("1:pve", limit=2, lease_seconds=60, client=client).acquire() is True
+
+
+def test_zero_limit_disables_throttling():
+    client = MagicMock()
+
+    assert NodeSemaphore("1:pve", limit=0, lease_seconds=60, client=client).acquire() is True
+    client.eval.assert_not_called()
+
+
+def test_direct_calls_bypass_the_semaphore():
+    @throttle_per_node(lambda params: "1:pve")
+    def work(self, app_id):
+        return app_id
+
+    with patch("apps.core.node_semaphore.NodeSemaphore") as mock_semaphore:
+        assert work(_fake_task(called_directly=True), "app-1") == "app-1"
+
+    mock_semaphore.assert_not_called()
+
+
+def test_busy_node_requeues_with_same_retry_count():
+    @throttle_per_node(lambda params: f"1:{params['node']}")
+    def work(self, node):
+        raise AssertionError("must not run while the node is busy")
+
+    task = _fake_task(retries=1)
+
+    with patch("apps.core.node_semaphore.NodeSemaphore") as mock_semaphore:
+        mock_semaphore.return_value.acquire.return_value = False
+        with pytest.raises(Retry):
+            work(task, node="pve")
+
+    mock_semaphore.assert_called_once_with("1:pve")
+    options = task.signature_from_request.call_args.kwargs
+    assert options["retries"] == 1
+    task.signature_from_request.return_value.apply_async.assert_called_once()
+
+
+def test_slot_is_released_after_failure():
+    @throttle_per_node(lambda params: "1:pve")
+    def work(self):
+        raise RuntimeError("boom")
+
+    with patch("apps.core.node_semaphore.NodeSemaphore") as mock_semaphore:
+        mock_semaphore.return_value.acquire.return_value = True
+        with pytest.raises(RuntimeError):
+            work(_fake_task())
+
+    mock_semaphore.return_value.release.assert_called_once()
@@ -0,0 +1,55 @@
+"""
+Tests for the startup_profile command and for imports kept off the startup path.
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+from apps.core.management.commands.startup_profile import parse_importtime, summarize
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     paramiko.util
+import time:      1500 |       1620 |   paramiko
+import time:       300 |       1920 | apps.proxmox.services
+import time:        80 |         80 | django.conf
+"""
+
+
+def test_parse_and_summarize_importtime():
+    imports = parse_importtime(IMPORTTIME)
+    assert [entry["module"] for entry in imports] == [
+        "paramiko.util",
+        "paramiko",
+        "apps.proxmox.services",
+        "django.conf",
+    ]
+
+    report = summarize(imports, limit=2)
+    assert report["packages"] == [
+        {"package": "paramiko", "ms": 1.6},
+        {"package": "apps", "ms": 0.3},
+    ]
+    assert report["project_modules"] == [{"module": "apps.proxmox.services", "ms": 1.9}]
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    probe = (
+        "import sys, django; django.setup();"
+        "import apps.proxmox.services, apps.applications.docker_setup, apps.catalog.services;"
+        "heavy = {'paramiko', 'proxmoxer', 'httpx'} & set(sys.modules);"
+        "print(sorted(heavy));"
+        "print(apps.catalog.services.CatalogService._initialized)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "proximity.settings"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.splitlines()[-2:] == ["[]", "False"]
@@ -0,0 +1,241 @@
+"""
+Async Proxmox service - concurrent read access for fan-out jobs.
+
+ProxmoxService (proxmoxer/requests) is synchronous, so scanning N nodes takes
+the sum of N round-trips. AsyncProxmoxService covers the read endpoints used by
+discovery, reconciliation, node sync and metrics on top of httpx, so a scan over
+every node takes as long as the slowest node instead.
+
+One instance talks to one host: it owns a pooled httpx.AsyncClient and a
+per-host rate limiter, and must be used as an async context manager:
+
+    async with AsyncProxmoxService(host) as proxmox:
+        nodes = await proxmox.get_nodes()
+        containers = await asyncio.gather(
+            *(proxmox.get_lxc_containers(node["node"]) for node in nodes)
+        )
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from django.conf import settings
+
+from .models import ProxmoxHost
+from .services import ProxmoxError
+
+logger = logging.getLogger(__name__)
+
+
+class _RateLimiter:
+    """Token bucket limiting requests per second to one host."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncProxmoxService:
+    """
+    Async, read-only Proxmox API client for a single host.
+    """
+
+    def __init__(
+        self,
+        host: ProxmoxHost,
+        max_connections: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize async Proxmox service.
+
+        Args:
+            host: ProxmoxHost to talk to (must already be loaded from the database)
+            max_connections: Connection pool size (defaults to PROXMOX_ASYNC_MAX_CONNECTIONS)
+            rate_limit: Max requests per second (defaults to PROXMOX_ASYNC_RATE_LIMIT, 0 = unlimited)
+            timeout: Per-request timeout in seconds (defaults to PROXMOX_ASYNC_TIMEOUT)
+            transport: Optional httpx transport (used by tests)
+        """
+        self.host = host
+        self.base_url = f"https://{host.host}:{host.port}/api2/json"
+        self.max_connections = max_connections or settings.PROXMOX_ASYNC_MAX_CONNECTIONS
+        self.timeout = timeout or settings.PROXMOX_ASYNC_TIMEOUT
+        self._limiter = _RateLimiter(
+            settings.PROXMOX_ASYNC_RATE_LIMIT if rate_limit is None else rate_limit
+        )
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._auth_lock = asyncio.Lock()
+        self._ticket_expires = 0.0
+
+    async def __aenter__(self) -> "AsyncProxmoxService":
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            verify=self.host.verify_ssl,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _authenticate(self) -> None:
+        """Get (or renew) a PVE ticket; tickets are valid for 2 hours."""
+        async with self._auth_lock:
+            if time.monotonic() < self._ticket_expires:
+                return
+
+            try:
+                response = await self._client.post(
+                    "/access/ticket",
+                    data={"username": self.host.user, "password": self.host.password},
+                )
+                response.raise_for_status()
+                ticket = response.json()["data"]["ticket"]
+            except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+                raise ProxmoxError(f"Authentication failed for {self.host.name}: {e}")
+
+            self._client.cookies.set("PVEAuthCookie", ticket)
+            # Renew well before the 2h expiry
+            self._ticket_expires = time.monotonic() + 90 * 60
+
+    async def _get(self, path: str, **params) -> Any:
+        """Rate-limited, authenticated GET returning the 'data' payload."""
+        if self._client is None:
+            raise ProxmoxError("AsyncProxmoxService must be used as an async context manager")
+
+        await self._authenticate()
+        await self._limiter.acquire()
+
+        params = {k: v for k, v in params.items() if v is not None}
+        try:
+            response = await self._client.get(path, params=params)
+            if response.status_code == 401:
+                # Ticket revoked or expired early - renew once and retry
+                self._ticket_expires = 0.0
+                await self._authenticate()
+                response = await self._client.get(path, params=params)
+            response.raise_for_status()
+            return response.json().get("data")
+        except httpx.HTTPError as e:
+            raise ProxmoxError(f"GET {path} failed on {self.host.name}: {e}")
+
+    async def get_nodes(self) -> List[Dict[str, Any]]:
+        """Get list of all Proxmox nodes for this host."""
+        return await self._get("/nodes") or []
+
+    async def get_lxc_containers(self, node_name: str) -> List[Dict[str, Any]]:
+        """Get all LXC containers on a specific node."""
+        return await self._get(f"/nodes/{node_name}/lxc") or []
+
+    async def get_lxc_status(self, node_name: str, vmid: int) -> Dict[str, Any]:
+        """Get the current status of an LXC container."""
+        return await self._get(f"/nodes/{node_name}/lxc/{vmid}/status/current") or {}
+
+    async def get_cluster_resources(
+        self, resource_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get cluster-wide resources in a single API call."""
+        return await self._get("/cluster/resources", type=resource_type) or []
+
+    async def get_tasks(
+        self,
+        node_name: str,
+        vmid: Optional[int] = None,
+        typefilter: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get recent tasks on a node, optionally filtered by guest and task type."""
+        return (
+            await self._get(
+                f"/nodes/{node_name}/tasks", vmid=vmid, typefilter=typefilter, limit=limit
+            )
+            or []
+        )
+
+    async def get_lxc_by_node(self) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """
+        List LXC containers on every node of this host concurrently.
+
+        Returns:
+            Tuple of (containers keyed by node name, per-node error messages)
+        """
+        nodes = await self.get_nodes()
+        node_names = [node["node"] for node in nodes if node.get("node")]
+
+        results = await asyncio.gather(
+            *(self.get_lxc_containers(name) for name in node_names), return_exceptions=True
+        )
+
+        containers: Dict[str, List[Dict[str, Any]]] = {}
+        errors: List[str] = []
+        for name, result in zip(node_names, results):
+            if isinstance(result, Exception):
+                errors.append(f"Node {name}: {result}")
+            else:
+                containers[name] = result
+        return containers, errors
+
+
+async def scan_lxc_containers(
+    hosts: Iterable[ProxmoxHost],
+) -> Tuple[Dict[int, Dict[str, List[Dict[str, Any]]]], List[str]]:
+    """
+    List LXC containers on every node of every host, all in parallel.
+
+    Args:
+        hosts: Loaded ProxmoxHost instances
+
+    Returns:
+        Tuple of ({host_id: {node_name: containers}}, error messages)
+    """
+
+    async def scan_host(host: ProxmoxHost):
+        async with AsyncProxmoxService(host) as proxmox:
+            return await proxmox.get_lxc_by_node()
+
+    hosts = list(hosts)
+    results = await asyncio.gather(*(scan_host(host) for host in hosts), return_exceptions=True)
+
+    containers: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+    errors: List[str] = []
+    for host, result in zip(hosts, results):
+        if isinstance(result, Exception):
+            errors.append(f"Host {host.name}: {result}")
+            continue
+        containers[host.id], host_errors = result
+        errors.extend(host_errors)
+    return containers, errors
@@ -7,7 +7,7 @@ It's activated via environment variable: USE_MOCK_PROXMOX=1
 
 import logging
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +77,22 @@ class MockProxmoxService:
         logger.info(f"🎭 MOCK: get_next_vmid() - returning {vmid}")
         return vmid
 
+    def get_cluster_resources(self, resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        resources = [
+            {"id": f"lxc/{vmid}", "type": "lxc", **container}
+            for vmid, container in self._containers.items()
+        ]
+        if resource_type in (None, "vm"):
+            return resources
+        return []
+
+    def get_used_vmids(self) -> set:
+        return set(self._containers.keys())
+
+    def discover_unmanaged_lxc(self) -> List[Dict[str, Any]]:
+        logger.info("🎭 MOCK: discover_unmanaged_lxc() - returning []")
+        return []
+
     def create_lxc(
         self,
         node_name: str,
@@ -135,21 +151,21 @@ class MockProxmoxService:
             del self._containers[vmid]
         return {"task": f"UPID:mock::{vmid}:vzdestroy:", "status": "success"}
 
-    def clone_lxc(
+    def start_clone_lxc(
         self,
         node_name: str,
         source_vmid: int,
         new_vmid: int,
         new_hostname: str,
         full: bool = True,
-        timeout: int = 600,
+        storage: Optional[str] = None,
+        target_node: Optional[str] = None,
+        snapname: Optional[str] = None,
     ) -> str:
-        logger.info(f"🎭 MOCK: clone_lxc({source_vmid} → {new_vmid})")
+        logger.info(f"🎭 MOCK: start_clone_lxc({source_vmid} → {new_vmid}, full={full})")
         if source_vmid not in self._containers:
             raise ProxmoxError(f"Source container {source_vmid} not found")
 
-        time.sleep(8 if full else 3)
-
         source = self._containers[source_vmid]
         self._containers[new_vmid] = {
             "vmid": new_vmid,
@@ -157,12 +173,56 @@ class MockProxmoxService:
             "status": "stopped",
             "memory": source["memory"],
             "cores": source["cores"],
-            "node": node_name,
+            "node": target_node or node_name,
             "cloned_from": source_vmid,
         }
+        return f"UPID:mock::{new_vmid}:vzclone:"
 
+    def clone_lxc(
+        self,
+        node_name: str,
+        source_vmid: int,
+        new_vmid: int,
+        new_hostname: str,
+        full: bool = True,
+        timeout: int = 600,
+        storage: Optional[str] = None,
+        target_node: Optional[str] = None,
+    ) -> str:
+        logger.info(f"🎭 MOCK: clone_lxc({source_vmid} → {new_vmid})")
+        time.sleep(8 if full else 3)
+        self.start_clone_lxc(
+            node_name, source_vmid, new_vmid, new_hostname, full, storage, target_node
+        )
         return f"Container {source_vmid} successfully cloned to {new_vmid}"
 
+    def create_snapshot(
+        self, node_name: str, vmid: int, snapname: str, description: str = ""
+    ) -> str:
+        logger.info(f"🎭 MOCK: create_snapshot({vmid}, {snapname})")
+        return f"UPID:mock::{vmid}:vzsnapshot:"
+
+    def delete_snapshot(self, node_name: str, vmid: int, snapname: str) -> str:
+        logger.info(f"🎭 MOCK: delete_snapshot({vmid}, {snapname})")
+        return f"UPID:mock::{vmid}:vzdelsnapshot:"
+
+    def list_node_storages(self, node_name: str, content: str = "rootdir") -> List[Dict[str, Any]]:
+        return [self.get_storage_status(node_name, "local-lvm")]
+
+    def ensure_template(self, node_name: str, ostemplate: str) -> Optional[str]:
+        return None
+
+    def get_storage_status(self, node_name: str, storage: str) -> Dict[str, Any]:
+        return {
+            "storage": storage,
+            "type": "lvmthin",
+            "shared": 0,
+            "active": 1,
+            "content": "rootdir,images",
+            "total": 500 * 1024**3,
+            "avail": 400 * 1024**3,
+        }
+
     def get_lxc_status(self, node_name: str, vmid: int) -> Dict[str, Any]:
         if vmid not in self._containers:
             raise ProxmoxError(f"Container {vmid} not found")
@@ -179,6 +239,62 @@ class MockProxmoxService:
         logger.info(f"🎭 MOCK: get_lxc_status(vmid={vmid}) - {status['status']}")
         return status
 
+    def get_lxc_config(self, node_name: str, vmid: int) -> Dict[str, Any]:
+        if vmid not in self._containers:
+            raise ProxmoxError(f"Container {vmid} not found")
+        container = self._containers[vmid]
+        return {
+            "hostname": container["hostname"],
+            "memory": container["memory"],
+            "cores": container["cores"],
+            "ostype": "debian",
+            "rootfs": f"local-lvm:vm-{vmid}-disk-0,size=8G",
+        }
+
+    def migrate_lxc(
+        self,
+        node_name: str,
+        vmid: int,
+        target_node: str,
+        restart: bool = True,
+        shutdown_timeout: int = 180,
+        target_storage: Optional[str] = None,
+    ) -> str:
+        logger.info(f"🎭 MOCK: migrate_lxc(vmid={vmid}, {node_name} → {target_node})")
+        if vmid in self._containers:
+            self._containers[vmid]["node"] = target_node
+        return f"UPID:mock::{vmid}:vzmigrate:"
+
+    def get_task_status(self, node_name: str, upid: str) -> Dict[str, Any]:
+        logger.info(f"🎭 MOCK: get_task_status(task={upid})")
+        return {"status": "stopped", "exitstatus": "OK"}
+
+    def get_task_log(
+        self, node_name: str, upid: str, start: int = 0, limit: int = 100
+    ) -> List[str]:
+        return ["TASK OK"][start : start + limit]
+
+    def get_lxc_rrd_data(
+        self, node_name: str, vmid: int, timeframe: str = "week", cf: str = "MAX"
+    ) -> List[Dict[str, Any]]:
+        logger.info(f"🎭 MOCK: get_lxc_rrd_data(vmid={vmid}, timeframe={timeframe})")
+        container = self._containers.get(vmid, {"memory": 2048, "cores": 2})
+        maxmem = container["memory"] * 1024**2
+        now = int(time.time())
+        # Half-hour samples of a busy container using about a quarter of its memory
+        return [
+            {
+                "time": now - i * 1800,
+                "cpu": 0.05 + (i % 12) * 0.01,
+                "maxcpu": container["cores"],
+                "mem": int(maxmem * (0.2 + (i % 10) * 0.005)),
+                "maxmem": maxmem,
+                "netin": 4096 + (i % 6) * 512,
+                "netout": 8192 + (i % 4) * 1024,
+            }
+            for i in range(336, 0, -1)
+        ]
+
     def wait_for_task(
         self, node_name: str, task_upid: str, timeout: int = 300, poll_interval: int = 2
     ) -> bool:
@@ -186,6 +302,13 @@ class MockProxmoxService:
         time.sleep(0.5)
         return True
 
+    def wait_for_tasks(
+        self, tasks: List[Tuple[str, str]], timeout: int = 600, poll_interval: int = 2
+    ) -> Dict[str, Optional[str]]:
+        logger.info(f"🎭 MOCK: wait_for_tasks({len(tasks)} task(s))")
+        time.sleep(0.5)
+        return {upid: None for _, upid in tasks}
+
     def execute_command(
         self, node_name: str, vmid: int, command: str, timeout: int = 30
     ) -> Dict[str, Any]:
@@ -4,17 +4,44 @@ Adapted from v1.0 ProxmoxService with async support via Celery
 """
 
 import logging
+import os
+import re
 import shlex
-from typing import List, Dict, Any, Optional
-from proxmoxer import ProxmoxAPI
+import time
+import uuid
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from django.utils import timezone
-from django.core.cache import cache
-import paramiko
+from django.core.cache import caches
+
+from apps.core.metrics import SSH_COMMAND_DURATION, cache_lookup, observe_proxmox_response
 
 from .models import ProxmoxHost, ProxmoxNode
 
+if TYPE_CHECKING:
+    import paramiko
+
 logger = logging.getLogger(__name__)
 
+# proxmoxer and paramiko (with cryptography) are imported on first use, not
+# when the module loads: most processes that import this module never open a
+# Proxmox or SSH connection. Tests may patch ProxmoxAPI directly.
+ProxmoxAPI = None
+
+
+def _proxmox_api():
+    """The ProxmoxAPI class, importing proxmoxer on first use."""
+    global ProxmoxAPI
+    if ProxmoxAPI is None:
+        from proxmoxer import ProxmoxAPI as api_class
+
+        ProxmoxAPI = api_class
+    return ProxmoxAPI
+
+
+# vzdump logs the target as "creating vzdump archive '<path>'" (older releases:
+# "creating archive '<path>'", PBS: "creating Proxmox Backup Server archive '<name>'")
+_VZDUMP_ARCHIVE_RE = re.compile(r"creating (?:vzdump |Proxmox Backup Server )?archive '([^']+)'")
+
 
 class ProxmoxError(Exception):
     """Custom exception for Proxmox API errors."""
@@ -52,7 +79,7 @@ class ProxmoxService:
                 raise ProxmoxError("No active Proxmox host")
             return host
 
-    def get_client(self) -> ProxmoxAPI:
+    def get_client(self) -> "ProxmoxAPI":
         """
         Get or create Proxmox API client.
         Uses caching for connection pooling.
@@ -63,15 +90,16 @@ class ProxmoxService:
         host = self.get_host()
         cache_key = f"proxmox_client_{host.id}"
 
-        # Try to get from cache
-        client = cache.get(cache_key)
+        # Try to get from the per-process cache (clients hold live connections)
+        client = caches["local"].get(cache_key)
+        cache_lookup("proxmox_client", bool(client))
         if client:
             self._client = client
             return client
 
         # Create new connection
         try:
-            client = ProxmoxAPI(
+            client = _proxmox_api()(
                 host.host,
                 backend="https",
                 user=host.user,
@@ -79,6 +107,8 @@ class ProxmoxService:
                 verify_ssl=host.verify_ssl,
                 port=host.port,
             )
+            # Times every API call of this client (latency and errors per endpoint)
+            client._store["session"].hooks["response"].append(observe_proxmox_response)
 
             # Test connection
             client.version.get()
@@ -88,7 +118,7 @@ class ProxmoxService:
             host.save(update_fields=["last_seen"])
 
             # Cache for 5 minutes
-            cache.set(cache_key, client, 300)
+            caches["local"].set(cache_key, client, 300)
             self._client = client
 
             logger.info(f"Connected to Proxmox host: {host.name}")
@@ -199,6 +229,34 @@ class ProxmoxService:
         except Exception as e:
             raise ProxmoxError(f"Failed to get next VMID: {e}")
 
+    def get_cluster_resources(self, resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get cluster-wide resources in a single API call.
+
+        Args:
+            resource_type: Optional resource type filter ('vm', 'storage', 'node')
+
+        Returns:
+            List of resource dictionaries (guests carry 'vmid', 'node' and 'type')
+        """
+        try:
+            client = self.get_client()
+            if resource_type:
+                return client.cluster.resources.get(type=resource_type)
+            return client.cluster.resources.get()
+        except Exception as e:
+            raise ProxmoxError(f"Failed to get cluster resources: {e}")
+
+    def get_used_vmids(self) -> set:
+        """
+        Get every VMID in use across the cluster (VMs and containers).
+
+        Returns:
+            Set of VMIDs known to Proxmox
+        """
+        resources = self.get_cluster_resources(resource_type="vm")
+        return {int(r["vmid"]) for r in resources if r.get("vmid") is not None}
+
     def create_lxc(
         self,
         node_name: str,
@@ -442,6 +500,108 @@ class ProxmoxService:
         except Exception as e:
             raise ProxmoxError(f"Failed to delete snapshot '{snapname}' for LXC {vmid}: {e}")
 
+    def list_snapshots(self, node_name: str, vmid: int) -> List[Dict[str, Any]]:
+        """
+        List snapshots of an LXC container.
+
+        Args:
+            node_name: Proxmox node name
+            vmid: Container VMID
+
+        Returns:
+            Snapshots (name, snaptime, description, parent), newest first. The
+            pseudo-entry "current" is omitted.
+
+        Raises:
+            ProxmoxError: If snapshots cannot be listed
+        """
+        try:
+            client = self.get_client()
+            snapshots = client.nodes(node_name).lxc(vmid).snapshot.get() or []
+            snapshots = [snap for snap in snapshots if snap.get("name") != "current"]
+            return sorted(snapshots, key=lambda snap: snap.get("snaptime", 0), reverse=True)
+        except Exception as e:
+            raise ProxmoxError(f"Failed to list snapshots for LXC {vmid}: {e}")
+
+    def rollback_snapshot(
+        self, node_name: str, vmid: int, snapname: str, timeout: int = 600
+    ) -> Dict[str, Any]:
+        """
+        Roll an LXC container back to a snapshot and wait for it to finish.
+
+        Args:
+            node_name: Proxmox node name
+            vmid: Container VMID
+            snapname: Snapshot to roll back to
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Task status information
+
+        Raises:
+            ProxmoxError: If the rollback fails (e.g. ZFS refuses to roll back
+                past newer snapshots)
+        """
+        try:
+            client = self.get_client()
+            task_upid = client.nodes(node_name).lxc(vmid).snapshot(snapname).rollback.post()
+            logger.info(f"Rolling back LXC {vmid} to snapshot '{snapname}'")
+            return self.wait_for_task(node_name, task_upid, timeout=timeout, poll_interval=1)
+        except Exception as e:
+            if isinstance(e, ProxmoxError):
+                raise
+            raise ProxmoxError(f"Failed to roll back LXC {vmid} to '{snapname}': {e}")
+
+    def start_clone_lxc(
+        self,
+        node_name: str,
+        source_vmid: int,
+        new_vmid: int,
+        new_hostname: str,
+        full: bool = True,
+        storage: Optional[str] = None,
+        target_node: Optional[str] = None,
+        snapname: Optional[str] = None,
+    ) -> str:
+        """
+        Start an LXC clone task without waiting for it.
+
+        Args:
+            node_name: Node the source container lives on
+            source_vmid: Source container VMID (a template for linked clones)
+            new_vmid: New container VMID for the clone
+            new_hostname: New hostname for the clone
+            full: Full copy (True) or linked clone of a template (False)
+            storage: Target storage for full clones (None keeps the source storage)
+            target_node: Node to place the clone on (requires shared storage)
+            snapname: Clone the state of this snapshot instead of the current state
+
+        Returns:
+            Task UPID
+
+        Raises:
+            ProxmoxError: If the clone cannot be started
+        """
+        clone_params = {"newid": new_vmid, "hostname": new_hostname, "full": 1 if full else 0}
+        if storage and full:
+            clone_params["storage"] = storage
+        if target_node and target_node != node_name:
+            clone_params["target"] = target_node
+        if snapname:
+            clone_params["snapname"] = snapname
+
+        try:
+            client = self.get_client()
+            task_upid = client.nodes(node_name).lxc(source_vmid).clone.post(**clone_params)
+            logger.info(
+                f"Clone task started: LXC {source_vmid} → {new_vmid} "
+                f"({'full' if full else 'linked'}, storage={storage or 'source'}, "
+                f"target={target_node or node_name}, snapshot={snapname or '-'})"
+            )
+            return task_upid
+        except Exception as e:
+            raise ProxmoxError(f"Failed to clone LXC {source_vmid} to {new_vmid}: {e}")
+
     def clone_lxc(
         self,
         node_name: str,
@@ -450,6 +610,8 @@ class ProxmoxService:
         new_hostname: str,
         full: bool = True,
         timeout: int = 600,
+        storage: Optional[str] = None,
+        target_node: Optional[str] = None,
     ) -> str:
         """
         Clone an LXC container with zero-downtime support.
@@ -460,6 +622,7 @@ class ProxmoxService:
         3. Deletes the temporary snapshot
 
         The try...finally block guarantees snapshot cleanup even if the clone fails.
+        Use apps.applications.clone_engine for linked clones and multiple copies.
 
         Args:
             node_name: Proxmox node name
@@ -468,6 +631,8 @@ class ProxmoxService:
             new_hostname: New hostname for the clone
             full: Create a full clone (True) or linked clone (False)
             timeout: Maximum time to wait for clone operation in seconds
+            storage: Target storage for full clones (None keeps the source storage)
+            target_node: Node to place the clone on (requires shared storage)
 
         Returns:
             Success message
@@ -481,8 +646,6 @@ class ProxmoxService:
         snapshot_created = False
 
         try:
-            client = self.get_client()
-
             # Step 1/4: Check container status
             logger.info(f"[Step 1/4] Checking status of source container {source_vmid}...")
             status_info = self.get_lxc_status(node_name, source_vmid)
@@ -513,19 +676,17 @@ class ProxmoxService:
                 f"[Step 3/4] Cloning LXC {source_vmid} → {new_vmid} (hostname: {new_hostname})..."
             )
 
-            clone_params = {
-                "newid": new_vmid,
-                "hostname": new_hostname,
-                "full": 1 if full else 0,
-                "storage": "local-lvm",
-            }
-
             # If snapshot exists, clone from snapshot instead of live container
-            if snapshot_created:
-                clone_params["snapname"] = snapshot_name
-                logger.info(f"[Step 3/4] Cloning from snapshot '{snapshot_name}'")
-
-            task_upid = client.nodes(node_name).lxc(source_vmid).clone.post(**clone_params)
+            task_upid = self.start_clone_lxc(
+                node_name,
+                source_vmid,
+                new_vmid,
+                new_hostname,
+                full=full,
+                storage=storage,
+                target_node=target_node,
+                snapname=snapshot_name if snapshot_created else None,
+            )
             logger.info(f"[Step 3/4] Clone task initiated: {task_upid}")
 
             self.wait_for_task(node_name, task_upid, timeout=timeout)
@@ -548,6 +709,53 @@ class ProxmoxService:
                         f"Manual cleanup required: 'pct delsnapshot {source_vmid} {snapshot_name}'"
                     )
 
+    def migrate_lxc(
+        self,
+        node_name: str,
+        vmid: int,
+        target_node: str,
+        restart: bool = True,
+        shutdown_timeout: int = 180,
+        target_storage: Optional[str] = None,
+    ) -> str:
+        """
+        Start migrating an LXC container to another node of the cluster.
+
+        Containers cannot be live-migrated; a running container is migrated in
+        restart mode (shut down, moved, started on the target).
+
+        Args:
+            node_name: Node the container currently lives on
+            vmid: Container VMID
+            target_node: Destination node
+            restart: Use restart mode (required for running containers)
+            shutdown_timeout: Seconds to wait for a clean shutdown in restart mode
+            target_storage: Storage on the target for local volumes (None keeps the ID)
+
+        Returns:
+            Task UPID (the task runs on the source node)
+
+        Raises:
+            ProxmoxError: If the migration cannot be started
+        """
+        migrate_params = {"target": target_node}
+        if restart:
+            migrate_params["restart"] = 1
+            migrate_params["timeout"] = shutdown_timeout
+        if target_storage:
+            migrate_params["target-storage"] = target_storage
+
+        try:
+            client = self.get_client()
+            task_upid = client.nodes(node_name).lxc(vmid).migrate.post(**migrate_params)
+            logger.info(
+                f"Migration task started: LXC {vmid} {node_name} → {target_node} "
+                f"(restart={restart})"
+            )
+            return task_upid
+        except Exception as e:
+            raise ProxmoxError(f"Failed to migrate LXC {vmid} to {target_node}: {e}")
+
     def get_lxc_status(self, node_name: str, vmid: int) -> Dict[str, Any]:
         """
         Get the current status of an LXC container.
@@ -608,6 +816,29 @@ class ProxmoxService:
             logger.debug(f"Could not get metrics for LXC {vmid} on {node_name}: {e}")
             return {}
 
+    def get_lxc_rrd_data(
+        self, node_name: str, vmid: int, timeframe: str = "week", cf: str = "MAX"
+    ) -> List[Dict[str, Any]]:
+        """
+        Get historical usage samples of an LXC container from the Proxmox RRD.
+
+        Args:
+            node_name: Proxmox node name
+            vmid: Container VMID
+            timeframe: hour, day, week, month or year (sample width grows with it)
+            cf: Consolidation function per sample, AVERAGE or MAX
+
+        Returns:
+            Samples with 'time', 'cpu' (fraction of 'maxcpu'), 'maxcpu', 'mem' and
+            'maxmem' (bytes), 'netin' and 'netout' (bytes/s); values are missing
+            while the container was stopped
+        """
+        try:
+            client = self.get_client()
+            return client.nodes(node_name).lxc(vmid).rrddata.get(timeframe=timeframe, cf=cf) or []
+        except Exception as e:
+            raise ProxmoxError(f"Failed to get usage history of LXC {vmid}: {e}")
+
     def get_lxc_config(self, node_name: str, vmid: int) -> Dict[str, Any]:
         """
         Get the configuration of an LXC container.
@@ -646,6 +877,19 @@ class ProxmoxService:
         except Exception as e:
             raise ProxmoxError(f"Failed to update LXC {vmid} config: {e}")
 
+    def get_task_status(self, node_name: str, upid: str) -> Dict[str, Any]:
+        """
+        Get the current status of a Proxmox task without waiting.
+
+        Returns:
+            Task status ('status' is 'running' or 'stopped', plus 'exitstatus')
+        """
+        try:
+            client = self.get_client()
+            return client.nodes(node_name).tasks(upid).status.get()
+        except Exception as e:
+            raise ProxmoxError(f"Failed to get status of task {upid}: {e}")
+
     def wait_for_task(
         self, node_name: str, upid: str, timeout: int = 600, poll_interval: int = 2
     ) -> Dict[str, Any]:
@@ -696,6 +940,116 @@ class ProxmoxService:
                 raise
             raise ProxmoxError(f"Error waiting for task {upid}: {e}")
 
+    def wait_for_tasks(
+        self, tasks: List[Tuple[str, str]], timeout: int = 600, poll_interval: int = 2
+    ) -> Dict[str, Optional[str]]:
+        """
+        Wait for several Proxmox tasks at once.
+
+        Unlike wait_for_task, a failing task does not stop the wait: every task
+        is followed until it finishes or the shared timeout expires.
+
+        Args:
+            tasks: (node_name, upid) pairs
+            timeout: Maximum time to wait for all tasks in seconds
+            poll_interval: Polling interval in seconds
+
+        Returns:
+            Dictionary mapping each UPID to None (success) or an error message
+        """
+        import time
+
+        pending = dict((upid, node_name) for node_name, upid in tasks)
+        results: Dict[str, Optional[str]] = {}
+        start_time = time.time()
+
+        while pending:
+            for upid, node_name in list(pending.items()):
+                try:
+                    status = self.get_client().nodes(node_name).tasks(upid).status.get()
+                except Exception as e:
+                    results[upid] = f"Error waiting for task {upid}: {e}"
+                    del pending[upid]
+                    continue
+
+                if status.get("status") == "stopped":
+                    exitstatus = status.get("exitstatus", "unknown")
+                    results[upid] = (
+                        None
+                        if exitstatus == "OK"
+                        else f"Task {upid} failed with status: {exitstatus}"
+                    )
+                    del pending[upid]
+
+            if not pending:
+                break
+            if time.time() - start_time > timeout:
+                for upid in pending:
+                    results[upid] = f"Task {upid} timed out after {timeout}s"
+                break
+            time.sleep(poll_interval)
+
+        return results
+
+    def list_node_storages(self, node_name: str, content: str = "rootdir") -> List[Dict[str, Any]]:
+        """
+        List the enabled storages of a node that accept a content type.
+
+        Args:
+            node_name: Proxmox node name
+            content: Content type (rootdir for container volumes)
+
+        Returns:
+            Storage status dicts (storage, type, shared, active, avail, total, ...)
+        """
+        try:
+            client = self.get_client()
+            return client.nodes(node_name).storage.get(content=content, enabled=1)
+        except Exception as e:
+            raise ProxmoxError(f"Failed to list storages on {node_name}: {e}")
+
+    def ensure_template(self, node_name: str, ostemplate: str) -> Optional[str]:
+        """
+        Make sure an OS template is present on a node, downloading it if missing.
+
+        Args:
+            node_name: Proxmox node name
+            ostemplate: Template volume ID (e.g., 'local:vztmpl/alpine-3.22-default_20250617_amd64.tar.xz')
+
+        Returns:
+            UPID of the download task, or None when the template is already there
+        """
+        storage, _, volume = ostemplate.partition(":")
+        try:
+            client = self.get_client()
+            content = client.nodes(node_name).storage(storage).content.get(content="vztmpl")
+            if any(item.get("volid") == ostemplate for item in content):
+                return None
+
+            template = volume.split("/", 1)[-1]
+            upid = client.nodes(node_name).aplinfo.post(storage=storage, template=template)
+            logger.info(f"Downloading template {template} to {storage} on {node_name}: {upid}")
+            return upid
+        except Exception as e:
+            raise ProxmoxError(f"Failed to ensure template {ostemplate} on {node_name}: {e}")
+
+    def get_storage_status(self, node_name: str, storage: str) -> Dict[str, Any]:
+        """
+        Get the type, sharing and capacity of one storage.
+
+        Args:
+            node_name: Proxmox node name
+            storage: Storage ID
+
+        Returns:
+            Storage status dict (type, shared, active, avail, total, content)
+        """
+        try:
+            client = self.get_client()
+            return client.nodes(node_name).storage(storage).status.get()
+        except Exception as e:
+            raise ProxmoxError(f"Failed to get status of storage {storage} on {node_name}: {e}")
+
     def create_lxc_backup(
         self,
         node_name: str,
@@ -715,7 +1069,7 @@ class ProxmoxService:
             vmid: Container VMID to backup
             storage: Proxmox storage name for backup (default: 'local')
             mode: Backup mode - 'snapshot' (fastest), 'suspend', or 'stop'
-            compress: Compression algorithm - 'zstd', 'gzip', or 'lzo'
+            compress: Compression algorithm - 'zstd', 'gzip', 'lzo', or '0' (uncompressed)
 
         Returns:
             Dictionary containing:
@@ -735,7 +1089,7 @@ class ProxmoxService:
                 raise ProxmoxError(f"Invalid backup mode '{mode}'. Must be one of: {valid_modes}")
 
             # Validate compression
-            valid_compress = ["zstd", "gzip", "lzo"]
+            valid_compress = ["zstd", "gzip", "lzo", "0"]
             if compress not in valid_compress:
                 raise ProxmoxError(
                     f"Invalid compression '{compress}'. Must be one of: {valid_compress}"
@@ -760,23 +1114,11 @@ class ProxmoxService:
             # Wait for backup to complete
             task_status = self.wait_for_task(node_name, task_upid, timeout=1800)
 
-            # Get the backup file information
-            # The backup filename follows pattern: vzdump-lxc-{vmid}-{timestamp}.{ext}
-            backups = client.nodes(node_name).storage(storage).content.get(content="backup")
-
-            # Find the most recent backup for this VMID
-            vmid_backups = [b for b in backups if f"lxc-{vmid}-" in b.get("volid", "")]
-
-            if not vmid_backups:
-                raise ProxmoxError(f"Backup file not found for LXC {vmid}")
-
-            # Sort by creation time and get the latest
-            latest_backup = sorted(vmid_backups, key=lambda x: x.get("ctime", 0), reverse=True)[0]
-
-            # Extract filename from volid (format: storage:backup/filename)
-            volid = latest_backup.get("volid", "")
-            file_name = volid.split("/")[-1] if "/" in volid else volid
-            size = latest_backup.get("size", 0)
+            # Resolve the archive this task wrote (no full storage listing)
+            volume = self._resolve_backup_volume(node_name, storage, vmid, task_upid)
+            volid = volume["volid"]
+            file_name = volid.split(":", 1)[-1].split("backup/", 1)[-1]
+            size = volume.get("size", 0)
 
             logger.info(f"Backup completed successfully: {file_name} ({size} bytes)")
 
@@ -785,6 +1127,7 @@ class ProxmoxService:
                 "size": size,
                 "storage": storage,
                 "volid": volid,
+                "ctime": volume.get("ctime"),
                 "task": task_status,
             }
 
@@ -793,6 +1136,74 @@ class ProxmoxService:
                 raise
             raise ProxmoxError(f"Failed to create backup for LXC {vmid}: {e}")
 
+    def get_task_log(
+        self, node_name: str, upid: str, start: int = 0, limit: int = 100
+    ) -> List[str]:
+        """
+        Get lines of a task's log.
+
+        Args:
+            node_name: Proxmox node name
+            upid: Task UPID
+            start: First line to return
+            limit: Maximum number of lines
+
+        Returns:
+            Log lines in order
+        """
+        try:
+            client = self.get_client()
+            entries = client.nodes(node_name).tasks(upid).log.get(start=start, limit=limit)
+            return [entry.get("t", "") for entry in entries or []]
+        except Exception as e:
+            raise ProxmoxError(f"Failed to get log of task {upid}: {e}")
+
+    def _resolve_backup_volume(
+        self, node_name: str, storage: str, vmid: int, upid: str
+    ) -> Dict[str, Any]:
+        """
+        Find the archive written by a vzdump task.
+
+        The archive name is read from the task log and its size from a single
+        volume lookup, so the cost does not grow with the number of archives on
+        the storage. If the log cannot be parsed, the storage is listed with
+        a server-side VMID filter and the newest archive is used.
+
+        Returns:
+            Storage content entry with at least 'volid' (plus 'size', 'ctime' when known)
+        """
+        client = self.get_client()
+
+        archive = None
+        try:
+            for line in self.get_task_log(node_name, upid):
+                match = _VZDUMP_ARCHIVE_RE.search(line)
+                if match:
+                    archive = match.group(1)
+                    break
+        except ProxmoxError as e:
+            logger.warning(f"Could not read vzdump log for LXC {vmid}: {e}")
+
+        if archive:
+            # File storages log an absolute path, PBS logs the snapshot name
+            name = os.path.basename(archive) if archive.startswith("/") else archive
+            volid = f"{storage}:backup/{name}"
+            try:
+                info = client.nodes(node_name).storage(storage).content(volid).get() or {}
+                return {
+                    "volid": volid,
+                    "size": info.get("size", 0),
+                    "ctime": info.get("ctime"),
+                    "format": info.get("format"),
+                }
+            except Exception as e:
+                logger.warning(f"Volume lookup for {volid} failed, falling back to listing: {e}")
+
+        backups = client.nodes(node_name).storage(storage).content.get(content="backup", vmid=vmid)
+        if not backups:
+            raise ProxmoxError(f"Backup file not found for LXC {vmid}")
+        return max(backups, key=lambda b: b.get("ctime", 0))
+
     def restore_lxc_backup(
         self,
         node_name: str,
@@ -828,11 +1239,10 @@ class ProxmoxService:
                 status = self.get_lxc_status(node_name, vmid)
                 if status.get("status") == "running":
                     logger.info(f"Stopping LXC {vmid} before restore")
-                    self.stop_lxc(node_name, vmid, force=True)
-                    # Wait for container to stop
-                    import time
-
-                    time.sleep(3)
+                    stop_upid = self.stop_lxc(node_name, vmid, force=True)
+                    # Wait for the stop task instead of guessing how long it takes
+                    if isinstance(stop_upid, str):
+                        self.wait_for_task(node_name, stop_upid, timeout=120, poll_interval=1)
             except Exception as e:
                 logger.warning(f"Could not check/stop container before restore: {e}")
 
@@ -917,18 +1327,198 @@ class ProxmoxService:
         try:
             client = self.get_client()
 
-            # Get all backups from storage
-            backups = client.nodes(node_name).storage(storage).content.get(content="backup")
-
-            # Filter by VMID if specified
+            # Filter by VMID server-side when specified
+            params = {"content": "backup"}
             if vmid is not None:
-                backups = [b for b in backups if f"lxc-{vmid}-" in b.get("volid", "")]
+                params["vmid"] = vmid
 
-            return backups
+            return client.nodes(node_name).storage(storage).content.get(**params)
 
         except Exception as e:
             raise ProxmoxError(f"Failed to list backups: {e}")
 
+    def stream_backup_archive(
+        self,
+        node_name: str,
+        storage: str,
+        backup_file: str,
+        block_size: int = 1024 * 1024,
+        offset: int = 0,
+    ) -> Iterator[bytes]:
+        """
+        Stream a backup archive off Proxmox storage without buffering it.
+
+        Args:
+            node_name: Proxmox node name
+            storage: Storage name
+            backup_file: Backup filename or volid
+            block_size: Maximum bytes per yielded block
+            offset: Start reading at this byte (resumes an interrupted transfer)
+
+        Yields:
+            Archive content in blocks of at most block_size bytes
+
+        Raises:
+            ProxmoxError: If the archive cannot be read
+        """
+        volid = backup_file if ":" in backup_file else f"{storage}:backup/{backup_file}"
+        ssh = None
+        try:
+            ssh = self._connect_host_ssh()
+            path = f'"$(pvesm path {shlex.quote(volid)})"'
+            command = f"tail -c +{int(offset) + 1} {path}" if offset else f"cat {path}"
+            _, stdout, stderr = ssh.exec_command(command)
+            channel = stdout.channel
+
+            while True:
+                data = channel.recv(block_size)
+                if not data:
+                    break
+                yield data
+
+            exit_code = channel.recv_exit_status()
+            if exit_code != 0:
+                raise ProxmoxError(
+                    f"Failed to read backup {volid}: {stderr.read().decode('utf-8', 'replace')}"
+                )
+
+        except ProxmoxError:
+            raise
+        except Exception as e:
+            raise ProxmoxError(f"Failed to stream backup {volid}: {e}")
+        finally:
+            if ssh:
+                ssh.close()
+
+    def upload_backup_archive(
+        self, node_name: str, storage: str, backup_file: str, blocks: Iterable[bytes]
+    ) -> str:
+        """
+        Write a new backup archive to Proxmox storage from a stream of blocks.
+
+        The stream goes to a temporary file next to the target. Only once the whole
+        stream is written is it hard-linked into place, and only if no archive has
+        that name (link creation is atomic): an existing archive is never overwritten,
+        and a failed or interrupted upload never leaves a truncated archive behind.
+
+        Args:
+            node_name: Proxmox node name
+            storage: Storage name
+            backup_file: Target backup filename (must not exist yet)
+            blocks: Archive content
+
+        Returns:
+            volid of the written archive
+
+        Raises:
+            ProxmoxError: If the archive cannot be written or the name is taken
+        """
+        volid = f"{storage}:backup/{backup_file}"
+        paths = (
+            f'target="$(pvesm path {shlex.quote(volid)})" || exit 1; '
+            f'tmp="$target.upload-{uuid.uuid4().hex}"; '
+        )
+
+        def run(ssh, command, blocks=()):
+            stdin, stdout, stderr = ssh.exec_command(paths + command)
+            for block in blocks:
+                stdin.write(block)
+            stdin.channel.shutdown_write()
+            if stdout.channel.recv_exit_status() != 0:
+                raise ProxmoxError(
+                    f"Failed to write backup {volid}: {stderr.read().decode('utf-8', 'replace')}"
+                )
+
+        ssh = None
+        try:
+            ssh = self._connect_host_ssh()
+            run(ssh, 'cat > "$tmp"', blocks)
+            run(ssh, 'ln "$tmp" "$target"; status=$?; rm -f "$tmp"; exit $status')
+
+            logger.info(f"Uploaded backup archive {volid}")
+            return volid
+
+        except Exception as e:
+            if ssh:
+                try:
+                    run(ssh, 'rm -f "$tmp"')
+                except Exception as cleanup_error:
+                    logger.warning(f"Could not remove partial upload of {volid}: {cleanup_error}")
+            if isinstance(e, ProxmoxError):
+                raise
+            raise ProxmoxError(f"Failed to upload backup {volid}: {e}")
+        finally:
+            if ssh:
+                ssh.close()
+
+    def _connect_ssh(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        timeout: int = 30,
+        key_filename: Optional[str] = None,
+    ) -> "paramiko.SSHClient":
+        """
+        Open an SSH connection, preferring key-based authentication.
+
+        Returns:
+            Connected paramiko SSHClient (caller must close it)
+        """
+        import paramiko
+
+        # Create SSH client with host key verification
+        ssh = paramiko.SSHClient()
+        # Load system's known_hosts file for proper host key verification
+        ssh.load_system_host_keys()
+        # Fall back to warning policy if host key not in known_hosts
+        # This is safer than AutoAddPolicy but still operational
+        ssh.set_missing_host_key_policy(paramiko.WarningPolicy())
+
+        logger.debug(f"Connecting to {host}:{port} as {username}")
+
+        # Try key-based auth first, then fall back to password
+        connect_kwargs = {
+            "hostname": host,
+            "port": port,
+            "username": username,
+            "timeout": timeout,
+            "allow_agent": False,
+            "look_for_keys": False,
+        }
+
+        if key_filename:
+            # Attempt key-based authentication
+            try:
+                connect_kwargs["key_filename"] = key_filename
+                ssh.connect(**connect_kwargs)
+                logger.debug(f"SSH authentication successful using key: {key_filename}")
+            except (paramiko.AuthenticationException, FileNotFoundError):
+                # Fall back to password authentication
+                logger.warning("Key-based auth failed, falling back to password auth")
+                del connect_kwargs["key_filename"]
+                connect_kwargs["password"] = password
+                ssh.connect(**connect_kwargs)
+        else:
+            # Use password authentication
+            connect_kwargs["password"] = password
+            ssh.connect(**connect_kwargs)
+
+        return ssh
+
+    def _connect_host_ssh(self, timeout: int = 30) -> "paramiko.SSHClient":
+        """Open an SSH connection to this service's Proxmox host."""
+        host = self.get_host()
+        return self._connect_ssh(
+            host=host.host,
+            port=host.ssh_port,
+            username=host.user.split("@")[0],
+            password=host.password,
+            timeout=timeout,
+            key_filename=host.ssh_key_path,
+        )
+
     def _execute_ssh_command(
         self,
         host: str,
@@ -960,44 +1550,13 @@ class ProxmoxService:
         Raises:
             ProxmoxError: If SSH connection or command execution fails
         """
+        import paramiko
+
         ssh = None
+        result = "error"
+        started = time.perf_counter()
         try:
-            # Create SSH client with host key verification
-            ssh = paramiko.SSHClient()
-            # Load system's known_hosts file for proper host key verification
-            ssh.load_system_host_keys()
-            # Fall back to warning policy if host key not in known_hosts
-            # This is safer than AutoAddPolicy but still operational
-            ssh.set_missing_host_key_policy(paramiko.WarningPolicy())
-
-            logger.debug(f"Connecting to {host}:{port} as {username}")
-
-            # Try key-based auth first, then fall back to password
-            connect_kwargs = {
-                "hostname": host,
-                "port": port,
-                "username": username,
-                "timeout": timeout,
-                "allow_agent": False,
-                "look_for_keys": False,
-            }
-
-            if key_filename:
-                # Attempt key-based authentication
-                try:
-                    connect_kwargs["key_filename"] = key_filename
-                    ssh.connect(**connect_kwargs)
-                    logger.debug(f"SSH authentication successful using key: {key_filename}")
-                except (paramiko.AuthenticationException, FileNotFoundError):
-                    # Fall back to password authentication
-                    logger.warning("Key-based auth failed, falling back to password auth")
-                    del connect_kwargs["key_filename"]
-                    connect_kwargs["password"] = password
-                    ssh.connect(**connect_kwargs)
-            else:
-                # Use password authentication
-                connect_kwargs["password"] = password
-                ssh.connect(**connect_kwargs)
+            ssh = self._connect_ssh(host, port, username, password, timeout, key_filename)
 
             logger.debug(f"Executing SSH command: {command}")
 
@@ -1011,6 +1570,7 @@ class ProxmoxService:
 
             logger.debug(f"SSH command completed with exit code {exit_code}")
 
+            result = "ok"
             return stdout_data, stderr_data, exit_code
 
         except paramiko.AuthenticationException as e:
@@ -1028,6 +1588,9 @@ class ProxmoxService:
         finally:
             if ssh:
                 ssh.close()
+            SSH_COMMAND_DURATION.labels(host=host, result=result).observe(
+                time.perf_counter() - started
+            )
 
     def execute_in_container(
         self,
@@ -1145,46 +1708,43 @@ class ProxmoxService:
             managed_vmids = set(
                 Application.objects.filter(lxc_id__isnull=False).values_list("lxc_id", flat=True)
             )
-            logger.info(f"Found {len(managed_vmids)} managed containers in DB: {managed_vmids}")
+            logger.debug(f"Found {len(managed_vmids)} managed containers in DB")
 
-            # Get all LXC containers from all nodes
-            unmanaged_containers = []
-            nodes = ProxmoxNode.objects.filter(host=self.get_host(), status="online")
+            online_nodes = set(
+                ProxmoxNode.objects.filter(host=self.get_host(), status="online").values_list(
+                    "name", flat=True
+                )
+            )
 
-            for node in nodes:
-                try:
-                    containers = self.get_lxc_containers(node.name)
-                    logger.info(f"Found {len(containers)} total containers on node {node.name}")
-
-                    for container in containers:
-                        vmid = int(container.get("vmid"))
-
-                        # Skip if already managed
-                        if vmid in managed_vmids:
-                            logger.debug(f"Skipping managed container {vmid}")
-                            continue
-
-                        # This is an unmanaged container - add to results
-                        unmanaged_containers.append(
-                            {
-                                "vmid": vmid,
-                                "name": container.get("name", f"ct-{vmid}"),
-                                "status": container.get("status", "unknown"),
-                                "node": node.name,
-                                "memory": container.get("maxmem", 0),
-                                "disk": container.get("maxdisk", 0),
-                                "uptime": container.get("uptime", 0),
-                                "cpus": container.get("cpus", 1),
-                            }
-                        )
-                        logger.info(f"Found unmanaged container: {vmid} ({container.get('name')})")
+            # One cluster-wide call instead of one lxc listing per node
+            resources = self.get_cluster_resources(resource_type="vm")
 
-                except Exception as e:
-                    logger.warning(f"Failed to get containers from node {node.name}: {e}")
+            unmanaged_containers = []
+            for container in resources:
+                if container.get("type") != "lxc" or container.get("node") not in online_nodes:
                     continue
 
+                vmid = int(container.get("vmid"))
+                if vmid in managed_vmids:
+                    continue
+
+                unmanaged_containers.append(
+                    {
+                        "vmid": vmid,
+                        "name": container.get("name", f"ct-{vmid}"),
+                        "status": container.get("status", "unknown"),
+                        "node": container.get("node"),
+                        "memory": container.get("maxmem", 0),
+                        "disk": container.get("maxdisk", 0),
+                        "uptime": container.get("uptime", 0),
+                        "cpus": container.get("maxcpu", 1),
+                    }
+                )
+                logger.debug(f"Found unmanaged container: {vmid} ({container.get('name')})")
+
             logger.info(
-                f"Discovery complete: Found {len(unmanaged_containers)} unmanaged containers"
+                f"Discovery complete: Found {len(unmanaged_containers)} unmanaged containers "
+                f"across {len(online_nodes)} online node(s)"
             )
             return unmanaged_containers
 
@@ -0,0 +1,130 @@
+"""
+Tests for the async Proxmox client used by fan-out jobs.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from apps.proxmox.async_service import AsyncProxmoxService, scan_lxc_containers
+from apps.proxmox.models import ProxmoxHost
+from apps.proxmox.services import ProxmoxError
+
+
+def _host(pk=1, name="pve-host"):
+    return ProxmoxHost(
+        id=pk, name=name, host="10.0.0.1", port=8006, user="root@pam", password="secret"
+    )
+
+
+def _transport(routes, calls=None):
+    """MockTransport answering ticket requests plus the given GET routes."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        path = request.url.path.replace("/api2/json", "")
+        if request.method == "POST" and path == "/access/ticket":
+            return httpx.Response(200, json={"data": {"ticket": "PVE:ticket"}})
+        if "PVEAuthCookie=PVE:ticket" not in request.headers.get("cookie", ""):
+            return httpx.Response(401)
+        if path in routes:
+            result = routes[path]
+            if isinstance(result, int):
+                return httpx.Response(result)
+            return httpx.Response(200, json={"data": result})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def test_reads_authenticate_once_and_pass_filters():
+    calls = []
+    routes = {
+        "/cluster/resources": [{"vmid": 100, "type": "lxc", "node": "pve1"}],
+        "/nodes/pve1/tasks": [{"upid": "UPID:pve1:1", "type": "vzdump"}],
+    }
+
+    async def run():
+        async with AsyncProxmoxService(
+            _host(), rate_limit=0, transport=_transport(routes, calls)
+        ) as proxmox:
+            resources = await proxmox.get_cluster_resources(resource_type="vm")
+            tasks = await proxmox.get_tasks("pve1", vmid=100, typefilter="vzdump")
+        return resources, tasks
+
+    resources, tasks = asyncio.run(run())
+
+    assert resources[0]["vmid"] == 100
+    assert tasks[0]["type"] == "vzdump"
+    assert sum(1 for c in calls if c.method == "POST") == 1
+    task_request = [c for c in calls if c.url.path.endswith("/tasks")][0]
+    assert task_request.url.params["vmid"] == "100"
+    assert "limit" not in task_request.url.params
+
+
+def test_http_errors_become_proxmox_errors():
+    async def run():
+        async with AsyncProxmoxService(
+            _host(), rate_limit=0, transport=_transport({"/nodes": 500})
+        ) as proxmox:
+            await proxmox.get_nodes()
+
+    with pytest.raises(ProxmoxError):
+        asyncio.run(run())
+
+
+def test_get_lxc_by_node_collects_per_node_errors():
+    routes = {
+        "/nodes": [{"node": "pve1"}, {"node": "pve2"}],
+        "/nodes/pve1/lxc": [{"vmid": 100}, {"vmid": 101}],
+        "/nodes/pve2/lxc": 500,
+    }
+
+    async def run():
+        async with AsyncProxmoxService(
+            _host(), rate_limit=0, transport=_transport(routes)
+        ) as proxmox:
+            return await proxmox.get_lxc_by_node()
+
+    containers, errors = asyncio.run(run())
+
+    assert [c["vmid"] for c in containers["pve1"]] == [100, 101]
+    assert "pve2" not in containers
+    assert len(errors) == 1 and errors[0].startswith("Node pve2")
+
+
+def test_rate_limit_spaces_out_requests():
+    routes = {"/nodes": []}
+
+    async def run():
+        async with AsyncProxmoxService(
+            _host(), rate_limit=20, transport=_transport(routes)
+        ) as proxmox:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            # The bucket holds 20 tokens; 30 requests need ~0.5s of refill
+            await asyncio.gather(*(proxmox.get_nodes() for _ in range(30)))
+            return loop.time() - started
+
+    assert asyncio.run(run()) >= 0.4
+
+
+def test_scan_reports_unreachable_hosts(monkeypatch):
+    transports = {
+        "ok": _transport({"/nodes": [{"node": "pve1"}], "/nodes/pve1/lxc": [{"vmid": 200}]}),
+        "down": _transport({}, None),
+    }
+
+    original_init = AsyncProxmoxService.__init__
+
+    def patched_init(self, host, **kwargs):
+        original_init(self, host, rate_limit=0, transport=transports[host.name])
+
+    monkeypatch.setattr(AsyncProxmoxService, "__init__", patched_init)
+
+    containers, errors = asyncio.run(scan_lxc_containers([_host(1, "ok"), _host(2, "down")]))
+
+    assert containers == {1: {"pve1": [{"vmid": 200}]}}
+    assert len(errors) == 1 and errors[0].startswith("Host down")
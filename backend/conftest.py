@@ -3,13 +3,26 @@ Pytest configuration for Proximity 2.0 backend tests.
 """
 
 import os
+import tempfile
 import django
 import pytest
+from unittest.mock import patch
 
 # Configure Django settings
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "proximity.settings")
 django.setup()
 
+# Keep synced catalogs and snapshots out of the source tree
+from django.conf import settings  # noqa: E402
+
+settings.CATALOG_CACHE_DIR = tempfile.mkdtemp(prefix="proximity-catalog-")
+
+# No Redis in the test environment: every cache alias is in-memory
+settings.CACHES = {
+    alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": alias}
+    for alias in settings.CACHES
+}
+
 
 @pytest.fixture(scope="session")
 def django_db_setup(django_db_blocker):
@@ -35,6 +48,18 @@ def enable_db_access(db):
     pass
 
 
+@pytest.fixture(autouse=True)
+def fake_redis():
+    """Give every test an empty in-memory Redis for state kept in Redis directly."""
+    import fakeredis
+
+    from apps.backups import backup_index
+
+    server = fakeredis.FakeRedis()
+    with patch.object(backup_index, "_redis", return_value=server):
+        yield server
+
+
 @pytest.fixture(scope="session")
 def celery_config():
     """Configure Celery for synchronous execution in tests."""
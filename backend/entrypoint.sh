@@ -18,6 +18,14 @@ while ! nc -z redis 6379; do
 done
 echo "✅ Redis started."
 
+# prometheus_client needs its multiprocess directory to exist before any sample is written.
+# It is shared by every container running this entrypoint, so it is not cleared here
+# (a restarting worker would wipe live samples); metrics_init clears it once per stack start.
+# The containers sharing it also share one PID namespace, since sample files are named by PID.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "🔧 Applying database migrations..."
 python manage.py migrate --noinput
 
@@ -1,4 +1,7 @@
-from ninja.security import APIKeyCookie
+import hmac
+
+from django.conf import settings
+from ninja.security import APIKeyCookie, APIKeyHeader
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
@@ -40,3 +43,22 @@ class JWTCookieAuthenticator(APIKeyCookie):
 
         # If no key is provided, authentication fails.
         return None
+
+
+class WakeTokenAuthenticator(APIKeyHeader):
+    param_name = "X-Proximity-Wake-Token"
+
+    def authenticate(self, request, key):
+        """
+        Authenticates the reverse proxy waking suspended applications.
+
+        The proxy has no user session; it sends the shared secret configured
+        in AUTOSUSPEND_WAKE_TOKEN. Without a configured token this always fails.
+
+        Returns:
+            The token when it matches, otherwise None.
+        """
+        expected = settings.AUTOSUSPEND_WAKE_TOKEN
+        if key and expected and hmac.compare_digest(key, expected):
+            return key
+        return None
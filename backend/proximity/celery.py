@@ -6,6 +6,7 @@ This module sets up Celery for background task processing.
 
 import os
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown
 
 # Set the default Django settings module
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "proximity.settings")
@@ -18,6 +19,29 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # Auto-discover tasks from all installed apps
 app.autodiscover_tasks()
 
+
+# Task runtimes for Prometheus (apps.core.metrics)
+@task_prerun.connect
+def _task_prerun(**kwargs):
+    from apps.core.metrics import task_started
+
+    task_started(**kwargs)
+
+
+@task_postrun.connect
+def _task_postrun(**kwargs):
+    from apps.core.metrics import task_finished
+
+    task_finished(**kwargs)
+
+
+@worker_process_shutdown.connect
+def _worker_process_shutdown(pid=None, **kwargs):
+    from apps.core.metrics import process_exited
+
+    process_exited(pid)
+
+
 # Celery Beat schedule for periodic tasks
 app.conf.beat_schedule = {
     # Reconciliation task - runs every hour to clean up orphan applications
@@ -28,12 +52,76 @@ app.conf.beat_schedule = {
             "expires": 3000,  # Task expires after 50 minutes if not executed
         },
     },
-    # Janitor task - runs every 6 hours to clean up stuck applications
-    "cleanup-stuck-applications-every-6-hours": {
+    # Janitor task - runs every 5 minutes to fail stuck applications (a few indexed queries)
+    "cleanup-stuck-applications-every-5-minutes": {
         "task": "apps.applications.tasks.janitor_task",
-        "schedule": 21600.0,  # Every 21600 seconds (6 hours)
+        "schedule": 300.0,  # Every 300 seconds (5 minutes)
+        "options": {
+            "expires": 240,  # Task expires after 4 minutes if not executed
+        },
+    },
+    # Rebalancer - runs hourly; moves apps off hot nodes when REBALANCE_AUTO_EXECUTE is on
+    "rebalance-nodes-every-hour": {
+        "task": "apps.applications.tasks.rebalance_nodes_task",
+        "schedule": 3600.0,  # Every 3600 seconds (1 hour)
+        "options": {
+            "expires": 3000,  # Task expires after 50 minutes if not executed
+        },
+    },
+    # Right-sizing - runs daily; refreshes recommendations (applies them when enabled)
+    "rightsize-apps-daily": {
+        "task": "apps.applications.tasks.rightsize_apps_task",
+        "schedule": 86400.0,  # Every 86400 seconds (24 hours)
+        "options": {
+            "expires": 82800,  # Task expires after 23 hours if not executed
+        },
+    },
+    # Autosuspend - runs every 10 minutes; shuts down apps idle for AUTOSUSPEND_IDLE_MINUTES
+    "autosuspend-idle-apps-every-10-minutes": {
+        "task": "apps.applications.tasks.autosuspend_idle_apps_task",
+        "schedule": 600.0,  # Every 600 seconds (10 minutes)
+        "options": {
+            "expires": 540,  # Task expires after 9 minutes if not executed
+        },
+    },
+    # Catalog sources - syncs CATALOG_SOURCES every 15 minutes (cheap when unchanged)
+    "sync-catalog-sources-every-15-minutes": {
+        "task": "apps.catalog.tasks.sync_catalog_sources_task",
+        "schedule": 900.0,  # Every 900 seconds (15 minutes)
+        "options": {
+            "expires": 840,  # Task expires after 14 minutes if not executed
+        },
+    },
+    # Backup policies - checks cron schedules every 5 minutes and queues due backups
+    "run-backup-policies-every-5-minutes": {
+        "task": "apps.backups.tasks.run_backup_policies_task",
+        "schedule": 300.0,  # Every 300 seconds (5 minutes)
+        "options": {
+            "expires": 240,  # Task expires after 4 minutes if not executed
+        },
+    },
+    # Backup pruning - applies policy retention every hour
+    "prune-backups-every-hour": {
+        "task": "apps.backups.tasks.prune_backups_task",
+        "schedule": 3600.0,  # Every 3600 seconds (1 hour)
+        "options": {
+            "expires": 3000,  # Task expires after 50 minutes if not executed
+        },
+    },
+    # Chunk store GC - runs daily to drop chunks no incremental backup references
+    "gc-backup-chunk-store-daily": {
+        "task": "apps.backups.tasks.gc_chunk_store_task",
+        "schedule": 86400.0,  # Every 86400 seconds (24 hours)
+        "options": {
+            "expires": 82800,  # Task expires after 23 hours if not executed
+        },
+    },
+    # Backup stats reconciliation - runs daily to repair counter drift
+    "rebuild-backup-stats-daily": {
+        "task": "apps.backups.tasks.rebuild_backup_stats_task",
+        "schedule": 86400.0,  # Every 86400 seconds (24 hours)
         "options": {
-            "expires": 20000,  # Task expires after ~5.5 hours if not executed
+            "expires": 82800,  # Task expires after 23 hours if not executed
         },
     },
 }
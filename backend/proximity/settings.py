@@ -4,6 +4,7 @@ Django settings for Proximity 2.0 project.
 Built with security, scalability, and developer experience in mind.
 """
 
+import json
 import os
 from pathlib import Path
 from datetime import timedelta
@@ -50,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.metrics.MetricsMiddleware",  # Prometheus request latency and query counts
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -202,9 +204,135 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 
+# Queue routing: quick lifecycle actions never wait behind long-running jobs.
+# Workers must consume all queues, e.g. "-Q celery,interactive" and "-Q long".
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+CELERY_TASK_ROUTES = {
+    "apps.applications.tasks.start_app_task": {"queue": "interactive"},
+    "apps.applications.tasks.stop_app_task": {"queue": "interactive"},
+    "apps.applications.tasks.restart_app_task": {"queue": "interactive"},
+    "apps.applications.tasks.migrate_app_task": {"queue": "long"},
+    "apps.backups.tasks.create_backup_task": {"queue": "long"},
+    "apps.backups.tasks.restore_backup_task": {"queue": "long"},
+    "apps.backups.tasks.export_backup_task": {"queue": "long"},
+    "apps.backups.tasks.import_backup_task": {"queue": "long"},
+}
+
+# Max heavy jobs (deploy, clone, backup, restore) running at once on one Proxmox node
+NODE_MAX_CONCURRENT_JOBS = int(os.getenv("NODE_MAX_CONCURRENT_JOBS", "2"))
+# Seconds before a job waiting for a busy node is re-queued
+NODE_SLOT_RETRY_DELAY = int(os.getenv("NODE_SLOT_RETRY_DELAY", "15"))
+
+# Discovery (adoption UI): seconds a cached listing is fresh / kept as stale fallback
+DISCOVERY_CACHE_TTL = int(os.getenv("DISCOVERY_CACHE_TTL", "30"))
+DISCOVERY_CACHE_MAX_AGE = int(os.getenv("DISCOVERY_CACHE_MAX_AGE", "600"))
+
+# Bulk adoption: concurrent config fetches against Proxmox
+BULK_ADOPT_CONCURRENCY = int(os.getenv("BULK_ADOPT_CONCURRENCY", "8"))
+
+# Batch deploys: max concurrent deployments per Proxmox node
+BATCH_DEPLOY_NODE_CONCURRENCY = int(os.getenv("BATCH_DEPLOY_NODE_CONCURRENCY", "3"))
+
+# Deployments: steps of one deployment run concurrently when their dependencies allow
+DEPLOY_STEP_CONCURRENCY = int(os.getenv("DEPLOY_STEP_CONCURRENCY", "4"))
+
+# Clones: max clone tasks in flight per node, and seconds to wait for one fan-out round
+CLONE_NODE_CONCURRENCY = int(os.getenv("CLONE_NODE_CONCURRENCY", "3"))
+CLONE_TASK_TIMEOUT = int(os.getenv("CLONE_TASK_TIMEOUT", "900"))
+
+# Node migrations: seconds to wait for the migrate task / for a clean shutdown (restart mode)
+MIGRATION_TASK_TIMEOUT = int(os.getenv("MIGRATION_TASK_TIMEOUT", "1800"))
+MIGRATION_SHUTDOWN_TIMEOUT = int(os.getenv("MIGRATION_SHUTDOWN_TIMEOUT", "180"))
+
+# Janitor: minutes an app may stay in a transitional state (deploying, migrating, ...)
+# before it is marked as error; keep it above the slowest legitimate operation
+JANITOR_STUCK_TIMEOUT_MINUTES = int(os.getenv("JANITOR_STUCK_TIMEOUT_MINUTES", "60"))
+
+# Rebalancer: memory utilization above which a node is hot, minimum utilization gap
+# between two nodes worth a move, and moves per run (auto-execute is off by default)
+REBALANCE_HOT_THRESHOLD = float(os.getenv("REBALANCE_HOT_THRESHOLD", "0.80"))
+REBALANCE_MIN_GAP = float(os.getenv("REBALANCE_MIN_GAP", "0.15"))
+REBALANCE_MAX_MOVES = int(os.getenv("REBALANCE_MAX_MOVES", "5"))
+REBALANCE_AUTO_EXECUTE = os.getenv("REBALANCE_AUTO_EXECUTE", "False") == "True"
+
+# Right-sizing: usage history window (Proxmox RRD timeframe), usage percentile sized for,
+# headroom on top of it, samples required, smallest memory change worth making,
+# memory floor, concurrent history fetches, and whether advice is applied automatically
+RIGHTSIZE_TIMEFRAME = os.getenv("RIGHTSIZE_TIMEFRAME", "week")
+RIGHTSIZE_PERCENTILE = float(os.getenv("RIGHTSIZE_PERCENTILE", "95"))
+RIGHTSIZE_HEADROOM = float(os.getenv("RIGHTSIZE_HEADROOM", "0.25"))
+RIGHTSIZE_MIN_SAMPLES = int(os.getenv("RIGHTSIZE_MIN_SAMPLES", "48"))
+RIGHTSIZE_MIN_CHANGE = float(os.getenv("RIGHTSIZE_MIN_CHANGE", "0.2"))
+RIGHTSIZE_MIN_MEMORY_MB = int(os.getenv("RIGHTSIZE_MIN_MEMORY_MB", "128"))
+RIGHTSIZE_CONCURRENCY = int(os.getenv("RIGHTSIZE_CONCURRENCY", "8"))
+RIGHTSIZE_AUTO_APPLY = os.getenv("RIGHTSIZE_AUTO_APPLY", "False") == "True"
+
+# Autosuspend: suspend apps idle for a window (opt-in; an app's config "autosuspend" overrides),
+# idle thresholds (network bytes/s in+out, busy cores), how long a wake request is held
+# while the container boots, and the shared secret the reverse proxy sends to wake apps
+AUTOSUSPEND_ENABLED = os.getenv("AUTOSUSPEND_ENABLED", "False") == "True"
+AUTOSUSPEND_IDLE_MINUTES = int(os.getenv("AUTOSUSPEND_IDLE_MINUTES", "60"))
+AUTOSUSPEND_NET_THRESHOLD = int(os.getenv("AUTOSUSPEND_NET_THRESHOLD", "2048"))
+AUTOSUSPEND_CPU_THRESHOLD = float(os.getenv("AUTOSUSPEND_CPU_THRESHOLD", "0.05"))
+AUTOSUSPEND_WAKE_TIMEOUT = int(os.getenv("AUTOSUSPEND_WAKE_TIMEOUT", "60"))
+# Seconds before a cold start with no outcome is given up and a new one is started
+AUTOSUSPEND_WAKE_STALE_AFTER = int(
+    os.getenv("AUTOSUSPEND_WAKE_STALE_AFTER", str(3 * AUTOSUSPEND_WAKE_TIMEOUT))
+)
+AUTOSUSPEND_WAKE_TOKEN = os.getenv("AUTOSUSPEND_WAKE_TOKEN", "")
+
+# Incremental backups: deduplicated chunk store, chunk size, and the Proxmox
+# storage used to stage uncompressed vzdump archives while they are chunked
+BACKUP_CHUNK_STORE_PATH = os.getenv("BACKUP_CHUNK_STORE_PATH", str(BASE_DIR / "backup_chunks"))
+BACKUP_CHUNK_SIZE = int(os.getenv("BACKUP_CHUNK_SIZE", str(4 * 1024 * 1024)))
+BACKUP_STAGING_STORAGE = os.getenv("BACKUP_STAGING_STORAGE", "local")
+
+# Seconds a cached per-storage backup index is trusted before it is rebuilt
+BACKUP_INDEX_TTL = int(os.getenv("BACKUP_INDEX_TTL", "3600"))
+
+# Backup policy pruning: archives deleted per batch
+BACKUP_PRUNE_BATCH_SIZE = int(os.getenv("BACKUP_PRUNE_BATCH_SIZE", "50"))
+
+# Backup export: off-node copies on a filesystem path or an S3-compatible bucket
+BACKUP_EXPORT_TARGET = os.getenv("BACKUP_EXPORT_TARGET", "filesystem")  # filesystem | s3
+BACKUP_EXPORT_PATH = os.getenv("BACKUP_EXPORT_PATH", str(BASE_DIR / "backup_exports"))
+BACKUP_EXPORT_PART_SIZE = int(os.getenv("BACKUP_EXPORT_PART_SIZE", str(8 * 1024 * 1024)))
+BACKUP_EXPORT_S3_BUCKET = os.getenv("BACKUP_EXPORT_S3_BUCKET", "")
+BACKUP_EXPORT_S3_PREFIX = os.getenv("BACKUP_EXPORT_S3_PREFIX", "proximity")
+BACKUP_EXPORT_S3_ENDPOINT = os.getenv("BACKUP_EXPORT_S3_ENDPOINT", "")  # e.g. MinIO URL
+BACKUP_EXPORT_S3_REGION = os.getenv("BACKUP_EXPORT_S3_REGION", "")
+BACKUP_EXPORT_S3_ACCESS_KEY = os.getenv("BACKUP_EXPORT_S3_ACCESS_KEY", "")
+BACKUP_EXPORT_S3_SECRET_KEY = os.getenv("BACKUP_EXPORT_S3_SECRET_KEY", "")
+
+# Restore fast path: take a container snapshot alongside every backup so
+# restores of recent backups can roll back in seconds instead of running vzdump
+BACKUP_COMPANION_SNAPSHOTS = os.getenv("BACKUP_COMPANION_SNAPSHOTS", "True") == "True"
+# Max seconds between a backup and a snapshot for the snapshot to stand in for it
+RESTORE_SNAPSHOT_MAX_GAP = int(os.getenv("RESTORE_SNAPSHOT_MAX_GAP", "900"))
+# Snapshot a container before a rollback restore discards its state, keeping the newest N
+AUTO_SNAPSHOT_BEFORE_RESTORE = os.getenv("AUTO_SNAPSHOT_BEFORE_RESTORE", "True") == "True"
+AUTO_SNAPSHOT_KEEP = int(os.getenv("AUTO_SNAPSHOT_KEEP", "3"))
+
 # Redis Configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
+# Cache Configuration
+# The default cache is shared by web and Celery processes (discovery listings,
+# refresh locks, backup index). Separate Redis DB from the Celery broker so a
+# cache clear never drops queued tasks. "local" is per-process, for objects that
+# cannot leave the process (e.g. Proxmox API clients and their connection pools).
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://redis:6379/1")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_REDIS_URL,
+        "KEY_PREFIX": "proximity",
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
 # Channels Configuration (for WebSockets)
 CHANNEL_LAYERS = {
     "default": {
@@ -222,6 +350,16 @@ PROXMOX_PASSWORD = os.getenv("PROXMOX_PASSWORD", "")
 PROXMOX_VERIFY_SSL = os.getenv("PROXMOX_VERIFY_SSL", "False") == "True"
 PROXMOX_PORT = int(os.getenv("PROXMOX_PORT", "8006"))
 
+# Async Proxmox client (fan-out reads): pool size, requests/second per host, timeout
+PROXMOX_ASYNC_MAX_CONNECTIONS = int(os.getenv("PROXMOX_ASYNC_MAX_CONNECTIONS", "10"))
+PROXMOX_ASYNC_RATE_LIMIT = float(os.getenv("PROXMOX_ASYNC_RATE_LIMIT", "20"))
+PROXMOX_ASYNC_TIMEOUT = float(os.getenv("PROXMOX_ASYNC_TIMEOUT", "15"))
+
+# Prometheus metrics (/metrics): bearer token scrapers must send (open when empty).
+# Multiprocess mode is enabled by the PROMETHEUS_MULTIPROC_DIR environment variable,
+# which prometheus_client reads itself; see apps/core/metrics.py
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # Sentry Configuration
 SENTRY_DSN = os.getenv("SENTRY_DSN", None)
 SENTRY_ENVIRONMENT = os.getenv("SENTRY_ENVIRONMENT", "development")
@@ -337,6 +475,24 @@ LOGGING = {
 # Path to catalog data directory containing application JSON files
 CATALOG_DATA_PATH = BASE_DIR.parent / "catalog_data"
 
+# Hot reload: every process re-checks the catalog files and the version published in
+# Redis at most this often (seconds), reparsing only the files that changed
+CATALOG_HOT_RELOAD = os.getenv("CATALOG_HOT_RELOAD", "True") == "True"
+CATALOG_RELOAD_INTERVAL = float(os.getenv("CATALOG_RELOAD_INTERVAL", "2"))
+
+# Seconds browsers and proxies may reuse catalog responses before revalidating (ETag)
+CATALOG_HTTP_MAX_AGE = int(os.getenv("CATALOG_HTTP_MAX_AGE", "30"))
+
+# Remote catalog sources (JSON list), synced every 15 minutes by Celery Beat, e.g.
+# [{"name": "community", "type": "http", "url": "https://example.org/catalog.json"},
+#  {"name": "team", "type": "git", "url": "https://git.example.org/c.git", "ref": "main"}]
+CATALOG_SOURCES = json.loads(os.getenv("CATALOG_SOURCES", "[]"))
+
+# Versioned source caches and the compiled catalog snapshots loaded at startup
+CATALOG_CACHE_DIR = os.getenv("CATALOG_CACHE_DIR", str(BASE_DIR / "catalog_cache"))
+CATALOG_CACHE_KEEP_VERSIONS = int(os.getenv("CATALOG_CACHE_KEEP_VERSIONS", "3"))
+CATALOG_SYNC_TIMEOUT = int(os.getenv("CATALOG_SYNC_TIMEOUT", "30"))
+
 
 # ======================================================================
 # CSRF SETTINGS FOR HTTPS
@@ -14,6 +14,8 @@ from apps.proxmox.api import router as proxmox_router
 from apps.backups.api import router as backups_router
 from apps.catalog.api import router as catalog_router
 
+from apps.core.metrics import metrics_view
+
 from .auth import JWTCookieAuthenticator
 
 # Create Django Ninja API instance with global authentication
@@ -70,6 +72,8 @@ api.add_router("/catalog/", catalog_router, tags=["Catalog"])
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # Prometheus scrape endpoint (outside the API: no JWT, optional METRICS_TOKEN)
+    path("metrics", metrics_view),
     # Mount the Ninja API (now globally protected by JWT cookie auth)
     path("api/", api.urls),
     # Add dj-rest-auth endpoints for login, logout, token refresh, etc.
@@ -148,6 +148,10 @@ def test_catalog_service():
             assert service is service2
             print("  ✓ Singleton pattern works")
 
+    # Don't leave the singleton pointing at the removed temp directory
+    CatalogService._instance = None
+    CatalogService._initialized = False
+
 
 def test_api_endpoints():
     """Test API endpoint structure."""
@@ -306,8 +306,18 @@ class ApiClient {
 	}
 
 	// Container Discovery & Adoption
-	async discoverUnmanagedContainers(hostId?: number) {
-		const params = hostId ? this.buildQueryString({ host_id: hostId }) : '';
+	async discoverUnmanagedContainers(
+		hostId?: number,
+		filters: {
+			node?: string;
+			status?: string;
+			search?: string;
+			page?: number;
+			per_page?: number;
+			refresh?: boolean;
+		} = {}
+	) {
+		const params = this.buildQueryString({ host_id: hostId, ...filters });
 		return this.request(`/api/apps/discover${params}`);
 	}
 
@@ -360,6 +370,13 @@ class ApiClient {
 		return this.request(`/api/apps/${appId}/backups/stats`);
 	}
 
+	async getBulkBackupStats(appIds?: string[]) {
+		const query = appIds?.length
+			? '?' + appIds.map((id) => `app_ids=${encodeURIComponent(id)}`).join('&')
+			: '';
+		return this.request(`/api/backups/stats${query}`);
+	}
+
 	// Settings API
 	async getResourceSettings() {
 		return this.request('/api/core/settings/resources', {